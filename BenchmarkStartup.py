@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# \Author: ionut.cristian.arsene@cern.ch
+# \Interface:  cevat.batuhan.tolon@cern.ch
+
+import os
+import sys
+import json
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.benchmarkHooks import STUB_FOLDER, runInstrumented
+
+# This script benchmarks the startup (time-to-command) of the run scripts with stubbed o2-* executables
+# and writes the phase times and peak memory to JSON. With --compare it reports regressions against an older result.
+
+# child process of the benchmark (started in the scratch work directory):
+# BenchmarkStartup.py --child <run script> <result file> -- <run script args>
+if len(sys.argv) > 1 and sys.argv[1] == "--child":
+    childScript, childResultFile, childArgs = sys.argv[2], sys.argv[3], sys.argv[5 :]
+    childResult = runInstrumented(childScript, childArgs, os.path.abspath(STUB_FOLDER))
+    with open(childResultFile, "w") as resultFile:
+        json.dump(childResult, resultFile)
+    sys.exit(0)
+
+# imports of the parent process, the child process measures the run script imports
+import shlex
+import argparse
+import logging
+import logging.config
+import argcomplete
+from extramodules.startupBenchmark import BENCHMARK_CASES, BENCHMARK_FILE, runBenchmark, compareBenchmarks
+
+parser = argparse.ArgumentParser(description = "Arguments to pass")
+parser.add_argument(
+    "--scripts", help = "Run scripts to benchmark (default: all)", action = "store", nargs = "*", choices = list(BENCHMARK_CASES.keys()),
+    )
+parser.add_argument(
+    "--scriptArgs",
+    help = "Arguments of the benchmarked run scripts instead of the default config (quoted, e.g. \"config.json --process Full\")",
+    action = "store", type = str,
+    )
+parser.add_argument("--repeat", help = "Measured runs per run script", action = "store", type = int, default = 5)
+parser.add_argument(
+    "--warmup", help = "Unmeasured runs per run script (bytecode and DQ library index caches)", action = "store", type = int, default = 1
+    )
+parser.add_argument("--output", help = "Output JSON file", action = "store", type = str, default = BENCHMARK_FILE)
+parser.add_argument("--compare", help = "Baseline JSON file of an older benchmark to compare with", action = "store", type = str)
+parser.add_argument(
+    "--threshold", help = "Relative increase of a median which is reported as regression", action = "store", type = float, default = 0.2
+    )
+parser.add_argument(
+    "--debug", help = "execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    default = "INFO", type = str.upper,
+    )
+
+argcomplete.autocomplete(parser)
+extrargs = parser.parse_args()
+
+logging.basicConfig(format = "[%(levelname)s] %(message)s", level = extrargs.debug)
+
+cases = {
+    script: BENCHMARK_CASES[script]
+    for script in extrargs.scripts or BENCHMARK_CASES.keys()
+    }
+if extrargs.scriptArgs is not None:
+    cases = {
+        script: shlex.split(extrargs.scriptArgs)
+        for script in cases
+        }
+
+benchmark = runBenchmark(cases, extrargs.repeat, extrargs.warmup)
+with open(extrargs.output, "w") as outputFile:
+    json.dump(benchmark, outputFile, indent = 2)
+logging.info("Benchmark results written to %s", extrargs.output)
+
+for script, result in benchmark["results"].items():
+    failedRuns = [run["exitCode"] for run in result["runs"] if run["exitCode"] != 0]
+    if failedRuns:
+        logging.warning("%s exited with %s, phases after the failure are missing", script, failedRuns[0])
+    logging.debug(
+        "%s median phase times: %s", script,
+        ", ".join(phase + " " + format(result["summary"][phase]["median"], ".4f") + " s" for phase in benchmark["phases"])
+        )
+
+if extrargs.compare:
+    with open(extrargs.compare) as baselineFile:
+        baseline = json.load(baselineFile)
+    logging.info("Comparing with %s (commit %s)", extrargs.compare, baseline.get("commit"))
+    regressions = 0
+    for script, metric, old, new, change, regression in compareBenchmarks(baseline, benchmark, extrargs.threshold):
+        level = logging.WARNING if regression else logging.DEBUG
+        logging.log(level, "%s %s: %.4f -> %.4f (%+.1f%%)", script, metric, old, new, 100 * change)
+        regressions += regression
+    if regressions:
+        logging.error("%d startup regressions above %.0f%%", regressions, 100 * extrargs.threshold)
+        sys.exit(1)
+    logging.info("No startup regressions above %.0f%%", 100 * extrargs.threshold)
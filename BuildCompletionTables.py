@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# \Author: ionut.cristian.arsene@cern.ch
+# \Interface:  cevat.batuhan.tolon@cern.ch
+
+import sys
+import argparse
+import logging
+import logging.config
+import argcomplete
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import ENTRY_POINTS, buildEntryPointParser, writeCompletionTable, loadCompletionTable
+from extramodules.completionScript import COMPLETION_SCRIPT_FILE, writeCompletionScript
+
+# This script builds the precompiled completion tables of the run scripts, so TAB autocompletion does not import the interfaces.
+# Tables are also refreshed automatically on the first TAB press after an interface or a DQ library changes.
+# With --shellScript it also generates static bash/zsh completion functions (no python process per TAB press)
+
+parser = argparse.ArgumentParser(description = "Arguments to pass")
+parser.add_argument(
+    "--scripts", help = "Run scripts for building completion tables (default: all)", action = "store", nargs = "*",
+    choices = list(ENTRY_POINTS.keys()),
+    )
+parser.add_argument(
+    "--shellScript",
+    help = "Also generate static bash/zsh completion script " + COMPLETION_SCRIPT_FILE + " (source it instead of argcomplete.sh)",
+    action = "store_true",
+    )
+parser.add_argument(
+    "--debug", help = "execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    default = "INFO", type = str.upper,
+    )
+
+argcomplete.autocomplete(parser)
+extrargs = parser.parse_args()
+
+logging.basicConfig(format = "[%(levelname)s] %(message)s", level = extrargs.debug)
+
+tables = {}
+for script in extrargs.scripts or ENTRY_POINTS.keys():
+    tablePath = writeCompletionTable(buildEntryPointParser(script), script)
+    tables[script] = loadCompletionTable(script)
+    logging.info("Completion table of %s created at %s", script, tablePath)
+
+if extrargs.shellScript:
+    completionScript = writeCompletionScript(tables)
+    logging.info("Static completion script created at %s, activate it with: source %s", completionScript, completionScript)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# \Author: ionut.cristian.arsene@cern.ch
+# \Interface:  cevat.batuhan.tolon@cern.ch
+
+import os
+import sys
+import signal
+import argparse
+import logging
+import logging.config
+import argcomplete
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionDaemon import CompletionDaemon, daemonSocketPath, daemonPidPath, isDaemonRunning
+
+# This script starts/stops the per-user completion daemon for TAB autocompletion of run scripts (use it with argcompleteDaemon.sh)
+
+parser = argparse.ArgumentParser(description = "Arguments to pass")
+parser.add_argument("--detach", help = "Run the completion daemon in background", action = "store_true")
+parser.add_argument("--stop", help = "Stop the running completion daemon", action = "store_true")
+parser.add_argument("--status", help = "Show whether the completion daemon is running", action = "store_true")
+parser.add_argument(
+    "--debug", help = "execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    default = "INFO", type = str.upper,
+    )
+
+
+def stopDaemon():
+    """Sends SIGTERM to the running completion daemon"""
+    
+    try:
+        with open(daemonPidPath()) as f:
+            pid = int(f.read())
+        os.kill(pid, signal.SIGTERM)
+        logging.info("Completion daemon (pid %s) stopped", pid)
+    except (OSError, ValueError):
+        logging.warning("Completion daemon is not running")
+
+
+def detach():
+    """Forks the daemon into background and detaches it from the terminal"""
+    
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    with open(os.devnull, "r+") as devnull:
+        for stream in [sys.stdin, sys.stdout, sys.stderr]:
+            os.dup2(devnull.fileno(), stream.fileno())
+
+
+# the daemon spawns interpreters for building completion tables, they import this script again
+if __name__ == "__main__":
+    argcomplete.autocomplete(parser)
+    extrargs = parser.parse_args()
+    
+    logging.basicConfig(format = "[%(levelname)s] %(message)s", level = extrargs.debug)
+    
+    if extrargs.status:
+        if isDaemonRunning(daemonSocketPath()):
+            logging.info("Completion daemon is running on %s", daemonSocketPath())
+        else:
+            logging.info("Completion daemon is not running")
+        sys.exit()
+    
+    if extrargs.stop:
+        stopDaemon()
+        sys.exit()
+    
+    if extrargs.detach:
+        detach()
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0)) # cleanup socket and pid file
+    CompletionDaemon().serve()
@@ -16,29 +16,37 @@
 # \Author: ionut.cristian.arsene@cern.ch
 # \Interface:  cevat.batuhan.tolon@cern.ch
 
-import urllib.request
-from urllib.request import Request, urlopen
 import os
 import sys
 import argparse
-import ssl
 import logging
 import logging.config
-import shutil
 import argcomplete
 
-# This script provides download to DQ libraries from O2Physics-DQ Manually with/without Production tag or get DQ libraries from alice-software in local machine
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionScript import writeCompletionScript
+from extramodules.libDownloader import libUrls
+from extramodules.libStore import MAX_VERSIONS, localRef, useVersion
 
-# header for github download
-headers = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
-    }
+# This script provides download to DQ libraries from O2Physics-DQ Manually with/without Production tag or get DQ libraries from alice-software in local machine
 
 parser = argparse.ArgumentParser(description = "Arguments to pass")
 parser.add_argument(
     "--version", help = "Online: Your Production tag for O2Physics example: for nightly-20220619, just enter as 20220619", action = "store",
     type = str.lower,
     )
+parser.add_argument(
+    "--baseUrl", help = "Online: Source of the O2Physics tree instead of github (<baseUrl>/<version>/PWGDQ/Core/...), e.g. a mirror",
+    action = "store", type = str
+    )
+parser.add_argument(
+    "--keepVersions", help = "Online and Local: Number of DQ library versions kept in the store (least recently used are evicted)",
+    action = "store", default = MAX_VERSIONS, type = int
+    )
 parser.add_argument(
     "--debug", help = "Online and Local: execute with debug options", action = "store",
     choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], default = "DEBUG", type = str.upper,
@@ -67,12 +75,17 @@ localPathMCSignalsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/MCSigna
 localPathEventMixing = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/MixingLibrary.h"
 localPathHistogramsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/HistogramsLibrary.h"
 
-URL_CUTS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/CutsLibrary.h?raw=true")
-URL_MCSIGNALS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MCSignalLibrary.h?raw=true")
-URL_MIXING_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MixingLibrary.h?raw=true")
-URL_HISTOGRAMS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/HistogramsLibrary.h?raw=true"
+O2PHYSICS_VERSION = "master"
+
+
+def regenerateCompletionScript():
+    """Regenerates the static completion script, choices of DQ libraries are inlined in it"""
+    
+    completionScript = writeCompletionScript()
+    logging.info(
+        "Static completion script %s regenerated with new DQ libraries. Activate it with: source %s", completionScript, completionScript
+        )
 
-isLibsExist = True
 
 if extrargs.version is not None:
     prefix_version = "nightly-"
@@ -87,13 +100,7 @@ if extrargs.debug:
 
 if extrargs.version and extrargs.local is False:
     logging.info("DQ libs will downloaded from github. Your Version For Downloading DQ Libs From Github : %s", extrargs.version,)
-    
-    URL_CUTS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/CutsLibrary.h?raw=true")
-    URL_MCSIGNALS_LIBRARY = (
-        "https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/MCSignalLibrary.h?raw=true"
-        )
-    URL_MIXING_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/MixingLibrary.h?raw=true")
-    URL_HISTOGRAMS_LIBRARY = ("https://github.com/AliceO2Group/O2Physics/blob/" + extrargs.version + "/PWGDQ/Core/HistogramsLibrary.h?raw=true")
+    O2PHYSICS_VERSION = extrargs.version
 
 if extrargs.local and extrargs.version:
     logging.warning(
@@ -131,113 +138,41 @@ if extrargs.local:
     localPathCutsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/CutsLibrary.h"
     localPathMCSignalsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/MCSignalLibrary.h"
     localPathEventMixing = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/MixingLibrary.h"
-    localPathHistogramsLibrary= ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/HistogramsLibrary.h"
+    localPathHistogramsLibrary = ALICE_SOFTWARE_PATH + "/O2Physics/PWGDQ/Core/HistogramsLibrary.h"
     
     logging.info("Local CutsLibrary.h Path: %s ", localPathCutsLibrary)
     logging.info("Local MCSignalsLibrary.h Path: %s ", localPathMCSignalsLibrary)
     logging.info("Local MixingLibrary.h Path: %s ", localPathEventMixing)
     logging.info("Local HistogramsLibrary.h Path: %s ", localPathHistogramsLibrary)
-    try:
-        with open("tempCutsLibrary.h", "wb") as f:
-            shutil.copyfile(localPathCutsLibrary, MY_PATH + "/tempCutsLibrary.h")
-            if os.path.isfile("tempCutsLibrary.h") is True:
-                logging.info("tempCutsLibrary.h created at %s", MY_PATH)
-            else:
-                logging.error("tempCutsLibrary.h not created at %s Fatal Error", MY_PATH)
-                sys.exit()
-    except FileNotFoundError:
-        logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathCutsLibrary,)
-        sys.exit()
-    
-    try:
-        with open("tempMCSignalsLibrary.h", "wb") as f:
-            shutil.copyfile(localPathMCSignalsLibrary, MY_PATH + "/tempMCSignalsLibrary.h")
-            if os.path.isfile("tempMCSignalsLibrary.h") is True:
-                logging.info("tempMCSignalsLibrary.h created at %s", MY_PATH)
-            else:
-                logging.error("tempMCSignalsLibrary.h not created at %s Fatal Error", MY_PATH)
-                sys.exit()
-    except FileNotFoundError:
-        logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathMCSignalsLibrary,)
-        sys.exit()
-    
-    try:
-        with open("tempMixingLibrary.h", "wb") as f:
-            shutil.copyfile(localPathEventMixing, MY_PATH + "/tempMixingLibrary.h")
-            if os.path.isfile("tempMixingLibrary.h") is True:
-                logging.info("tempMixingLibrary.h created at %s", MY_PATH)
-            else:
-                logging.error("tempMixingLibrary.h not created at %s Fatal Error", MY_PATH)
-                sys.exit()
-    except FileNotFoundError:
-        logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathEventMixing,)
-        sys.exit()
-        
-    try:
-        with open("tempHistogramsLibrary.h", "wb") as f:
-            shutil.copyfile(localPathHistogramsLibrary, MY_PATH + "/tempHistogramsLibrary.h")
-            if os.path.isfile("tempHistogramsLibrary.h") is True:
-                logging.info("tempHistogramsLibrary.h created at %s", MY_PATH)
-            else:
-                logging.error("tempHistogramsLibrary.h not created at %s Fatal Error", MY_PATH)
-                sys.exit()
-    except FileNotFoundError:
-        logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPathHistogramsLibrary,)
-        sys.exit()
+    for localPath in [localPathCutsLibrary, localPathMCSignalsLibrary, localPathEventMixing, localPathHistogramsLibrary]:
+        if not os.path.isfile(localPath):
+            logging.error("%s not found in your provided alice-software path!!! Check your alice software path", localPath)
+            sys.exit()
     
+    # Local checkouts are kept by commit (local-<commit>), the headers are added to the store if their content is new
+    o2PhysicsPath = ALICE_SOFTWARE_PATH + "/O2Physics"
+    contentHash, changed = useVersion(
+        localRef(o2PhysicsPath), o2PhysicsPath = o2PhysicsPath, workDir = MY_PATH, maxVersions = extrargs.keepVersions
+        )
     logging.info("DQ Libraries pulled from local alice software successfully!")
+    if changed:
+        regenerateCompletionScript()
     sys.exit()
 
+# Stored nightly tags are a pointer flip, otherwise missing headers are downloaded and existing headers are only transferred again
+# if they are changed on the server (ETag/Last-Modified)
 if extrargs.local is False:
-    if (os.path.isfile("tempCutsLibrary.h") and os.path.isfile("tempMCSignalsLibrary.h") and os.path.isfile("tempMixingLibrary.h") and os.path.isfile("tempHistogramsLibrary.h")) is False:
-        logging.info("Some Libs are Missing. All DQ libs will download")
-        logging.info("Github CutsLibrary.h Path: %s ", URL_CUTS_LIBRARY)
-        logging.info("Github MCSignalsLibrary.h Path: %s ", URL_MCSIGNALS_LIBRARY)
-        logging.info("Github MixingLibrary.h Path: %s ", URL_MIXING_LIBRARY)
-        logging.info("Github HistogramsLibrary.h Path: %s ", URL_HISTOGRAMS_LIBRARY)
-        isLibsExist = False
-        if extrargs.debug:
-            try:
-                context = ssl._create_unverified_context() # prevent ssl problems
-                request = urllib.request.urlopen(URL_CUTS_LIBRARY, context = context)
-                request = urllib.request.urlopen(URL_MCSIGNALS_LIBRARY, context = context)
-                request = urllib.request.urlopen(URL_MIXING_LIBRARY, context = context)
-                request = urllib.request.urlopen(URL_HISTOGRAMS_LIBRARY, context = context)
-            except urllib.error.HTTPError as error:
-                logging.error(error)
-        else:
-            # Dummy SSL Adder
-            context = ssl._create_unverified_context() # prevent ssl problems
-            request = urllib.request.urlopen(URL_CUTS_LIBRARY, context = context)
-        
-        # HTTP Request
-        requestCutsLibrary = Request(URL_CUTS_LIBRARY, headers = headers)
-        requestMCSignalsLibrary = Request(URL_MCSIGNALS_LIBRARY, headers = headers)
-        requestMixingLibrary = Request(URL_MIXING_LIBRARY, headers = headers)
-        requestHistogramsLibrary = Request(URL_HISTOGRAMS_LIBRARY, headers = headers)
-        
-        # Get Files With Http Requests
-        htmlCutsLibrary = urlopen(requestCutsLibrary, context = context).read()
-        htmlMCSignalsLibrary = urlopen(requestMCSignalsLibrary, context = context).read()
-        htmlMixingLibrary = urlopen(requestMixingLibrary, context = context).read()
-        htmlHistogramsLibrary = urlopen(requestHistogramsLibrary, context = context).read()
-        
-        with open("tempCutsLibrary.h", "wb") as f:
-            f.write(htmlCutsLibrary)
-            logging.info("tempCutsLibrary.h downloaded successfully from github")
-        with open("tempMCSignalsLibrary.h", "wb") as f:
-            f.write(htmlMCSignalsLibrary)
-            logging.info("tempMCSignalsLibrary.h downloaded successfully from github")
-        with open("tempMixingLibrary.h", "wb") as f:
-            f.write(htmlMixingLibrary)
-            logging.info("tempMixingLibrary.h downloaded successfully from github")
-        with open("tempHistogramsLibrary.h", "wb") as f:
-            f.write(htmlHistogramsLibrary)
-            logging.info("tempHistogramsLibrary.h downloaded successfully from github")
+    urls = libUrls(O2PHYSICS_VERSION, extrargs.baseUrl)
+    for lib, url in urls.items():
+        logging.info("%s Path: %s ", lib, url)
+    contentHash, changed = useVersion(O2PHYSICS_VERSION, urls = urls, workDir = MY_PATH, maxVersions = extrargs.keepVersions)
     
-    if isLibsExist:
-        logging.info("DQ Libraries have been downloaded before. If you want to update, delete they manually and run this script again.")
-        sys.exit()
+    if contentHash is None:
+        logging.error("Some DQ libraries could not be downloaded, the previous headers are kept. Check your connection or use --local")
+        sys.exit(1)
+    if changed:
+        logging.info("DQ Libraries switched to %s successfully!", O2PHYSICS_VERSION)
+        regenerateCompletionScript()
     else:
-        logging.info("DQ Libraries downloaded from github successfully!")
+        logging.info("DQ Libraries are up to date.")
 sys.exit()
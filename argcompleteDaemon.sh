@@ -0,0 +1,44 @@
+# TAB autocompletion of DQ run scripts through the completion daemon (python3 CompletionDaemon.py --detach).
+# Source it instead of argcomplete.sh: source argcompleteDaemon.sh
+# Queries are sent to the daemon socket with socat, if the daemon is not running (or socat is missing)
+# completion falls back to argcomplete.sh, which spawns python for every TAB press.
+
+source "$(dirname "${BASH_SOURCE[0]}")/argcomplete.sh"
+
+# Same rule as daemonSocketPath() in extramodules/completionDaemon.py
+__dq_completion_socket() {
+    echo "${XDG_RUNTIME_DIR:-${TMPDIR:-/tmp}}/dq-completion-$(id -u).sock"
+}
+
+_dq_completion_daemon_global() {
+    local executable=$1
+    local script=""
+    local ARGCOMPLETE=0
+    if [[ "$executable" == python* ]] && [[ "${COMP_WORDS[1]}" == *run*.py ]]; then
+        script=${COMP_WORDS[1]}
+        ARGCOMPLETE=2
+    elif [[ "$executable" == *run*.py ]]; then
+        script=$executable
+        ARGCOMPLETE=1
+    fi
+
+    local socket=$(__dq_completion_socket)
+    if [[ -n "$script" ]] && [[ -S "$socket" ]] && type -P socat >/dev/null 2>&1; then
+        local IFS=$(echo -e '\v')
+        local reply
+        # "." is appended if socat succeeds, it keeps the trailing newlines of the reply (stripped by the command substitution)
+        reply=$(printf '%s\0' "${script##*/}" "$PWD" "$ARGCOMPLETE" "$COMP_LINE" "$COMP_POINT" "$COMP_WORDBREAKS" "$IFS" \
+            | socat -t 5 - "UNIX-CONNECT:$socket" 2>/dev/null && printf '.')
+        if [[ "${reply: -1}" == "." ]] && [[ "${reply:0:2}" == $'0\n' ]]; then
+            reply=${reply%.}
+            COMPREPLY=( ${reply:2} )
+            if [[ "${COMPREPLY-}" =~ [=/:]$ ]]; then
+                compopt -o nospace
+            fi
+            return
+        fi
+    fi
+
+    _python_argcomplete_global "$@"
+}
+complete -o default -o bashdefault -D -F _dq_completion_daemon_global
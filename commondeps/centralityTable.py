@@ -16,7 +16,31 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/centralityTable.cxx
 
 import argparse
-from extramodules.choicesHandler import ChoicesCompleterList
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Predefined Selections
+CENTRALITY_TABLE_SELECTIONS = {
+    "Run2V0M": "Produces centrality percentiles using V0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "Run2SPDtks": "Produces Run2 centrality percentiles using SPD tracklets multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "Run2SPDcls": "Produces Run2 centrality percentiles using SPD clusters multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "Run2CL0": "Produces Run2 centrality percentiles using CL0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "Run2CL1": "Produces Run2 centrality percentiles using CL1 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "FV0A": "Produces centrality percentiles using FV0A multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "FT0M": "Produces centrality percentiles using FT0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "FDDM": "Produces centrality percentiles using FDD multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    "NTPV": "Produces centrality percentiles using number of tracks contributing to the PV. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
+    }
+
+# Interface
+CENTRALITY_TABLE_SCHEMA = [
+    argumentGroup(
+        "Data processor options: centrality-table",
+        argument(
+            "--est", help = "Produces centrality percentiles parameters", nargs = "*", type = str, metavar = "EST",
+            choices = CENTRALITY_TABLE_SELECTIONS
+            ),
+        ),
+    ]
 
 
 class CentralityTable(object):
@@ -28,45 +52,18 @@ class CentralityTable(object):
         object (parser_args() object): centralityTable.cxx Interface
     """
     
-    def __init__(self, parserCentralityTable = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserCentralityTable = None):
         super(CentralityTable, self).__init__()
+        if parserCentralityTable is None:
+            parserCentralityTable = argparse.ArgumentParser(add_help = False)
         self.parserCentralityTable = parserCentralityTable
-        # self.parserB.register("action", "none", NoAction)
-        # self.parserB.register("action", "store_choice", ChoicesAction)
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        centralityTableSelections = {
-            "Run2V0M": "Produces centrality percentiles using V0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "Run2SPDtks":
-                "Produces Run2 centrality percentiles using SPD tracklets multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "Run2SPDcls":
-                "Produces Run2 centrality percentiles using SPD clusters multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "Run2CL0": "Produces Run2 centrality percentiles using CL0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "Run2CL1": "Produces Run2 centrality percentiles using CL1 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "FV0A": "Produces centrality percentiles using FV0A multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "FT0M": "Produces centrality percentiles using FT0 multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "FDDM": "Produces centrality percentiles using FDD multiplicity. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            "NTPV":
-                "Produces centrality percentiles using number of tracks contributing to the PV. -1: auto, 0: don't, 1: yes. Default: auto (-1)",
-            }
-        centralityTableSelectionsList = []
-        for k, v in centralityTableSelections.items():
-            centralityTableSelectionsList.append(k)
-        
-        # Interface
-        groupCentralityTable = self.parserCentralityTable.add_argument_group(title = "Data processor options: centrality-table")
-        groupCentralityTable.add_argument(
-            "--est", help = "Produces centrality percentiles parameters", action = "store", nargs = "*", type = str, metavar = "EST",
-            choices = centralityTableSelectionsList,
-            ).completer = ChoicesCompleterList(centralityTableSelectionsList)
-        
-        for key, value in centralityTableSelections.items():
-            groupCentralityTable.add_argument(key, help = value, action = "none")
+        addSchemaArguments(self.parserCentralityTable, CENTRALITY_TABLE_SCHEMA)
     
     def parseArgs(self):
         """
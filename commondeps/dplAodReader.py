@@ -14,6 +14,68 @@
 # or submit itself to any jurisdiction.
 
 import argparse
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Interface
+DPL_AOD_READER_SCHEMA = [
+    argumentGroup(
+        "Data processor options: internal-dpl-aod-reader", argument("--aod", help = "Add your AOD File with path", type = str),
+        argument("--aod-memory-rate-limit", help = "Rate limit AOD processing based on memory", type = str),
+        argument("cfgFileName", metavar = "Config.json", default = "config.json", help = "config JSON file name (mandatory)"),
+        ),
+    ]
+
+# Shared memory of the workflows which produce skimmed tables (tableMaker), see extramodules/memorySizing.py
+MEMORY_SIZING_SELECTIONS = {
+    "fixed": "12 GB shared memory segment",
+    "auto": "Shared memory segment and AOD memory rate limit derived from the memory budget (node, cgroup, shards), AO2D sizes and tables",
+    }
+SHARED_MEMORY_SCHEMA = [
+    argumentGroup(
+        "Shared memory of the workflow",
+        argument("--shm-segment-size", help = "Shared memory segment size in bytes (wins over --memorySizing)", type = int),
+        argument(
+            "--memorySizing", help = "Sizing of the shared memory segment and the AOD memory rate limit", type = str,
+            metavar = "MEMORYSIZING", choices = MEMORY_SIZING_SELECTIONS, default = "fixed"
+            ),
+        ),
+    ]
+
+# Cache of the skimmed data of tableMaker, see extramodules/skimCache.py
+SKIM_CACHE_SELECTIONS = {
+    "off": "Skimming always runs",
+    "on":
+        "reducedAod of a run with the same skim-relevant config and input files is taken from the cache (tempSkimCache) instead of skimming",
+    }
+SKIM_CACHE_SCHEMA = [
+    argumentGroup(
+        "Cache of the skimmed data",
+        argument(
+            "--skimCache", help = "Cache of the reducedAod outputs keyed by the skim-relevant config and input files", type = str,
+            metavar = "SKIMCACHE", choices = SKIM_CACHE_SELECTIONS, default = "off"
+            ),
+        argument(
+            "--skimCacheSize", help = "Largest size of the cache in GB (least recently used entries are evicted)", type = float,
+            default = 50.0
+            ),
+        ),
+    ]
+
+# Pruning of the skimmed output tables against the downstream analyses, see extramodules/tablePruning.py
+TABLE_PRUNING_SCHEMA = [
+    argumentGroup(
+        "Pruning of the skimmed tables",
+        argument(
+            "--pruneFor",
+            help = "JSON configs or quoted run scripts with arguments of the downstream analyses (tableReader, dqEfficiency), tables"
+            " not consumed by them are not written", nargs = "*", type = str, metavar = "PRUNEFOR"
+            ),
+        argument(
+            "--pruneReference", help = "Output written without pruning, the bytes saved per table are measured in it", type = str,
+            default = "reducedAod.root"
+            ),
+        ),
+    ]
 
 
 class DplAodReader(object):
@@ -25,8 +87,10 @@ class DplAodReader(object):
         object (parser_args() object): DplAodReader Interface
     """
     
-    def __init__(self, parserDplAodReader = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserDplAodReader = None):
         super(DplAodReader, self).__init__()
+        if parserDplAodReader is None:
+            parserDplAodReader = argparse.ArgumentParser(add_help = False)
         self.parserDplAodReader = parserDplAodReader
     
     def addArguments(self):
@@ -34,15 +98,7 @@ class DplAodReader(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Interface
-        groupDPLReader = self.parserDplAodReader.add_argument_group(title = "Data processor options: internal-dpl-aod-reader")
-        groupDPLReader.add_argument("--aod", help = "Add your AOD File with path", action = "store", type = str)
-        groupDPLReader.add_argument(
-            "--aod-memory-rate-limit", help = "Rate limit AOD processing based on memory", action = "store", type = str
-            )
-        groupDPLReader.add_argument(
-            "cfgFileName", metavar = "Config.json", default = "config.json", help = "config JSON file name (mandatory)"
-            )
+        addSchemaArguments(self.parserDplAodReader, DPL_AOD_READER_SCHEMA)
     
     def parseArgs(self):
         """
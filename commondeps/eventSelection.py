@@ -17,7 +17,23 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/eventSelection.cxx
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Predefined Selections
+COLLISION_SYSTEM_SELECTIONS = ["PbPb", "pp", "pPb", "Pbp", "XeXe"]
+EVENT_MUON_SELECTIONS = ["0", "1", "2"]
+
+# Interface
+EVENT_SELECTION_SCHEMA = [
+    argumentGroup(
+        "Data processor options: event-selection-task",
+        argument("--syst", help = "Collision System Selection ex. pp", type = str, choices = COLLISION_SYSTEM_SELECTIONS),
+        argument(
+            "--muonSelection", help = "0 - barrel, 1 - muon selection with pileup cuts, 2 - muon selection without pileup cuts", type = str,
+            choices = EVENT_MUON_SELECTIONS
+            ), argument("--customDeltaBC", help = "custom BC delta for FIT-collision matching", type = str),
+        ),
+    ]
 
 
 class EventSelectionTask(object):
@@ -29,8 +45,10 @@ class EventSelectionTask(object):
         object (parser_args() object): eventSelection.cxx Interface
     """
     
-    def __init__(self, parserEventSelectionTask = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserEventSelectionTask = None):
         super(EventSelectionTask, self).__init__()
+        if parserEventSelectionTask is None:
+            parserEventSelectionTask = argparse.ArgumentParser(add_help = False)
         self.parserEventSelectionTask = parserEventSelectionTask
     
     def addArguments(self):
@@ -38,22 +56,7 @@ class EventSelectionTask(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        collisionSystemSelections = ["PbPb", "pp", "pPb", "Pbp", "XeXe"]
-        eventMuonSelections = ["0", "1", "2"]
-        
-        # Interface
-        groupEventSelection = self.parserEventSelectionTask.add_argument_group(title = "Data processor options: event-selection-task")
-        groupEventSelection.add_argument(
-            "--syst", help = "Collision System Selection ex. pp", action = "store", type = str, choices = (collisionSystemSelections),
-            ).completer = ChoicesCompleter(collisionSystemSelections)
-        groupEventSelection.add_argument(
-            "--muonSelection", help = "0 - barrel, 1 - muon selection with pileup cuts, 2 - muon selection without pileup cuts",
-            action = "store", type = str, choices = (eventMuonSelections),
-            ).completer = ChoicesCompleter(eventMuonSelections)
-        groupEventSelection.add_argument(
-            "--customDeltaBC", help = "custom BC delta for FIT-collision matching", action = "store", type = str,
-            )
+        addSchemaArguments(self.parserEventSelectionTask, EVENT_SELECTION_SCHEMA)
     
     def parseArgs(self):
         """
@@ -16,7 +16,18 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/multiplicityTable.cxx
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Predefined Selections
+BINARY_SELECTIONS = ["1", "0"]
+
+# Interface
+MULTIPLICITY_TABLE_SCHEMA = [
+    argumentGroup(
+        "Data processor options: multiplicity-table",
+        argument("--doVertexZeq", help = "if 1: do vertex Z eq mult table", type = str, choices = BINARY_SELECTIONS),
+        ),
+    ]
 
 
 class MultiplicityTable(object):
@@ -28,8 +39,10 @@ class MultiplicityTable(object):
         object (parser_args() object): multiplicityTable.cxx Interface
     """
     
-    def __init__(self, parserMultiplicityTable = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserMultiplicityTable = None):
         super(MultiplicityTable, self).__init__()
+        if parserMultiplicityTable is None:
+            parserMultiplicityTable = argparse.ArgumentParser(add_help = False)
         self.parserMultiplicityTable = parserMultiplicityTable
     
     def addArguments(self):
@@ -37,14 +50,7 @@ class MultiplicityTable(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        binarySelections = ["1", "0"]
-        
-        # Interface
-        groupMultiplicityTable = self.parserMultiplicityTable.add_argument_group(title = "Data processor options: multiplicity-table")
-        groupMultiplicityTable.add_argument(
-            "--doVertexZeq", help = "if 1: do vertex Z eq mult table", action = "store", type = str, choices = (binarySelections),
-            ).completer = ChoicesCompleter(binarySelections)
+        addSchemaArguments(self.parserMultiplicityTable, MULTIPLICITY_TABLE_SCHEMA)
     
     def parseArgs(self):
         """
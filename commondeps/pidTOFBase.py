@@ -16,7 +16,24 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/PID/pidTOFBase.cxx
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments
+
+# Predefined Selections
+FT0_SELECTIONS = {
+    "FT0": "FT0: Process with FT0",
+    "NoFT0": "Process without FT0",
+    "OnlyFT0": "Process only with FT0",
+    "Run2": "Process with Run2 data"
+    }
+
+# Interface
+TOF_EVENT_TIME_SCHEMA = [
+    argumentGroup(
+        "Data processor options: tof-event-time",
+        argument("--FT0", help = "tof-event-time: PROCESS_SWITCH options", metavar = "FT0", type = str, choices = FT0_SELECTIONS),
+        ),
+    choiceListGroup("Choice List for tof-event-time PROCESS_SWITCH options", "--FT0"),
+    ]
 
 
 class TofEventTime(object):
@@ -28,8 +45,10 @@ class TofEventTime(object):
         object (parser_args() object): pidTOFBase.cxx.cxx Interface
     """
     
-    def __init__(self, parserTofEventTime = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserTofEventTime = None):
         super(TofEventTime, self).__init__()
+        if parserTofEventTime is None:
+            parserTofEventTime = argparse.ArgumentParser(add_help = False)
         self.parserTofEventTime = parserTofEventTime
     
     def addArguments(self):
@@ -37,26 +56,7 @@ class TofEventTime(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        ft0Selections = {
-            "FT0": "FT0: Process with FT0",
-            "NoFT0": "Process without FT0",
-            "OnlyFT0": "Process only with FT0",
-            "Run2": "Process with Run2 data"
-            }
-        ft0SelectionsList = []
-        for k, v in ft0Selections.items():
-            ft0SelectionsList.append(k)
-        
-        # Interface
-        groupTofEventTime = self.parserTofEventTime.add_argument_group(title = "Data processor options: tof-event-time")
-        groupTofEventTime.add_argument(
-            "--FT0", help = "tof-event-time: PROCESS_SWITCH options", action = "store", metavar = "FT0", type = str,
-            choices = ft0SelectionsList,
-            ).completer = ChoicesCompleter(ft0SelectionsList)
-        groupProcess = self.parserTofEventTime.add_argument_group(title = "Choice List for tof-event-time PROCESS_SWITCH options")
-        for key, value in ft0Selections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
+        addSchemaArguments(self.parserTofEventTime, TOF_EVENT_TIME_SCHEMA)
     
     def parseArgs(self):
         """
@@ -16,6 +16,15 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/PID/pidTOFbeta.cxx
 
 import argparse
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Interface
+TOF_PID_BETA_SCHEMA = [
+    argumentGroup(
+        "Data processor options: tof-pid-beta",
+        argument("--tof-expreso", help = "Expected resolution for the computation of the expected beta", type = str),
+        ),
+    ]
 
 
 class TofPidBeta(object):
@@ -27,8 +36,10 @@ class TofPidBeta(object):
         object (parser_args() object): pidTOFbeta.cxx Interface
     """
     
-    def __init__(self, parserTofPidBeta = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserTofPidBeta = None):
         super(TofPidBeta, self).__init__()
+        if parserTofPidBeta is None:
+            parserTofPidBeta = argparse.ArgumentParser(add_help = False)
         self.parserTofPidBeta = parserTofPidBeta
     
     def addArguments(self):
@@ -36,11 +47,7 @@ class TofPidBeta(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Interface
-        groupTofPidbeta = self.parserTofPidBeta.add_argument_group(title = "Data processor options: tof-pid-beta")
-        groupTofPidbeta.add_argument(
-            "--tof-expreso", help = "Expected resolution for the computation of the expected beta", action = "store", type = str,
-            )
+        addSchemaArguments(self.parserTofPidBeta, TOF_PID_BETA_SCHEMA)
     
     def parseArgs(self):
         """
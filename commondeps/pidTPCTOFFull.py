@@ -17,8 +17,66 @@
 # Orginal Task For pidTOFFull.cxx: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/PID/pidTOFFull.cxx
 
 import argparse
-from extramodules.choicesHandler import ChoicesCompleterList
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments
+
+# Predefined Selections
+PID_SELECTIONS = {
+    "el":
+        "Produce PID information for the Electron mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "mu":
+        "Produce PID information for the Muon mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "pi":
+        "Produce PID information for the Pion mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "ka":
+        "Produce PID information for the Kaon mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "pr":
+        "Produce PID information for the Proton mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "de":
+        "Produce PID information for the Deuterons mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "tr":
+        "Produce PID information for the Triton mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "he":
+        "Produce PID information for the Helium3 mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    "al":
+        "Produce PID information for the Alpha mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
+    }
+PID_PRUNING_SELECTIONS = {
+    "off": "PID species as configured",
+    "cuts": "PID species which are not used by the barrel track cuts are set to the automatic setup (-1)",
+    }
+SLICE_SELECTIONS = {
+    "WSlice": "Process with track slices",
+    "WoSlice": "Process without track slices"
+    }
+
+# Interface
+TPC_TOF_PID_FULL_SCHEMA = [
+    argumentGroup(
+        "Data processor options: tpc-pid-full, tof-pid-full",
+        argument(
+            "--pid", help = "Produce PID information for the <particle> mass hypothesis", nargs = "*", type = str.lower, metavar = "PID",
+            choices = PID_SELECTIONS
+            ),
+        ),
+    argumentGroup(
+        "Data processor options: tof-pid, tof-pid-full",
+        argument(
+            "--isWSlice", help = "tof-pid, tof-pid-full: PROCESS_SWITCH options", metavar = "ISWSLICE", type = str,
+            choices = SLICE_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for tof-pid, tof-pid-full PROCESS_SWITCH options", "--isWSlice"),
+    ]
+PID_PRUNING_SCHEMA = [
+    argumentGroup(
+        "PID species pruning: tpc-pid-full, tof-pid-full",
+        argument(
+            "--pidPruning",
+            help = "Pruning of the PID species with the nσ variables of the barrel track cuts, only species which table-maker does not subscribe to (de, tr, he, al) can be pruned",
+            type = str, metavar = "PIDPRUNING", choices = PID_PRUNING_SELECTIONS, default = "off"
+            ),
+        ),
+    ]
 
 
 class TpcTofPidFull(object):
@@ -30,8 +88,10 @@ class TpcTofPidFull(object):
         object (parser_args() object): pidTPCFull.cxx and pidTOFFull.cxx Interface
     """
     
-    def __init__(self, parserTpcTofPidFull = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserTpcTofPidFull = None):
         super(TpcTofPidFull, self).__init__()
+        if parserTpcTofPidFull is None:
+            parserTpcTofPidFull = argparse.ArgumentParser(add_help = False)
         self.parserTpcTofPidFull = parserTpcTofPidFull
     
     def addArguments(self):
@@ -39,57 +99,7 @@ class TpcTofPidFull(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        pidSelections = {
-            "el":
-                "Produce PID information for the Electron mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "mu":
-                "Produce PID information for the Muon mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "pi":
-                "Produce PID information for the Pion mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "ka":
-                "Produce PID information for the Kaon mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "pr":
-                "Produce PID information for the Proton mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "de":
-                "Produce PID information for the Deuterons mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "tr":
-                "Produce PID information for the Triton mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "he":
-                "Produce PID information for the Helium3 mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            "al":
-                "Produce PID information for the Alpha mass hypothesis, overrides the automatic setup: the corresponding table can be set off (0) or on (1)",
-            }
-        pidSelectionsList = []
-        for k, v in pidSelections.items():
-            pidSelectionsList.append(k)
-        
-        sliceSelections = {
-            "WSlice": "Process with track slices",
-            "WoSlice": "Process without track slices"
-            }
-        sliceSelectionsList = []
-        for k, v in sliceSelections.items():
-            sliceSelectionsList.append(k)
-        
-        # Interface
-        groupPID = self.parserTpcTofPidFull.add_argument_group(title = "Data processor options: tpc-pid-full, tof-pid-full")
-        groupPID.add_argument(
-            "--pid", help = "Produce PID information for the <particle> mass hypothesis", action = "store", nargs = "*", type = str.lower,
-            metavar = "PID", choices = pidSelectionsList,
-            ).completer = ChoicesCompleterList(pidSelectionsList)
-        
-        for key, value in pidSelections.items():
-            groupPID.add_argument(key, help = value, action = "none")
-        
-        groupTofPid = self.parserTpcTofPidFull.add_argument_group(title = "Data processor options: tof-pid, tof-pid-full")
-        groupTofPid.add_argument(
-            "--isWSlice", help = "tof-pid, tof-pid-full: PROCESS_SWITCH options", action = "store", metavar = "ISWSLICE", type = str,
-            choices = sliceSelectionsList,
-            ).completer = ChoicesCompleter(sliceSelectionsList)
-        groupProcess = self.parserTpcTofPidFull.add_argument_group(title = "Choice List for tof-pid, tof-pid-full PROCESS_SWITCH options")
-        for key, value in sliceSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
+        addSchemaArguments(self.parserTpcTofPidFull, TPC_TOF_PID_FULL_SCHEMA)
     
     def parseArgs(self):
         """
@@ -16,7 +16,25 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/trackPropagation.cxx
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments
+
+# Predefined Selections
+COV_SELECTIONS = {
+    "Standard": "Process without covariance",
+    "Covariance": "Process with covariance"
+    }
+
+# Interface
+TRACK_PROPAGATION_SCHEMA = [
+    argumentGroup(
+        "Data processor options: track-propagation",
+        argument(
+            "--isCovariance", help = "track-propagation: PROCESS_SWITCH options", metavar = "ISCOVARIANCE", type = str,
+            choices = COV_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for track-propagation PROCESS_SWITCH options", "--isCovariance"),
+    ]
 
 
 class TrackPropagation(object):
@@ -28,8 +46,10 @@ class TrackPropagation(object):
         object (parser_args() object): trackPropagation.cxx Interface
     """
     
-    def __init__(self, parserTrackPropagation = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserTrackPropagation = None):
         super(TrackPropagation, self).__init__()
+        if parserTrackPropagation is None:
+            parserTrackPropagation = argparse.ArgumentParser(add_help = False)
         self.parserTrackPropagation = parserTrackPropagation
     
     def addArguments(self):
@@ -37,24 +57,7 @@ class TrackPropagation(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        covSelections = {
-            "Standard": "Process without covariance",
-            "Covariance": "Process with covariance"
-            }
-        covSelectionsList = []
-        for k, v in covSelections.items():
-            covSelectionsList.append(k)
-        
-        # Interface
-        groupTrackPropagation = self.parserTrackPropagation.add_argument_group(title = "Data processor options: track-propagation")
-        groupTrackPropagation.add_argument(
-            "--isCovariance", help = "track-propagation: PROCESS_SWITCH options", action = "store", metavar = "ISCOVARIANCE", type = str,
-            choices = (covSelectionsList),
-            ).completer = ChoicesCompleter(covSelectionsList)
-        groupProcess = self.parserTrackPropagation.add_argument_group(title = "Choice List for track-propagation PROCESS_SWITCH options")
-        for key, value in covSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
+        addSchemaArguments(self.parserTrackPropagation, TRACK_PROPAGATION_SCHEMA)
     
     def parseArgs(self):
         """
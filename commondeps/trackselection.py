@@ -16,7 +16,25 @@
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/Common/TableProducer/trackselection.cxx
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Predefined Selections
+ITS_MATCHING_SELECTIONS = ["0", "1", "2", "3"]
+
+# Interface
+TRACK_SELECTION_SCHEMA = [
+    argumentGroup(
+        "Data processor options: track-selection",
+        argument(
+            "--itsMatching",
+            help = "condition for ITS matching (0: Run2 SPD kAny, 1: Run3ITSibAny, 2: Run3ITSallAny, 3: Run3ITSall7Layers)", type = str,
+            choices = ITS_MATCHING_SELECTIONS
+            ), argument("--ptMin", help = "Lower cut on pt for the track selected", type = str),
+        argument("--ptMax", help = "Upper cut on pt for the track selected", type = str),
+        argument("--etaMin", help = "Lower cut on eta for the track selected", type = str),
+        argument("--etaMax", help = "Upper cut on eta for the track selected", type = str),
+        ),
+    ]
 
 
 class TrackSelectionTask(object):
@@ -28,8 +46,10 @@ class TrackSelectionTask(object):
         object (parser_args() object): trackselection.cxx.cxx Interface
     """
     
-    def __init__(self, parserTrackSelectionTask = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserTrackSelectionTask = None):
         super(TrackSelectionTask, self).__init__()
+        if parserTrackSelectionTask is None:
+            parserTrackSelectionTask = argparse.ArgumentParser(add_help = False)
         self.parserTrackSelectionTask = parserTrackSelectionTask
     
     def addArguments(self):
@@ -37,20 +57,7 @@ class TrackSelectionTask(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        itsMatchingSelections = ["0", "1", "2", "3"]
-        
-        # Interface
-        groupTrackSelectionTask = self.parserTrackSelectionTask.add_argument_group(title = "Data processor options: track-selection")
-        groupTrackSelectionTask.add_argument(
-            "--itsMatching",
-            help = "condition for ITS matching (0: Run2 SPD kAny, 1: Run3ITSibAny, 2: Run3ITSallAny, 3: Run3ITSall7Layers)",
-            action = "store", type = str, choices = (itsMatchingSelections),
-            ).completer = ChoicesCompleter(itsMatchingSelections)
-        groupTrackSelectionTask.add_argument("--ptMin", help = "Lower cut on pt for the track selected", action = "store", type = str)
-        groupTrackSelectionTask.add_argument("--ptMax", help = "Upper cut on pt for the track selected", action = "store", type = str)
-        groupTrackSelectionTask.add_argument("--etaMin", help = "Lower cut on eta for the track selected", action = "store", type = str)
-        groupTrackSelectionTask.add_argument("--etaMax", help = "Upper cut on eta for the track selected", action = "store", type = str)
+        addSchemaArguments(self.parserTrackSelectionTask, TRACK_SELECTION_SCHEMA)
     
     def parseArgs(self):
         """
@@ -18,19 +18,187 @@
 
 # Orginal Task For dqEfficiency.cxx: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Tasks/dqEfficiency.cxx
 
-import argparse
-import os
-import re
-from urllib.request import Request, urlopen
-import ssl
 import argcomplete
-from argcomplete.completers import ChoicesCompleter
-from commondeps.dplAodReader import DplAodReader
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
-from extramodules.helperOptions import HelperOptions
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runDQEfficiency.py <yourConfig.json> --arg value "
+
+# Predefined Selections
+WRITER_PATH = "configs/writerConfiguration_dileptonMC.json"
+ANALYSIS_SELECTIONS = {
+    "eventSelection": "Run event selection on DQ skimmed events",
+    "muonSelection": "Run muon selection on DQ skimmed muons",
+    "trackSelection": "Run barrel track selection on DQ skimmed tracks",
+    "sameEventPairing": "Run same event pairing selection on DQ skimmed data",
+    "dileptonTrackDimuonMuonSelection": "Run dimuon-muon pairing, using skimmed data",
+    "dileptonTrackDielectronKaonSelection": "Run dielectron-kaon pairing, using skimmed data",
+    }
+SAME_EVENT_PAIRING_PROCESS_SELECTIONS = {
+    "JpsiToEE": "Run electron-electron pairing, with skimmed tracks",
+    "JpsiToEEVertexing": "Run barrel barrel pairing on DQ skimmed tracks including vertexing",
+    "JpsiToMuMu": "Run muon-muon pairing, with skimmed muons",
+    "JpsiToMuMuVertexing": "Run muon-muon pairing and vertexing, with skimmed muons",
+    }
+
+# yapf: disable
+# Definition of all the trees we may read
+DQ_EFFICIENCY_TREES = {
+    "ReducedEvents": {"table": "AOD/REDUCEDEVENT/0","treename": "ReducedEvents"},
+    "ReducedEventsExtended": {"table": "AOD/REEXTENDED/0","treename": "ReducedEventsExtended"},
+    "ReducedEventsVtxCov": {"table": "AOD/REVTXCOV/0","treename": "ReducedEventsVtxCov"},
+    "ReducedMCEventLabels": {"table": "AOD/REMCCOLLBL/0","treename": "ReducedMCEventLabels"},
+    "ReducedMCEvents": {"table": "AOD/REMC/0","treename": "ReducedMCEvents"},
+    "ReducedTracks": {"table": "AOD/REDUCEDTRACK/0","treename": "ReducedTracks"},
+    "ReducedTracksBarrel": {"table": "AOD/RTBARREL/0","treename": "ReducedTracksBarrel"},
+    "ReducedTracksBarrelCov": {"table": "AOD/RTBARRELCOV/0","treename": "ReducedTracksBarrelCov"},
+    "ReducedTracksBarrelPID": {"table": "AOD/RTBARRELPID/0","treename": "ReducedTracksBarrelPID"},
+    "ReducedTracksBarrelLabels": {"table": "AOD/RTBARRELLABELS/0","treename": "ReducedTracksBarrelLabels"},
+    "ReducedMCTracks": {"table": "AOD/RTMC/0","treename": "ReducedMCTracks"},
+    "ReducedMuons": {"table": "AOD/RTMUON/0","treename": "ReducedMuons"},
+    "ReducedMuonsExtra": {"table": "AOD/RTMUONEXTRA/0","treename": "ReducedMuonsExtra"},
+    "ReducedMuonsCov": {"table": "AOD/RTMUONCOV/0","treename": "ReducedMuonsCov"},
+    "ReducedMuonsLabels": {"table": "AOD/RTMUONSLABELS/0","treename": "ReducedMuonsLabels"},
+    "Dileptons": {"table": "AOD/RTDILEPTON/0","treename": "Dileptons"},
+    "DileptonsExtra": {"table": "AOD/RTDILEPTONEXTRA/0","treename": "DileptonsExtra"}
+    }
+# yapf: enable
+# Trees consumed by the process functions (the input descriptor is generated from the enabled ones)
+EVENT_TREES = ["ReducedEvents", "ReducedEventsExtended", "ReducedMCEventLabels"]
+MC_TREES = ["ReducedMCEvents", "ReducedMCTracks"]
+BARREL_TREES = ["ReducedTracks", "ReducedTracksBarrel", "ReducedTracksBarrelPID", "ReducedTracksBarrelLabels"]
+MUON_TREES = ["ReducedMuons", "ReducedMuonsExtra", "ReducedMuonsLabels"]
+DILEPTON_TREES = ["Dileptons", "DileptonsExtra"]
+DQ_EFFICIENCY_CONSUMERS = {
+    "analysis-event-selection": {
+        "processSkimmed": EVENT_TREES + ["ReducedMCEvents"]
+        },
+    "analysis-track-selection": {
+        "processSkimmed": EVENT_TREES + BARREL_TREES + MC_TREES
+        },
+    "analysis-muon-selection": {
+        "processSkimmed": EVENT_TREES + MUON_TREES + MC_TREES
+        },
+    "analysis-same-event-pairing":
+        {
+            "processJpsiToEESkimmed": EVENT_TREES + BARREL_TREES + MC_TREES,
+            "processJpsiToEEVertexingSkimmed": EVENT_TREES + ["ReducedEventsVtxCov"] + BARREL_TREES + ["ReducedTracksBarrelCov"] + MC_TREES,
+            "processJpsiToMuMuSkimmed": EVENT_TREES + MUON_TREES + MC_TREES,
+            "processJpsiToMuMuVertexingSkimmed": EVENT_TREES + ["ReducedEventsVtxCov"] + MUON_TREES + ["ReducedMuonsCov"] + MC_TREES
+            },
+    "analysis-dilepton-track":
+        {
+            "processDimuonMuonSkimmed": EVENT_TREES + MUON_TREES + MC_TREES + DILEPTON_TREES,
+            "processDielectronKaonSkimmed": EVENT_TREES + BARREL_TREES + MC_TREES + DILEPTON_TREES
+            },
+    }
+# Tables produced in the workflow (not read from the input files if the producer runs)
+DQ_EFFICIENCY_PRODUCTS = {
+    "analysis-same-event-pairing": DILEPTON_TREES
+    }
+
+# Interface
+DQ_EFFICIENCY_SCHEMA = [
+    # analysis task selections
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-dilepton-track",
+        argument(
+            "--analysis", help = "Skimmed process selections for MC Analysis", nargs = "*", type = str, metavar = "ANALYSIS",
+            choices = ANALYSIS_SELECTIONS
+            ),
+        ),
+    # same event pairing process function selection
+    argumentGroup(
+        "Data processor options: analysis-same-event-pairing",
+        argument(
+            "--cfgBarrelMCRecSignals", help = "Space separated list of MC signals (reconstructed)", nargs = "*", type = str,
+            metavar = "CFGBARRELMCRECSIGNALS", lib = "allMCSignals"
+            ),
+        argument(
+            "--cfgBarrelMCGenSignals", help = "Space separated list of MC signals (generated)", nargs = "*", type = str,
+            metavar = "CFGBARRELMCGENSIGNALS", lib = "allMCSignals"
+            ),
+        argument(
+            "--cfgFlatTables", help = "Produce a single flat tables with all relevant information of the pairs and single tracks",
+            type = str.lower, choices = BOOLEAN_SELECTIONS
+            ),
+        argument(
+            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", nargs = "*", type = str, metavar = "PROCESS",
+            choices = SAME_EVENT_PAIRING_PROCESS_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for analysis-same-event-pairing PROCESS_SWITCH options", "--process"),
+    # cfg for QA
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing, analysis-dilepton-hadron",
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        ),
+    # analysis-event-selection
+    argumentGroup(
+        "Data processor options: analysis-event-selection",
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-track-selection
+    argumentGroup(
+        "Data processor options: analysis-track-selection",
+        argument(
+            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGTRACKCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGTRACKMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        ),
+    # analysis-muon-selection
+    argumentGroup(
+        "Data processor options: analysis-muon-selection",
+        argument(
+            "--cfgMuonCuts", help = "Space separated list of muon cuts", nargs = "*", type = str, metavar = "CFGMUONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgMuonMCSignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGMUONMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        ),
+    # analysis-dilepton-track
+    argumentGroup(
+        "Data processor options: analysis-dilepton-track",
+        argument(
+            "--cfgLeptonCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGLEPTONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgFillCandidateTable", help = "Produce a single flat tables with all relevant information dilepton-track candidates",
+            type = str.lower, choices = BOOLEAN_SELECTIONS
+            ),
+        argument(
+            "--cfgBarrelDileptonMCRecSignals", help = "Space separated list of MC signals (reconstructed)", nargs = "*", type = str,
+            metavar = "CFGBARRELDILEPTONMCRECSIGNALS", lib = "allMCSignals"
+            ),
+        argument(
+            "--cfgBarrelDileptonMCGenSignals", help = "Space separated list of MC signals (generated)", nargs = "*", type = str,
+            metavar = "CFGBARRELDILEPTONMCRECSIGNALS", lib = "allMCSignals"
+            ),
+        ),
+    # Aod Writer - Reader configs
+    argumentGroup(
+        "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer",
+        argument(
+            "--reader",
+            help = "Reader config JSON with path. If not given, the input descriptor is generated with only the trees consumed by the enabled process functions",
+            type = str
+            ),
+        argument("--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", default = WRITER_PATH, type = str),
+        ),
+    ]
 
 
 class DQEfficiency(object):
@@ -42,168 +210,19 @@ class DQEfficiency(object):
         object (parser_args object): dqEfficiency.cxx Interface
     """
     
-    def __init__(
-        self, parserDQEfficiency = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runDQEfficiency.py <yourConfig.json> --arg value "
-            ), helperOptions = HelperOptions(), dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    def __init__(self, parserDQEfficiency = None, dqLibGetter = None):
         super(DQEfficiency, self).__init__()
         self.parserDQEfficiency = parserDQEfficiency
-        self.dplAodReader = dplAodReader
-        self.helperOptions = helperOptions
-        self.dqLibGetter = dqLibGetter
-        self.parserDQEfficiency.register("action", "none", NoAction)
-        self.parserDQEfficiency.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        
-        readerPath = "configs/readerConfiguration_reducedEventMC.json"
-        writerPath = "configs/writerConfiguration_dileptonMC.json"
-        
-        analysisSelections = {
-            "eventSelection": "Run event selection on DQ skimmed events",
-            "muonSelection": "Run muon selection on DQ skimmed muons",
-            "trackSelection": "Run barrel track selection on DQ skimmed tracks",
-            "sameEventPairing": "Run same event pairing selection on DQ skimmed data",
-            "dileptonTrackDimuonMuonSelection": "Run dimuon-muon pairing, using skimmed data",
-            "dileptonTrackDielectronKaonSelection": "Run dielectron-kaon pairing, using skimmed data",
-            }
-        analysisSelectionsList = []
-        for k, v in analysisSelections.items():
-            analysisSelectionsList.append(k)
-        
-        sameEventPairingProcessSelections = {
-            "JpsiToEE": "Run electron-electron pairing, with skimmed tracks",
-            "JpsiToEEVertexing": "Run barrel barrel pairing on DQ skimmed tracks including vertexing",
-            "JpsiToMuMu": "Run muon-muon pairing, with skimmed muons",
-            "JpsiToMuMuVertexing": "Run muon-muon pairing and vertexing, with skimmed muons",
-            }
-        sameEventPairingProcessSelectionsList = []
-        for k, v in sameEventPairingProcessSelections.items():
-            sameEventPairingProcessSelectionsList.append(k)
-        
-        booleanSelections = ["true", "false"]
-        
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allMCSignals = self.dqLibGetter.allMCSignals
-        
-        # Interface
-        
-        # analysis task selections
-        groupAnalysisSelections = self.parserDQEfficiency.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-dilepton-track"
-            )
-        groupAnalysisSelections.add_argument(
-            "--analysis", help = "Skimmed process selections for MC Analysis", action = "store", nargs = "*", type = str,
-            metavar = "ANALYSIS", choices = analysisSelectionsList,
-            ).completer = ChoicesCompleterList(analysisSelectionsList)
-        
-        for key, value in analysisSelections.items():
-            groupAnalysisSelections.add_argument(key, help = value, action = "none")
-        
-        # same event pairing process function selection
-        groupProcessSEPSelections = self.parserDQEfficiency.add_argument_group(
-            title = "Data processor options: analysis-same-event-pairing"
-            )
-        groupProcessSEPSelections.add_argument(
-            "--cfgBarrelMCRecSignals", help = "Space separated list of MC signals (reconstructed)", nargs = "*", action = "store",
-            type = str, metavar = "CFGBARRELMCRECSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        groupProcessSEPSelections.add_argument(
-            "--cfgBarrelMCGenSignals", help = "Space separated list of MC signals (generated)", nargs = "*", action = "store", type = str,
-            metavar = "CFGBARRELMCGENSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        groupProcessSEPSelections.add_argument(
-            "--cfgFlatTables", help = "Produce a single flat tables with all relevant information of the pairs and single tracks",
-            action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupProcessSEPSelections.add_argument(
-            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", action = "store", nargs = "*", type = str,
-            metavar = "PROCESS", choices = sameEventPairingProcessSelectionsList,
-            ).completer = ChoicesCompleterList(sameEventPairingProcessSelectionsList)
-        groupProcess = self.parserDQEfficiency.add_argument_group(
-            title = "Choice List for analysis-same-event-pairing PROCESS_SWITCH options"
-            )
-        
-        for key, value in sameEventPairingProcessSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
-        
-        # cfg for QA
-        groupQASelections = self.parserDQEfficiency.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing, analysis-dilepton-hadron"
-            )
-        groupQASelections.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = (booleanSelections),
-            ).completer = ChoicesCompleter(booleanSelections)
-        
-        # analysis-event-selection
-        groupAnalysisEventSelection = self.parserDQEfficiency.add_argument_group(title = "Data processor options: analysis-event-selection")
-        groupAnalysisEventSelection.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # analysis-track-selection
-        groupAnalysisTrackSelection = self.parserDQEfficiency.add_argument_group(title = "Data processor options: analysis-track-selection")
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        
-        # analysis-muon-selection
-        groupAnalysisMuonSelection = self.parserDQEfficiency.add_argument_group(title = "Data processor options: analysis-muon-selection")
-        groupAnalysisMuonSelection.add_argument(
-            "--cfgMuonCuts", help = "Space separated list of muon cuts", nargs = "*", action = "store", type = str, metavar = "CFGMUONCUTS",
-            choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisMuonSelection.add_argument(
-            "--cfgMuonMCSignals", help = "Space separated list of MC signals", nargs = "*", action = "store", type = str,
-            metavar = "CFGMUONMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        
-        # analysis-dilepton-track
-        groupAnalysisDileptonTrack = self.parserDQEfficiency.add_argument_group(title = "Data processor options: analysis-dilepton-track")
-        groupAnalysisDileptonTrack.add_argument(
-            "--cfgLeptonCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGLEPTONCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisDileptonTrack.add_argument(
-            "--cfgFillCandidateTable", help = "Produce a single flat tables with all relevant information dilepton-track candidates",
-            action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupAnalysisDileptonTrack.add_argument(
-            "--cfgBarrelDileptonMCRecSignals", help = "Space separated list of MC signals (reconstructed)", nargs = "*", action = "store",
-            type = str, metavar = "CFGBARRELDILEPTONMCRECSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        groupAnalysisDileptonTrack.add_argument(
-            "--cfgBarrelDileptonMCGenSignals", help = "Space separated list of MC signals (generated)", nargs = "*", action = "store",
-            type = str, metavar = "CFGBARRELDILEPTONMCRECSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        
-        # Aod Writer - Reader configs
-        groupDPLReader = self.parserDQEfficiency.add_argument_group(
-            title = "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer"
-            )
-        groupDPLReader.add_argument(
-            "--reader",
-            help = "Reader config JSON with path. For Standart Analysis use as default, for dilepton analysis change to dilepton JSON config file",
-            action = "store", default = readerPath, type = str
-            )
-        groupDPLReader.add_argument(
-            "--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", action = "store", default = writerPath,
-            type = str
-            )
+        if self.parserDQEfficiency is None:
+            self.parserDQEfficiency = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserDQEfficiency, DQ_EFFICIENCY_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -213,18 +232,20 @@ class DQEfficiency(object):
             Namespace: returns parse_args()
         """
         
+        if self.parserDQEfficiency is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserDQEfficiency)
         argcomplete.autocomplete(self.parserDQEfficiency, always_complete_options = False)
         return self.parserDQEfficiency.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserDQEfficiency
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserDQEfficiency
-        self.dplAodReader.addArguments()
-        
-        self.addArguments()
+        schema = mergeSchemas(HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, DQ_EFFICIENCY_SCHEMA)
+        if self.parserDQEfficiency is None:
+            self.parserDQEfficiency = buildParser("dqEfficiency", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserDQEfficiency, schema, self.dqLibGetter)
@@ -18,28 +18,49 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Tasks/dqFlow.cxx
 
-import argparse
-import os
-import re
-from urllib.request import Request, urlopen
-import ssl
 import argcomplete
-from argcomplete.completers import ChoicesCompleter
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
-from extramodules.helperOptions import HelperOptions
-from extramodules.converters import O2Converters
-from commondeps.centralityTable import CentralityTable
-from commondeps.eventSelection import EventSelectionTask
-from commondeps.multiplicityTable import MultiplicityTable
-from commondeps.pidTOFBase import TofEventTime
-from commondeps.pidTOFBeta import TofPidBeta
-from commondeps.pidTPCTOFFull import TpcTofPidFull
-from commondeps.trackPropagation import TrackPropagation
-from commondeps.trackselection import TrackSelectionTask
-from commondeps.dplAodReader import DplAodReader
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+from commondeps.eventSelection import EVENT_SELECTION_SCHEMA
+from commondeps.trackselection import TRACK_SELECTION_SCHEMA
+from commondeps.trackPropagation import TRACK_PROPAGATION_SCHEMA
+from commondeps.multiplicityTable import MULTIPLICITY_TABLE_SCHEMA
+from commondeps.centralityTable import CENTRALITY_TABLE_SCHEMA
+from commondeps.pidTPCTOFFull import TPC_TOF_PID_FULL_SCHEMA
+from commondeps.pidTOFBase import TOF_EVENT_TIME_SCHEMA
+from commondeps.pidTOFBeta import TOF_PID_BETA_SCHEMA
+from extramodules.converters import O2_CONVERTERS_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runDQFlow.py <yourConfig.json> --arg value "
+
+# Interface
+DQ_FLOW_SCHEMA = [
+    argumentGroup(
+        "Data processor options: analysis-qvector",
+        argument(
+            "--cfgBarrelTrackCuts", help = "Space separated list of barrel track cuts", lib = "allAnalysisCuts", nargs = "*", type = str,
+            metavar = "CFGBARRELTRACKCUTS"
+            ),
+        argument(
+            "--cfgMuonCuts", help = "Space separated list of muon cuts", lib = "allAnalysisCuts", nargs = "*", type = str,
+            metavar = "CFGMUONCUTS"
+            ),
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", lib = "allAnalysisCuts", nargs = "*", type = str,
+            metavar = "CFGEVENTCUT"
+            ), argument("--cfgWithQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        argument("--cfgCutPtMin", help = "Minimal pT for tracks", type = str, metavar = "CFGCUTPTMIN"),
+        argument("--cfgCutPtMax", help = "Maximal pT for tracks", type = str, metavar = "CFGCUTPTMAX"),
+        argument("--cfgCutEta", help = "Eta range for tracks", type = str, metavar = "CFGCUTETA"),
+        argument("--cfgEtaLimit", help = "Eta gap separation, only if using subEvents", type = str, metavar = "CFGETALIMIT"),
+        argument("--cfgNPow", help = "Power of weights for Q vector", type = str, metavar = "CFGNPOW"),
+        argument("--cfgEfficiency", help = "CCDB path to efficiency object", type = str),
+        argument("--cfgAcceptance", help = "CCDB path to acceptance object", type = str),
+        ),
+    ]
 
 
 class AnalysisQvector(object):
@@ -51,77 +72,19 @@ class AnalysisQvector(object):
         object (parser_args() object): dqFlow.cxx Interface
     """
     
-    def __init__(
-        self, parserAnalysisQvector = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runDQFlow.py <yourConfig.json> --arg value "
-            ), eventSelection = EventSelectionTask(), centralityTable = CentralityTable(), multiplicityTable = MultiplicityTable(),
-        tofEventTime = TofEventTime(), tofPidBeta = TofPidBeta(), tpcTofPidFull = TpcTofPidFull(), trackPropagation = TrackPropagation(),
-        trackSelection = TrackSelectionTask(), helperOptions = HelperOptions(), o2Converters = O2Converters(),
-        dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    def __init__(self, parserAnalysisQvector = None, dqLibGetter = None):
         super(AnalysisQvector, self).__init__()
         self.parserAnalysisQvector = parserAnalysisQvector
-        self.eventSelection = eventSelection
-        self.centralityTable = centralityTable
-        self.multiplicityTable = multiplicityTable
-        self.tofEventTime = tofEventTime
-        self.tofPidBeta = tofPidBeta
-        self.tpcTofPidFull = tpcTofPidFull
-        self.trackPropagation = trackPropagation
-        self.trackSelection = trackSelection
-        self.helperOptions = helperOptions
-        self.o2Converters = o2Converters
-        self.dplAodReader = dplAodReader
-        self.dqLibGetter = dqLibGetter
-        self.parserAnalysisQvector.register("action", "none", NoAction)
-        self.parserAnalysisQvector.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        booleanSelections = ["true", "false"]
-        
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        
-        # Interface
-        groupAnalysisQvector = self.parserAnalysisQvector.add_argument_group(title = "Data processor options: analysis-qvector")
-        groupAnalysisQvector.add_argument(
-            "--cfgBarrelTrackCuts", help = "Space separated list of barrel track cuts", choices = allAnalysisCuts, nargs = "*",
-            action = "store", type = str, metavar = "CFGBARRELTRACKCUTS",
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisQvector.add_argument(
-            "--cfgMuonCuts", help = "Space separated list of muon cuts", action = "store", choices = allAnalysisCuts, nargs = "*",
-            type = str, metavar = "CFGMUONCUTS",
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisQvector.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", choices = allAnalysisCuts, nargs = "*", action = "store",
-            type = str, metavar = "CFGEVENTCUT",
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisQvector.add_argument(
-            "--cfgWithQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupAnalysisQvector.add_argument(
-            "--cfgCutPtMin", help = "Minimal pT for tracks", action = "store", type = str, metavar = "CFGCUTPTMIN",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgCutPtMax", help = "Maximal pT for tracks", action = "store", type = str, metavar = "CFGCUTPTMAX",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgCutEta", help = "Eta range for tracks", action = "store", type = str, metavar = "CFGCUTETA",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgEtaLimit", help = "Eta gap separation, only if using subEvents", action = "store", type = str, metavar = "CFGETALIMIT",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgNPow", help = "Power of weights for Q vector", action = "store", type = str, metavar = "CFGNPOW",
-            )
-        groupAnalysisQvector.add_argument("--cfgEfficiency", help = "CCDB path to efficiency object", action = "store", type = str)
-        groupAnalysisQvector.add_argument("--cfgAcceptance", help = "CCDB path to acceptance object", action = "store", type = str)
+        if self.parserAnalysisQvector is None:
+            self.parserAnalysisQvector = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserAnalysisQvector, DQ_FLOW_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -130,45 +93,24 @@ class AnalysisQvector(object):
         Returns:
             Namespace: returns parse_args()
         """
+        if self.parserAnalysisQvector is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserAnalysisQvector)
         argcomplete.autocomplete(self.parserAnalysisQvector, always_complete_options = False)
         return self.parserAnalysisQvector.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserAnalysisQvector
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserAnalysisQvector
-        self.dplAodReader.addArguments()
-        
-        self.eventSelection.parserEventSelectionTask = self.parserAnalysisQvector
-        self.eventSelection.addArguments()
-        
-        self.trackSelection.parserTrackSelectionTask = self.parserAnalysisQvector
-        self.trackSelection.addArguments()
-        
-        self.trackPropagation.parserTrackPropagation = self.parserAnalysisQvector
-        self.trackPropagation.addArguments()
-        
-        self.multiplicityTable.parserMultiplicityTable = self.parserAnalysisQvector
-        self.multiplicityTable.addArguments()
-        
-        self.centralityTable.parserCentralityTable = self.parserAnalysisQvector
-        self.centralityTable.addArguments()
-        
-        self.tpcTofPidFull.parserTpcTofPidFull = self.parserAnalysisQvector
-        self.tpcTofPidFull.addArguments()
-        
-        self.tofEventTime.parserTofEventTime = self.parserAnalysisQvector
-        self.tofEventTime.addArguments()
-        
-        self.tofPidBeta.parserTofPidBeta = self.parserAnalysisQvector
-        self.tofPidBeta.addArguments()
-        
-        self.o2Converters.parserO2Converters = self.parserAnalysisQvector
-        self.o2Converters.addArguments()
-        
-        self.addArguments()
+        schema = mergeSchemas(
+            HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, EVENT_SELECTION_SCHEMA, TRACK_SELECTION_SCHEMA, TRACK_PROPAGATION_SCHEMA,
+            MULTIPLICITY_TABLE_SCHEMA, CENTRALITY_TABLE_SCHEMA, TPC_TOF_PID_FULL_SCHEMA, TOF_EVENT_TIME_SCHEMA, TOF_PID_BETA_SCHEMA,
+            O2_CONVERTERS_SCHEMA, DQ_FLOW_SCHEMA
+            )
+        if self.parserAnalysisQvector is None:
+            self.parserAnalysisQvector = buildParser("dqFlow", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserAnalysisQvector, schema, self.dqLibGetter)
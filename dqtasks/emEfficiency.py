@@ -18,150 +18,112 @@
 
 # Orginal Task For dqEfficiency.cxx: https://github.com/AliceO2Group/O2Physics/blob/master/PWGEM/Dilepton/Tasks/emEfficiencyEE.cxx
 
-import argparse
-import os
-import re
-from urllib.request import Request, urlopen
-import ssl
 import argcomplete
-from argcomplete.completers import ChoicesCompleter
-from commondeps.dplAodReader import DplAodReader
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
-from extramodules.helperOptions import HelperOptions
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runEMEfficiency.py <yourConfig.json> --arg value "
+
+# Predefined Selections
+READER_PATH = "configs/readerConfiguration_reducedEventMC.json"
+WRITER_PATH = "configs/writerConfiguration_dileptonMC.json"
+ANALYSIS_SELECTIONS = {
+    "eventSelection": "Run event selection on DQ skimmed events",
+    "eventQA": "Run event QA on DQ skimmed events",
+    "trackSelection": "Run barrel track selection on DQ skimmed tracks",
+    "sameEventPairing": "Run same event pairing selection on DQ skimmed data"
+    }
+SAME_EVENT_PAIRING_PROCESS_SELECTIONS = {
+    "ToEE": "Run electron-electron pairing, with skimmed tracks"
+    }
+
+# Interface
+EM_EFFICIENCY_SCHEMA = [
+    # analysis task selections
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-track-selection",
+        argument(
+            "--analysis", help = "Skimmed process selections for MC Analysis", nargs = "*", type = str, metavar = "ANALYSIS",
+            choices = ANALYSIS_SELECTIONS
+            ),
+        ),
+    # same event pairing process function selection
+    argumentGroup(
+        "Data processor options: analysis-same-event-pairing",
+        argument(
+            "--cfgBarrelMCSignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGBARRELMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        argument(
+            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", nargs = "*", type = str, metavar = "PROCESS",
+            choices = SAME_EVENT_PAIRING_PROCESS_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for analysis-same-event-pairing PROCESS_SWITCH options", "--process"),
+    # cfg for QA
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-track-selection",
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        ),
+    # analysis-event-selection
+    argumentGroup(
+        "Data processor options: analysis-event-selection",
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-track-selection
+    argumentGroup(
+        "Data processor options: analysis-track-selection",
+        argument(
+            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGTRACKCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGTRACKMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        ),
+    # Aod Writer - Reader configs
+    argumentGroup(
+        "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer",
+        argument(
+            "--reader",
+            help = "Reader config JSON with path. For Standart Analysis use as default, for dilepton analysis change to dilepton JSON config file",
+            default = READER_PATH, type = str
+            ),
+        argument("--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", default = WRITER_PATH, type = str),
+        ),
+    ]
 
 
 class EMEfficiency(object):
-
+    
     """
     Class for Interface -> emEfficiencyEE.cxx Task -> Configurable, Process Functions
 
     Args:
         object (parser_args object): emEfficiencyEE.cxx Interface
     """
-
-    def __init__(
-        self, parserEMEfficiency = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runEMEfficiency.py <yourConfig.json> --arg value "
-            ), helperOptions = HelperOptions(), dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    
+    def __init__(self, parserEMEfficiency = None, dqLibGetter = None):
         super(EMEfficiency, self).__init__()
         self.parserEMEfficiency = parserEMEfficiency
-        self.dplAodReader = dplAodReader
-        self.helperOptions = helperOptions
-        self.dqLibGetter = dqLibGetter
-        self.parserEMEfficiency.register("action", "none", NoAction)
-        self.parserEMEfficiency.register("action", "store_choice", ChoicesAction)
-
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
+    
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
-
-        # Predefined Selections
-
-        readerPath = "configs/readerConfiguration_reducedEventMC.json"
-        writerPath = "configs/writerConfiguration_dileptonMC.json"
-
-        analysisSelections = {
-            "eventSelection": "Run event selection on DQ skimmed events",
-            "eventQA": "Run event QA on DQ skimmed events",
-            "trackSelection": "Run barrel track selection on DQ skimmed tracks",
-            "sameEventPairing": "Run same event pairing selection on DQ skimmed data"
-        }
-        analysisSelectionsList = []
-        for k, v in analysisSelections.items():
-            analysisSelectionsList.append(k)
-
-        sameEventPairingProcessSelections = {
-            "ToEE": "Run electron-electron pairing, with skimmed tracks"
-            }
-        sameEventPairingProcessSelectionsList = []
-        for k, v in sameEventPairingProcessSelections.items():
-            sameEventPairingProcessSelectionsList.append(k)
-
-        booleanSelections = ["true", "false"]
-
-        # Get EM Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allMCSignals = self.dqLibGetter.allMCSignals
-
-        # Interface
-
-        # analysis task selections
-        groupAnalysisSelections = self.parserEMEfficiency.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-track-selection"
-            )
-        groupAnalysisSelections.add_argument(
-            "--analysis", help = "Skimmed process selections for MC Analysis", action = "store", nargs = "*", type = str,
-            metavar = "ANALYSIS", choices = analysisSelectionsList,
-            ).completer = ChoicesCompleterList(analysisSelectionsList)
-
-        for key, value in analysisSelections.items():
-            groupAnalysisSelections.add_argument(key, help = value, action = "none")
-
-        # same event pairing process function selection
-        groupProcessSEPSelections = self.parserEMEfficiency.add_argument_group(
-            title = "Data processor options: analysis-same-event-pairing"
-            )
-        groupProcessSEPSelections.add_argument(
-            "--cfgBarrelMCSignals", help = "Space separated list of MC signals", nargs = "*", action = "store",
-            type = str, metavar = "CFGBARRELMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        groupProcessSEPSelections.add_argument(
-            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", action = "store", nargs = "*", type = str,
-            metavar = "PROCESS", choices = sameEventPairingProcessSelectionsList,
-            ).completer = ChoicesCompleterList(sameEventPairingProcessSelectionsList)
-        groupProcess = self.parserEMEfficiency.add_argument_group(
-            title = "Choice List for analysis-same-event-pairing PROCESS_SWITCH options"
-            )
-
-        for key, value in sameEventPairingProcessSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
-
-        # cfg for QA
-        groupQASelections = self.parserEMEfficiency.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-track-selection"
-            )
-        groupQASelections.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = (booleanSelections),
-            ).completer = ChoicesCompleter(booleanSelections)
-
-        # analysis-event-selection
-        groupAnalysisEventSelection = self.parserEMEfficiency.add_argument_group(title = "Data processor options: analysis-event-selection")
-        groupAnalysisEventSelection.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-
-        # analysis-track-selection
-        groupAnalysisTrackSelection = self.parserEMEfficiency.add_argument_group(title = "Data processor options: analysis-track-selection")
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-
-        # Aod Writer - Reader configs
-        groupDPLReader = self.parserEMEfficiency.add_argument_group(
-            title = "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer"
-            )
-        groupDPLReader.add_argument(
-            "--reader",
-            help = "Reader config JSON with path. For Standart Analysis use as default, for dilepton analysis change to dilepton JSON config file",
-            action = "store", default = readerPath, type = str
-            )
-        groupDPLReader.add_argument(
-            "--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", action = "store", default = writerPath,
-            type = str
-            )
-
+        
+        if self.parserEMEfficiency is None:
+            self.parserEMEfficiency = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserEMEfficiency, EM_EFFICIENCY_SCHEMA, self.dqLibGetter)
+    
     def parseArgs(self):
         """
         This function allows to save the obtained arguments to the parser_args() function
@@ -169,19 +131,21 @@ class EMEfficiency(object):
         Returns:
             Namespace: returns parse_args()
         """
-
+        
+        if self.parserEMEfficiency is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserEMEfficiency)
         argcomplete.autocomplete(self.parserEMEfficiency, always_complete_options = False)
         return self.parserEMEfficiency.parse_args()
-
+    
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
-
-        self.helperOptions.parserHelperOptions = self.parserEMEfficiency
-        self.helperOptions.addArguments()
-
-        self.dplAodReader.parserDplAodReader = self.parserEMEfficiency
-        self.dplAodReader.addArguments()
-
-        self.addArguments()
+        
+        schema = mergeSchemas(HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, EM_EFFICIENCY_SCHEMA)
+        if self.parserEMEfficiency is None:
+            self.parserEMEfficiency = buildParser("emEfficiency", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserEMEfficiency, schema, self.dqLibGetter)
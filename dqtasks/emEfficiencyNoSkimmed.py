@@ -18,125 +18,91 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGEM/Dilepton/Tasks/emEfficiencyEE.cxx
 
-import argparse
-import os
-import re
-from urllib.request import Request, urlopen
-import ssl
-from argcomplete.completers import ChoicesCompleter
 import argcomplete
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
-from extramodules.helperOptions import HelperOptions
-from extramodules.converters import O2Converters
-from commondeps.eventSelection import EventSelectionTask
-from commondeps.multiplicityTable import MultiplicityTable
-from commondeps.pidTOFBase import TofEventTime
-from commondeps.pidTOFBeta import TofPidBeta
-from commondeps.pidTPCTOFFull import TpcTofPidFull
-from commondeps.trackPropagation import TrackPropagation
-from commondeps.trackselection import TrackSelectionTask
-from commondeps.dplAodReader import DplAodReader
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+from commondeps.eventSelection import EVENT_SELECTION_SCHEMA
+from commondeps.trackselection import TRACK_SELECTION_SCHEMA
+from commondeps.trackPropagation import TRACK_PROPAGATION_SCHEMA
+from commondeps.multiplicityTable import MULTIPLICITY_TABLE_SCHEMA
+from commondeps.pidTPCTOFFull import TPC_TOF_PID_FULL_SCHEMA
+from commondeps.pidTOFBase import TOF_EVENT_TIME_SCHEMA
+from commondeps.pidTOFBeta import TOF_PID_BETA_SCHEMA
+from extramodules.converters import O2_CONVERTERS_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runEMEfficiencyNoSkimmed.py <yourConfig.json> --arg value"
+
+# Predefined Selections
+DQ_SELECTIONS = {
+    "eventSelection": "Run event selection on DQ skimmed events",
+    "eventQA": "Run event QA on DQ skimmed events",
+    "trackSelection": "Run barrel track selection on DQ skimmed tracks"
+    }
+
+# Interface
+EM_EFFICIENCY_NO_SKIMMED_SCHEMA = [
+    # analysis task selections
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-track-selection",
+        argument(
+            "--analysis", help = "Noskimmed process selections for MC Analysis", nargs = "*", type = str, metavar = "ANALYSIS",
+            choices = DQ_SELECTIONS
+            ),
+        ),
+    # cfg for QA
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-track-selection",
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        ),
+    # analysis-event-selection
+    argumentGroup(
+        "Data processor options: analysis-event-selection",
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-track-selection
+    argumentGroup(
+        "Data processor options: analysis-track-selection",
+        argument(
+            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGTRACKCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGTRACKMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        ),
+    ]
 
 
 class EMEfficiencyNoSkimmed(object):
-
+    
     """
     Class for Interface -> emEfficiencyEE.cxx Task -> Configurable, Process Functions
 
     Args:
         object (parser_args() object): emEfficiencyEE.cxx Interface
     """
-
-    def __init__(
-        self, parserEMEfficiencyNoSkimmed = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runEMEfficiencyNoSkimmed.py <yourConfig.json> --arg value",
-            ), eventSelection = EventSelectionTask(), multiplicityTable = MultiplicityTable(), tofEventTime = TofEventTime(),
-        tofPidBeta = TofPidBeta(), tpcTofPidFull = TpcTofPidFull(), trackPropagation = TrackPropagation(),
-        trackSelection = TrackSelectionTask(), helperOptions = HelperOptions(), o2Converters = O2Converters(),
-        dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    
+    def __init__(self, parserEMEfficiencyNoSkimmed = None, dqLibGetter = None):
         super(EMEfficiencyNoSkimmed, self).__init__()
         self.parserEMEfficiencyNoSkimmed = parserEMEfficiencyNoSkimmed
-        self.eventSelection = eventSelection
-        self.multiplicityTable = multiplicityTable
-        self.tofEventTime = tofEventTime
-        self.tofPidBeta = tofPidBeta
-        self.tpcTofPidFull = tpcTofPidFull
-        self.trackPropagation = trackPropagation
-        self.trackSelection = trackSelection
-        self.helperOptions = helperOptions
-        self.o2Converters = o2Converters
-        self.dplAodReader = dplAodReader
-        self.dqLibGetter = dqLibGetter
-        self.parserEMEfficiencyNoSkimmed.register("action", "none", NoAction)
-        self.parserEMEfficiencyNoSkimmed.register("action", "store_choice", ChoicesAction)
-
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
+    
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
-
-        # Predefined Selections
-        dqSelections = {
-            "eventSelection": "Run event selection on DQ skimmed events",
-            "eventQA": "Run event QA on DQ skimmed events",
-            "trackSelection": "Run barrel track selection on DQ skimmed tracks"
-            }
-        dqSelectionsList = []
-        for k, v in dqSelections.items():
-            dqSelectionsList.append(k)
-
-        booleanSelections = ["true", "false"]
-
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allMCSignals = self.dqLibGetter.allMCSignals
-
-        # Interface
-
-        # analysis task selections
-        groupAnalysisSelections = self.parserEMEfficiencyNoSkimmed.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-track-selection"
-            )
-        groupAnalysisSelections.add_argument(
-            "--analysis", help = "Noskimmed process selections for MC Analysis", action = "store", nargs = "*", type = str,
-            metavar = "ANALYSIS", choices = dqSelectionsList,
-            ).completer = ChoicesCompleterList(dqSelectionsList)
-
-        for key, value in dqSelections.items():
-            groupAnalysisSelections.add_argument(key, help = value, action = "none")
-
-        # cfg for QA
-        groupQASelections = self.parserEMEfficiencyNoSkimmed.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-track-selection"
-            )
-        groupQASelections.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = (booleanSelections),
-            ).completer = ChoicesCompleter(booleanSelections)
-
-        # analysis-event-selection
-        groupAnalysisEventSelection = self.parserEMEfficiencyNoSkimmed.add_argument_group(title = "Data processor options: analysis-event-selection")
-        groupAnalysisEventSelection.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-
-        # analysis-track-selection
-        groupAnalysisTrackSelection = self.parserEMEfficiencyNoSkimmed.add_argument_group(title = "Data processor options: analysis-track-selection")
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackMCSignals", help = "Space separated list of MC signals", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-
-
+        
+        if self.parserEMEfficiencyNoSkimmed is None:
+            self.parserEMEfficiencyNoSkimmed = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserEMEfficiencyNoSkimmed, EM_EFFICIENCY_NO_SKIMMED_SCHEMA, self.dqLibGetter)
+    
     def parseArgs(self):
         """
         This function allows to save the obtained arguments to the parser_args() function
@@ -144,42 +110,24 @@ class EMEfficiencyNoSkimmed(object):
         Returns:
             Namespace: returns parse_args()
         """
+        if self.parserEMEfficiencyNoSkimmed is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserEMEfficiencyNoSkimmed)
         argcomplete.autocomplete(self.parserEMEfficiencyNoSkimmed, always_complete_options = False)
         return self.parserEMEfficiencyNoSkimmed.parse_args()
-
+    
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
-
-        self.helperOptions.parserHelperOptions = self.parserEMEfficiencyNoSkimmed
-        self.helperOptions.addArguments()
-
-        self.dplAodReader.parserDplAodReader = self.parserEMEfficiencyNoSkimmed
-        self.dplAodReader.addArguments()
-
-        self.eventSelection.parserEventSelectionTask = self.parserEMEfficiencyNoSkimmed
-        self.eventSelection.addArguments()
-
-        self.trackSelection.parserTrackSelectionTask = self.parserEMEfficiencyNoSkimmed
-        self.trackSelection.addArguments()
-
-        self.trackPropagation.parserTrackPropagation = self.parserEMEfficiencyNoSkimmed
-        self.trackPropagation.addArguments()
-
-        self.multiplicityTable.parserMultiplicityTable = self.parserEMEfficiencyNoSkimmed
-        self.multiplicityTable.addArguments()
-
-        self.tpcTofPidFull.parserTpcTofPidFull = self.parserEMEfficiencyNoSkimmed
-        self.tpcTofPidFull.addArguments()
-
-        self.tofEventTime.parserTofEventTime = self.parserEMEfficiencyNoSkimmed
-        self.tofEventTime.addArguments()
-
-        self.tofPidBeta.parserTofPidBeta = self.parserEMEfficiencyNoSkimmed
-        self.tofPidBeta.addArguments()
-
-        self.o2Converters.parserO2Converters = self.parserEMEfficiencyNoSkimmed
-        self.o2Converters.addArguments()
-
-        self.addArguments()
+        
+        schema = mergeSchemas(
+            HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, EVENT_SELECTION_SCHEMA, TRACK_SELECTION_SCHEMA, TRACK_PROPAGATION_SCHEMA,
+            MULTIPLICITY_TABLE_SCHEMA, TPC_TOF_PID_FULL_SCHEMA, TOF_EVENT_TIME_SCHEMA, TOF_PID_BETA_SCHEMA, O2_CONVERTERS_SCHEMA,
+            EM_EFFICIENCY_NO_SKIMMED_SCHEMA
+            )
+        if self.parserEMEfficiencyNoSkimmed is None:
+            self.parserEMEfficiencyNoSkimmed = buildParser("emEfficiencyNoSkimmed", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserEMEfficiencyNoSkimmed, schema, self.dqLibGetter)
@@ -18,28 +18,167 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/TableProducer/tableMaker.cxx
 
-import argparse
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
-from extramodules.helperOptions import HelperOptions
-from extramodules.converters import O2Converters
 import argcomplete
-from argcomplete.completers import ChoicesCompleter
-from extramodules.choicesHandler import ChoicesCompleterList
-from commondeps.centralityTable import CentralityTable
-from commondeps.eventSelection import EventSelectionTask
-from commondeps.multiplicityTable import MultiplicityTable
-from commondeps.pidTOFBase import TofEventTime
-from commondeps.pidTOFBeta import TofPidBeta
-from commondeps.pidTPCTOFFull import TpcTofPidFull
-from commondeps.trackPropagation import TrackPropagation
-from commondeps.trackselection import TrackSelectionTask
-from commondeps.dplAodReader import DplAodReader
-from dqtasks.v0selector import V0selector
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA, SHARED_MEMORY_SCHEMA, SKIM_CACHE_SCHEMA, TABLE_PRUNING_SCHEMA
+from commondeps.eventSelection import EVENT_SELECTION_SCHEMA
+from commondeps.trackselection import TRACK_SELECTION_SCHEMA
+from commondeps.trackPropagation import TRACK_PROPAGATION_SCHEMA
+from commondeps.multiplicityTable import MULTIPLICITY_TABLE_SCHEMA
+from commondeps.centralityTable import CENTRALITY_TABLE_SCHEMA
+from dqtasks.v0selector import V0_SELECTOR_SCHEMA
+from commondeps.pidTPCTOFFull import TPC_TOF_PID_FULL_SCHEMA, PID_PRUNING_SCHEMA
+from commondeps.pidTOFBase import TOF_EVENT_TIME_SCHEMA
+from commondeps.pidTOFBeta import TOF_PID_BETA_SCHEMA
+from extramodules.converters import O2_CONVERTERS_SCHEMA
 
 # Special configurations for filterPP are combined to avoid conflicts in the tableMaker interface
 
+PARSER_DESCRIPTION = "Example Usage: ./runTableMaker.py <yourConfig.json> --arg value "
+
+# Predefined Selections
+TABLE_MAKER_PROCESS_SELECTIONS = {
+    "Full": "Build full DQ skimmed data model, w/o centrality",
+    "FullWithCov": "Build full DQ skimmed data model, w/ track and fwdtrack covariance tables",
+    "FullWithCent": "Build full DQ skimmed data model, w/ centrality",
+    "BarrelOnly": "Build barrel-only DQ skimmed data model, w/o centrality",
+    "BarrelOnlyWithCov": "Build barrel-only DQ skimmed data model, w/ track cov matrix",
+    "BarrelOnlyWithV0Bits": "Build full DQ skimmed data model, w/o centrality, w/ V0Bits",
+    "BarrelOnlyWithEventFilter": "Build full DQ skimmed data model, w/o centrality, w/ event filter",
+    "BarrelOnlyWithQvector": "Build full DQ skimmed data model, w/ centrality, w/ q vector",
+    "BarrelOnlyWithCent": "Build barrel-only DQ skimmed data model, w/ centrality",
+    "MuonOnly": "Build muon-only DQ skimmed data model",
+    "MuonOnlyWithCov": "Build muon-only DQ skimmed data model, w/ muon cov matrix",
+    "MuonOnlyWithCent": "Build muon-only DQ skimmed data model, w/ centrality",
+    "MuonOnlyWithFilter": "Build muon-only DQ skimmed data model, w/ event filter",
+    "MuonOnlyWithQvector": "Build muon-only DQ skimmed data model, w/ q vector",
+    "AmbiguousMuonOnly": "Build muon-only DQ skimmed data model with QA plots for ambiguous muons",
+    "AmbiguousBarrelOnly": "Build muon-only DQ skimmed data model with QA plots for ambiguous tracks",
+    "OnlyBCs": "Analyze the BCs to store sampled lumi",
+    }
+
+# Interface
+TABLE_MAKER_SCHEMA = [
+    # analysis-qvector
+    argumentGroup(
+        "Data processor options: analysis-qvector",
+        argument("--cfgCutPtMin", help = "Minimal pT for tracks", type = str, metavar = "CFGCUTPTMIN"),
+        argument("--cfgCutPtMax", help = "Maximal pT for tracks", type = str, metavar = "CFGCUTPTMAX"),
+        argument("--cfgCutEta", help = "Eta range for tracks", type = str, metavar = "CFGCUTETA"),
+        argument("--cfgEtaLimit", help = "Eta gap separation, only if using subEvents", type = str, metavar = "CFGETALIMIT"),
+        argument("--cfgNPow", help = "Power of weights for Q vector", type = str, metavar = "CFGNPOW"),
+        argument("--cfgEfficiency", help = "CCDB path to efficiency object", type = str),
+        argument("--cfgAcceptance", help = "CCDB path to acceptance object", type = str),
+        ),
+    # all d-q tasks and selections
+    argumentGroup(
+        "Data processor options: d-q-event-selection-task, d-q-barrel-track-selection-task, d-q-muons-selection, d-q-filter-p-p-task, analysis-qvector",
+        argument("--cfgWithQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        ),
+    # d-q-track barrel-task
+    argumentGroup(
+        "Data processor options: d-q-barrel-track-selection-task",
+        argument(
+            "--isBarrelSelectionTiny",
+            help = "Run barrel track selection instead of normal(process func. for barrel selection must be true)", type = str.lower,
+            choices = BOOLEAN_SELECTIONS
+            ),
+        ),
+    # d-q muons-selection
+    argumentGroup(
+        "Data processor options: d-q muons-selection",
+        argument(
+            "--cfgMuonsCuts", help = "Space separated list of ADDITIONAL muon track cuts", nargs = "*", type = str, metavar = "CFGMUONSCUT",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # d-q-filter-p-p-task
+    argumentGroup(
+        "Data processor options: d-q-filter-p-p-task",
+        argument(
+            "--cfgBarrelSels",
+            help = "Configure Barrel Selection <track-cut>:[<pair-cut>]:<n>,[<track-cut>:[<pair-cut>]:<n>],... | example jpsiO2MCdebugCuts2::1 ",
+            type = str, nargs = "*", metavar = "CFGBARRELSELS", lib = "allSels"
+            ),
+        argument(
+            "--cfgMuonSels", help = "Configure Muon Selection <muon-cut>:[<pair-cut>]:<n> example muonQualityCuts:pairNoCut:1", type = str,
+            nargs = "*", metavar = "CFGMUONSELS", lib = "allSels"
+            ),
+        argument(
+            "--isFilterPPTiny", help = "Run filter tiny task instead of normal (processFilterPP must be true) ", type = str.lower,
+            choices = BOOLEAN_SELECTIONS
+            ),
+        ),
+    # table-maker configurables
+    argumentGroup(
+        "Data processor options: table-maker",
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgBarrelTrackCuts", help = " Space separated list of barrel track cuts", nargs = "*", type = str,
+            metavar = "CFGBARRELTRACKCUTS", lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgMuonCuts", help = "Space separated list of muon cuts in table-maker", nargs = "*", type = str, metavar = "CFGMUONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgAddEventHistogram", help = "Comma separated list of event histograms", nargs = "*", type = str,
+            metavar = "CFGADDEVENTHISTOGRAM", lib = "allEventHistos"
+            ),
+        argument(
+            "--cfgAddTrackHistogram", help = "Comma separated list of track histograms", nargs = "*", type = str,
+            metavar = "CFGADDTRACKHISTOGRAM", lib = "allTrackHistos"
+            ),
+        argument(
+            "--cfgAddMuonHistogram", help = "Comma separated list of muon histograms", nargs = "*", type = str,
+            metavar = "CFGADDMUONHISTOGRAM", lib = "allTrackHistos"
+            ), argument("--cfgBarrelLowPt", help = "Low pt cut for tracks in the barrel", type = str),
+        argument("--cfgMuonLowPt", help = "Low pt cut for muons", type = str),
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        argument(
+            "--cfgDetailedQA", help = "If true, include more QA histograms (BeforeCuts classes and more)", type = str.lower,
+            choices = BOOLEAN_SELECTIONS
+            ),
+        argument(
+            "--cfgIsAmbiguous", help = "Whether we enable QA plots for ambiguous tracks", choices = BOOLEAN_SELECTIONS, type = str.lower
+            ), argument("--cfgMinTpcSignal", help = "Minimum TPC signal", type = str),
+        argument("--cfgMaxTpcSignal", help = "Maximum TPC signal", type = str),
+        argument(
+            "--process", help = "table-maker: PROCESS_SWITCH options", type = str, nargs = "*", metavar = "PROCESS",
+            choices = TABLE_MAKER_PROCESS_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for table-maker PROCESS_SWITCH options", "--process"),
+    # sharded execution
+    argumentGroup(
+        "Sharded execution over AO2D text lists",
+        argument(
+            "--shards", help = "Split the AO2D text list (--aod @list.txt) into N shards and run their workflows concurrently", type = int,
+            metavar = "SHARDS"
+            ),
+        argument(
+            "--shardWorkers", help = "Maximum number of concurrent shard workflows, None: CPU/memory budget of the node", type = int,
+            metavar = "SHARDWORKERS"
+            ),
+        argument("--shardMemory", help = "Memory budget of one shard workflow in GB", type = float, metavar = "SHARDMEMORY", default = 4.0),
+        argument(
+            "--shardPlan",
+            help = "Replay a shard plan manifest (each sharded run writes tempShards/<run id>/shardPlan.json) instead of planning",
+            type = str, metavar = "SHARDPLAN"
+            ),
+        ),
+    # core part
+    argumentGroup(
+        "Core configurations that must be configured", argument("-runData", help = "Run over Data", action = "store_true", default = True),
+        ),
+    ]
+
 
 class TableMaker(object):
     
@@ -51,181 +190,19 @@ class TableMaker(object):
         object (parser_args() object): tableMaker.cxx Interface
     """
     
-    def __init__(
-        self, parserTableMaker = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runTableMaker.py <yourConfig.json> --arg value "
-            ), eventSelection = EventSelectionTask(), centralityTable = CentralityTable(), multiplicityTable = MultiplicityTable(),
-        tofEventTime = TofEventTime(), tofPidBeta = TofPidBeta(), tpcTofPidFull = TpcTofPidFull(), trackPropagation = TrackPropagation(),
-        trackSelection = TrackSelectionTask(), v0selector = V0selector(), helperOptions = HelperOptions(), o2Converters = O2Converters(),
-        dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    def __init__(self, parserTableMaker = None, dqLibGetter = None):
         super(TableMaker, self).__init__()
         self.parserTableMaker = parserTableMaker
-        self.eventSelection = eventSelection
-        self.centralityTable = centralityTable
-        self.multiplicityTable = multiplicityTable
-        self.tofEventTime = tofEventTime
-        self.tofPidBeta = tofPidBeta
-        self.tpcTofPidFull = tpcTofPidFull
-        self.trackPropagation = trackPropagation
-        self.trackSelection = trackSelection
-        self.v0selector = v0selector
-        self.helperOptions = helperOptions
-        self.o2Converters = o2Converters
-        self.dplAodReader = dplAodReader
-        self.dqLibGetter = dqLibGetter
-        self.parserTableMaker.register("action", "none", NoAction)
-        self.parserTableMaker.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        tableMakerProcessSelections = {
-            "Full": "Build full DQ skimmed data model, w/o centrality",
-            "FullWithCov": "Build full DQ skimmed data model, w/ track and fwdtrack covariance tables",
-            "FullWithCent": "Build full DQ skimmed data model, w/ centrality",
-            "BarrelOnly": "Build barrel-only DQ skimmed data model, w/o centrality",
-            "BarrelOnlyWithCov": "Build barrel-only DQ skimmed data model, w/ track cov matrix",
-            "BarrelOnlyWithV0Bits": "Build full DQ skimmed data model, w/o centrality, w/ V0Bits",
-            "BarrelOnlyWithEventFilter": "Build full DQ skimmed data model, w/o centrality, w/ event filter",
-            "BarrelOnlyWithQvector": "Build full DQ skimmed data model, w/ centrality, w/ q vector",
-            "BarrelOnlyWithCent": "Build barrel-only DQ skimmed data model, w/ centrality",
-            "MuonOnly": "Build muon-only DQ skimmed data model",
-            "MuonOnlyWithCov": "Build muon-only DQ skimmed data model, w/ muon cov matrix",
-            "MuonOnlyWithCent": "Build muon-only DQ skimmed data model, w/ centrality",
-            "MuonOnlyWithFilter": "Build muon-only DQ skimmed data model, w/ event filter",
-            "MuonOnlyWithQvector": "Build muon-only DQ skimmed data model, w/ q vector",
-            "AmbiguousMuonOnly": "Build muon-only DQ skimmed data model with QA plots for ambiguous muons",
-            "AmbiguousBarrelOnly": "Build muon-only DQ skimmed data model with QA plots for ambiguous tracks",
-            "OnlyBCs": "Analyze the BCs to store sampled lumi",
-            }
-        tableMakerProcessSelectionsList = []
-        for k, v in tableMakerProcessSelections.items():
-            tableMakerProcessSelectionsList.append(k)
-        
-        booleanSelections = ["true", "false"]
-        
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allSels = self.dqLibGetter.allSels
-        allEventHistos = self.dqLibGetter.allEventHistos
-        allTrackHistos = self.dqLibGetter.allTrackHistos
-        
-        # Interface
-        
-        # analysis-qvector
-        groupAnalysisQvector = self.parserTableMaker.add_argument_group(title = "Data processor options: analysis-qvector")
-        groupAnalysisQvector.add_argument(
-            "--cfgCutPtMin", help = "Minimal pT for tracks", action = "store", type = str, metavar = "CFGCUTPTMIN",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgCutPtMax", help = "Maximal pT for tracks", action = "store", type = str, metavar = "CFGCUTPTMAX",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgCutEta", help = "Eta range for tracks", action = "store", type = str, metavar = "CFGCUTETA",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgEtaLimit", help = "Eta gap separation, only if using subEvents", action = "store", type = str, metavar = "CFGETALIMIT",
-            )
-        groupAnalysisQvector.add_argument(
-            "--cfgNPow", help = "Power of weights for Q vector", action = "store", type = str, metavar = "CFGNPOW",
-            )
-        groupAnalysisQvector.add_argument("--cfgEfficiency", help = "CCDB path to efficiency object", action = "store", type = str)
-        groupAnalysisQvector.add_argument("--cfgAcceptance", help = "CCDB path to acceptance object", action = "store", type = str)
-        
-        # all d-q tasks and selections
-        groupQASelections = self.parserTableMaker.add_argument_group(
-            title = "Data processor options: d-q-event-selection-task, d-q-barrel-track-selection-task, d-q-muons-selection, d-q-filter-p-p-task, analysis-qvector"
-            )
-        groupQASelections.add_argument(
-            "--cfgWithQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        
-        # d-q-track barrel-task
-        groupDQTrackBarrelTask = self.parserTableMaker.add_argument_group(title = "Data processor options: d-q-barrel-track-selection-task")
-        groupDQTrackBarrelTask.add_argument(
-            "--isBarrelSelectionTiny",
-            help = "Run barrel track selection instead of normal(process func. for barrel selection must be true)", action = "store",
-            type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        
-        # d-q muons-selection
-        groupDQMuonsSelection = self.parserTableMaker.add_argument_group(title = "Data processor options: d-q muons-selection")
-        groupDQMuonsSelection.add_argument(
-            "--cfgMuonsCuts", help = "Space separated list of ADDITIONAL muon track cuts", action = "store", nargs = "*", type = str,
-            metavar = "CFGMUONSCUT", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # d-q-filter-p-p-task
-        groupDQFilterPP = self.parserTableMaker.add_argument_group(title = "Data processor options: d-q-filter-p-p-task")
-        groupDQFilterPP.add_argument(
-            "--cfgBarrelSels",
-            help = "Configure Barrel Selection <track-cut>:[<pair-cut>]:<n>,[<track-cut>:[<pair-cut>]:<n>],... | example jpsiO2MCdebugCuts2::1 ",
-            action = "store", type = str, nargs = "*", metavar = "CFGBARRELSELS", choices = allSels,
-            ).completer = ChoicesCompleterList(allSels)
-        groupDQFilterPP.add_argument(
-            "--cfgMuonSels", help = "Configure Muon Selection <muon-cut>:[<pair-cut>]:<n> example muonQualityCuts:pairNoCut:1",
-            action = "store", type = str, nargs = "*", metavar = "CFGMUONSELS", choices = allSels,
-            ).completer = ChoicesCompleterList(allSels)
-        groupDQFilterPP.add_argument(
-            "--isFilterPPTiny", help = "Run filter tiny task instead of normal (processFilterPP must be true) ", action = "store",
-            type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        
-        # table-maker configurables
-        groupTableMakerConfigs = self.parserTableMaker.add_argument_group(title = "Data processor options: table-maker")
-        groupTableMakerConfigs.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgBarrelTrackCuts", help = " Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGBARRELTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgMuonCuts", help = "Space separated list of muon cuts in table-maker", action = "store", nargs = "*", type = str,
-            metavar = "CFGMUONCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddEventHistogram", help = "Comma separated list of event histograms", action = "store", nargs = "*", type = str, metavar="CFGADDEVENTHISTOGRAM", choices = allEventHistos,
-            ).completer = ChoicesCompleterList(allEventHistos)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddTrackHistogram", help = "Comma separated list of track histograms", action = "store", nargs= "*", type = str, metavar="CFGADDTRACKHISTOGRAM", choices = allTrackHistos,
-            ).completer = ChoicesCompleterList(allTrackHistos)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddMuonHistogram", help = "Comma separated list of muon histograms", action = "store", nargs="*", type = str, metavar="CFGADDMUONHISTOGRAM", choices = allTrackHistos,
-            ).completer = ChoicesCompleterList(allTrackHistos)
-        groupTableMakerConfigs.add_argument("--cfgBarrelLowPt", help = "Low pt cut for tracks in the barrel", action = "store", type = str)
-        groupTableMakerConfigs.add_argument("--cfgMuonLowPt", help = "Low pt cut for muons", action = "store", type = str)
-        groupTableMakerConfigs.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupTableMakerConfigs.add_argument(
-            "--cfgDetailedQA", help = "If true, include more QA histograms (BeforeCuts classes and more)", action = "store",
-            type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        # groupTableMakerConfigs.add_argument("--cfgIsRun2", help="Run selection true or false", action="store", choices=["true","false"], type=str) # no need
-        groupTableMakerConfigs.add_argument(
-            "--cfgIsAmbiguous", help = "Whether we enable QA plots for ambiguous tracks", action = "store", choices = booleanSelections,
-            type = str.lower
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupTableMakerConfigs.add_argument("--cfgMinTpcSignal", help = "Minimum TPC signal", action = "store", type = str)
-        groupTableMakerConfigs.add_argument("--cfgMaxTpcSignal", help = "Maximum TPC signal", action = "store", type = str)
-        groupTableMakerConfigs.add_argument(
-            "--process", help = "table-maker: PROCESS_SWITCH options", action = "store", type = str, nargs = "*", metavar = "PROCESS",
-            choices = tableMakerProcessSelectionsList,
-            ).completer = ChoicesCompleterList(tableMakerProcessSelectionsList)
-        groupProcess = self.parserTableMaker.add_argument_group(title = "Choice List for table-maker PROCESS_SWITCH options")
-        for key, value in tableMakerProcessSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
-        
-        # core part
-        groupCoreSelections = self.parserTableMaker.add_argument_group(title = "Core configurations that must be configured")
-        groupCoreSelections.add_argument("-runData", help = "Run over Data", action = "store_true", default = True)
+        if self.parserTableMaker is None:
+            self.parserTableMaker = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserTableMaker, TABLE_MAKER_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -235,59 +212,25 @@ class TableMaker(object):
             Namespace: returns parse_args()
         """
         
+        if self.parserTableMaker is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserTableMaker)
         argcomplete.autocomplete(self.parserTableMaker, always_complete_options = False)
         return self.parserTableMaker.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserTableMaker
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserTableMaker
-        self.dplAodReader.addArguments()
-        
-        self.eventSelection.parserEventSelectionTask = self.parserTableMaker
-        self.eventSelection.addArguments()
-        
-        self.trackSelection.parserTrackSelectionTask = self.parserTableMaker
-        self.trackSelection.addArguments()
-        
-        self.trackPropagation.parserTrackPropagation = self.parserTableMaker
-        self.trackPropagation.addArguments()
-        
-        self.multiplicityTable.parserMultiplicityTable = self.parserTableMaker
-        self.multiplicityTable.addArguments()
-        
-        self.centralityTable.parserCentralityTable = self.parserTableMaker
-        self.centralityTable.addArguments()
-        
-        self.v0selector.parserV0selector = self.parserTableMaker
-        self.v0selector.addArguments()
-        
-        self.tpcTofPidFull.parserTpcTofPidFull = self.parserTableMaker
-        self.tpcTofPidFull.addArguments()
-        
-        self.tofEventTime.parserTofEventTime = self.parserTableMaker
-        self.tofEventTime.addArguments()
-        
-        self.tofPidBeta.parserTofPidBeta = self.parserTableMaker
-        self.tofPidBeta.addArguments()
-        
-        self.o2Converters.parserO2Converters = self.parserTableMaker
-        self.o2Converters.addArguments()
-        
-        self.addArguments()
-    
-    # This function not work should be integrated instead of mergeArgs
-    
-    """
-    def mergeMultiArgs(self, *objects):
-        parser = self.parserTableMaker
-        for object in objects:
-            object.parser = parser
-            object.addArguments()
-        self.addArguments()
-    """
+        schema = mergeSchemas(
+            HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, SHARED_MEMORY_SCHEMA, SKIM_CACHE_SCHEMA, TABLE_PRUNING_SCHEMA,
+            EVENT_SELECTION_SCHEMA, TRACK_SELECTION_SCHEMA, TRACK_PROPAGATION_SCHEMA, MULTIPLICITY_TABLE_SCHEMA, CENTRALITY_TABLE_SCHEMA,
+            V0_SELECTOR_SCHEMA, TPC_TOF_PID_FULL_SCHEMA, PID_PRUNING_SCHEMA, TOF_EVENT_TIME_SCHEMA, TOF_PID_BETA_SCHEMA,
+            O2_CONVERTERS_SCHEMA, TABLE_MAKER_SCHEMA
+            )
+        if self.parserTableMaker is None:
+            self.parserTableMaker = buildParser("tableMaker", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserTableMaker, schema, self.dqLibGetter)
@@ -18,24 +18,90 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/TableProducer/tableMakerMC.cxx
 
-import argparse
-from argcomplete.completers import ChoicesCompleter
 import argcomplete
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.helperOptions import HelperOptions
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
-from extramodules.converters import O2Converters
-from commondeps.centralityTable import CentralityTable
-from commondeps.eventSelection import EventSelectionTask
-from commondeps.multiplicityTable import MultiplicityTable
-from commondeps.pidTOFBase import TofEventTime
-from commondeps.pidTOFBeta import TofPidBeta
-from commondeps.pidTPCTOFFull import TpcTofPidFull
-from commondeps.trackPropagation import TrackPropagation
-from commondeps.trackselection import TrackSelectionTask
-from commondeps.dplAodReader import DplAodReader
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA, SHARED_MEMORY_SCHEMA, SKIM_CACHE_SCHEMA, TABLE_PRUNING_SCHEMA
+from commondeps.eventSelection import EVENT_SELECTION_SCHEMA
+from commondeps.trackselection import TRACK_SELECTION_SCHEMA
+from commondeps.trackPropagation import TRACK_PROPAGATION_SCHEMA
+from commondeps.multiplicityTable import MULTIPLICITY_TABLE_SCHEMA
+from commondeps.centralityTable import CENTRALITY_TABLE_SCHEMA
+from commondeps.pidTPCTOFFull import TPC_TOF_PID_FULL_SCHEMA, PID_PRUNING_SCHEMA
+from commondeps.pidTOFBase import TOF_EVENT_TIME_SCHEMA
+from commondeps.pidTOFBeta import TOF_PID_BETA_SCHEMA
+from extramodules.converters import O2_CONVERTERS_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runTableMakerMC.py <yourConfig.json> --arg value"
+
+# Predefined Selections
+TABLE_MAKER_PROCESS_SELECTIONS = {
+    "Full": "Build full DQ skimmed data model, w/o centrality",
+    "FullWithCov": "Build full DQ skimmed data model, w/ track and fwdtrack covariance tables",
+    "BarrelOnly": "Build barrel-only DQ skimmed data model, w/o centrality",
+    "BarrelOnlyWithCov": "Build barrel-only DQ skimmed data model, w/ track cov matrix",
+    "BarrelOnlyWithCent": "Build barrel-only DQ skimmed data model, w/ centrality",
+    "MuonOnlyWithCov": "Build muon-only DQ skimmed data model, w/ muon cov matrix",
+    "MuonOnlyWithCent": "Build muon-only DQ skimmed data model, w/ centrality",
+    "OnlyBCs": "Analyze the BCs to store sampled lumi",
+    }
+
+# Interface
+TABLE_MAKER_MC_SCHEMA = [
+    argumentGroup(
+        "Data processor options: table-maker-m-c",
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgBarrelTrackCuts", help = " Space separated list of barrel track cuts", nargs = "*", type = str,
+            metavar = "CFGBARRELTRACKCUTS", lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgMuonCuts", help = "Space separated list of muon cuts in table-maker", nargs = "*", type = str, metavar = "CFGMUONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        argument(
+            "--cfgAddEventHistogram", help = "Comma separated list of event histograms", nargs = "*", type = str,
+            metavar = "CFGADDEVENTHISTOGRAM", lib = "allEventHistos"
+            ),
+        argument(
+            "--cfgAddTrackHistogram", help = "Comma separated list of track histograms", nargs = "*", type = str,
+            metavar = "CFGADDTRACKHISTOGRAM", lib = "allTrackHistos"
+            ),
+        argument(
+            "--cfgAddMuonHistogram", help = "Comma separated list of muon histograms", nargs = "*", type = str,
+            metavar = "CFGADDMUONHISTOGRAM", lib = "allTrackHistos"
+            ),
+        argument(
+            "--cfgAddMCTruthHistogram", help = "Comma separated list of mctruth histograms", nargs = "*", type = str,
+            metavar = "CFGADDMCTRUTHHISTOGRAM", lib = "allMCTruthHistos"
+            ), argument("--cfgBarrelLowPt", help = "Low pt cut for tracks in the barrel", type = str),
+        argument("--cfgMuonLowPt", help = "Low pt cut for muons", type = str),
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        argument(
+            "--cfgDetailedQA", help = "If true, include more QA histograms (BeforeCuts classes and more)", type = str.lower,
+            choices = BOOLEAN_SELECTIONS
+            ), argument("--cfgMinTpcSignal", help = "Minimum TPC signal", type = str),
+        argument("--cfgMaxTpcSignal", help = "Maximum TPC signal", type = str),
+        argument(
+            "--cfgMCsignals", help = "Space separated list of MC signals", nargs = "*", type = str, metavar = "CFGMCSIGNALS",
+            lib = "allMCSignals"
+            ),
+        argument(
+            "--process", help = "table-maker-m-c: PROCESS_SWITCH options", type = str, nargs = "*", metavar = "PROCESS",
+            choices = TABLE_MAKER_PROCESS_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for table-maker-m-c PROCESS_SWITCH options", "--process"),
+    # Core Part
+    argumentGroup(
+        "Core configurations that must be configured", argument("-runMC", help = "Run over MC", action = "store_true", default = True),
+        ),
+    ]
 
 
 class TableMakerMC(object):
@@ -47,114 +113,19 @@ class TableMakerMC(object):
         object (parser_args() object): tableMakerMC.cxx Interface
     """
     
-    def __init__(
-        self, parserTableMakerMC = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runTableMakerMC.py <yourConfig.json> --arg value",
-            ), eventSelection = EventSelectionTask(), centralityTable = CentralityTable(), multiplicityTable = MultiplicityTable(),
-        tofEventTime = TofEventTime(), tofPidBeta = TofPidBeta(), tpcTofPidFull = TpcTofPidFull(), trackPropagation = TrackPropagation(),
-        trackSelection = TrackSelectionTask(), helperOptions = HelperOptions(), o2Converters = O2Converters(),
-        dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    def __init__(self, parserTableMakerMC = None, dqLibGetter = None):
         super(TableMakerMC, self).__init__()
         self.parserTableMakerMC = parserTableMakerMC
-        self.eventSelection = eventSelection
-        self.centralityTable = centralityTable
-        self.multiplicityTable = multiplicityTable
-        self.tofEventTime = tofEventTime
-        self.tofPidBeta = tofPidBeta
-        self.tpcTofPidFull = tpcTofPidFull
-        self.trackPropagation = trackPropagation
-        self.trackSelection = trackSelection
-        self.helperOptions = helperOptions
-        self.o2Converters = o2Converters
-        self.dplAodReader = dplAodReader
-        self.dqLibGetter = dqLibGetter
-        self.parserTableMakerMC.register("action", "none", NoAction)
-        self.parserTableMakerMC.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        tableMakerProcessSelections = {
-            "Full": "Build full DQ skimmed data model, w/o centrality",
-            "FullWithCov": "Build full DQ skimmed data model, w/ track and fwdtrack covariance tables",
-            "BarrelOnly": "Build barrel-only DQ skimmed data model, w/o centrality",
-            "BarrelOnlyWithCov": "Build barrel-only DQ skimmed data model, w/ track cov matrix",
-            "BarrelOnlyWithCent": "Build barrel-only DQ skimmed data model, w/ centrality",
-            "MuonOnlyWithCov": "Build muon-only DQ skimmed data model, w/ muon cov matrix",
-            "MuonOnlyWithCent": "Build muon-only DQ skimmed data model, w/ centrality",
-            "OnlyBCs": "Analyze the BCs to store sampled lumi",
-            }
-        tableMakerProcessSelectionsList = []
-        for k, v in tableMakerProcessSelections.items():
-            tableMakerProcessSelectionsList.append(k)
-        
-        booleanSelections = ["true", "false"]
-        
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allMCSignals = self.dqLibGetter.allMCSignals
-        allEventHistos = self.dqLibGetter.allEventHistos
-        allTrackHistos = self.dqLibGetter.allTrackHistos
-        allMCTruthHistos = self.dqLibGetter.allMCTruthHistos
-        
-        # Interface
-        groupTableMakerConfigs = self.parserTableMakerMC.add_argument_group(title = "Data processor options: table-maker-m-c")
-        groupTableMakerConfigs.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgBarrelTrackCuts", help = " Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGBARRELTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgMuonCuts", help = "Space separated list of muon cuts in table-maker", action = "store", nargs = "*", type = str,
-            metavar = "CFGMUONCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddEventHistogram", help = "Comma separated list of event histograms", action = "store", nargs = "*", type = str, metavar="CFGADDEVENTHISTOGRAM", choices = allEventHistos,
-            ).completer = ChoicesCompleterList(allEventHistos)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddTrackHistogram", help = "Comma separated list of track histograms", action = "store", nargs= "*", type = str, metavar="CFGADDTRACKHISTOGRAM", choices = allTrackHistos,
-            ).completer = ChoicesCompleterList(allTrackHistos)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddMuonHistogram", help = "Comma separated list of muon histograms", action = "store", nargs="*", type = str, metavar="CFGADDMUONHISTOGRAM", choices = allTrackHistos,
-            ).completer = ChoicesCompleterList(allTrackHistos)
-        groupTableMakerConfigs.add_argument(
-            "--cfgAddMCTruthHistogram", help = "Comma separated list of mctruth histograms", action = "store", nargs="*", type = str, metavar="CFGADDMCTRUTHHISTOGRAM", choices = allMCTruthHistos,
-            ).completer = ChoicesCompleterList(allMCTruthHistos)
-        groupTableMakerConfigs.add_argument("--cfgBarrelLowPt", help = "Low pt cut for tracks in the barrel", action = "store", type = str)
-        groupTableMakerConfigs.add_argument("--cfgMuonLowPt", help = "Low pt cut for muons", action = "store", type = str)
-        groupTableMakerConfigs.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        groupTableMakerConfigs.add_argument(
-            "--cfgDetailedQA", help = "If true, include more QA histograms (BeforeCuts classes and more)", action = "store",
-            type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        # groupTableMakerConfigs.add_argument("--cfgIsRun2", help="Run selection true or false", action="store", choices=["true","false"], type=str) # no need
-        groupTableMakerConfigs.add_argument("--cfgMinTpcSignal", help = "Minimum TPC signal", action = "store", type = str)
-        groupTableMakerConfigs.add_argument("--cfgMaxTpcSignal", help = "Maximum TPC signal", action = "store", type = str)
-        groupTableMakerConfigs.add_argument(
-            "--cfgMCsignals", help = "Space separated list of MC signals", action = "store", nargs = "*", type = str,
-            metavar = "CFGMCSIGNALS", choices = allMCSignals,
-            ).completer = ChoicesCompleterList(allMCSignals)
-        groupTableMakerConfigs.add_argument(
-            "--process", help = "table-maker-m-c: PROCESS_SWITCH options", action = "store", type = str, nargs = "*", metavar = "PROCESS",
-            choices = tableMakerProcessSelectionsList,
-            ).completer = ChoicesCompleterList(tableMakerProcessSelectionsList)
-        groupProcess = self.parserTableMakerMC.add_argument_group(title = "Choice List for table-maker-m-c PROCESS_SWITCH options")
-        for key, value in tableMakerProcessSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
-        
-        # Core Part
-        groupCoreSelections = self.parserTableMakerMC.add_argument_group(title = "Core configurations that must be configured")
-        groupCoreSelections.add_argument("-runMC", help = "Run over MC", action = "store_true", default = True)
+        if self.parserTableMakerMC is None:
+            self.parserTableMakerMC = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserTableMakerMC, TABLE_MAKER_MC_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -163,45 +134,25 @@ class TableMakerMC(object):
         Returns:
             Namespace: returns parse_args()
         """
+        if self.parserTableMakerMC is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserTableMakerMC)
         argcomplete.autocomplete(self.parserTableMakerMC, always_complete_options = False)
         return self.parserTableMakerMC.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserTableMakerMC
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserTableMakerMC
-        self.dplAodReader.addArguments()
-        
-        self.eventSelection.parserEventSelectionTask = self.parserTableMakerMC
-        self.eventSelection.addArguments()
-        
-        self.trackSelection.parserTrackSelectionTask = self.parserTableMakerMC
-        self.trackSelection.addArguments()
-        
-        self.trackPropagation.parserTrackPropagation = self.parserTableMakerMC
-        self.trackPropagation.addArguments()
-        
-        self.multiplicityTable.parserMultiplicityTable = self.parserTableMakerMC
-        self.multiplicityTable.addArguments()
-        
-        self.centralityTable.parserCentralityTable = self.parserTableMakerMC
-        self.centralityTable.addArguments()
-        
-        self.tpcTofPidFull.parserTpcTofPidFull = self.parserTableMakerMC
-        self.tpcTofPidFull.addArguments()
-        
-        self.tofEventTime.parserTofEventTime = self.parserTableMakerMC
-        self.tofEventTime.addArguments()
-        
-        self.tofPidBeta.parserTofPidBeta = self.parserTableMakerMC
-        self.tofPidBeta.addArguments()
-        
-        self.o2Converters.parserO2Converters = self.parserTableMakerMC
-        self.o2Converters.addArguments()
-        
-        self.addArguments()
+        schema = mergeSchemas(
+            HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, SHARED_MEMORY_SCHEMA, SKIM_CACHE_SCHEMA, TABLE_PRUNING_SCHEMA,
+            EVENT_SELECTION_SCHEMA, TRACK_SELECTION_SCHEMA, TRACK_PROPAGATION_SCHEMA, MULTIPLICITY_TABLE_SCHEMA, CENTRALITY_TABLE_SCHEMA,
+            TPC_TOF_PID_FULL_SCHEMA, PID_PRUNING_SCHEMA, TOF_EVENT_TIME_SCHEMA, TOF_PID_BETA_SCHEMA, O2_CONVERTERS_SCHEMA,
+            TABLE_MAKER_MC_SCHEMA
+            )
+        if self.parserTableMakerMC is None:
+            self.parserTableMakerMC = buildParser("tableMakerMC", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserTableMakerMC, schema, self.dqLibGetter)
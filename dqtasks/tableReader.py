@@ -18,16 +18,185 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Tasks/tableReader.cxx
 
-import argparse
 import argcomplete
-from argcomplete.completers import ChoicesCompleter
-from commondeps.dplAodReader import DplAodReader
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, buildParser, newParser, mergeSchemas, BOOLEAN_SELECTIONS
 from extramodules.dqLibGetter import DQLibGetter
-from extramodules.choicesHandler import ChoicesCompleterList
-from extramodules.helperOptions import HelperOptions
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
-from extramodules.helperOptions import HelperOptions
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runTableReader.py <yourConfig.json> --arg value"
+
+# Predefined Selections
+WRITER_PATH = "configs/writerConfiguration_dileptons.json"
+ANALYSIS_SELECTIONS = {
+    "eventSelection": "Run event selection on DQ skimmed events",
+    "muonSelection": "Run muon selection on DQ skimmed muons",
+    "trackSelection": "Run barrel track selection on DQ skimmed tracks",
+    "eventMixing": "Run mixing on skimmed tracks based muon and track selections",
+    "sameEventPairing": "Run same event pairing selection on DQ skimmed data",
+    "dileptonHadron": "Run dilepton-hadron pairing, using skimmed data",
+    }
+SAME_EVENT_PAIRING_PROCESS_SELECTIONS = {
+    "JpsiToEE": "Run electron-electron pairing, with skimmed tracks",
+    "JpsiToMuMu": "Run muon-muon pairing, with skimmed muons",
+    "JpsiToMuMuVertexing": "Run muon-muon pairing and vertexing, with skimmed muons",
+    "VnJpsiToEE": "Run barrel-barrel vn mixing on skimmed tracks",
+    "VnJpsiToMuMu": "Run muon-muon vn mixing on skimmed tracks",
+    "ElectronMuon": "Run electron-muon pairing, with skimmed tracks/muons",
+    "All": "Run all types of pairing, with skimmed tracks/muons",
+    }
+MIXING_SELECTIONS = {
+    "Barrel": "Run barrel-barrel mixing on skimmed tracks",
+    "Muon": "Run muon-muon mixing on skimmed muons",
+    "BarrelMuon": "Run barrel-muon mixing on skimmed tracks/muons",
+    "BarrelVn": "Run barrel-barrel vn mixing on skimmed tracks",
+    "MuonVn": "Run muon-muon vn mixing on skimmed tracks",
+    }
+
+# yapf: disable
+# Definition of all the trees we may read
+TABLE_READER_TREES = {
+    "ReducedEvents": {"table": "AOD/REDUCEDEVENT/0","treename": "ReducedEvents"},
+    "ReducedEventsExtended": {"table": "AOD/REEXTENDED/0","treename": "ReducedEventsExtended"},
+    "ReducedEventsVtxCov": {"table": "AOD/REVTXCOV/0","treename": "ReducedEventsVtxCov"},
+    "ReducedEventsQvector": {"table": "AOD/REQVECTOR/0","treename": "ReducedEventsQvector"},
+    "ReducedTracks": {"table": "AOD/REDUCEDTRACK/0","treename": "ReducedTracks"},
+    "ReducedTracksBarrel": {"table": "AOD/RTBARREL/0","treename": "ReducedTracksBarrel"},
+    "ReducedTracksBarrelCov": {"table": "AOD/RTBARRELCOV/0","treename": "ReducedTracksBarrelCov"},
+    "ReducedTracksBarrelPID": {"table": "AOD/RTBARRELPID/0","treename": "ReducedTracksBarrelPID"},
+    "ReducedMuons": {"table": "AOD/RTMUON/0","treename": "ReducedMuons"},
+    "ReducedMuonsExtra": {"table": "AOD/RTMUONEXTRA/0","treename": "ReducedMuonsExtra"},
+    "ReducedMuonsCov": {"table": "AOD/RTMUONCOV/0","treename": "ReducedMuonsCov"},
+    "AmbiguousTracksMid": {"table": "AOD/AMBIGUOUSTRACK/0","treename": "AmbiguousTracksMid"},
+    "AmbiguousTracksFwd": {"table": "AOD/AMBIGUOUSFWDTR/0","treename": "AmbiguousTracksFwd"},
+    "Dileptons": {"table": "AOD/RTDILEPTON/0","treename": "Dileptons"},
+    "DileptonsExtra": {"table": "AOD/RTDILEPTONEXTRA/0","treename": "DileptonsExtra"}
+    }
+# yapf: enable
+# Trees consumed by the process functions (the input descriptor is generated from the enabled ones)
+EVENT_TREES = ["ReducedEvents", "ReducedEventsExtended"]
+EVENT_VTX_COV_TREES = EVENT_TREES + ["ReducedEventsVtxCov"]
+BARREL_TREES = ["ReducedTracks", "ReducedTracksBarrel", "ReducedTracksBarrelPID"]
+MUON_TREES = ["ReducedMuons", "ReducedMuonsExtra"]
+DILEPTON_TREES = ["Dileptons", "DileptonsExtra"]
+TABLE_READER_CONSUMERS = {
+    "analysis-event-selection": {
+        "processSkimmed": EVENT_TREES
+        },
+    "analysis-track-selection": {
+        "processSkimmed": EVENT_TREES + BARREL_TREES
+        },
+    "analysis-muon-selection": {
+        "processSkimmed": EVENT_TREES + MUON_TREES
+        },
+    "analysis-event-mixing":
+        {
+            "processBarrelSkimmed": EVENT_TREES + BARREL_TREES,
+            "processMuonSkimmed": EVENT_TREES + MUON_TREES,
+            "processBarrelMuonSkimmed": EVENT_TREES + BARREL_TREES + MUON_TREES,
+            "processBarrelVnSkimmed": EVENT_TREES + ["ReducedEventsQvector"] + BARREL_TREES,
+            "processMuonVnSkimmed": EVENT_TREES + ["ReducedEventsQvector"] + MUON_TREES
+            },
+    "analysis-same-event-pairing":
+        {
+            "processJpsiToEESkimmed": EVENT_VTX_COV_TREES + BARREL_TREES + ["ReducedTracksBarrelCov"],
+            "processJpsiToMuMuSkimmed": EVENT_VTX_COV_TREES + MUON_TREES,
+            "processJpsiToMuMuVertexingSkimmed": EVENT_VTX_COV_TREES + MUON_TREES + ["ReducedMuonsCov"],
+            "processVnJpsiToEESkimmed": EVENT_VTX_COV_TREES + ["ReducedEventsQvector"] + BARREL_TREES,
+            "processVnJpsiToMuMuSkimmed": EVENT_VTX_COV_TREES + ["ReducedEventsQvector"] + MUON_TREES,
+            "processElectronMuonSkimmed": EVENT_VTX_COV_TREES + BARREL_TREES + MUON_TREES,
+            "processAllSkimmed": EVENT_VTX_COV_TREES + BARREL_TREES + ["ReducedTracksBarrelCov"] + MUON_TREES
+            },
+    "analysis-dilepton-hadron": {
+        "processSkimmed": EVENT_VTX_COV_TREES + BARREL_TREES + DILEPTON_TREES
+        },
+    }
+# Tables produced in the workflow (not read from the input files if the producer runs)
+TABLE_READER_PRODUCTS = {
+    "analysis-same-event-pairing": DILEPTON_TREES
+    }
+
+# Interface
+TABLE_READER_SCHEMA = [
+    # analysis task selections
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing, analysis-dilepton-hadron",
+        argument(
+            "--analysis", help = "Skimmed process selections for Data Analysis", nargs = "*", type = str, metavar = "ANALYSIS",
+            choices = ANALYSIS_SELECTIONS
+            ),
+        ),
+    # same event pairing process function selection
+    argumentGroup(
+        "Data processor options: analysis-same-event-pairing",
+        argument(
+            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", nargs = "*", type = str, metavar = "PROCESS",
+            choices = SAME_EVENT_PAIRING_PROCESS_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for analysis-same-event-pairing PROCESS_SWITCH options", "--process"),
+    # analysis-event-mixing
+    argumentGroup(
+        "Data processor options: analysis-event-mixing",
+        argument(
+            "--mixing", help = "analysis-event-mixing: PROCESS_SWITCH options", nargs = "*", metavar = "MIXING", type = str,
+            choices = MIXING_SELECTIONS
+            ),
+        ),
+    choiceListGroup("Choice List for analysis-event-mixing PROCESS_SWITCH options", "--mixing"),
+    # cfg for QA
+    argumentGroup(
+        "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing",
+        argument("--cfgQA", help = "If true, fill QA histograms", type = str.lower, choices = BOOLEAN_SELECTIONS),
+        ),
+    # analysis-event-selection
+    argumentGroup(
+        "Data processor options: analysis-event-selection",
+        argument(
+            "--cfgMixingVars", help = "Mixing configs separated by a space", nargs = "*", type = str, metavar = "CFGMIXINGVARS",
+            lib = "allMixing"
+            ),
+        argument(
+            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", type = str, metavar = "CFGEVENTCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-muon-selection
+    argumentGroup(
+        "Data processor options: analysis-muon-selection",
+        argument(
+            "--cfgMuonCuts", help = "Space separated list of muon cuts", nargs = "*", type = str, metavar = "CFGMUONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-track-selection
+    argumentGroup(
+        "Data processor options: analysis-track-selection",
+        argument(
+            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGTRACKCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # analysis-dilepton-hadron
+    argumentGroup(
+        "Data processor options: analysis-dilepton-hadron",
+        argument(
+            "--cfgLeptonCuts", help = "Space separated list of barrel track cuts", nargs = "*", type = str, metavar = "CFGLEPTONCUTS",
+            lib = "allAnalysisCuts"
+            ),
+        ),
+    # Aod Writer - Reader configs
+    argumentGroup(
+        "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer",
+        argument(
+            "--reader",
+            help = "Reader config JSON with path. If not given, the input descriptor is generated with only the trees consumed by the enabled process functions",
+            type = str
+            ),
+        argument("--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", default = WRITER_PATH, type = str),
+        ),
+    ]
 
 
 class TableReader(object):
@@ -39,161 +208,19 @@ class TableReader(object):
         object (parser_args() object): tableReader.cxx Interface
     """
     
-    def __init__(
-        self, parserTableReader = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runTableReader.py <yourConfig.json> --arg value",
-            ), helperOptions = HelperOptions(), dplAodReader = DplAodReader(), dqLibGetter = DQLibGetter()
-        ):
+    def __init__(self, parserTableReader = None, dqLibGetter = None):
         super(TableReader, self).__init__()
         self.parserTableReader = parserTableReader
-        self.helperOptions = helperOptions
-        self.dplAodReader = dplAodReader
-        self.dqLibGetter = dqLibGetter
-        self.parserTableReader.register("action", "none", NoAction)
-        self.parserTableReader.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        readerPath = "configs/readerConfiguration_reducedEvent.json"
-        writerPath = "configs/writerConfiguration_dileptons.json"
-        
-        # Predefined Selections
-        analysisSelections = {
-            "eventSelection": "Run event selection on DQ skimmed events",
-            "muonSelection": "Run muon selection on DQ skimmed muons",
-            "trackSelection": "Run barrel track selection on DQ skimmed tracks",
-            "eventMixing": "Run mixing on skimmed tracks based muon and track selections",
-            "sameEventPairing": "Run same event pairing selection on DQ skimmed data",
-            "dileptonHadron": "Run dilepton-hadron pairing, using skimmed data",
-            }
-        analysisSelectionsList = []
-        for k, v in analysisSelections.items():
-            analysisSelectionsList.append(k)
-        
-        sameEventPairingProcessSelections = {
-            "JpsiToEE": "Run electron-electron pairing, with skimmed tracks",
-            "JpsiToMuMu": "Run muon-muon pairing, with skimmed muons",
-            "JpsiToMuMuVertexing": "Run muon-muon pairing and vertexing, with skimmed muons",
-            "VnJpsiToEE": "Run barrel-barrel vn mixing on skimmed tracks",
-            "VnJpsiToMuMu": "Run muon-muon vn mixing on skimmed tracks",
-            "ElectronMuon": "Run electron-muon pairing, with skimmed tracks/muons",
-            "All": "Run all types of pairing, with skimmed tracks/muons",
-            }
-        sameEventPairingProcessSelectionsList = []
-        for k, v in sameEventPairingProcessSelections.items():
-            sameEventPairingProcessSelectionsList.append(k)
-        
-        booleanSelections = ["true", "false"]
-        
-        mixingSelections = {
-            "Barrel": "Run barrel-barrel mixing on skimmed tracks",
-            "Muon": "Run muon-muon mixing on skimmed muons",
-            "BarrelMuon": "Run barrel-muon mixing on skimmed tracks/muons",
-            "BarrelVn": "Run barrel-barrel vn mixing on skimmed tracks",
-            "MuonVn": "Run muon-muon vn mixing on skimmed tracks",
-            }
-        mixingSelectionsList = []
-        for k, v in mixingSelections.items():
-            mixingSelectionsList.append(k)
-        
-        # Get DQ Analysis Selections from O2-DQ Framework Header Files
-        allAnalysisCuts = self.dqLibGetter.allAnalysisCuts
-        allMixing = self.dqLibGetter.allMixing
-        
-        # Interface
-        
-        # analysis task selections
-        groupAnalysisSelections = self.parserTableReader.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing, analysis-dilepton-hadron"
-            )
-        groupAnalysisSelections.add_argument(
-            "--analysis", help = "Skimmed process selections for Data Analysis", action = "store", nargs = "*", type = str,
-            metavar = "ANALYSIS", choices = analysisSelectionsList,
-            ).completer = ChoicesCompleterList(analysisSelectionsList)
-        
-        for key, value in analysisSelections.items():
-            groupAnalysisSelections.add_argument(key, help = value, action = "none")
-        
-        # same event pairing process function selection
-        groupProcessSEPSelections = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-same-event-pairing")
-        groupProcessSEPSelections.add_argument(
-            "--process", help = "analysis-same-event-pairing: PROCESS_SWITCH options", action = "store", nargs = "*", type = str,
-            metavar = "PROCESS", choices = sameEventPairingProcessSelectionsList,
-            ).completer = ChoicesCompleterList(sameEventPairingProcessSelectionsList)
-        groupProcess = self.parserTableReader.add_argument_group(
-            title = "Choice List for analysis-same-event-pairing PROCESS_SWITCH options"
-            )
-        
-        for key, value in sameEventPairingProcessSelections.items():
-            groupProcess.add_argument(key, help = value, action = "none")
-        
-        # analysis-event-mixing
-        groupAnalysisEventMixing = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-event-mixing")
-        groupAnalysisEventMixing.add_argument(
-            "--mixing", help = "analysis-event-mixing: PROCESS_SWITCH options", nargs = "*", action = "store", metavar = "MIXING",
-            type = str, choices = mixingSelectionsList,
-            ).completer = ChoicesCompleterList(mixingSelectionsList)
-        groupMixing = self.parserTableReader.add_argument_group(title = "Choice List for analysis-event-mixing PROCESS_SWITCH options")
-        for key, value in mixingSelections.items():
-            groupMixing.add_argument(key, help = value, action = "none")
-        
-        # cfg for QA
-        groupQASelections = self.parserTableReader.add_argument_group(
-            title = "Data processor options: analysis-event-selection, analysis-muon-selection, analysis-track-selection, analysis-event-mixing"
-            )
-        groupQASelections.add_argument(
-            "--cfgQA", help = "If true, fill QA histograms", action = "store", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
-        
-        # analysis-event-selection
-        groupAnalysisEventSelection = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-event-selection")
-        groupAnalysisEventSelection.add_argument(
-            "--cfgMixingVars", help = "Mixing configs separated by a space", nargs = "*", action = "store", type = str,
-            metavar = "CFGMIXINGVARS", choices = allMixing,
-            ).completer = ChoicesCompleterList(allMixing)
-        groupAnalysisEventSelection.add_argument(
-            "--cfgEventCuts", help = "Space separated list of event cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGEVENTCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # analysis-muon-selection
-        groupAnalysisMuonSelection = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-muon-selection")
-        groupAnalysisMuonSelection.add_argument(
-            "--cfgMuonCuts", help = "Space separated list of muon cuts", nargs = "*", action = "store", type = str, metavar = "CFGMUONCUTS",
-            choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # analysis-track-selection
-        groupAnalysisTrackSelection = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-track-selection")
-        groupAnalysisTrackSelection.add_argument(
-            "--cfgTrackCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGTRACKCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # analysis-dilepton-hadron
-        groupAnalysisDileptonHadron = self.parserTableReader.add_argument_group(title = "Data processor options: analysis-dilepton-hadron")
-        groupAnalysisDileptonHadron.add_argument(
-            "--cfgLeptonCuts", help = "Space separated list of barrel track cuts", nargs = "*", action = "store", type = str,
-            metavar = "CFGLEPTONCUTS", choices = allAnalysisCuts,
-            ).completer = ChoicesCompleterList(allAnalysisCuts)
-        
-        # Aod Writer - Reader configs
-        groupDPLReader = self.parserTableReader.add_argument_group(
-            title = "Data processor options: internal-dpl-aod-reader, internal-dpl-aod-writer"
-            )
-        groupDPLReader.add_argument(
-            "--reader",
-            help = "Reader config JSON with path. For Standart Analysis use as default, for dilepton analysis change to dilepton JSON config file",
-            action = "store", default = readerPath, type = str
-            )
-        groupDPLReader.add_argument(
-            "--writer", help = "Argument for producing dileptonAOD.root. Set false for disable", action = "store", default = writerPath,
-            type = str
-            )
+        if self.parserTableReader is None:
+            self.parserTableReader = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserTableReader, TABLE_READER_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -202,18 +229,20 @@ class TableReader(object):
         Returns:
             Namespace: returns parse_args()
         """
+        if self.parserTableReader is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserTableReader)
         argcomplete.autocomplete(self.parserTableReader, always_complete_options = False)
         return self.parserTableReader.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserTableReader
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserTableReader
-        self.dplAodReader.addArguments()
-        
-        self.addArguments()
+        schema = mergeSchemas(HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, TABLE_READER_SCHEMA)
+        if self.parserTableReader is None:
+            self.parserTableReader = buildParser("tableReader", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserTableReader, schema, self.dqLibGetter)
@@ -18,21 +18,35 @@
 
 # Orginal Task: https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Tasks/v0selector.cxx
 
-import argparse
-from extramodules.choicesHandler import NoAction
-from extramodules.choicesHandler import ChoicesAction
-from extramodules.helperOptions import HelperOptions
-from extramodules.converters import O2Converters
 import argcomplete
-from commondeps.centralityTable import CentralityTable
-from commondeps.eventSelection import EventSelectionTask
-from commondeps.multiplicityTable import MultiplicityTable
-from commondeps.pidTOFBase import TofEventTime
-from commondeps.pidTOFBeta import TofPidBeta
-from commondeps.pidTPCTOFFull import TpcTofPidFull
-from commondeps.trackPropagation import TrackPropagation
-from commondeps.trackselection import TrackSelectionTask
-from commondeps.dplAodReader import DplAodReader
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments, buildParser, newParser, mergeSchemas
+from extramodules.dqLibGetter import DQLibGetter
+from extramodules.completionTable import updateCompletionTable
+from extramodules.helperOptions import HELPER_OPTIONS_SCHEMA
+from commondeps.dplAodReader import DPL_AOD_READER_SCHEMA
+from commondeps.eventSelection import EVENT_SELECTION_SCHEMA
+from commondeps.trackselection import TRACK_SELECTION_SCHEMA
+from commondeps.trackPropagation import TRACK_PROPAGATION_SCHEMA
+from commondeps.multiplicityTable import MULTIPLICITY_TABLE_SCHEMA
+from commondeps.centralityTable import CENTRALITY_TABLE_SCHEMA
+from commondeps.pidTPCTOFFull import TPC_TOF_PID_FULL_SCHEMA
+from commondeps.pidTOFBase import TOF_EVENT_TIME_SCHEMA
+from commondeps.pidTOFBeta import TOF_PID_BETA_SCHEMA
+from extramodules.converters import O2_CONVERTERS_SCHEMA
+
+PARSER_DESCRIPTION = "Example Usage: ./runV0selector.py <yourConfig.json> --arg value"
+
+# Interface
+V0_SELECTOR_SCHEMA = [
+    argumentGroup(
+        "Data processor options: v0-selector", argument("--d_bz_input", help = "bz field in kG, -999 is automatic", type = str),
+        argument("--v0cospa", help = "v0cospa", type = str), argument("--dcav0dau", help = "DCA V0 Daughters", type = str),
+        argument("--v0Rmin", help = "v0Rmin", type = str), argument("--v0Rmax", help = "v0Rmax", type = str),
+        argument("--dcamin", help = "dcamin", type = str), argument("--dcamax", help = "dcamax", type = str),
+        argument("--mincrossedrows", help = "Min crossed rows", type = str),
+        argument("--maxchi2tpc", help = "max chi2/NclsTPC", type = str),
+        ),
+    ]
 
 
 class V0selector(object):
@@ -44,46 +58,19 @@ class V0selector(object):
         object (parser_args() object): v0selector.cxx Interface
     """
     
-    def __init__(
-        self, parserV0selector = argparse.ArgumentParser(
-            formatter_class = argparse.ArgumentDefaultsHelpFormatter,
-            description = "Example Usage: ./runV0selector.py <yourConfig.json> --arg value"
-            ), eventSelection = EventSelectionTask(), centralityTable = CentralityTable(), multiplicityTable = MultiplicityTable(),
-        tofEventTime = TofEventTime(), tofPidBeta = TofPidBeta(), tpcTofPidFull = TpcTofPidFull(), trackPropagation = TrackPropagation(),
-        trackSelection = TrackSelectionTask(), helperOptions = HelperOptions(), o2Converters = O2Converters(), dplAodReader = DplAodReader()
-        ):
+    def __init__(self, parserV0selector = None, dqLibGetter = None):
         super(V0selector, self).__init__()
         self.parserV0selector = parserV0selector
-        self.eventSelection = eventSelection
-        self.centralityTable = centralityTable
-        self.multiplicityTable = multiplicityTable
-        self.tofEventTime = tofEventTime
-        self.tofPidBeta = tofPidBeta
-        self.tpcTofPidFull = tpcTofPidFull
-        self.trackPropagation = trackPropagation
-        self.trackSelection = trackSelection
-        self.helperOptions = helperOptions
-        self.o2Converters = o2Converters
-        self.dplAodReader = dplAodReader
-        self.parserV0selector.register("action", "none", NoAction)
-        self.parserV0selector.register("action", "store_choice", ChoicesAction)
+        self.dqLibGetter = dqLibGetter if dqLibGetter is not None else DQLibGetter()
     
     def addArguments(self):
         """
         This function allows to add arguments for parser_args() function
         """
         
-        # Interface
-        groupV0Selector = self.parserV0selector.add_argument_group(title = "Data processor options: v0-selector")
-        groupV0Selector.add_argument("--d_bz_input", help = "bz field in kG, -999 is automatic", action = "store", type = str)
-        groupV0Selector.add_argument("--v0cospa", help = "v0cospa", action = "store", type = str)
-        groupV0Selector.add_argument("--dcav0dau", help = "DCA V0 Daughters", action = "store", type = str)
-        groupV0Selector.add_argument("--v0Rmin", help = "v0Rmin", action = "store", type = str)
-        groupV0Selector.add_argument("--v0Rmax", help = "v0Rmax", action = "store", type = str)
-        groupV0Selector.add_argument("--dcamin", help = "dcamin", action = "store", type = str)
-        groupV0Selector.add_argument("--dcamax", help = "dcamax", action = "store", type = str)
-        groupV0Selector.add_argument("--mincrossedrows", help = "Min crossed rows", action = "store", type = str)
-        groupV0Selector.add_argument("--maxchi2tpc", help = "max chi2/NclsTPC", action = "store", type = str)
+        if self.parserV0selector is None:
+            self.parserV0selector = newParser(PARSER_DESCRIPTION)
+        addSchemaArguments(self.parserV0selector, V0_SELECTOR_SCHEMA, self.dqLibGetter)
     
     def parseArgs(self):
         """
@@ -93,45 +80,24 @@ class V0selector(object):
             Namespace: returns parse_args()
         """
         
+        if self.parserV0selector is None:
+            self.mergeArgs()
+        updateCompletionTable(self.parserV0selector)
         argcomplete.autocomplete(self.parserV0selector, always_complete_options = False)
         return self.parserV0selector.parse_args()
     
     def mergeArgs(self):
         """
-        This function allows to merge parser_args argument information from different classes
+        This function allows to merge parser_args argument information from different classes.
+        The merged parser is built from the schemas once per process and cached
         """
         
-        self.helperOptions.parserHelperOptions = self.parserV0selector
-        self.helperOptions.addArguments()
-        
-        self.dplAodReader.parserDplAodReader = self.parserV0selector
-        self.dplAodReader.addArguments()
-        
-        self.eventSelection.parserEventSelectionTask = self.parserV0selector
-        self.eventSelection.addArguments()
-        
-        self.trackSelection.parserTrackSelectionTask = self.parserV0selector
-        self.trackSelection.addArguments()
-        
-        self.trackPropagation.parserTrackPropagation = self.parserV0selector
-        self.trackPropagation.addArguments()
-        
-        self.multiplicityTable.parserMultiplicityTable = self.parserV0selector
-        self.multiplicityTable.addArguments()
-        
-        self.centralityTable.parserCentralityTable = self.parserV0selector
-        self.centralityTable.addArguments()
-        
-        self.tpcTofPidFull.parserTpcTofPidFull = self.parserV0selector
-        self.tpcTofPidFull.addArguments()
-        
-        self.tofEventTime.parserTofEventTime = self.parserV0selector
-        self.tofEventTime.addArguments()
-        
-        self.tofPidBeta.parserTofPidBeta = self.parserV0selector
-        self.tofPidBeta.addArguments()
-        
-        self.o2Converters.parserO2Converters = self.parserV0selector
-        self.o2Converters.addArguments()
-        
-        self.addArguments()
+        schema = mergeSchemas(
+            HELPER_OPTIONS_SCHEMA, DPL_AOD_READER_SCHEMA, EVENT_SELECTION_SCHEMA, TRACK_SELECTION_SCHEMA, TRACK_PROPAGATION_SCHEMA,
+            MULTIPLICITY_TABLE_SCHEMA, CENTRALITY_TABLE_SCHEMA, TPC_TOF_PID_FULL_SCHEMA, TOF_EVENT_TIME_SCHEMA, TOF_PID_BETA_SCHEMA,
+            O2_CONVERTERS_SCHEMA, V0_SELECTOR_SCHEMA
+            )
+        if self.parserV0selector is None:
+            self.parserV0selector = buildParser("v0selector", schema, PARSER_DESCRIPTION, self.dqLibGetter)
+        else:
+            addSchemaArguments(self.parserV0selector, schema, self.dqLibGetter)
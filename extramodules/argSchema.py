@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the engine of the declarative argument schemas of the interfaces.
+# A schema is a list of argument groups (plain dicts, see argumentGroup, argument and choiceListGroup):
+#   {"title": <group title>, "args": [<argument>, ...]}
+#   {"title": <group title>, "choicesOf": <option>} -> separate group listing the choice descriptions of an option
+# An argument holds add_argument() keyword arguments with the option strings in "flags" and these extra keys:
+#   "choices": list, or dict (choice -> description, descriptions are listed in help after the option if no group lists them)
+#   "lib": name of a DQ library selection list of DQLibGetter (e.g. "allAnalysisCuts"), used as lazy choices
+# Completers are derived from the choices: FilterSelsCompleter for allSels, ChoicesCompleterList for options with nargs "*"/"+",
+# ChoicesCompleter otherwise
+
+import argparse
+from argcomplete.completers import ChoicesCompleter
+from extramodules.choicesHandler import ChoicesCompleterList, ChoicesHelp, LazyChoicesHelpFormatter
+from extramodules.filterSelsGrammar import FilterSelsCompleter
+
+BOOLEAN_SELECTIONS = ["true", "false"]
+SCHEMA_KEYS = ["flags", "choices", "lib"] # argument keys which are not passed to add_argument() as is
+PARSER_CACHE = {} # entry point name -> merged parser
+
+
+def argument(*flags, **options):
+    """Schema argument
+
+    Args:
+        flags (str): Option strings
+        options (dict): add_argument() keyword arguments, choices (list or dict with descriptions) or lib (DQ library selection list)
+
+    Returns:
+        dict: Schema argument
+    """
+    
+    return dict(flags = list(flags), **options)
+
+
+def argumentGroup(title: str, *arguments):
+    """Schema argument group
+
+    Args:
+        title (str): Group title
+        arguments (dict): Schema arguments
+
+    Returns:
+        dict: Schema argument group
+    """
+    
+    return {
+        "title": title,
+        "args": list(arguments)
+        }
+
+
+def choiceListGroup(title: str, option: str):
+    """Schema group which lists the choice descriptions of an option
+
+    Args:
+        title (str): Group title
+        option (str): Option with choice descriptions (dict choices)
+
+    Returns:
+        dict: Schema choice list group
+    """
+    
+    return {
+        "title": title,
+        "choicesOf": option
+        }
+
+
+def mergeSchemas(*schemas):
+    """Merges the schemas of the interfaces of an entry point, groups keep the given order
+
+    Args:
+        schemas (list): Argument schemas
+
+    Returns:
+        list: Merged argument schema
+    """
+    
+    return [group for schema in schemas for group in schema]
+
+
+def schemaChoices(argument: dict, dqLibGetter = None):
+    """Choices of a schema argument
+
+    Args:
+        argument (dict): Schema argument
+        dqLibGetter (DQLibGetter, optional): Provider of the DQ library selections. Defaults to None.
+
+    Raises:
+        ValueError: If the argument refers to a DQ library without a DQLibGetter
+
+    Returns:
+        list or None: Choices (lazy list for DQ library selections)
+    """
+    
+    if "lib" in argument:
+        if dqLibGetter is None:
+            raise ValueError(argument["flags"][0] + " uses DQ library selections " + argument["lib"] + ", DQLibGetter is required")
+        return getattr(dqLibGetter, argument["lib"])
+    choices = argument.get("choices")
+    if isinstance(choices, dict):
+        return list(choices)
+    return choices
+
+
+def schemaCompleter(argument: dict, choices):
+    """TAB autocompletion completer of a schema argument
+
+    Args:
+        argument (dict): Schema argument
+        choices (list): Choices of the argument
+
+    Returns:
+        object: argcomplete completer
+    """
+    
+    if argument.get("lib") == "allSels":
+        return FilterSelsCompleter(choices)
+    if argument.get("nargs") in ["*", "+"]:
+        return ChoicesCompleterList(choices)
+    return ChoicesCompleter(choices)
+
+
+def addSchemaArguments(parser: argparse.ArgumentParser, schema: list, dqLibGetter = None):
+    """Adds the argument groups of a schema to a parser
+
+    Args:
+        parser (argparse.ArgumentParser): Parser
+        schema (list): Argument schema (list of argument groups)
+        dqLibGetter (DQLibGetter, optional): Provider of the DQ library selections. Defaults to None.
+    """
+    
+    listedChoices = {group["choicesOf"]
+                     for group in schema
+                     if "choicesOf" in group}
+    choiceDescriptions = {} # option -> choice descriptions
+    for group in schema:
+        if "choicesOf" in group:
+            parser.add_argument_group(title = group["title"], description = ChoicesHelp(choiceDescriptions[group["choicesOf"]]))
+            continue
+        parserGroup = parser.add_argument_group(title = group["title"])
+        for schemaArgument in group["args"]:
+            kwargs = {
+                key: value
+                for key, value in schemaArgument.items()
+                if key not in SCHEMA_KEYS
+                }
+            choices = schemaChoices(schemaArgument, dqLibGetter)
+            if choices is not None:
+                kwargs["choices"] = choices
+            action = parserGroup.add_argument(*schemaArgument["flags"], **kwargs)
+            if choices is not None:
+                action.completer = schemaCompleter(schemaArgument, choices)
+            if isinstance(schemaArgument.get("choices"), dict):
+                option = schemaArgument["flags"][0]
+                choiceDescriptions[option] = schemaArgument["choices"]
+                if option not in listedChoices:
+                    action.choicesHelp = ChoicesHelp(schemaArgument["choices"])
+
+
+def newParser(description: str):
+    """Empty parser of an entry point with the help formatter of the lazy choices
+
+    Args:
+        description (str): Parser description
+
+    Returns:
+        argparse.ArgumentParser: Parser
+    """
+    
+    return argparse.ArgumentParser(formatter_class = LazyChoicesHelpFormatter, description = description)
+
+
+def buildParser(name: str, schema: list, description: str, dqLibGetter = None):
+    """Builds the parser of an entry point from its merged schema. Parsers are cached,
+    so an entry point is built only once per process
+
+    Args:
+        name (str): Entry point name (cache key)
+        schema (list): Merged argument schema
+        description (str): Parser description
+        dqLibGetter (DQLibGetter, optional): Provider of the DQ library selections. Defaults to None.
+
+    Returns:
+        argparse.ArgumentParser: Parser
+    """
+    
+    if name not in PARSER_CACHE:
+        parser = newParser(description)
+        addSchemaArguments(parser, schema, dqLibGetter)
+        PARSER_CACHE[name] = parser
+    return PARSER_CACHE[name]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the phase hooks of the startup benchmark, they run in the benchmarked interpreter.
+# Only light modules are imported here, so the hooks do not shift import time between phases
+
+import os
+import sys
+import time
+import shlex
+import runpy
+import logging
+import resource
+import importlib
+from extramodules.completionTable import ENTRY_POINTS, PACKAGE_PATH
+from extramodules.dqLibGetter import DQLibGetter
+
+STUB_FOLDER = "stubs" # o2-* stubs in the scratch work directory
+STUB_EXECUTABLE = "#!/bin/sh\n# o2 stub of the DQ startup benchmark\nexit 0\n"
+
+
+class PhaseTimer(object):
+    
+    """
+    Attributes wall time to the innermost active phase. Background phases follow each other
+    (imports -> ... -> commandAssembly), hooked calls are nested phases on top of them
+
+    Args:
+        object (object): self
+    """
+    
+    def __init__(self, phase = "imports"):
+        self.times = {}
+        self.peakRssKb = {}
+        self.stack = [phase]
+        self.last = time.perf_counter()
+        self.start = self.last
+    
+    def switch(self):
+        """Books the elapsed time to the active phase"""
+        
+        now = time.perf_counter()
+        phase = self.stack[-1]
+        self.times[phase] = self.times.get(phase, 0.0) + now - self.last
+        self.peakRssKb[phase] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.last = now
+    
+    def background(self, phase: str):
+        """Continues with the next background phase
+
+        Args:
+            phase (str): Phase name
+        """
+        
+        self.switch()
+        self.stack[0] = phase
+    
+    def enter(self, phase: str):
+        """Starts a nested phase
+
+        Args:
+            phase (str): Phase name
+        """
+        
+        self.switch()
+        self.stack.append(phase)
+    
+    def exit(self):
+        """Ends the innermost nested phase"""
+        
+        self.switch()
+        self.stack.pop()
+    
+    def wrap(self, function, phase: str, after = None):
+        """Wraps a function, its calls are booked to a phase
+
+        Args:
+            function (callable): Function to wrap
+            phase (str): Phase name
+            after (str, optional): Background phase which follows the call. Defaults to None.
+
+        Returns:
+            callable: Wrapped function
+        """
+        
+        timer = self
+        
+        def wrapped(*args, **kwargs):
+            timer.enter(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timer.exit()
+                if after is not None:
+                    timer.background(after)
+        
+        return wrapped
+    
+    def total(self):
+        """Wall time since the timer was created
+
+        Returns:
+            float: Seconds
+        """
+        
+        return time.perf_counter() - self.start
+
+
+def createStubs(command: str, stubDir: str):
+    """Creates stub executables for the o2-* executables of a command
+
+    Args:
+        command (str): Command to run
+        stubDir (str): Directory of the stubs (first in PATH)
+    """
+    
+    for word in shlex.split(command.replace("|", " ")):
+        if word.startswith("o2-") and not os.path.exists(os.path.join(stubDir, word)):
+            with open(os.path.join(stubDir, word), "w") as f:
+                f.write(STUB_EXECUTABLE)
+            os.chmod(os.path.join(stubDir, word), 0o755)
+
+
+def runInstrumented(scriptName: str, scriptArgs: list, stubDir: str):
+    """Runs a run script in this interpreter with phase hooks (child side of the benchmark)
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+        scriptArgs (list): Arguments of the run script
+        stubDir (str): Directory of the o2-* stubs
+
+    Returns:
+        dict: Exclusive phase times (s), peak RSS per phase (kB), commands and exit code
+    """
+    
+    timer = PhaseTimer()
+    moduleName, className, parserName = ENTRY_POINTS[scriptName]
+    interface = getattr(importlib.import_module(moduleName), className)
+    interface.mergeArgs = timer.wrap(interface.mergeArgs, "mergeArgs")
+    interface.parseArgs = timer.wrap(interface.parseArgs, "parseArgs", after = "configRewrite")
+    DQLibGetter.load = timer.wrap(DQLibGetter.load, "dqLibParse")
+    # generated JSON files are written with writeArtifact and the descriptor generators imported by the run scripts
+    runArtifacts = importlib.import_module("extramodules.runArtifacts")
+    configSetter = importlib.import_module("extramodules.configSetter")
+    runArtifacts.writeArtifact = timer.wrap(runArtifacts.writeArtifact, "jsonDump", after = "commandAssembly")
+    configSetter.generateDescriptors = timer.wrap(configSetter.generateDescriptors, "jsonDump", after = "commandAssembly")
+    configSetter.generateReaderDescriptor = timer.wrap(configSetter.generateReaderDescriptor, "jsonDump")
+    
+    commands = []
+    
+    def stubbedWorkflow(function):
+        
+        def wrapper(command, *args, **kwargs):
+            createStubs(command, stubDir)
+            commands.append(command)
+            timer.enter("workflow")
+            try:
+                return function(command, *args, **kwargs)
+            finally:
+                timer.exit()
+        
+        return wrapper
+    
+    os.system = stubbedWorkflow(os.system) # older run scripts execute the workflow with os.system
+    try:
+        workflowRunner = importlib.import_module("extramodules.workflowRunner")
+        workflowRunner.runWorkflow = stubbedWorkflow(workflowRunner.runWorkflow)
+    except ImportError:
+        pass
+    exitCode = 0
+    sys.argv = [os.path.join(PACKAGE_PATH, scriptName)] + scriptArgs
+    try:
+        runpy.run_path(sys.argv[0], run_name = "__main__")
+    except SystemExit as e:
+        exitCode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        logging.exception("%s failed", scriptName)
+        exitCode = 1
+    timer.switch()
+    return {
+        "times": timer.times,
+        "total": timer.total(),
+        "peakRssKb": timer.peakRssKb,
+        "maxRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "commands": commands,
+        "exitCode": exitCode
+        }
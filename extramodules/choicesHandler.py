@@ -35,6 +35,58 @@ class NoAction(argparse.Action):
         pass
 
 
+class LazyChoicesHelpFormatter(argparse.ArgumentDefaultsHelpFormatter):
+    
+    """
+    Help formatter which expands the choices of an argument only if its help message uses %(choices)s,
+    so printing the help message does not load lazy DQ library selections
+
+    Args:
+        argparse (Class): ArgumentDefaultsHelpFormatter
+    """
+    
+    def _expand_help(self, action):
+        if action.choices is not None and "%(choices)" not in self._get_help_string(action):
+            choices = action.choices
+            action.choices = None
+            try:
+                return super()._expand_help(action)
+            finally:
+                action.choices = choices
+        return super()._expand_help(action)
+    
+    def add_argument(self, action):
+        super().add_argument(action)
+        self.addChoicesHelp(getattr(action, "choicesHelp", None))
+    
+    def add_text(self, text):
+        if isinstance(text, ChoicesHelp):
+            self.addChoicesHelp(text)
+        else:
+            super().add_text(text)
+    
+    def addChoicesHelp(self, choicesHelp):
+        """Lists choice descriptions like positional arguments
+
+        Args:
+            choicesHelp (ChoicesHelp): Choice descriptions
+        """
+        
+        for choice, description in (choicesHelp or {}).items():
+            super().add_argument(argparse.Action(option_strings = [], dest = choice, help = description))
+
+
+class ChoicesHelp(dict):
+    
+    """
+    ChoicesHelp class holds choice -> description pairs of an argument.
+    They are listed in help messages after the argument, or as the description of an argument group
+
+    Args:
+        dict (dict): Choice descriptions
+    """
+
+
 class ChoicesAction(argparse._StoreAction):
     
     """
@@ -65,7 +117,7 @@ class ChoicesCompleterList(object):
     """
     
     def __init__(self, choices):
-        self.choices = list(choices)
+        self.choices = choices # not copied, lazy DQ library selections are resolved only when TAB is pressed
     
     def __call__(self, **kwargs):
-        return self.choices
+        return list(self.choices)
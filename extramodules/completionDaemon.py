@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes a per-user completion daemon. It keeps the completion tables of all run scripts in memory
+# and answers TAB autocompletion queries of argcompleteDaemon.sh over a Unix domain socket.
+# Request: NUL terminated fields (see REQUEST_FIELDS). Reply: "0\n" + completions joined by IFS, "1\n" if the query can not be answered
+
+import os
+import time
+import socket
+import logging
+import tempfile
+import socketserver
+import multiprocessing
+from extramodules.completionTable import ENTRY_POINTS, buildCompletionTable, buildEntryPointParser, sourceStats, completeFromTable, splitCommandLine, formatCompletions
+
+REQUEST_FIELDS = ["script", "workDir", "argcomplete", "compLine", "compPoint", "wordBreaks", "ifs"]
+RELOAD_CHECK_INTERVAL = 1.0 # seconds between two staleness checks of a table
+MAX_REQUEST_SIZE = 65536
+
+
+def daemonSocketPath():
+    """Per-user socket path of the completion daemon (same rule as argcompleteDaemon.sh)
+
+    Returns:
+        str: Unix domain socket path
+    """
+    
+    runtimeDir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtimeDir, "dq-completion-" + str(os.getuid()) + ".sock")
+
+
+def daemonPidPath():
+    """Pid file of the completion daemon
+
+    Returns:
+        str: Pid file path
+    """
+    
+    return daemonSocketPath() + ".pid"
+
+
+def isDaemonRunning(socketPath: str):
+    """Checks whether a completion daemon accepts connections on the socket
+
+    Args:
+        socketPath (str): Unix domain socket path
+
+    Returns:
+        bool: True if the daemon is running
+    """
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socketPath)
+        except OSError:
+            return False
+    return True
+
+
+def buildEntryPointTable(scriptName: str, workDir: str):
+    """Builds the completion table of an entry point in a working directory.
+    Runs in a freshly spawned interpreter, so edited dqtasks modules are imported again
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+        workDir (str): Working directory of the DQ libraries
+
+    Returns:
+        dict: Completion table
+    """
+    
+    os.chdir(workDir)
+    return buildCompletionTable(buildEntryPointParser(scriptName), scriptName)
+
+
+class CompletionDaemon(object):
+    
+    """
+    Keeps completion tables of the run scripts per working directory and reloads them when the
+    dqtasks/commondeps/extramodules sources or the temp DQ libraries change
+
+    Args:
+        object (object): self
+    """
+    
+    def __init__(self, socketPath = None):
+        self.socketPath = socketPath or daemonSocketPath()
+        self.tables = {} # (workDir, script) -> completion table
+        self.lastChecks = {} # (workDir, script) -> monotonic time of the last staleness check
+        self.spawnContext = multiprocessing.get_context("spawn")
+    
+    def getTable(self, scriptName: str, workDir: str):
+        """Returns the in-memory completion table, rebuilds it if a source or a DQ library has changed
+
+        Args:
+            scriptName (str): Entry point e.g. runTableMaker.py
+            workDir (str): Working directory of the client
+
+        Returns:
+            dict: Completion table
+        """
+        
+        key = (workDir, scriptName)
+        now = time.monotonic()
+        table = self.tables.get(key)
+        if table is not None and now - self.lastChecks[key] < RELOAD_CHECK_INTERVAL:
+            return table
+        if table is None or table["stats"] != sourceStats(scriptName, workDir):
+            logging.info("Loading completion table of %s for %s", scriptName, workDir)
+            with self.spawnContext.Pool(1) as pool:
+                table = pool.apply(buildEntryPointTable, (scriptName, workDir))
+            self.tables[key] = table
+        self.lastChecks[key] = now
+        return table
+    
+    def complete(self, request: dict):
+        """Answers a completion request
+
+        Args:
+            request (dict): Request fields (see REQUEST_FIELDS)
+
+        Returns:
+            str: Completions joined by the client IFS
+        """
+        
+        scriptName = os.path.basename(request["script"])
+        if scriptName not in ENTRY_POINTS:
+            raise KeyError(scriptName + " is not a DQ run script")
+        table = self.getTable(scriptName, request["workDir"])
+        words, prefix = splitCommandLine(request["compLine"], int(request["compPoint"]))
+        words = words[int(request["argcomplete"]):]
+        completions = completeFromTable(table, words, prefix, request["workDir"])
+        completions = formatCompletions(completions, prefix, request["wordBreaks"], appendSpace = False)
+        return request["ifs"].join(completions)
+    
+    def handle(self, connection):
+        """Reads one request from a client connection and sends the reply
+
+        Args:
+            connection (socket.socket): Client connection
+        """
+        
+        data = b""
+        while data.count(b"\0") < len(REQUEST_FIELDS) and len(data) < MAX_REQUEST_SIZE:
+            chunk = connection.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        try:
+            request = dict(zip(REQUEST_FIELDS, data.decode().split("\0")))
+            if len(request) < len(REQUEST_FIELDS):
+                raise ValueError("Incomplete completion request")
+            reply = "0\n" + self.complete(request)
+        except Exception:
+            logging.exception("Completion request can not be answered, client falls back to python")
+            reply = "1\n"
+        connection.sendall(reply.encode())
+    
+    def serve(self):
+        """Listens on the per-user socket until the daemon is stopped"""
+        
+        if os.path.exists(self.socketPath):
+            if isDaemonRunning(self.socketPath):
+                logging.error("Completion daemon is already running on %s", self.socketPath)
+                return
+            os.remove(self.socketPath) # stale socket of a killed daemon
+        
+        daemon = self
+        
+        class RequestHandler(socketserver.BaseRequestHandler):
+            
+            def handle(self):
+                daemon.handle(self.request)
+        
+        oldUmask = os.umask(0o077) # socket is only accessible by the user
+        try:
+            server = socketserver.UnixStreamServer(self.socketPath, RequestHandler)
+        finally:
+            os.umask(oldUmask)
+        with open(daemonPidPath(), "w") as f:
+            f.write(str(os.getpid()))
+        logging.info("Completion daemon is listening on %s", self.socketPath)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            for path in [self.socketPath, daemonPidPath()]:
+                if os.path.exists(path):
+                    os.remove(path)
+            logging.info("Completion daemon stopped")
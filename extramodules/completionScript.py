@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes a generator for static bash/zsh completion functions of the run scripts.
+# All choices and DQ library selections are inlined, so no python process is started per TAB press
+
+import os
+import shlex
+from extramodules.completionTable import ENTRY_POINTS, buildCompletionTable, buildEntryPointParser
+from extramodules.filterSelsGrammar import SELS_MULTIPLICITIES
+
+COMPLETION_SCRIPT_FILE = "tempDQCompletion.sh"
+
+SHELL_HEADER = """# Static TAB autocompletion for DQ run scripts (bash, or zsh with bashcompinit).
+# Generated by BuildCompletionTables.py / DownloadLibs.py, do not edit. Usage: source {fileName}
+
+if [[ -n "${{ZSH_VERSION-}}" ]]; then
+    autoload -U +X bashcompinit && bashcompinit
+fi
+
+# Splits the command line up to the cursor ($1: index of the first argument),
+# sets cur (word under the cursor), option (last option) and nValues (values typed after it)
+__dq_parse_line() {{
+    [[ -n "${{ZSH_VERSION-}}" ]] && setopt localoptions ksharrays
+    local line="${{COMP_LINE:0:COMP_POINT}}"
+    local words i last
+    if [[ -n "${{ZSH_VERSION-}}" ]]; then
+        read -r -A words <<< "$line"
+    else
+        read -r -a words <<< "$line"
+    fi
+    last=${{#words[@]}}
+    cur=""
+    if [[ -n "$line" && "${{line: -1}}" != [[:space:]] ]]; then
+        last=$((last - 1))
+        cur="${{words[last]}}"
+    fi
+    option=""
+    nValues=0
+    for ((i = $1; i < last; i++)); do
+        case "${{words[i]}}" in
+            -*) option="${{words[i]}}"; nValues=0;;
+            *) nValues=$((nValues + 1));;
+        esac
+    done
+}}
+
+# Sets COMPREPLY to the candidates ($1) matching cur, the part before a ":" or "=" word break is trimmed like bash expects
+__dq_reply() {{
+    [[ -n "${{ZSH_VERSION-}}" ]] && setopt localoptions shwordsplit ksharrays
+    local IFS=$' \\t\\n'
+    local wordBreak stem
+    COMPREPLY=( $(compgen -W "$1" -- "$cur") )
+    for wordBreak in ":" "="; do
+        if [[ "$cur" == *"$wordBreak"* && "$COMP_WORDBREAKS" == *"$wordBreak"* ]]; then
+            stem="${{cur%"${{cur##*"$wordBreak"}}"}}"
+            COMPREPLY=( "${{COMPREPLY[@]#"$stem"}}" )
+        fi
+    done
+    if [[ ${{#COMPREPLY[@]}} == 1 && "${{COMPREPLY[0]}}" == *[:=/] ]]; then
+        type compopt >/dev/null 2>&1 && compopt -o nospace
+    fi
+}}
+
+# d-q-filter-p-p-task selections <track-cut>:[<pair-cut>]:<n> ($1: analysis cuts, $2: pair cuts, $3: extra selections)
+__dq_sels() {{
+    [[ -n "${{ZSH_VERSION-}}" ]] && setopt localoptions shwordsplit ksharrays
+    local candidates="$3" cut="${{cur%%:*}}" rest="${{cur#*:}}" pairCut item n
+    if [[ "$cur" != *:* ]]; then
+        for item in $1; do candidates+=" $item:"; done
+    elif [[ " $1 " == *" $cut "* ]]; then
+        if [[ "$rest" != *:* ]]; then
+            for n in {multiplicities}; do candidates+=" $cut::$n"; done
+            for item in $2; do candidates+=" $cut:$item:"; done
+        else
+            pairCut="${{rest%%:*}}"
+            if [[ -z "$pairCut" || " $2 " == *" $pairCut "* ]]; then
+                for n in {multiplicities}; do candidates+=" $cut:$pairCut:$n"; done
+            fi
+        fi
+    fi
+    __dq_reply "$candidates"
+}}
+"""
+
+SHELL_DISPATCHER = """
+# python3 <run script> ... or ./<run script> ...
+_dq_complete() {{
+    [[ -n "${{ZSH_VERSION-}}" ]] && setopt localoptions ksharrays
+    local script="${{COMP_WORDS[0]##*/}}" offset=1
+    if [[ "$script" == python* ]]; then
+        script="${{COMP_WORDS[1]##*/}}"
+        offset=2
+    fi
+    COMPREPLY=()
+    case "$script" in
+{cases}
+    esac
+}}
+complete -o default -F _dq_complete python python3 {scripts}
+"""
+
+
+def shellWords(words):
+    """Quotes a word list as a single shell word, duplicates are dropped (compgen does not remove them)
+
+    Args:
+        words (list): Words
+
+    Returns:
+        str: Quoted, space separated words
+    """
+    
+    return shlex.quote(" ".join(dict.fromkeys(words)))
+
+
+def shellFunctionName(scriptName: str):
+    """Name of the completion function of an entry point
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        str: Shell function name e.g. _dq_runTableMaker
+    """
+    
+    return "_dq_" + os.path.splitext(os.path.basename(scriptName))[0]
+
+
+def nargsCondition(nargs):
+    """Shell condition which is true while the active option still takes values
+
+    Args:
+        nargs (int, str or None): argparse nargs
+
+    Returns:
+        str: Shell condition prefix (empty if the option takes any number of values)
+    """
+    
+    if nargs is None or nargs == "?":
+        return "[[ $nValues -lt 1 ]] && "
+    if isinstance(nargs, int):
+        return "[[ $nValues -lt " + str(nargs) + " ]] && "
+    return ""
+
+
+def generateScriptFunction(scriptName: str, table: dict, libVariables: dict):
+    """Generates the completion function of an entry point from its completion table
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+        table (dict): Completion table
+        libVariables (dict): DQ library list name -> shell variable name
+
+    Returns:
+        str: Shell function
+    """
+    
+    options = [option for option, entry in table["options"].items() if entry["help"] is not None]
+    cases = []
+    for option, entry in table["options"].items():
+        if entry["nargs"] == 0:
+            continue
+        condition = nargsCondition(entry["nargs"])
+        if "sels" in entry:
+            analysisCuts, pairCuts = (libVariables[name] for name in entry["sels"])
+            action = '__dq_sels "$' + analysisCuts + '" "$' + pairCuts + '" ' + shellWords(entry["choices"])
+        elif "lib" in entry:
+            action = '__dq_reply "$' + libVariables[entry["lib"]] + '"'
+        elif "choices" in entry:
+            action = "__dq_reply " + shellWords(entry["choices"])
+        else:
+            continue
+        cases.append("        " + option + ") " + condition + action + ";;")
+    
+    return "\n".join(
+        [
+            "",
+            shellFunctionName(scriptName) +
+            "() {", "    local cur option nValues", '    __dq_parse_line "$1"', '    case "$cur" in', "        -*) __dq_reply " +
+            shellWords(options) + "; return;;", "    esac", '    case "$option" in',
+            ] + cases + ["    esac", "}",]
+        )
+
+
+def generateCompletionScript(tables: dict, fileName = COMPLETION_SCRIPT_FILE):
+    """Generates the static completion script of all entry points
+
+    Args:
+        tables (dict): Entry point -> completion table
+        fileName (str, optional): Name of the generated script (shown in usage). Defaults to COMPLETION_SCRIPT_FILE.
+
+    Returns:
+        str: bash/zsh completion script
+    """
+    
+    script = [SHELL_HEADER.format(fileName = fileName, multiplicities = " ".join(SELS_MULTIPLICITIES))]
+    
+    # DQ library lists are shared by the entry points, each distinct list is inlined once
+    libContents = {}
+    for table in tables.values():
+        for name, selections in table["libs"].items():
+            key = (name, tuple(selections))
+            if key not in libContents:
+                libContents[key] = "__dq_lib_" + name + "_" + str(len(libContents))
+                script.append(libContents[key] + "=" + shellWords(selections))
+    for scriptName, table in tables.items():
+        libVariables = {
+            name: libContents[(name, tuple(selections))]
+            for name, selections in table["libs"].items()
+            }
+        script.append(generateScriptFunction(scriptName, table, libVariables))
+    
+    cases = ["        " + scriptName + ") " + shellFunctionName(scriptName) + ' "$offset";;' for scriptName in tables]
+    script.append(SHELL_DISPATCHER.format(cases = "\n".join(cases), scripts = " ".join(tables)))
+    return "\n".join(script)
+
+
+def writeCompletionScript(tables = None, fileName = COMPLETION_SCRIPT_FILE):
+    """Writes the static completion script of the entry points
+
+    Args:
+        tables (dict, optional): Entry point -> completion table. Defaults to the tables of all entry points built from their merged parsers.
+        fileName (str, optional): Output file. Defaults to COMPLETION_SCRIPT_FILE.
+
+    Returns:
+        str: Output file
+    """
+    
+    if tables is None:
+        tables = {
+            scriptName: buildCompletionTable(buildEntryPointParser(scriptName), scriptName)
+            for scriptName in ENTRY_POINTS
+            }
+    with open(fileName, "w") as f:
+        f.write(generateCompletionScript(tables, os.path.basename(fileName)))
+    return fileName
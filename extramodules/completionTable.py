@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes precompiled completion tables for TAB autocompletion.
+# The tables are built once from the merged parsers and answer argcomplete requests
+# without importing the dqtasks classes (keep the imports of this module light)
+
+import os
+import sys
+import json
+import shlex
+import argparse
+import importlib
+from extramodules.dqLibGetter import DQ_LIBS
+from extramodules.filterSelsGrammar import FilterSelsChoices, FilterSelsCompleter
+
+COMPLETION_TABLES_DIR = "tempCompletionTables"
+COMPLETION_TABLE_VERSION = 1
+PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_FOLDERS = ["dqtasks", "commondeps", "extramodules"]
+
+# Entry point -> (interface module, interface class, parser attribute)
+ENTRY_POINTS = {
+    "runTableMaker.py": ("dqtasks.tableMaker", "TableMaker", "parserTableMaker"),
+    "runTableMakerMC.py": ("dqtasks.tableMakerMC", "TableMakerMC", "parserTableMakerMC"),
+    "runTableReader.py": ("dqtasks.tableReader", "TableReader", "parserTableReader"),
+    "runDQEfficiency.py": ("dqtasks.dqEfficiency", "DQEfficiency", "parserDQEfficiency"),
+    "runFilterPP.py": ("dqtasks.filterPP", "DQFilterPPTask", "parserDQFilterPPTask"),
+    "runDQFlow.py": ("dqtasks.dqFlow", "AnalysisQvector", "parserAnalysisQvector"),
+    "runV0selector.py": ("dqtasks.v0selector", "V0selector", "parserV0selector"),
+    "runEMEfficiency.py": ("dqtasks.emEfficiency", "EMEfficiency", "parserEMEfficiency"),
+    "runEMEfficiencyNotSkimmed.py": ("dqtasks.emEfficiencyNoSkimmed", "EMEfficiencyNoSkimmed", "parserEMEfficiencyNoSkimmed"),
+    }
+
+
+def completionTablePath(scriptName: str):
+    """Path of the completion table of an entry point
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        str: Completion table path
+    """
+    
+    return os.path.join(COMPLETION_TABLES_DIR, os.path.splitext(os.path.basename(scriptName))[0] + ".json")
+
+
+def sourceStats(scriptName: str, workDir = "."):
+    """Modification times of the interface sources and the DQ libraries, a completion table is valid only if they are unchanged
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+        workDir (str, optional): Working directory of the DQ libraries. Defaults to ".".
+
+    Returns:
+        dict: path -> [size, mtime_ns]
+    """
+    
+    stats = {}
+    sources = [os.path.join(PACKAGE_PATH, os.path.basename(scriptName))]
+    for folder in SOURCE_FOLDERS:
+        folderPath = os.path.join(PACKAGE_PATH, folder)
+        sources += sorted(os.path.join(folderPath, f) for f in os.listdir(folderPath) if f.endswith(".py"))
+    for source in sources:
+        stat = os.stat(source)
+        stats[source] = [stat.st_size, stat.st_mtime_ns]
+    if all(os.path.isfile(os.path.join(workDir, lib)) for lib in DQ_LIBS):
+        for lib in DQ_LIBS:
+            stat = os.stat(os.path.join(workDir, lib))
+            stats[lib] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def buildCompletionTable(parser: argparse.ArgumentParser, scriptName: str):
+    """Walks a merged parser and compiles options, choices, nargs and metavars into a serializable table
+
+    Args:
+        parser (argparse.ArgumentParser): Merged parser of an entry point
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        dict: Completion table
+    """
+    
+    libs = {}
+    options = {}
+    
+    for action in parser._actions:
+        if not action.option_strings:
+            continue # positionals (config json and dummy choice lists) are completed as files
+        completer = getattr(action, "completer", None)
+        entry = {
+            "nargs": action.nargs,
+            "metavar": action.metavar,
+            "help": action.help if action.help != argparse.SUPPRESS else None
+            }
+        if isinstance(completer, FilterSelsCompleter):
+            selsChoices = completer.choices
+            for libList in [selsChoices.analysisCuts, selsChoices.pairCuts]:
+                libs[libList.name] = list(libList)
+            entry["sels"] = [selsChoices.analysisCuts.name, selsChoices.pairCuts.name]
+            entry["choices"] = selsChoices.extraSels
+        elif hasattr(action.choices, "name") and hasattr(action.choices, "dqLibGetter"):
+            libs[action.choices.name] = list(action.choices)
+            entry["lib"] = action.choices.name
+        elif action.choices is not None:
+            entry["choices"] = list(action.choices)
+        elif completer is not None and hasattr(completer, "choices"):
+            entry["choices"] = list(completer.choices)
+        for optionString in action.option_strings:
+            options[optionString] = entry
+    
+    return {
+        "version": COMPLETION_TABLE_VERSION,
+        "script": os.path.basename(scriptName),
+        "stats": sourceStats(scriptName),
+        "libs": libs,
+        "options": options
+        }
+
+
+def writeCompletionTable(parser: argparse.ArgumentParser, scriptName: str):
+    """Builds and saves the completion table of an entry point
+
+    Args:
+        parser (argparse.ArgumentParser): Merged parser of an entry point
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        str: Completion table path
+    """
+    
+    tablePath = completionTablePath(scriptName)
+    os.makedirs(COMPLETION_TABLES_DIR, exist_ok = True)
+    tempTablePath = tablePath + "." + str(os.getpid())
+    with open(tempTablePath, "w") as f:
+        json.dump(buildCompletionTable(parser, scriptName), f, separators = (",", ":"))
+    os.replace(tempTablePath, tablePath)
+    return tablePath
+
+
+def loadCompletionTable(scriptName: str):
+    """Loads the completion table of an entry point
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        dict: Completion table, None if it is missing or stale
+    """
+    
+    try:
+        with open(completionTablePath(scriptName)) as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if table.get("version") != COMPLETION_TABLE_VERSION or table["stats"] != sourceStats(scriptName):
+        return None
+    return table
+
+
+def updateCompletionTable(parser: argparse.ArgumentParser, scriptName = None):
+    """Refreshes a missing or stale completion table while argcomplete is running on the full parser,
+    so the next TAB press takes the fast path
+
+    Args:
+        parser (argparse.ArgumentParser): Merged parser of an entry point
+        scriptName (str, optional): Entry point. Defaults to the running script.
+    """
+    
+    if "_ARGCOMPLETE" not in os.environ:
+        return
+    scriptName = scriptName or os.path.basename(sys.argv[0])
+    if os.path.basename(scriptName) not in ENTRY_POINTS:
+        return
+    try:
+        if loadCompletionTable(scriptName) is None:
+            writeCompletionTable(parser, scriptName)
+    except OSError:
+        pass # completion still works from the full parser
+
+
+def buildEntryPointParser(scriptName: str):
+    """Imports the interface class of an entry point and builds its merged parser
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+
+    Returns:
+        argparse.ArgumentParser: Merged parser
+    """
+    
+    moduleName, className, parserName = ENTRY_POINTS[os.path.basename(scriptName)]
+    interface = getattr(importlib.import_module(moduleName), className)()
+    interface.mergeArgs()
+    return getattr(interface, parserName)
+
+
+def fileCompletions(prefix: str, workDir = "."):
+    """File and folder completions for arguments without choices
+
+    Args:
+        prefix (str): Typed prefix
+        workDir (str, optional): Directory relative paths are completed from. Defaults to ".".
+
+    Returns:
+        list: Matching paths, folders end with /
+    """
+    
+    folder, _ = os.path.split(prefix)
+    try:
+        entries = os.listdir(os.path.join(workDir, folder))
+    except OSError:
+        return []
+    completions = []
+    for entry in entries:
+        path = os.path.join(folder, entry)
+        if path.startswith(prefix):
+            completions.append(path + "/" if os.path.isdir(os.path.join(workDir, path)) else path)
+    return sorted(completions)
+
+
+def completeFromTable(table: dict, words: list, prefix: str, workDir = "."):
+    """Computes completions with the same rules as argcomplete (always_complete_options = False)
+
+    Args:
+        table (dict): Completion table
+        words (list): Command line arguments before the word under the cursor (without script name)
+        prefix (str): Word under the cursor
+        workDir (str, optional): Directory file arguments are completed from. Defaults to ".".
+
+    Returns:
+        list: Completions
+    """
+    
+    options = table["options"]
+    
+    if prefix.startswith("-"):
+        return [option for option, entry in options.items() if option.startswith(prefix) and entry["help"] is not None]
+    
+    # find the option which is active for the word under the cursor
+    activeEntry = None
+    nValues = 0
+    for word in words:
+        if word.startswith("-"):
+            activeEntry = options.get(word, {
+                "nargs": "*",
+                "unknown": True
+                })
+            nValues = 0
+        elif activeEntry is not None:
+            nValues += 1
+    if activeEntry is not None:
+        nargs = activeEntry["nargs"]
+        if (nargs is None or nargs == "?") and nValues >= 1:
+            activeEntry = None
+        elif isinstance(nargs, int) and nValues >= nargs:
+            activeEntry = None
+    
+    if activeEntry is None:
+        return fileCompletions(prefix, workDir)
+    if "unknown" in activeEntry:
+        return [] # argparse can not assign values of unrecognized options
+    if "sels" in activeEntry:
+        analysisCuts, pairCuts = activeEntry["sels"]
+        selsChoices = FilterSelsChoices(table["libs"][analysisCuts], table["libs"][pairCuts], activeEntry["choices"])
+        completions = [sel for sel in selsChoices.extraSels if sel.startswith(prefix)]
+        return list(dict.fromkeys(completions + FilterSelsCompleter(selsChoices)(prefix = prefix)))
+    if "lib" in activeEntry:
+        choices = table["libs"][activeEntry["lib"]]
+    elif "choices" in activeEntry:
+        choices = activeEntry["choices"]
+    else:
+        return fileCompletions(prefix, workDir)
+    return list(dict.fromkeys(choice for choice in choices if choice.startswith(prefix)))
+
+
+def splitCommandLine(compLine: str, compPoint: int):
+    """Splits the command line up to the cursor
+
+    Args:
+        compLine (str): COMP_LINE
+        compPoint (int): COMP_POINT
+
+    Returns:
+        tuple: (words before the cursor, word under the cursor)
+    """
+    
+    line = compLine[: compPoint]
+    try:
+        words = shlex.split(line)
+    except ValueError:
+        words = shlex.split(line + '"') if line.count('"') % 2 else shlex.split(line + "'")
+    if not line or line[-1].isspace():
+        return words, ""
+    return words[:-1], words[-1]
+
+
+def formatCompletions(completions: list, prefix: str, wordBreaks: str, appendSpace = True):
+    """Trims completions like argcomplete for bash COMP_WORDBREAKS and adds a space after a unique match
+
+    Args:
+        completions (list): Completions
+        prefix (str): Word under the cursor
+        wordBreaks (str): COMP_WORDBREAKS
+        appendSpace (bool, optional): Add a space after a unique match (bash hooks with compopt do it themselves). Defaults to True.
+
+    Returns:
+        list: Completions for bash
+    """
+    
+    lastWordBreak = max([prefix.rfind(char) for char in wordBreaks] + [-1])
+    if lastWordBreak >= 0:
+        completions = [c[lastWordBreak + 1 :] for c in completions]
+    if appendSpace and len(completions) == 1 and completions[0][-1 :] not in ["=", "/", ":"]:
+        completions[0] += " "
+    return completions
+
+
+def fastComplete(scriptName = None):
+    """Answers an argcomplete request from the precompiled completion table and exits.
+    Does nothing if the script is not called for completion or the table is missing/stale (full parser is used instead)
+
+    Args:
+        scriptName (str, optional): Entry point. Defaults to the running script.
+    """
+    
+    if "_ARGCOMPLETE" not in os.environ:
+        return
+    scriptName = scriptName or os.path.basename(sys.argv[0])
+    table = loadCompletionTable(scriptName)
+    if table is None:
+        return
+    
+    words, prefix = splitCommandLine(os.environ["COMP_LINE"], int(os.environ["COMP_POINT"]))
+    words = words[int(os.environ["_ARGCOMPLETE"]):] # drop interpreter and script name
+    completions = completeFromTable(table, words, prefix)
+    completions = formatCompletions(
+        completions, prefix, os.environ.get("_ARGCOMPLETE_COMP_WORDBREAKS", ""),
+        appendSpace = os.environ.get("_ARGCOMPLETE_SUPPRESS_SPACE") != "1"
+        )
+    
+    ifs = os.environ.get("_ARGCOMPLETE_IFS", "\013")
+    outputFileName = os.environ.get("_ARGCOMPLETE_STDOUT_FILENAME")
+    output = open(outputFileName, "w") if outputFileName else os.fdopen(8, "w")
+    output.write(ifs.join(completions))
+    output.flush()
+    os._exit(0)
@@ -16,11 +16,11 @@
 # This script includes setter functions for configurables (Developer package)
 
 from .stringOperations import listToString, stringToListWithSlash
+from .runArtifacts import writeArtifact
 import logging
 from logging import handlers
 import sys
 import os
-import json
 
 
 # NOTE This will removed when we have unique name for dilepton-track signals
@@ -111,6 +111,28 @@ def setConverters(allArgs: dict, updatedConfigFileName: str, commandToRun: str):
     return commandToRun
 
 
+def generateReaderDescriptor(tablesToRead: dict, tables: dict, readerConfigFileName = "aodReaderTempConfig.json"):
+    """Generates the input descriptor for reading only the given trees from AO2D with json config file
+
+    Args:
+        tablesToRead (dict): Tables are read from the input files
+        tables (dict): Definition of all the tables can be read
+        readerConfigFileName (str, optional): Output name of reader config. Defaults to "aodReaderTempConfig.json".
+
+    Returns:
+        str: Written reader config, named by its content hash (see writeArtifact)
+    """
+    
+    readerConfig = {}
+    readerConfig["InputDirector"] = {
+        "debugmode": True,
+        "InputDescriptors": [tables[table] for table in tablesToRead.keys()]
+        }
+    readerConfigFileName = writeArtifact(readerConfig, readerConfigFileName)
+    logging.info("%s==========", readerConfigFileName)
+    return readerConfigFileName
+
+
 def generateDescriptors(
         tablesToProduce: dict, tables: dict, writerConfigFileName = "aodWriterTempConfig.json",
         readerConfigFileName = "aodReaderTempConfig.json", kFlag = False
@@ -123,16 +145,12 @@ def generateDescriptors(
         writerConfigFileName (str, optional): Output name of writer config. Defaults to "aodWriterTempConfig.json".
         readerConfigFileName (str, optional): Output name of reader config. Defaults to "aodReaderTempConfig.json".
         kFlag (bool, optional): if True also generates input descriptors. Defaults to False.
+
+    Returns:
+        tuple: Written writer config and reader config (None if kFlag is False), named by their content hash (see writeArtifact)
     """
     
     iTable = 0
-    iTableReader = 0
-    # Generate the aod-reader output descriptor json file
-    readerConfig = {}
-    readerConfig["InputDirector"] = {
-        "debugmode": True,
-        "InputDescriptors": []
-        }
     # Generate the aod-writer output descriptor json file
     writerConfig = {}
     writerConfig["OutputDirector"] = {
@@ -146,21 +164,15 @@ def generateDescriptors(
     for table in tablesToProduce.keys():
         writerConfig["OutputDirector"]["OutputDescriptors"].insert(iTable, tables[table])
         iTable += 1
-    if kFlag is True:
-        for table in tablesToProduce.keys():
-            readerConfig["InputDirector"]["InputDescriptors"].insert(iTableReader, tables[table])
-            iTableReader += 1
-    
-    writerConfigFileName = "aodWriterTempConfig.json"
-    with open(writerConfigFileName, "w") as writerConfigFile:
-        json.dump(writerConfig, writerConfigFile, indent = 2)
     
+    writerConfigFileName = writeArtifact(writerConfig, writerConfigFileName)
     if kFlag is True:
-        readerConfigFileName = "aodReaderTempConfig.json"
-        with open(readerConfigFileName, "w") as readerConfigFile:
-            json.dump(readerConfig, readerConfigFile, indent = 2)
-    logging.info("aodWriterTempConfig==========")
+        readerConfigFileName = generateReaderDescriptor(tablesToProduce, tables, readerConfigFileName)
+    else:
+        readerConfigFileName = None
+    logging.info("%s==========", writerConfigFileName)
     print(writerConfig)
+    return writerConfigFileName, readerConfigFileName
 
 
 def tableProducer(
@@ -315,6 +327,104 @@ def setSwitch(config: dict, task: str, cfg: str, allArgs: dict, cliMode: str, ar
                         logging.debug(" - [%s] %s : %s", task, param, SWITCH_OFF)
 
 
+class ConfigRewriter(object):
+    
+    """
+    Indexed config rewrite engine, replaces the setConfig/setSwitch calls for each (task, cfg) pair of the JSON config.
+    The JSON config is indexed once (cfg -> tasks), so each CLI argument only visits the (task, cfg) locations it touches.
+    Semantics of override (cliMode "true") and additional (cliMode "false") modes are the same as in setConfig/setSwitch.
+    Configs with the same tasks and cfgs (e.g. copies of the JSON config for parameter scans) can be rewritten with one index.
+
+    Args:
+        config (dict): Input as JSON config file
+        protectedCfgs (dict, optional): Task -> cfg prefix, which are never rewritten by CLI arguments. Defaults to None.
+    """
+    
+    def __init__(self, config: dict, protectedCfgs = None):
+        super(ConfigRewriter, self).__init__()
+        self.protectedCfgs = protectedCfgs if protectedCfgs is not None else {}
+        self.cfgIndex = {} # cfg -> tasks which have the cfg
+        for task, cfgValuePair in config.items():
+            if isinstance(cfgValuePair, dict):
+                for cfg in cfgValuePair.keys():
+                    if task in self.protectedCfgs and cfg.startswith(self.protectedCfgs[task]):
+                        continue
+                    self.cfgIndex.setdefault(cfg, []).append(task)
+    
+    def locations(self, cfg: str, selectedTask = None):
+        """Locations of a cfg in the indexed config
+
+        Args:
+            cfg (str): Configurable or Process Func
+            selectedTask (str, optional): If defined, only the location in this task. Defaults to None.
+
+        Returns:
+            list: (task, cfg) pairs
+        """
+        
+        return [(task, cfg) for task in self.cfgIndex.get(cfg, []) if selectedTask is None or task == selectedTask]
+    
+    def setConfig(self, config: dict, allArgs: dict, cliMode: str):
+        """Indexed setConfig for all configured args in CLI, sets each argument to the cfgs with the same naming
+
+        Args:
+            config (dict): Input as JSON config file
+            allArgs (dict): Configured args in CLI
+            cliMode (str): CLI mode
+        """
+        
+        for keyCfg, valueCfg in allArgs.items():
+            if valueCfg is None:
+                continue
+            if isinstance(valueCfg, list):
+                valueCfg = listToString(valueCfg)
+            for task, cfg in self.locations(keyCfg):
+                value = valueCfg
+                if cliMode == "false":
+                    value = config[task][cfg] + "," + valueCfg
+                config[task][cfg] = value
+                logging.debug(" - [%s] %s : %s", task, cfg, value)
+    
+    def setSwitch(self, config: dict, allArgs: dict, cliMode: str, argument: str, parameters: list, switchType: str, selectedTask = None):
+        """Indexed setSwitch, configures parameters with SWITCH_ON/SWITCH_OFF (both for configurables and process functions)
+
+        Args:
+            config (dict): JSON config file as input
+            allArgs (dict): Configured args in CLI
+            cliMode (str): CLI mode
+            argument (str): Selected argument from configured args
+            parameters (list): All available parameters for argument
+            switchType (str): Switch type usage in string --> "SWITCH_ON/SWITCHOFF"
+            selectedTask (str, optional): If defined, only the cfgs of this task are configured. Defaults to None.
+        """
+        
+        possibleSwitchTypes = ["1/-1", "1/0", "true/false"] # you have to add new switch type here if you need
+        if switchType not in possibleSwitchTypes:
+            logging.error("%s is invalid argument for setSwitch", switchType)
+            raise ValueError("Invalid switchType. Expected one of: %s" % possibleSwitchTypes)
+        
+        SWITCH_ON, SWITCH_OFF = stringToListWithSlash(switchType)
+        
+        valueCfg = allArgs.get(argument)
+        if isinstance(valueCfg, str):
+            valueCfg = [valueCfg]
+        elif not isinstance(valueCfg, list):
+            return
+        
+        for element in valueCfg:
+            for task, cfg in self.locations(element, selectedTask):
+                config[task][cfg] = SWITCH_ON
+                logging.debug(" - [%s] %s : %s", task, cfg, SWITCH_ON)
+        
+        if cliMode == "true":
+            for param in parameters:
+                if param in valueCfg:
+                    continue
+                for task, cfg in self.locations(param, selectedTask):
+                    config[task][cfg] = SWITCH_OFF
+                    logging.debug(" - [%s] %s : %s", task, cfg, SWITCH_OFF)
+
+
 def setProcessDummy(config: dict, dummyHasTasks = None):
     """Dummy Automizer
 
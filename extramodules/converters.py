@@ -17,6 +17,32 @@
 # \Interface:  cevat.batuhan.tolon@cern.ch
 
 import argparse
+from extramodules.argSchema import argumentGroup, argument, addSchemaArguments
+
+# Interface
+O2_CONVERTERS_SCHEMA = [
+    argumentGroup(
+        "Converter task adding options:",
+        argument(
+            "--add_mc_conv",
+            help = "Add the converter from mcparticle to mcparticle+001 (Adds your workflow o2-analysis-mc-converter task)",
+            action = "store_true"
+            ),
+        argument(
+            "--add_fdd_conv", help = "Add the fdd converter (Adds your workflow o2-analysis-fdd-converter task)", action = "store_true"
+            ),
+        argument(
+            "--add_track_prop",
+            help = "Add track propagation to the innermost layer (TPC or ITS) (Adds your workflow o2-analysis-track-propagation task)",
+            action = "store_true"
+            ),
+        argument(
+            "--add_weakdecay_ind",
+            help = "Add Converts V0 and cascade version 000 to 001 (Adds your workflow o2-analysis-weak-decay-indices task)",
+            action = "store_true"
+            ),
+        ),
+    ]
 
 
 class O2Converters(object):
@@ -28,8 +54,10 @@ class O2Converters(object):
         object (parser_args() object): Converter task adder arguments
     """
     
-    def __init__(self, parserO2Converters = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserO2Converters = None):
         super(O2Converters, self).__init__()
+        if parserO2Converters is None:
+            parserO2Converters = argparse.ArgumentParser(add_help = False)
         self.parserO2Converters = parserO2Converters
     
     def addArguments(self):
@@ -37,26 +65,7 @@ class O2Converters(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Interface
-        groupO2Converters = self.parserO2Converters.add_argument_group(title = "Converter task adding options:")
-        groupO2Converters.add_argument(
-            "--add_mc_conv",
-            help = "Add the converter from mcparticle to mcparticle+001 (Adds your workflow o2-analysis-mc-converter task)",
-            action = "store_true",
-            )
-        groupO2Converters.add_argument(
-            "--add_fdd_conv", help = "Add the fdd converter (Adds your workflow o2-analysis-fdd-converter task)", action = "store_true",
-            )
-        groupO2Converters.add_argument(
-            "--add_track_prop",
-            help = "Add track propagation to the innermost layer (TPC or ITS) (Adds your workflow o2-analysis-track-propagation task)",
-            action = "store_true",
-            )
-        groupO2Converters.add_argument(
-            "--add_weakdecay_ind",
-            help = "Add Converts V0 and cascade version 000 to 001 (Adds your workflow o2-analysis-weak-decay-indices task)",
-            action = "store_true",
-            )
+        addSchemaArguments(self.parserO2Converters, O2_CONVERTERS_SCHEMA)
     
     def parseArgs(self):
         """
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the cut composition index of the cuts library (CutsLibrary.h). The header is parsed in a single pass:
+# composite cuts (GetCompositeCut) with their analysis cuts (AddCut(GetAnalysisCut(...)), also of nested composite cuts),
+# analysis cuts (GetAnalysisCut) with their VarManager variables and the pair cuts. The index is serializable (compiled DQ library
+# index of dqLibGetter) and is queried by the selection lists (validation, autocompletion) and by the PID pruning.
+
+import re
+
+CUTS_LIBRARY = "tempCutsLibrary.h"
+PAIR_CUT = "pair" # pair cuts are named with pair (e.g. pairNoCut, pairJpsi)
+CUT_NAME = re.compile(r'nameStr\.compare\("([^"]*)"\)')
+ANALYSIS_CUT_CALL = re.compile(r'GetAnalysisCut\("([^"]*)"\)')
+VARIABLE = re.compile(r"VarManager::(k\w+)")
+
+
+class CutsIndex(object):
+    
+    """
+    Cut composition index of the cuts library, lookups by cut name are dict lookups
+
+    Args:
+        object (object): self
+    """
+    
+    def __init__(self, compositeCuts = None, analysisCuts = None, pairCuts = None):
+        self.compositeCuts = compositeCuts if compositeCuts is not None else {} # composite cut -> analysis cuts
+        self.analysisCuts = analysisCuts if analysisCuts is not None else {} # analysis cut -> VarManager variables
+        self.pairCuts = dict.fromkeys(pairCuts if pairCuts is not None else []) # ordered set
+    
+    def isCompositeCut(self, name: str):
+        """Checks if the cut is a composite cut (GetCompositeCut)"""
+        
+        return name in self.compositeCuts
+    
+    def isAnalysisCut(self, name: str):
+        """Checks if the cut is an analysis cut (GetAnalysisCut)"""
+        
+        return name in self.analysisCuts
+    
+    def isPairCut(self, name: str):
+        """Checks if the cut is a pair cut"""
+        
+        return name in self.pairCuts
+    
+    def cutNames(self):
+        """All cut names of the library, composite cuts first
+
+        Returns:
+            list: Cut names in order of the library without duplicates
+        """
+        
+        return list(dict.fromkeys(list(self.compositeCuts) + list(self.analysisCuts)))
+    
+    def components(self, name: str):
+        """Analysis cuts of a cut
+
+        Args:
+            name (str): Composite cut or analysis cut (the cut itself)
+
+        Returns:
+            list or None: Analysis cuts, None if the cut is not in the library
+        """
+        
+        if name in self.compositeCuts:
+            return self.compositeCuts[name]
+        if name in self.analysisCuts:
+            return [name]
+        return None
+    
+    def variables(self, name: str):
+        """VarManager variables of a cut over all its analysis cuts
+
+        Args:
+            name (str): Composite cut or analysis cut
+
+        Returns:
+            list or None: Variables (e.g. kTPCnSigmaEl), None if the cut is not in the library
+        """
+        
+        components = self.components(name)
+        if components is None:
+            return None
+        variables = {}
+        for component in components:
+            variables.update(dict.fromkeys(self.analysisCuts.get(component, [])))
+        return list(variables)
+    
+    def toDict(self):
+        """Serializable form of the index
+
+        Returns:
+            dict: compositeCuts, analysisCuts and pairCuts
+        """
+        
+        return {
+            "compositeCuts": self.compositeCuts,
+            "analysisCuts": self.analysisCuts,
+            "pairCuts": list(self.pairCuts)
+            }
+    
+    @classmethod
+    def fromDict(cls, index: dict):
+        """Index from its serializable form (see toDict)
+
+        Args:
+            index (dict): compositeCuts, analysisCuts and pairCuts
+
+        Returns:
+            CutsIndex: Cut composition index
+        """
+        
+        return cls(index["compositeCuts"], index["analysisCuts"], index["pairCuts"])
+
+
+def parseCutsLibrary(fileName = CUTS_LIBRARY):
+    """Builds the cut composition index of the cuts library in a single pass. The first definition of a name wins as in C++
+
+    Args:
+        fileName (str, optional): Cuts library header. Defaults to CUTS_LIBRARY.
+
+    Returns:
+        CutsIndex: Cut composition index
+    """
+    
+    cutsIndex = CutsIndex()
+    library = None # cuts of the function being parsed
+    names = [] # cuts of the if block being parsed
+    with open(fileName) as libraryFile:
+        for line in libraryFile:
+            if "dqcuts::GetCompositeCut(const char*" in line:
+                library, names = cutsIndex.compositeCuts, []
+            elif "dqcuts::GetAnalysisCut(const char*" in line:
+                library, names = cutsIndex.analysisCuts, []
+            elif library is None:
+                continue
+            elif "nameStr.compare(" in line:
+                names = [name for name in CUT_NAME.findall(line) if name not in library]
+                for name in names:
+                    library[name] = []
+                    if PAIR_CUT in name:
+                        cutsIndex.pairCuts[name] = None
+            else:
+                pattern = ANALYSIS_CUT_CALL if library is cutsIndex.compositeCuts else VARIABLE
+                for item in pattern.findall(line):
+                    for name in names:
+                        if item not in library[name]:
+                            library[name].append(item)
+            if "return cut;" in line:
+                names = []
+    return cutsIndex
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the dependency graph of the O2 analysis devices. Each producer declares the derived tables it produces
+# and the derived tables it consumes (tables of the AO2D come from the reader and are not listed). The run scripts declare
+# the tables consumed by the process functions of their tasks, the engine works backwards from the enabled process functions
+# to the minimal set of devices, so devices whose products are not used don't run. The same declarations give the input descriptor
+# of the analyses on skimmed data: only the trees consumed by the enabled process functions are read from the input files.
+
+import logging
+
+# yapf: disable
+# Producers in the order of the generated commands: device -> produced and consumed tables
+PRODUCERS = {
+    "o2-analysis-timestamp": {"produces": ["Timestamps"], "consumes": []},
+    "o2-analysis-event-selection": {"produces": ["BcSels", "EvSels"], "consumes": ["Timestamps"]},
+    "o2-analysis-multiplicity-table": {"produces": ["Mults"], "consumes": []},
+    "o2-analysis-trackselection": {"produces": ["TrackSelection"], "consumes": ["TracksDCA"]},
+    "o2-analysis-trackextension": {"produces": ["TracksDCA"], "consumes": []},
+    "o2-analysis-pid-tof-base": {"produces": ["TOFSignal", "TOFEvTime"], "consumes": []},
+    "o2-analysis-pid-tof": {"produces": ["pidTOF"], "consumes": ["TOFSignal", "TOFEvTime"]},
+    "o2-analysis-pid-tof-full": {"produces": ["pidTOFFull"], "consumes": ["TOFSignal", "TOFEvTime"]},
+    "o2-analysis-pid-tof-beta": {"produces": ["pidTOFbeta"], "consumes": ["TOFSignal", "TOFEvTime"]},
+    "o2-analysis-pid-tpc-full": {"produces": ["pidTPCFull"], "consumes": []},
+    "o2-analysis-fwdtrackextension": {"produces": ["FwdTracksDCA"], "consumes": []},
+    "o2-analysis-centrality-table": {"produces": ["Cents"], "consumes": ["Mults"]},
+    "o2-analysis-dq-v0-selector": {"produces": ["V0Bits"], "consumes": ["TracksDCA", "pidTPCFull"]},
+    "o2-analysis-dq-filter-pp": {"produces": ["DQEventFilter"], "consumes": ["EvSels"]},
+    "o2-analysis-dq-flow": {"produces": ["EventQvectors"], "consumes": ["Cents"]},
+    "o2-analysis-track-propagation": {"produces": ["TracksCov", "TracksDCA"], "consumes": ["Timestamps"]}, # --add_track_prop
+    }
+# yapf: enable
+
+
+def requiredTables(config: dict, consumers: dict):
+    """Tables consumed by the enabled process functions of the tasks in the JSON config
+
+    Args:
+        config (dict): Updated JSON config
+        consumers (dict): Task -> process function -> consumed tables
+
+    Returns:
+        dict: Table -> consumers (task:processFunction) in order of appearance
+    """
+    
+    tables = {}
+    for task, processFunctions in consumers.items():
+        for processFunc, consumedTables in processFunctions.items():
+            if config.get(task, {}).get(processFunc) != "true":
+                continue
+            for table in consumedTables:
+                tables.setdefault(table, []).append(task + ":" + processFunc)
+    return tables
+
+
+def inputTables(config: dict, consumers: dict, workflowProducts = None):
+    """Tables read from the input files: consumed by the enabled process functions and not produced in the workflow
+
+    Args:
+        config (dict): Updated JSON config
+        consumers (dict): Task -> process function -> consumed tables
+        workflowProducts (dict, optional): Task -> tables it produces if one of its process functions is enabled. Defaults to None.
+
+    Returns:
+        dict: Table -> consumers (task:processFunction) in order of appearance
+    """
+    
+    producedTables = []
+    for task, products in (workflowProducts or {}).items():
+        if any(value == "true" for cfg, value in config.get(task, {}).items() if cfg.startswith("process") and cfg != "processDummy"):
+            producedTables += products
+    return {
+        table: tableConsumers
+        for table, tableConsumers in requiredTables(config, consumers).items()
+        if table not in producedTables
+        }
+
+
+def logTables(tablesToRead: dict, tables: dict):
+    """Logs the trees of the input descriptor with the process functions they are read for and the trees which are not read
+
+    Args:
+        tablesToRead (dict): Table -> consumers (see inputTables)
+        tables (dict): Definition of all the tables can be read
+    """
+    
+    for table, tableConsumers in tablesToRead.items():
+        logging.info("%s read for %s", table, ", ".join(tableConsumers))
+    logging.info("Not read: %s", ", ".join(table for table in tables if table not in tablesToRead) or "-")
+
+
+def resolveDevices(tables: dict, availableDevices = (), producers = PRODUCERS):
+    """Minimal set of devices producing the required tables and (recursively) the tables consumed by these devices
+
+    Args:
+        tables (dict): Required table -> consumers (see requiredTables)
+        availableDevices (list, optional): Devices added to the workflow in another way (e.g. converters). Defaults to ().
+        producers (dict, optional): Producer declarations. Defaults to PRODUCERS.
+
+    Raises:
+        ValueError: If a required table has no producer
+
+    Returns:
+        dict: Device -> tables it is needed for, in the order of the producer declarations (availableDevices are not included)
+    """
+    
+    producerOf = {}
+    for device in list(availableDevices) + list(producers.keys()):
+        for table in producers[device]["produces"]:
+            producerOf.setdefault(table, device) # devices of the workflow first, otherwise the first declared producer
+    
+    neededFor = {}
+    pending = [(table, consumer) for table, tableConsumers in tables.items() for consumer in tableConsumers]
+    pending += [(table, device) for device in availableDevices for table in producers[device]["consumes"]]
+    while pending:
+        table, consumer = pending.pop(0)
+        if table not in producerOf:
+            raise ValueError("No producer declared for table " + table + " (consumed by " + consumer + ")")
+        device = producerOf[table]
+        if device not in neededFor:
+            neededFor[device] = []
+            pending += [(consumedTable, device) for consumedTable in producers[device]["consumes"]]
+        if table not in neededFor[device]:
+            neededFor[device].append(table)
+    
+    return {
+        device: neededFor[device]
+        for device in producers
+        if device in neededFor and device not in availableDevices
+        }
+
+
+def logDevices(depsToRun: dict, producers = PRODUCERS):
+    """Logs the devices of the minimal set with the tables they are needed for and the producers which are not needed
+
+    Args:
+        depsToRun (dict): Device -> tables (see resolveDevices)
+        producers (dict, optional): Producer declarations. Defaults to PRODUCERS.
+    """
+    
+    for device, tables in depsToRun.items():
+        logging.info("%s needed for %s", device, ", ".join(tables))
+    logging.debug("Not needed: %s", ", ".join(device for device in producers if device not in depsToRun))
@@ -144,3 +144,89 @@ class DependencyNotFoundError(Exception):
     
     def __str__(self):
         return f"For configuring {self.checkedDep}, you have to specify [{self.task}] {self.cfg} function as true"
+
+
+class ShardsNeedAodListError(Exception):
+    
+    """Exception raised if sharded execution is requested without an AO2D text list
+
+    Attributes:
+        aod: provided AO2D input
+    """
+    
+    def __init__(self, aod):
+        self.aod = aod
+    
+    def __str__(self):
+        return f"Sharded execution needs an AO2D text list (--aod @list.txt), provided AO2D input: {self.aod}"
+
+
+class FusedConfigConflictError(Exception):
+    
+    """Exception raised if the JSON configs of fused analyses configure a shared task differently
+
+    Attributes:
+        conflicts: list of (task, cfg, dict analysis -> value)
+    """
+    
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+    
+    def __str__(self):
+        details = "; ".join(
+            f"[{task}] {cfg}: " + ", ".join(f"{analysis} = {value}"
+                                            for analysis, value in values.items())
+            for task, cfg, values in self.conflicts
+            )
+        return f"Fused analyses configure shared tasks differently, configure the same values for all analyses (e.g. --aod, --syst): {details}"
+
+
+class NotFusableAnalysisError(Exception):
+    
+    """Exception raised if an analysis does not generate exactly one workflow (e.g. sharded execution)
+
+    Attributes:
+        analysis: run script of the analysis
+        workflows: number of generated workflows
+    """
+    
+    def __init__(self, analysis, workflows):
+        self.analysis = analysis
+        self.workflows = workflows
+    
+    def __str__(self):
+        return f"{self.analysis} generated {self.workflows} workflows, only analyses with one workflow can be fused (no --shards/--shardPlan)"
+
+
+class ShardedAnalysisError(Exception):
+    
+    """Exception raised if an analysis to fuse is configured with sharded execution
+
+    Attributes:
+        analysis: run script of the analysis
+        option: sharding option (--shards or --shardPlan)
+    """
+    
+    def __init__(self, analysis, option):
+        self.analysis = analysis
+        self.option = option
+    
+    def __str__(self):
+        return f"{self.analysis} is configured with {self.option}, sharded analyses generate several workflows and can't be fused (remove {self.option})"
+
+
+class MemoryBudgetError(Exception):
+    
+    """Exception raised if the memory budget is too small for the smallest auto sized shared memory segment
+
+    Attributes:
+        available: available memory in bytes
+        minimum: smallest memory budget of one workflow in bytes
+    """
+    
+    def __init__(self, available, minimum):
+        self.available = available
+        self.minimum = minimum
+    
+    def __str__(self):
+        return f"Available memory of {self.available / 1024**3:.2f} GB is too small for one workflow, auto sizing needs at least {self.minimum / 1024**3:.2f} GB (free memory or configure --shm-segment-size)"
@@ -18,152 +18,315 @@
 
 import os
 import re
-from urllib.request import Request, urlopen
-import ssl
+import json
+import hashlib
+from collections.abc import Sequence
+from extramodules.filterSelsGrammar import FilterSelsChoices
+from extramodules.cutsIndex import CutsIndex, parseCutsLibrary
+
+# Temp DQ libraries in working directory and their github sources
+DQ_LIBS = {
+    "tempCutsLibrary.h": "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/CutsLibrary.h?raw=true",
+    "tempMCSignalsLibrary.h": "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MCSignalLibrary.h?raw=true",
+    "tempMixingLibrary.h": "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MixingLibrary.h?raw=true",
+    "tempHistogramsLibrary.h": "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/HistogramsLibrary.h?raw=true",
+    }
+
+# Compiled index of DQ libraries, keyed by the content hash of the headers
+INDEX_CACHE_FILE = "tempDQLibsIndex.json"
+INDEX_CACHE_VERSION = 2
+
+
+def libsHash(libs = DQ_LIBS, libDir = ""):
+    """Content hash of the DQ library headers
+
+    Args:
+        libs (dict or list, optional): Header file names. Defaults to DQ_LIBS.
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        str: sha256 hex digest over all headers in fixed order
+    """
+    
+    sha = hashlib.sha256()
+    for lib in libs:
+        with open(os.path.join(libDir, lib), "rb") as f:
+            sha.update(lib.encode())
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def libsStats(libs = DQ_LIBS, libDir = ""):
+    """Size and modification time of the DQ library headers, used as a fast path before hashing
+
+    Args:
+        libs (dict or list, optional): Header file names. Defaults to DQ_LIBS.
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        dict: header name -> [size, mtime_ns]
+    """
+    
+    stats = {}
+    for lib in libs:
+        stat = os.stat(os.path.join(libDir, lib))
+        stats[lib] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def parseLibs(libDir = ""):
+    """Parses DQ library headers and builds the compiled index (cut composition index, MC signals, mixing vars, histogram groups)
+
+    Args:
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        dict: Compiled index of DQ libraries
+    """
+    
+    mcSignals = []
+    mixing = []
+    eventHistos = []
+    trackHistos = []
+    mctruthHistos = []
+    
+    # Read Cuts, Signals, Mixing vars from downloaded files
+    with open(os.path.join(libDir, "tempMCSignalsLibrary.h")) as f:
+        for line in f:
+            if "if" in line:
+                mcSignals += re.findall('"([^"]*)"', line)
+    
+    with open(os.path.join(libDir, "tempMixingLibrary.h")) as f:
+        for line in f:
+            if "if" in line:
+                mixing += re.findall('"([^"]*)"', line)
+    
+    # todo create dep tree and improve better performance
+    kEvents = True
+    kTracks = True
+    with open(os.path.join(libDir, "tempHistogramsLibrary.h")) as f:
+        for line in f:
+            if "if" in line:
+                if "track" not in line and kEvents is True:
+                    eventHistos += re.findall('"([^"]*)"', line)
+                elif "mctruth" not in line and kTracks is True:
+                    kEvents = False
+                    trackHistos += re.findall('"([^"]*)"', line)
+                elif "pair_lmee" not in line:
+                    kTracks = False
+                    mctruthHistos += re.findall('"([^"]*)"', line)
+                else:
+                    break
+    
+    # composite cuts -> analysis cuts -> variables, selection lists of cuts are derived from the index
+    cutsIndex = parseCutsLibrary(os.path.join(libDir, "tempCutsLibrary.h"))
+    
+    return {
+        "cuts": cutsIndex.toDict(),
+        "analysisCuts": cutsIndex.cutNames(),
+        "pairCuts": list(cutsIndex.pairCuts),
+        "mcSignals": mcSignals,
+        "mixing": mixing,
+        "eventHistos": eventHistos,
+        "trackHistos": trackHistos,
+        "mctruthHistos": mctruthHistos
+        }
+
+
+def indexCacheFile(libDir = ""):
+    """Compiled index file of the DQ library headers, it is kept next to the headers in the version directory of the DQ library
+    store if the headers are linked to the store (see libStore), so each library version keeps its own index
+
+    Args:
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        str: Cache file name
+    """
+    
+    cutsLibrary = os.path.join(libDir, "tempCutsLibrary.h")
+    if os.path.islink(cutsLibrary):
+        return os.path.join(os.path.dirname(os.path.realpath(cutsLibrary)), INDEX_CACHE_FILE)
+    return os.path.join(libDir, INDEX_CACHE_FILE)
+
+
+def loadIndex(cacheFileName = None, libDir = ""):
+    """Loads the compiled DQ library index from the on-disk cache. The index is rebuilt only if a header has changed
+
+    Args:
+        cacheFileName (str, optional): Cache file name. Defaults to None (see indexCacheFile).
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        dict: Compiled index of DQ libraries
+    """
+    
+    if cacheFileName is None:
+        cacheFileName = indexCacheFile(libDir)
+    cache = None
+    try:
+        with open(cacheFileName) as f:
+            cache = json.load(f)
+        if cache.get("version") != INDEX_CACHE_VERSION:
+            cache = None
+    except (OSError, ValueError):
+        cache = None
+    
+    stats = libsStats(libDir = libDir)
+    if cache is not None and cache["stats"] == stats:
+        return cache["index"]
+    
+    # headers touched or cache missing, hash decides whether parsing is needed
+    contentHash = libsHash(libDir = libDir)
+    if cache is not None and cache["hash"] == contentHash:
+        index = cache["index"]
+    else:
+        index = parseLibs(libDir)
+    
+    cache = {
+        "version": INDEX_CACHE_VERSION,
+        "hash": contentHash,
+        "stats": stats,
+        "index": index
+        }
+    try:
+        tempFileName = cacheFileName + "." + str(os.getpid())
+        with open(tempFileName, "w") as f:
+            json.dump(cache, f, separators = (",", ":"))
+        os.replace(tempFileName, cacheFileName)
+    except OSError:
+        pass # read-only working directory, index is still valid for this run
+    return index
+
+
+class LazyLibList(Sequence):
+    
+    """
+    Read-only list of DQ library selections which is materialized on first access.
+    argparse choices and argcomplete completers only touch it when the related option is used
+
+    Args:
+        Sequence (Sequence): List interface (in, len, iteration, indexing)
+    """
+    
+    def __init__(self, dqLibGetter, name):
+        self.dqLibGetter = dqLibGetter
+        self.name = name
+        self.selectionSet = None
+    
+    def materialize(self):
+        """Loads DQ libraries if needed and returns the selection list
+
+        Returns:
+            list: DQ library selections
+        """
+        
+        return self.dqLibGetter.load()[self.name]
+    
+    def __getitem__(self, index):
+        return self.materialize()[index]
+    
+    def __len__(self):
+        return len(self.materialize())
+    
+    def __iter__(self):
+        return iter(self.materialize())
+    
+    def __contains__(self, value):
+        if self.selectionSet is None:
+            self.selectionSet = set(self.materialize())
+        return value in self.selectionSet
+    
+    def __repr__(self):
+        return repr(self.materialize())
 
 
 # TODO It should check first local path then it should try download
 class DQLibGetter(object):
     
     """
-    Class for Downloading DQ Libraries Github and It gets analysis selections 
-    like analysis cuts, MC signals and event mixing variables
+    Class for Downloading DQ Libraries Github and It gets analysis selections
+    like analysis cuts, MC signals and event mixing variables.
+    Nothing is downloaded or parsed until one of the selection lists is accessed
 
     Args:
         object (object): self
     """
     
-    def __init__(self, allAnalysisCuts = [], allMCSignals = [], allSels = [], allMixing = [], allEventHistos = [], allTrackHistos = [], allMCTruthHistos = []) -> None:
-        
-        self.allAnalysisCuts = list(allAnalysisCuts)
-        self.allMCSignals = list(allMCSignals)
-        self.allSels = list(allSels)
-        self.allMixing = list(allMixing)
-        self.allEventHistos = list(allEventHistos)
-        self.allTrackHistos = list(allTrackHistos)
-        self.allMCTruthHistos = list(allMCTruthHistos)
-
-        allPairCuts = [] # only pair cuts
-        nAddedallAnalysisCutsList = [] # e.g. muonQualityCuts:2
-        nAddedPairCutsList = [] # e.g paircutMass:3
-        selsWithOneColon = [] # track/muon cut:paircut:n
-        oneColon = ":" # Namespace reference
-        doubleColon = "::" # Namespace reference
+    def __init__(
+            self, allAnalysisCuts = [], allMCSignals = [], allSels = [], allMixing = [], allEventHistos = [], allTrackHistos = [],
+            allMCTruthHistos = []
+        ) -> None:
         
-        kEvents = True
-        kTracks = True
-        eventHistos = []
-        trackHistos = []
-        mctruthHistos = []
-        
-        headers = {
-            "User-Agent":
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
+        self.selections = None
+        self.cutsIndexCache = None
+        self.extraSelections = {
+            "allAnalysisCuts": list(allAnalysisCuts),
+            "allMCSignals": list(allMCSignals),
+            "allMixing": list(allMixing),
+            "allEventHistos": list(allEventHistos),
+            "allTrackHistos": list(allTrackHistos),
+            "allMCTruthHistos": list(allMCTruthHistos)
             }
         
-        URL_CUTS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/CutsLibrary.h?raw=true"
-        URL_MCSIGNALS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MCSignalLibrary.h?raw=true"
-        URL_MIXING_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/MixingLibrary.h?raw=true"
-        URL_HISTOGRAMS_LIBRARY = "https://github.com/AliceO2Group/O2Physics/blob/master/PWGDQ/Core/HistogramsLibrary.h?raw=true"
+        self.allAnalysisCuts = LazyLibList(self, "allAnalysisCuts")
+        self.allPairCuts = LazyLibList(self, "allPairCuts")
+        self.allMCSignals = LazyLibList(self, "allMCSignals")
+        # in Filter PP Task, sels options for barrel and muon uses namespaces e.g. "<track-cut>:[<pair-cut>]:<n> and <track-cut>::<n>
+        self.allSels = FilterSelsChoices(self.allAnalysisCuts, self.allPairCuts, allSels)
+        self.allMixing = LazyLibList(self, "allMixing")
+        self.allEventHistos = LazyLibList(self, "allEventHistos")
+        self.allTrackHistos = LazyLibList(self, "allTrackHistos")
+        self.allMCTruthHistos = LazyLibList(self, "allMCTruthHistos")
+    
+    def load(self):
+        """Downloads (if missing) and indexes DQ libraries on first call
+
+        Returns:
+            dict: selection list name -> selections
+        """
+        
+        if self.selections is not None:
+            return self.selections
         
         # Github Links for CutsLibrary and MCSignalsLibrary from PWG-DQ --> download from github
         # This condition solves performance issues
-        if (os.path.isfile("tempCutsLibrary.h") and os.path.isfile("tempMCSignalsLibrary.h") and os.path.isfile("tempMixingLibrary.h") and os.path.isfile("tempHistogramsLibrary.h")) is False:
-            print("[INFO] Some Libs are Missing. They will download.")
-            
-            # Dummy SSL Adder
-            context = ssl._create_unverified_context() # prevent ssl problems
-            # request = urllib.request.urlopen(URL_CUTS_LIBRARY, context=context)
-            
-            # HTTP Request
-            requestCutsLibrary = Request(URL_CUTS_LIBRARY, headers = headers)
-            requestMCSignalsLibrary = Request(URL_MCSIGNALS_LIBRARY, headers = headers)
-            requestMixingLibrary = Request(URL_MIXING_LIBRARY, headers = headers)
-            requestHistogramsLibrary = Request(URL_HISTOGRAMS_LIBRARY, headers = headers)
-            
-            # Get Files With Http Requests
-            htmlCutsLibrary = urlopen(requestCutsLibrary, context = context).read()
-            htmlMCSignalsLibrary = urlopen(requestMCSignalsLibrary, context = context).read()
-            htmlMixingLibrary = urlopen(requestMixingLibrary, context = context).read()
-            htmlHistogramsLibrary = urlopen(requestHistogramsLibrary, context = context).read()
-            
-            # Save Disk to temp DQ libs
-            with open("tempCutsLibrary.h", "wb") as f:
-                f.write(htmlCutsLibrary)
-            f.close()
-            with open("tempMCSignalsLibrary.h", "wb") as f:
-                f.write(htmlMCSignalsLibrary)
-            f.close()
-            with open("tempMixingLibrary.h", "wb") as f:
-                f.write(htmlMixingLibrary)
-            f.close()
-            with open("tempHistogramsLibrary.h", "wb") as f:
-                f.write(htmlHistogramsLibrary)
-            f.close()
-            print("[INFO] Libs downloaded succesfully.")
-        # Read Cuts, Signals, Mixing vars from downloaded files
-        with open("tempMCSignalsLibrary.h") as f:
-            stringIfSearch = [x for x in f if "if" in x]
-            for i in stringIfSearch:
-                getSignals = re.findall('"([^"]*)"', i)
-                self.allMCSignals = self.allMCSignals + getSignals
-        f.close() 
+        if not all(os.path.isfile(lib) for lib in DQ_LIBS):
+            self.downloadLibs()
         
-        with open("tempMixingLibrary.h") as f:
-            stringIfSearch = [x for x in f if "if" in x]
-            for i in stringIfSearch:
-                getMixing = re.findall('"([^"]*)"', i)
-                self.allMixing = self.allMixing + getMixing
-        f.close() 
-             
-        # todo create dep tree and improve better performance        
-        with open("tempHistogramsLibrary.h") as f:
-            for line in f:
-                if "if" in line:
-                    #print(line, len(line) - len(line.lstrip()))
-                    if "track" not in line and kEvents is True:
-                        line = re.findall('"([^"]*)"', line)
-                        eventHistos += line
-                    elif "mctruth" not in line and kTracks is True:
-                        line = re.findall('"([^"]*)"', line)
-                        kEvents = False
-                        trackHistos += line
-                    elif "pair_lmee" not in line:
-                        line = re.findall('"([^"]*)"', line)
-                        kTracks = False
-                        mctruthHistos += line
-                    else:
-                        break 
-        f.close()       
-        self.allEventHistos = eventHistos
-        self.allTrackHistos = self.allTrackHistos + trackHistos
-        self.allMCTruthHistos = self.allMCTruthHistos + mctruthHistos
-        with open("tempCutsLibrary.h") as f:
-            stringIfSearch = [x for x in f if "if" in x] # get lines only includes if string
-            for i in stringIfSearch:
-                getCuts = re.findall('"([^"]*)"', i) # get in double quotes string value with regex exp.
-                getPairCuts = [y for y in getCuts if "pair" in y] # get pair cuts
-                if getPairCuts: # if pair cut list is not empty
-                    allPairCuts = (allPairCuts + getPairCuts) # Get Only pair cuts from CutsLibrary.h
-                    namespacedPairCuts = [x + oneColon for x in allPairCuts] # paircut:
-                self.allAnalysisCuts = (self.allAnalysisCuts + getCuts) # Get all Cuts from CutsLibrary.h
-                nameSpacedallAnalysisCuts = [x + oneColon for x in self.allAnalysisCuts] # cut:
-                nameSpacedallAnalysisCutsTwoDots = [x + doubleColon for x in self.allAnalysisCuts] # cut::
+        index = loadIndex()
+        self.cutsIndexCache = CutsIndex.fromDict(index["cuts"])
         
-        # in Filter PP Task, sels options for barrel and muon uses namespaces e.g. "<track-cut>:[<pair-cut>]:<n> and <track-cut>::<n> For Manage this issue:
-        for k in range(1, 10):
-            nAddedallAnalysisCuts = [x + str(k) for x in nameSpacedallAnalysisCutsTwoDots]
-            nAddedallAnalysisCutsList = nAddedallAnalysisCutsList + nAddedallAnalysisCuts
-            nAddedPairCuts = [x + str(k) for x in namespacedPairCuts]
-            nAddedPairCutsList = nAddedPairCutsList + nAddedPairCuts
+        selections = {
+            "allAnalysisCuts": self.extraSelections["allAnalysisCuts"] + index["analysisCuts"],
+            "allPairCuts": index["pairCuts"],
+            "allMCSignals": self.extraSelections["allMCSignals"] + index["mcSignals"],
+            "allMixing": self.extraSelections["allMixing"] + index["mixing"],
+            "allEventHistos": index["eventHistos"],
+            "allTrackHistos": self.extraSelections["allTrackHistos"] + index["trackHistos"],
+            "allMCTruthHistos": self.extraSelections["allMCTruthHistos"] + index["mctruthHistos"]
+            }
         
-        # Style 1 <track-cut>:[<pair-cut>]:<n>:
-        for i in nAddedPairCutsList:
-            Style1 = [x + i for x in nameSpacedallAnalysisCuts]
-            selsWithOneColon = selsWithOneColon + Style1
+        self.selections = selections
+        return self.selections
+    
+    def cutsIndex(self):
+        """Cut composition index of the cuts library (downloaded and indexed with the other DQ libraries if needed)
+
+        Returns:
+            CutsIndex: Composite cuts, analysis cuts and pair cuts
+        """
+        
+        self.load()
+        return self.cutsIndexCache
+    
+    def downloadLibs(self):
+        """Downloads the missing DQ libraries from github into the working directory (concurrently, existing headers are kept)"""
         
-        # Style 2 <track-cut>:<n> --> nAddedallAnalysisCutsList
+        # imported here, TAB autocompletion imports this module and should not pay for urllib
+        from extramodules.libDownloader import downloadLibs, libUrls
         
-        # Merge All possible styles for Sels (cfgBarrelSels and cfgMuonSels) in FilterPP Task
-        f.close() 
-        self.allSels = selsWithOneColon + nAddedallAnalysisCutsList
+        print("[INFO] Some Libs are Missing. They will download.")
+        results = downloadLibs(libUrls(), onlyMissing = True)
+        if "failed" not in results.values():
+            print("[INFO] Libs downloaded succesfully.")
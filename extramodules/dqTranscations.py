@@ -22,7 +22,9 @@ import logging
 import sys
 import os
 
-from .dqExceptions import CentFilterError, CfgInvalidFormatError, DependencyNotFoundError, ForgettedArgsError, MandatoryArgNotFoundError, NotInAlienvError, EventFilterSelectionsError, TasknameNotFoundInConfigFileError, TextListNotStartsWithAtError
+from .dqExceptions import CentFilterError, CfgInvalidFormatError, DependencyNotFoundError, ForgettedArgsError, FusedConfigConflictError, MandatoryArgNotFoundError, NotInAlienvError, NotFusableAnalysisError, EventFilterSelectionsError, ShardedAnalysisError, ShardsNeedAodListError, TasknameNotFoundInConfigFileError, TextListNotStartsWithAtError
+
+SHARD_OPTIONS = ["--shards", "--shardPlan"] # sharded execution generates one workflow per shard
 
 
 def aodFileChecker(aod: str):
@@ -77,6 +79,134 @@ def aodFileChecker(aod: str):
                 sys.exit()
 
 
+def shardsChecker(shards, aod: str, shardPlan = None):
+    """Sharded execution splits an AO2D text list, so it needs a @ prefixed text list as AO2D input (or a shard plan to replay)
+
+    Args:
+        shards (int): CLI argument as shards
+        aod (str): AO2D input (aod-file in the JSON config or --aod)
+        shardPlan (str, optional): CLI argument as shardPlan. Defaults to None.
+
+    Raises:
+        ShardsNeedAodListError: If shards is configured without an AO2D text list
+    """
+    
+    if shardPlan is not None:
+        if not os.path.isfile(shardPlan):
+            logging.error("%s shard plan manifest not found in path!!!", shardPlan)
+            sys.exit()
+        return
+    if shards is None:
+        return
+    if shards < 1:
+        logging.error("Number of shards must be at least 1, provided: %s", shards)
+        sys.exit()
+    try:
+        if aod is None or not aod.startswith("@"):
+            raise ShardsNeedAodListError(aod)
+    except ShardsNeedAodListError as e:
+        logging.exception(e)
+        sys.exit()
+
+
+def pruneForChecker(configFileNames: list):
+    """Table pruning needs the JSON configs or the run scripts with their arguments of the downstream analyses
+
+    Args:
+        configFileNames (list): CLI argument as pruneFor
+    """
+    
+    if configFileNames is None:
+        return
+    if not configFileNames:
+        logging.error("No downstream analysis config for table pruning, add JSON configs (e.g. --pruneFor configs/configAnalysisData.json)")
+        sys.exit()
+    for configFileName in configFileNames:
+        if configFileName.strip().split(" ")[0].endswith(".py"):
+            continue # run script with its arguments, checked when it is prepared
+        jsonTypeChecker(configFileName)
+        if not os.path.isfile(configFileName):
+            logging.error("%s downstream analysis config not found in path!!!", configFileName)
+            sys.exit()
+
+
+def fusedAnalysesChecker(analyses: list):
+    """Fused workflows need at least one analysis, each run script only once and no sharded analysis
+
+    Args:
+        analyses (list): (run script, arguments) of the analyses
+    """
+    
+    if not analyses:
+        logging.error("No analysis to fuse, add run scripts with their arguments (e.g. runTableMaker.py config.json --process BarrelOnly)")
+        sys.exit()
+    scriptNames = [scriptName for scriptName, scriptArgs in analyses]
+    for scriptName in scriptNames:
+        if scriptNames.count(scriptName) > 1:
+            logging.error("%s is configured more than once, each analysis can be fused only once", scriptName)
+            sys.exit()
+    try:
+        for scriptName, scriptArgs in analyses:
+            for arg in scriptArgs:
+                option = arg.split("=", 1)[0]
+                if option in SHARD_OPTIONS:
+                    raise ShardedAnalysisError(scriptName, option)
+    except ShardedAnalysisError as e:
+        logging.exception(e)
+        sys.exit()
+
+
+def pipelineStagesChecker(stages: list):
+    """Pipelines need at least one stage
+
+    Args:
+        stages (list): (run script, arguments) of the stages
+    """
+    
+    if not stages:
+        logging.error(
+            "No stage in the pipeline, add run scripts with their arguments (e.g. runTableMaker.py config.json runTableReader.py config.json)"
+            )
+        sys.exit()
+
+
+def fusedWorkflowChecker(scriptName: str, workflows: list):
+    """The workflow of a fused analysis has to be one pipeline
+
+    Args:
+        scriptName (str): Run script of the analysis
+        workflows (list): Workflows generated by the run script
+
+    Raises:
+        NotFusableAnalysisError: If the analysis generated not exactly one workflow
+    """
+    
+    try:
+        if len(workflows) != 1:
+            raise NotFusableAnalysisError(scriptName, len(workflows))
+    except NotFusableAnalysisError as e:
+        logging.exception(e)
+        sys.exit()
+
+
+def fusedConfigChecker(conflicts: list):
+    """Shared tasks of fused analyses run once, so they have to be configured the same in all analyses
+
+    Args:
+        conflicts (list): Conflicts of the merged JSON config as (task, cfg, dict analysis -> value)
+
+    Raises:
+        FusedConfigConflictError: If a shared task is configured differently
+    """
+    
+    try:
+        if conflicts:
+            raise FusedConfigConflictError(conflicts)
+    except FusedConfigConflictError as e:
+        logging.exception(e)
+        sys.exit()
+
+
 def trackPropagationChecker(trackProp: bool, deps: list):
     """This method automatically deletes the o2-analysis-trackextension(for run2) task from your workflow
     when you add the o2-analysis-track-propagation (for run3)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes validation and autocompletion for d-q-filter-p-p-task selections (cfgBarrelSels, cfgMuonSels)
+# Grammar: <track-cut>:[<pair-cut>]:<n> e.g. jpsiO2MCdebugCuts2::1 or muonQualityCuts:pairNoCut:1
+
+SELS_SEPARATOR = ":"
+SELS_MULTIPLICITIES = [str(n) for n in range(1, 10)]
+SELS_TEMPLATES = ["<track-cut>:<pair-cut>:<n>", "<track-cut>::<n>"]
+
+
+def parseFilterSel(sel: str):
+    """Splits a filter selection into its tokens
+
+    Args:
+        sel (str): Filter selection e.g. muonQualityCuts:pairNoCut:1
+
+    Returns:
+        tuple: (cut, pairCut, n), pairCut is empty string if not used. None if selection is malformed
+    """
+    
+    tokens = sel.split(SELS_SEPARATOR)
+    if len(tokens) != 3:
+        return None
+    return tuple(tokens)
+
+
+class FilterSelsChoices(object):
+    
+    """
+    Container for argparse choices which validates filter selections by the grammar
+    instead of enumerating all <cut>:<pair-cut>:<n> combinations
+
+    Args:
+        object (list): Analysis cuts and pair cuts (set based lookups, e.g. LazyLibList)
+    """
+    
+    def __init__(self, analysisCuts, pairCuts, extraSels = []):
+        self.analysisCuts = analysisCuts
+        self.pairCuts = pairCuts
+        self.extraSels = list(extraSels)
+    
+    def __contains__(self, sel):
+        if sel in self.extraSels:
+            return True
+        tokens = parseFilterSel(sel)
+        if tokens is None:
+            return False
+        cut, pairCut, n = tokens
+        if n not in SELS_MULTIPLICITIES or cut not in self.analysisCuts:
+            return False
+        return pairCut == "" or pairCut in self.pairCuts
+    
+    def __iter__(self):
+        # only used by argparse for invalid choice messages
+        return iter(self.extraSels + SELS_TEMPLATES)
+
+
+class FilterSelsCompleter(object):
+    
+    """
+    argcomplete completer for filter selections. Candidates are generated token by token from the typed prefix
+
+    Args:
+        object (FilterSelsChoices): Filter selection choices
+    """
+    
+    def __init__(self, choices):
+        self.choices = choices
+    
+    def __call__(self, prefix = "", **kwargs):
+        tokens = prefix.split(SELS_SEPARATOR)
+        
+        # <track-cut>
+        if len(tokens) == 1:
+            return [cut + SELS_SEPARATOR for cut in self.choices.analysisCuts if cut.startswith(prefix)]
+        
+        cut = tokens[0]
+        if cut not in self.choices.analysisCuts:
+            return []
+        
+        # [<pair-cut>]
+        if len(tokens) == 2:
+            candidates = [cut + "::" + n for n in SELS_MULTIPLICITIES]
+            candidates += [cut + SELS_SEPARATOR + pairCut + SELS_SEPARATOR for pairCut in self.choices.pairCuts]
+            return [c for c in candidates if c.startswith(prefix)]
+        
+        # <n>
+        if len(tokens) == 3 and (tokens[1] == "" or tokens[1] in self.choices.pairCuts):
+            stem = SELS_SEPARATOR.join(tokens[: 2]) + SELS_SEPARATOR
+            return [stem + n for n in SELS_MULTIPLICITIES if (stem + n).startswith(prefix)]
+        
+        return []
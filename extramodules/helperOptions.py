@@ -14,8 +14,36 @@
 # or submit itself to any jurisdiction.
 
 import argparse
-from argcomplete.completers import ChoicesCompleter
-from extramodules.choicesHandler import ChoicesCompleterList
+from extramodules.argSchema import argumentGroup, argument, choiceListGroup, addSchemaArguments, BOOLEAN_SELECTIONS
+
+# Predefined Selections
+DEBUG_LEVEL_SELECTIONS = {
+    "NOTSET": "Set Debug Level to NOTSET",
+    "DEBUG": "Set Debug Level to DEBUG",
+    "INFO": "Set Debug Level to INFO",
+    "WARNING": "Set Debug Level to WARNING",
+    "ERROR": "Set Debug Level to ERROR",
+    "CRITICAL": "Set Debug Level to CRITICAL",
+    }
+
+# Interface
+HELPER_OPTIONS_SCHEMA = [
+    argumentGroup(
+        "Additional Debug Options",
+        argument(
+            "--debug", help = "execute with debug options", type = str.upper, metavar = "DEBUG", default = "INFO",
+            choices = DEBUG_LEVEL_SELECTIONS
+            ), argument("--logFile", help = "Enable logger for both file and CLI", action = "store_true"),
+        ),
+    choiceListGroup("Choice List for debug Parameters", "--debug"),
+    argumentGroup(
+        "Interface Mode Selection Parameters",
+        argument(
+            "--onlySelect", help = "If false JSON Overrider Interface If true JSON Additional Interface", default = "true",
+            type = str.lower, choices = BOOLEAN_SELECTIONS
+            ),
+        ),
+    ]
 
 
 class HelperOptions(object):
@@ -27,8 +55,10 @@ class HelperOptions(object):
         object (parser_args() object): Helper Options Interface
     """
     
-    def __init__(self, parserHelperOptions = argparse.ArgumentParser(add_help = False)):
+    def __init__(self, parserHelperOptions = None):
         super(HelperOptions, self).__init__()
+        if parserHelperOptions is None:
+            parserHelperOptions = argparse.ArgumentParser(add_help = False)
         self.parserHelperOptions = parserHelperOptions
     
     def addArguments(self):
@@ -36,38 +66,7 @@ class HelperOptions(object):
         This function allows to add arguments for parser_args() function
         """
         
-        # Predefined Selections
-        debugLevelSelections = {
-            "NOTSET": "Set Debug Level to NOTSET",
-            "DEBUG": "Set Debug Level to DEBUG",
-            "INFO": "Set Debug Level to INFO",
-            "WARNING": "Set Debug Level to WARNING",
-            "ERROR": "Set Debug Level to ERROR",
-            "CRITICAL": "Set Debug Level to CRITICAL",
-            }
-        debugLevelSelectionsList = []
-        for k, v in debugLevelSelections.items():
-            debugLevelSelectionsList.append(k)
-        
-        booleanSelections = ["true", "false"]
-        
-        # Interface
-        groupDebugOptions = self.parserHelperOptions.add_argument_group(title = "Additional Debug Options")
-        groupDebugOptions.add_argument(
-            "--debug", help = "execute with debug options", action = "store", type = str.upper, metavar = "DEBUG", default = "INFO",
-            choices = debugLevelSelectionsList,
-            ).completer = ChoicesCompleterList(debugLevelSelectionsList)
-        groupDebugOptions.add_argument("--logFile", help = "Enable logger for both file and CLI", action = "store_true")
-        groupDebug = self.parserHelperOptions.add_argument_group(title = "Choice List for debug Parameters")
-        
-        for key, value in debugLevelSelections.items():
-            groupDebug.add_argument(key, help = value, action = "none")
-        
-        groupAutomations = self.parserHelperOptions.add_argument_group(title = "Interface Mode Selection Parameters")
-        groupAutomations.add_argument(
-            "--onlySelect", help = "If false JSON Overrider Interface If true JSON Additional Interface", action = "store",
-            default = "true", type = str.lower, choices = booleanSelections,
-            ).completer = ChoicesCompleter(booleanSelections)
+        addSchemaArguments(self.parserHelperOptions, HELPER_OPTIONS_SCHEMA)
     
     def parseArgs(self):
         """
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the concurrent and conditional download of the DQ library headers. The headers are fetched in parallel
+# threads, the validators of the server (ETag, Last-Modified) are kept in a sidecar JSON file and sent back with the next request
+# (If-None-Match, If-Modified-Since), so unchanged headers are answered with 304 Not Modified and are not transferred again.
+# Headers are written atomically, a failed download keeps the previous header. The source can be changed with DQ_LIBS_BASE_URL
+# (e.g. a local HTTP server with the O2Physics tree: <base url>/<version>/PWGDQ/Core/CutsLibrary.h).
+
+import os
+import ssl
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+# Temp DQ libraries in working directory and their path in O2Physics
+DQ_LIB_PATHS = {
+    "tempCutsLibrary.h": "PWGDQ/Core/CutsLibrary.h",
+    "tempMCSignalsLibrary.h": "PWGDQ/Core/MCSignalLibrary.h",
+    "tempMixingLibrary.h": "PWGDQ/Core/MixingLibrary.h",
+    "tempHistogramsLibrary.h": "PWGDQ/Core/HistogramsLibrary.h",
+    }
+GITHUB_BASE_URL = "https://github.com/AliceO2Group/O2Physics/blob"
+BASE_URL_ENV = "DQ_LIBS_BASE_URL"
+VALIDATORS_FILE = "tempDQLibsValidators.json" # ETag and Last-Modified of the downloaded headers
+DOWNLOAD_TIMEOUT = 60 # seconds for each request
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_3) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/35.0.1916.47 Safari/537.36"
+    }
+
+
+def libUrls(version = "master", baseUrl = None):
+    """Download URLs of the DQ library headers
+
+    Args:
+        version (str, optional): Branch or production tag of O2Physics (e.g. nightly-20220619). Defaults to "master".
+        baseUrl (str, optional): Source of the O2Physics tree. Defaults to None (DQ_LIBS_BASE_URL or github).
+
+    Returns:
+        dict: Header file name -> URL
+    """
+    
+    baseUrl = (baseUrl or os.environ.get(BASE_URL_ENV) or GITHUB_BASE_URL).rstrip("/")
+    return {
+        lib: baseUrl + "/" + version + "/" + path + "?raw=true"
+        for lib, path in DQ_LIB_PATHS.items()
+        }
+
+
+def readValidators(fileName = VALIDATORS_FILE):
+    """Reads the validators of the downloaded headers
+
+    Args:
+        fileName (str, optional): Validators file. Defaults to VALIDATORS_FILE.
+
+    Returns:
+        dict: Header file name -> url, etag and lastModified
+    """
+    
+    try:
+        with open(fileName) as validatorsFile:
+            return json.load(validatorsFile)
+    except (OSError, ValueError):
+        return {}
+
+
+def writeValidators(validators: dict, fileName = VALIDATORS_FILE):
+    """Writes the validators of the downloaded headers atomically
+
+    Args:
+        validators (dict): Header file name -> url, etag and lastModified
+        fileName (str, optional): Validators file. Defaults to VALIDATORS_FILE.
+    """
+    
+    tempFileName = fileName + "." + str(os.getpid())
+    with open(tempFileName, "w") as validatorsFile:
+        json.dump(validators, validatorsFile, indent = 2)
+    os.replace(tempFileName, fileName)
+
+
+def fetchLib(lib: str, url: str, validator = None, context = None, timeout = DOWNLOAD_TIMEOUT, libDir = ""):
+    """Downloads a header if it is missing or changed (conditional request with the validators of the previous download)
+
+    Args:
+        lib (str): Header file name
+        url (str): Download URL
+        validator (dict, optional): Validators of the previous download of the same URL. Defaults to None (unconditional).
+        context (ssl.SSLContext, optional): SSL context. Defaults to None.
+        timeout (int, optional): Timeout of the request in seconds. Defaults to DOWNLOAD_TIMEOUT.
+        libDir (str, optional): Directory of the headers. Defaults to "" (working directory).
+
+    Returns:
+        tuple: Status (downloaded, unchanged or failed), new validator or error message
+    """
+    
+    libFileName = os.path.join(libDir, lib)
+    headers = dict(HEADERS)
+    if validator is not None and os.path.isfile(libFileName):
+        if validator.get("etag"):
+            headers["If-None-Match"] = validator["etag"]
+        if validator.get("lastModified"):
+            headers["If-Modified-Since"] = validator["lastModified"]
+    
+    try:
+        with urlopen(Request(url, headers = headers), context = context, timeout = timeout) as response:
+            content = response.read()
+            newValidator = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "lastModified": response.headers.get("Last-Modified")
+                }
+    except HTTPError as error:
+        if error.code == 304:
+            return "unchanged", validator
+        return "failed", "HTTP %d %s" % (error.code, error.reason)
+    except (URLError, OSError) as error:
+        return "failed", str(getattr(error, "reason", error))
+    
+    tempFileName = libFileName + "." + str(os.getpid())
+    with open(tempFileName, "wb") as libFile:
+        libFile.write(content)
+    os.replace(tempFileName, libFileName)
+    return "downloaded", newValidator
+
+
+def downloadLibs(urls: dict, onlyMissing = False, validatorsFileName = VALIDATORS_FILE, timeout = DOWNLOAD_TIMEOUT, libDir = ""):
+    """Downloads the DQ library headers concurrently, only missing or changed headers are transferred
+
+    Args:
+        urls (dict): Header file name -> URL (see libUrls)
+        onlyMissing (bool, optional): If True, existing headers are not checked with the server. Defaults to False.
+        validatorsFileName (str, optional): Validators file. Defaults to VALIDATORS_FILE.
+        timeout (int, optional): Timeout of each request in seconds. Defaults to DOWNLOAD_TIMEOUT.
+        libDir (str, optional): Directory of the headers and the validators file. Defaults to "" (working directory).
+
+    Returns:
+        dict: Header file name -> status (downloaded, unchanged, present or failed)
+    """
+    
+    validatorsFileName = os.path.join(libDir, validatorsFileName)
+    validators = readValidators(validatorsFileName)
+    context = ssl._create_unverified_context() # prevent ssl problems
+    results = {
+        lib: "present"
+        for lib in urls
+        if onlyMissing and os.path.isfile(os.path.join(libDir, lib))
+        }
+    toFetch = [lib for lib in urls if lib not in results]
+    
+    with ThreadPoolExecutor(max_workers = max(1, len(toFetch))) as executor:
+        futures = {}
+        for lib in toFetch:
+            validator = validators.get(lib)
+            if validator is not None and validator.get("url") != urls[lib]:
+                validator = None # other version or source, the header is downloaded again
+            futures[lib] = executor.submit(fetchLib, lib, urls[lib], validator, context, timeout, libDir)
+        for lib, future in futures.items():
+            status, result = future.result()
+            results[lib] = status
+            if status == "failed":
+                logging.error("%s could not be downloaded from %s: %s", lib, urls[lib], result)
+                continue
+            validators[lib] = result
+            if status == "downloaded":
+                logging.info("%s downloaded from %s", lib, urls[lib])
+            else:
+                logging.info("%s is up to date (not modified on the server)", lib)
+    
+    try:
+        writeValidators(validators, validatorsFileName)
+    except OSError:
+        pass # read-only working directory, the next download is unconditional
+    return results
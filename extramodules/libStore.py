@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the versioned store of the DQ libraries (DownloadLibs.py). Each library version is kept side by side in a
+# content-addressed directory (objects/<content hash>) with its parsed index, refs map nightly tags, master and local O2Physics
+# checkouts (local-<commit>) to the versions. The temp*Library.h files of the working directory are links to the "current" pointer
+# of the store, which is switched atomically, so switching to a stored version is a pointer flip without download and parsing.
+# The least recently used versions are evicted if the store has more versions (or bytes) than allowed.
+
+import os
+import re
+import shutil
+import logging
+import subprocess
+from extramodules.dqLibGetter import DQ_LIBS, libsHash, loadIndex
+from extramodules.libDownloader import DQ_LIB_PATHS, downloadLibs
+
+STORE_DIR = "tempDQLibsStore"
+STORE_ENV = "DQ_LIBS_STORE"
+MAX_VERSIONS = 5
+CURRENT = "current"
+OBJECTS = "objects"
+REFS = "refs"
+DOWNLOADS = "downloads"
+MUTABLE_REFS = ["master"] # refs which move, they are refreshed with conditional requests instead of taken from the store
+
+
+def storeDir():
+    """Directory of the DQ library store
+
+    Returns:
+        str: DQ_LIBS_STORE or STORE_DIR in the working directory
+    """
+    
+    return os.environ.get(STORE_ENV) or STORE_DIR
+
+
+def refFileName(ref: str, store: str):
+    """File of a ref in the store
+
+    Args:
+        ref (str): Nightly tag, master or local-<commit>
+        store (str): Store directory
+
+    Returns:
+        str: Ref file name (content hash of the version)
+    """
+    
+    return os.path.join(store, REFS, re.sub(r"[^\w.-]", "_", ref))
+
+
+def localRef(o2PhysicsPath: str):
+    """Ref of a local O2Physics checkout
+
+    Args:
+        o2PhysicsPath (str): O2Physics checkout
+
+    Returns:
+        str: local-<commit>, local if the commit is unknown (not a git checkout)
+    """
+    
+    try:
+        commit = subprocess.run(["git", "-C", o2PhysicsPath, "rev-parse", "--short", "HEAD"], capture_output = True,
+                                text = True).stdout.strip()
+    except OSError:
+        commit = ""
+    return "local-" + commit if commit else "local"
+
+
+def touch(path: str):
+    """Marks a version or ref as used (LRU)"""
+    
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def findVersion(ref: str, store: str):
+    """Looks up a ref in the store
+
+    Args:
+        ref (str): Nightly tag, master or local-<commit>
+        store (str): Store directory
+
+    Returns:
+        str or None: Content hash of the version, None if the ref or its version is not in the store
+    """
+    
+    try:
+        with open(refFileName(ref, store)) as refFile:
+            contentHash = refFile.read().strip()
+    except OSError:
+        return None
+    if not os.path.isdir(os.path.join(store, OBJECTS, contentHash)):
+        return None
+    touch(refFileName(ref, store))
+    return contentHash
+
+
+def addVersion(ref: str, sources: dict, store: str, linkSources = False):
+    """Adds a library version to the store (if its content is new) with its parsed index and points the ref to it
+
+    Args:
+        ref (str): Nightly tag, master or local-<commit>
+        sources (dict): Header file name -> source file
+        store (str): Store directory
+        linkSources (bool, optional): Hard links the sources instead of copying them, only for sources which are never changed in
+        place (downloads of the store, fetchLib replaces them). Defaults to False (local checkouts are edited in place).
+
+    Returns:
+        str: Content hash of the version
+    """
+    
+    objects = os.path.join(store, OBJECTS)
+    staging = os.path.join(objects, ".staging-" + str(os.getpid()))
+    if os.path.isdir(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+    for lib in DQ_LIBS:
+        if linkSources:
+            try:
+                os.link(sources[lib], os.path.join(staging, lib))
+                continue
+            except OSError:
+                pass # other file system
+        shutil.copy2(sources[lib], os.path.join(staging, lib))
+    
+    contentHash = libsHash(libDir = staging)
+    objectDir = os.path.join(objects, contentHash)
+    if os.path.isdir(objectDir):
+        shutil.rmtree(staging)
+    else:
+        loadIndex(libDir = staging) # parsed index of this version, kept next to its headers
+        try:
+            os.rename(staging, objectDir)
+        except OSError:
+            shutil.rmtree(staging) # added concurrently
+    
+    os.makedirs(os.path.join(store, REFS), exist_ok = True)
+    tempFileName = refFileName(ref, store) + "." + str(os.getpid())
+    with open(tempFileName, "w") as refFile:
+        refFile.write(contentHash + "\n")
+    os.replace(tempFileName, refFileName(ref, store))
+    return contentHash
+
+
+def currentVersion(store: str):
+    """Current version of the store
+
+    Args:
+        store (str): Store directory
+
+    Returns:
+        str or None: Content hash of the current version, None if no version is current
+    """
+    
+    try:
+        return os.path.basename(os.readlink(os.path.join(store, CURRENT)))
+    except OSError:
+        return None
+
+
+def replaceWithLink(target: str, linkName: str):
+    """Replaces a file with a symbolic link atomically
+
+    Args:
+        target (str): Target of the link
+        linkName (str): Link file name
+    """
+    
+    tempLinkName = linkName + "." + str(os.getpid())
+    if os.path.lexists(tempLinkName):
+        os.remove(tempLinkName)
+    os.symlink(target, tempLinkName)
+    os.replace(tempLinkName, linkName)
+
+
+def switchVersion(contentHash: str, store: str, workDir = "."):
+    """Switches the current pointer of the store atomically and links the headers of the working directory to it
+
+    Args:
+        contentHash (str): Content hash of the version
+        store (str): Store directory
+        workDir (str, optional): Working directory of the run scripts. Defaults to ".".
+
+    Returns:
+        bool: True if the libraries of the working directory are changed
+    """
+    
+    changed = currentVersion(store) != contentHash
+    if changed:
+        replaceWithLink(os.path.join(OBJECTS, contentHash), os.path.join(store, CURRENT))
+    touch(os.path.join(store, OBJECTS, contentHash))
+    
+    for lib in DQ_LIBS:
+        linkName = os.path.join(workDir, lib)
+        target = os.path.relpath(os.path.join(os.path.abspath(store), CURRENT, lib), os.path.abspath(workDir))
+        if os.path.islink(linkName) and os.readlink(linkName) == target:
+            continue
+        replaceWithLink(target, linkName)
+        changed = True
+    return changed
+
+
+def directorySize(path: str):
+    """Size of the files in a directory in bytes"""
+    
+    return sum(os.path.getsize(os.path.join(path, fileName)) for fileName in os.listdir(path))
+
+
+def evictVersions(store: str, maxVersions = MAX_VERSIONS, maxBytes = None):
+    """Evicts the least recently used versions (never the current one) and the refs pointing to them
+
+    Args:
+        store (str): Store directory
+        maxVersions (int, optional): Largest number of versions. Defaults to MAX_VERSIONS.
+        maxBytes (int, optional): Largest size of the versions in bytes. Defaults to None (no size limit).
+
+    Returns:
+        list: Evicted content hashes
+    """
+    
+    objects = os.path.join(store, OBJECTS)
+    current = currentVersion(store)
+    versions = sorted(
+        (os.path.getmtime(os.path.join(objects, contentHash)), contentHash)
+        for contentHash in os.listdir(objects)
+        if not contentHash.startswith(".")
+        )
+    sizes = {
+        contentHash: directorySize(os.path.join(objects, contentHash))
+        for lastUsed, contentHash in versions
+        }
+    
+    evicted = []
+    for lastUsed, contentHash in versions:
+        remaining = [version for version in sizes if version not in evicted]
+        if len(remaining) <= maxVersions and (maxBytes is None or sum(sizes[version] for version in remaining) <= maxBytes):
+            break
+        if contentHash == current:
+            continue
+        shutil.rmtree(os.path.join(objects, contentHash), ignore_errors = True)
+        evicted.append(contentHash)
+    
+    refs = os.path.join(store, REFS)
+    for ref in os.listdir(refs) if os.path.isdir(refs) else []:
+        with open(os.path.join(refs, ref)) as refFile:
+            if refFile.read().strip() in evicted:
+                os.remove(os.path.join(refs, ref))
+                logging.info("DQ libraries %s evicted from the store (least recently used)", ref)
+    return evicted
+
+
+def useVersion(ref: str, urls = None, o2PhysicsPath = None, store = None, workDir = ".", maxVersions = MAX_VERSIONS):
+    """Makes a DQ library version current: taken from the store if it is there (pointer flip), otherwise downloaded
+    (mutable refs like master are refreshed with conditional requests) or copied from a local O2Physics checkout
+
+    Args:
+        ref (str): Nightly tag, master or local-<commit>
+        urls (dict, optional): Header file name -> download URL (see libUrls). Defaults to None.
+        o2PhysicsPath (str, optional): Local O2Physics checkout, used instead of urls. Defaults to None.
+        store (str, optional): Store directory. Defaults to None (see storeDir).
+        workDir (str, optional): Working directory of the run scripts. Defaults to ".".
+        maxVersions (int, optional): Largest number of versions in the store. Defaults to MAX_VERSIONS.
+
+    Returns:
+        tuple: Content hash of the version (None if the download failed), True if the libraries of the working directory are changed
+    """
+    
+    store = store or storeDir()
+    contentHash = None
+    if o2PhysicsPath is not None:
+        sources = {
+            lib: os.path.join(o2PhysicsPath, path)
+            for lib, path in DQ_LIB_PATHS.items()
+            }
+        contentHash = addVersion(ref, sources, store)
+    elif ref not in MUTABLE_REFS:
+        contentHash = findVersion(ref, store)
+        if contentHash is not None:
+            logging.info("DQ libraries %s found in the store, no download needed", ref)
+    
+    if contentHash is None:
+        downloadDir = os.path.join(store, DOWNLOADS, os.path.basename(refFileName(ref, store)))
+        os.makedirs(downloadDir, exist_ok = True)
+        results = downloadLibs(urls, libDir = downloadDir)
+        if "failed" in results.values():
+            return None, False
+        sources = {
+            lib: os.path.join(downloadDir, lib)
+            for lib in DQ_LIBS
+            }
+        contentHash = addVersion(ref, sources, store, linkSources = True)
+        if ref not in MUTABLE_REFS:
+            shutil.rmtree(downloadDir, ignore_errors = True) # tags don't change, no refresh needed
+    
+    changed = switchVersion(contentHash, store, workDir)
+    evictVersions(store, maxVersions)
+    logging.info("DQ libraries %s (%s) are current, the store %s keeps %d versions", ref, contentHash[: 12], store, maxVersions)
+    return contentHash, changed
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the memory budget of the node (/proc/meminfo and the cgroup memory limit of batch slots and containers)
+# and the sizing of the DPL shared memory segment (--shm-segment-size) and the AOD reader rate limit (--aod-memory-rate-limit).
+# In auto mode (--memorySizing auto) the segment is derived from the memory budget of one workflow (budget / concurrent shard workflows),
+# the largest AO2D input file and the number of produced tables, values configured in CLI are kept as they are. If the budget
+# can't give each concurrent workflow a segment of SHM_MIN, fewer workflows run concurrently, if not even one fits the run fails.
+
+import os
+import sys
+import logging
+from extramodules.dqExceptions import MemoryBudgetError
+
+SHM_SEGMENT_SIZE = 12000000000 # fixed segment of the run scripts (--memorySizing fixed)
+SHM_MIN = 1024**3 # smallest auto sized segment, DPL workflows don't run with less
+SHM_BUDGET_FRACTION = 0.5 # the rest of the workflow budget is left to the device processes (ROOT, CCDB objects, histograms)
+SHM_BASE = 512 * 1024**2 # messages of the devices which don't scale with the input (BCs, collisions, CCDB objects)
+SHM_PER_TABLE = 64 * 1024**2 # in-flight output of each produced table until it is written
+SHM_PER_INPUT_BYTE = 4 # decompressed tables of the largest AO2D file in flight (compression factor and reader/processing overlap)
+DEFAULT_AOD_SIZE = 1024**3 # size estimate of AO2D files with unknown size (e.g. alien://) if no size is known
+RATE_LIMIT_FRACTION = 0.5 # part of the segment the AOD reader may fill before it waits for the devices
+CGROUP_ROOT = "/sys/fs/cgroup"
+CGROUP_NO_LIMIT = 2**60 # cgroup v1 reports a page aligned maximum value if there is no limit
+
+
+def readMeminfo():
+    """Total and available memory of the node
+
+    Returns:
+        dict: MemTotal and MemAvailable of /proc/meminfo in bytes (missing if unknown)
+    """
+    
+    meminfo = {}
+    try:
+        with open("/proc/meminfo") as meminfoFile:
+            for line in meminfoFile:
+                key, value = line.split(":", 1)
+                if key in ["MemTotal", "MemAvailable"]:
+                    meminfo[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return meminfo
+
+
+def readCgroupValue(fileName: str):
+    """Reads an integer value of a cgroup file
+
+    Args:
+        fileName (str): cgroup file
+
+    Returns:
+        int or None: Value, None if the file is missing or has no limit (max)
+    """
+    
+    try:
+        with open(fileName) as cgroupFile:
+            value = cgroupFile.read().strip()
+    except OSError:
+        return None
+    if not value.isdigit() or int(value) >= CGROUP_NO_LIMIT:
+        return None
+    return int(value)
+
+
+def readCgroupStat(fileName: str, key: str):
+    """Reads a value of a cgroup memory.stat file
+
+    Args:
+        fileName (str): memory.stat file
+        key (str): Statistic e.g. inactive_file
+
+    Returns:
+        int: Value, 0 if it is unknown
+    """
+    
+    try:
+        with open(fileName) as statFile:
+            for line in statFile:
+                name, value = line.split()
+                if name == key:
+                    return int(value)
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def cgroupMemory():
+    """Memory limit and usage of the cgroup of this process (cgroup v2 or v1)
+
+    Returns:
+        tuple: Limit and usage in bytes (reclaimable page cache is not counted as usage), (None, None) if there is no limit
+    """
+    
+    paths = {}
+    try:
+        with open("/proc/self/cgroup") as cgroupFile:
+            for line in cgroupFile:
+                hierarchy, controllers, path = line.strip().split(":", 2)
+                paths[controllers] = path
+    except (OSError, ValueError):
+        pass
+    
+    # cgroup v2 (unified hierarchy), the path is relative to the namespace root in containers
+    for cgroupDir in [os.path.join(CGROUP_ROOT, paths.get("", "/").lstrip("/")), CGROUP_ROOT]:
+        limit = readCgroupValue(os.path.join(cgroupDir, "memory.max"))
+        if limit is not None:
+            usage = readCgroupValue(os.path.join(cgroupDir, "memory.current")) or 0
+            return limit, max(0, usage - readCgroupStat(os.path.join(cgroupDir, "memory.stat"), "inactive_file"))
+    
+    # cgroup v1
+    memoryPath = next((path for controllers, path in paths.items() if "memory" in controllers.split(",")), "/")
+    for cgroupDir in [os.path.join(CGROUP_ROOT, "memory", memoryPath.lstrip("/")), os.path.join(CGROUP_ROOT, "memory")]:
+        limit = readCgroupValue(os.path.join(cgroupDir, "memory.limit_in_bytes"))
+        if limit is not None:
+            usage = readCgroupValue(os.path.join(cgroupDir, "memory.usage_in_bytes")) or 0
+            return limit, max(0, usage - readCgroupStat(os.path.join(cgroupDir, "memory.stat"), "total_inactive_file"))
+    return None, None
+
+
+def memoryBudget():
+    """Memory budget of the node: available memory of the node, limited by the free memory of the cgroup
+
+    Returns:
+        dict: memTotal, memAvailable, cgroupLimit, cgroupUsage and available in bytes (None if unknown)
+    """
+    
+    meminfo = readMeminfo()
+    cgroupLimit, cgroupUsage = cgroupMemory()
+    candidates = [meminfo.get("MemAvailable")]
+    if cgroupLimit is not None:
+        candidates.append(max(0, cgroupLimit - cgroupUsage))
+    candidates = [candidate for candidate in candidates if candidate is not None]
+    return {
+        "memTotal": meminfo.get("MemTotal"),
+        "memAvailable": meminfo.get("MemAvailable"),
+        "cgroupLimit": cgroupLimit,
+        "cgroupUsage": cgroupUsage,
+        "available": min(candidates) if candidates else None
+        }
+
+
+def availableMemoryGb():
+    """Available memory of the node
+
+    Returns:
+        float or None: Available memory (also within the cgroup limit) in GB, None if it is unknown
+    """
+    
+    available = memoryBudget()["available"]
+    return None if available is None else available / 1024**3
+
+
+def formatGb(size):
+    """Formats a size in bytes for the logs
+
+    Args:
+        size (int or None): Size in bytes
+
+    Returns:
+        str: Size in GB or unknown
+    """
+    
+    return "unknown" if size is None else "%.2f GB" % (size / 1024**3)
+
+
+def sizeSharedMemory(tablesToProduce: dict, inputSizes: list, concurrentWorkflows = 1, shmSegmentSize = None, aodMemoryRateLimit = None):
+    """Auto sizing of the shared memory segment and the AOD reader rate limit, the decision and its inputs are logged
+
+    Args:
+        tablesToProduce (dict): Tables in the output of the workflow
+        inputSizes (list): Sizes of the AO2D input files in bytes (None if unknown)
+        concurrentWorkflows (int, optional): Workflows running at the same time on the node (shards). Defaults to 1.
+        shmSegmentSize (int, optional): Segment size configured in CLI, kept if it is configured. Defaults to None.
+        aodMemoryRateLimit (str, optional): Rate limit configured in CLI, kept if it is configured. Defaults to None.
+
+    Returns:
+        tuple: Shared memory segment size and AOD memory rate limit in bytes, concurrent workflows (reduced if the budget can't give
+        each of them a segment of SHM_MIN)
+    """
+    
+    budget = memoryBudget()
+    knownSizes = [size for size in inputSizes if size is not None]
+    largestInput = max(knownSizes) if knownSizes else (DEFAULT_AOD_SIZE if inputSizes else 0)
+    demand = SHM_BASE + SHM_PER_TABLE * len(tablesToProduce) + SHM_PER_INPUT_BYTE*largestInput
+    concurrentWorkflows = max(1, concurrentWorkflows)
+    workflowBudget = None
+    if budget["available"] is not None:
+        fittingWorkflows = int(budget["available"] * SHM_BUDGET_FRACTION // SHM_MIN) # workflows with a segment of SHM_MIN
+        if not shmSegmentSize and fittingWorkflows < 1:
+            try:
+                raise MemoryBudgetError(budget["available"], SHM_MIN / SHM_BUDGET_FRACTION)
+            except MemoryBudgetError as e:
+                logging.exception(e)
+                sys.exit(1)
+        if not shmSegmentSize and fittingWorkflows < concurrentWorkflows:
+            logging.warning(
+                "Available memory of %s gives a shared memory segment of %s to %d of %d concurrent workflows, %d workflows run concurrently",
+                formatGb(budget["available"]), formatGb(SHM_MIN), fittingWorkflows, concurrentWorkflows, fittingWorkflows
+                )
+            concurrentWorkflows = fittingWorkflows
+        workflowBudget = budget["available"] // concurrentWorkflows
+    
+    logging.info(
+        "Memory budget: node total %s, available %s, cgroup limit %s (used %s) -> %s for each of %d concurrent workflows",
+        formatGb(budget["memTotal"]), formatGb(budget["memAvailable"]), formatGb(budget["cgroupLimit"]), formatGb(budget["cgroupUsage"]),
+        formatGb(workflowBudget), concurrentWorkflows
+        )
+    logging.info(
+        "Shared memory demand: %s (%d tables to produce, largest of %d AO2D inputs %s%s)", formatGb(demand), len(tablesToProduce),
+        len(inputSizes), formatGb(largestInput),
+        "" if len(knownSizes) == len(inputSizes) else ", %d sizes unknown" % (len(inputSizes) - len(knownSizes))
+        )
+    
+    if shmSegmentSize:
+        logging.info("Shared memory segment: %s (configured in CLI)", formatGb(shmSegmentSize))
+    elif workflowBudget is None:
+        shmSegmentSize = SHM_SEGMENT_SIZE
+        logging.warning("Memory budget is unknown, shared memory segment: %s (fixed)", formatGb(shmSegmentSize))
+    else:
+        limit = int(workflowBudget * SHM_BUDGET_FRACTION)
+        shmSegmentSize = min(max(demand, SHM_MIN), limit)
+        logging.info(
+            "Shared memory segment: %s (demand %s, limit %.0f%% of the workflow budget %s)", formatGb(shmSegmentSize), formatGb(demand),
+            SHM_BUDGET_FRACTION * 100, formatGb(limit)
+            )
+        if shmSegmentSize < demand:
+            logging.warning("Shared memory segment is smaller than the demand, the AOD reader is rate limited to stay within the budget")
+    
+    if aodMemoryRateLimit:
+        logging.info("AOD memory rate limit: %s (configured in CLI)", aodMemoryRateLimit)
+    else:
+        aodMemoryRateLimit = int(shmSegmentSize * RATE_LIMIT_FRACTION)
+        logging.info(
+            "AOD memory rate limit: %s (%.0f%% of the shared memory segment)", formatGb(aodMemoryRateLimit), RATE_LIMIT_FRACTION * 100
+            )
+    return shmSegmentSize, aodMemoryRateLimit, concurrentWorkflows
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the cut-aware pruning of the PID species (--pidPruning cuts). The selected barrel track cuts are resolved
+# with the cut composition index (composite cut -> analysis cuts -> VarManager variables), the nσ variables (kTPCnSigmaXx, kTOFnSigmaXx)
+# give the species each detector has to compute for the cuts. Species forced on (1) in tpc-pid-full/tof-pid-full which are not used
+# by any cut are set back to the automatic setup (-1), so their tables are only produced if a device subscribes to them. The barrel
+# track join of table-maker subscribes to the full tables of el, mu, pi, ka and pr, so these species are computed anyway and are
+# kept as configured, only the species no device subscribes to stop being computed.
+
+import re
+import logging
+
+TRACK_CUTS_CFG = "cfgBarrelTrackCuts"
+NSIGMA_VARIABLE = re.compile(r"k(TPC|TOF)nSigma(El|Mu|Pi|Ka|Pr|De|Tr|He|Al)(?:Randomized)?\b")
+PID_TASK_DETECTORS = {
+    "tpc-pid": "TPC",
+    "tpc-pid-full": "TPC",
+    "tof-pid": "TOF",
+    "tof-pid-full": "TOF",
+    }
+PID_ON = "1"
+PID_AUTO = "-1"
+# Species of the pidTPCFull*/pidTOFFull* tables subscribed by the barrel track join of table-maker/table-maker-m-c
+TABLE_MAKER_SUBSCRIPTIONS = {
+    "TPC": ["el", "mu", "pi", "ka", "pr"],
+    "TOF": ["el", "mu", "pi", "ka", "pr"]
+    }
+
+
+def selectedTrackCuts(config: dict):
+    """Barrel track cuts selected in the JSON config (cfgBarrelTrackCuts of all tasks)
+
+    Args:
+        config (dict): Updated JSON config
+
+    Returns:
+        list: Cut names in order of appearance
+    """
+    
+    cuts = []
+    for task, cfgValuePair in config.items():
+        if isinstance(cfgValuePair, dict) and cfgValuePair.get(TRACK_CUTS_CFG):
+            for cut in cfgValuePair[TRACK_CUTS_CFG].split(","):
+                if cut.strip() and cut.strip() not in cuts:
+                    cuts.append(cut.strip())
+    return cuts
+
+
+def pidSpecies(cutNames: list, cutsIndex):
+    """Species of the nσ variables used by the cuts for each detector
+
+    Args:
+        cutNames (list): Selected cuts (composite cuts or analysis cuts)
+        cutsIndex (CutsIndex): Cut composition index of the cuts library
+
+    Returns:
+        tuple: Detector -> species -> cuts using them, cuts which are not in the library
+    """
+    
+    species = {
+        "TPC": {},
+        "TOF": {}
+        }
+    unknownCuts = []
+    for cutName in cutNames:
+        variables = cutsIndex.variables(cutName)
+        if variables is None:
+            unknownCuts.append(cutName)
+            continue
+        for variable in variables:
+            match = NSIGMA_VARIABLE.match(variable)
+            if match:
+                users = species[match.group(1)].setdefault(match.group(2).lower(), [])
+                if cutName not in users:
+                    users.append(cutName)
+    return species, unknownCuts
+
+
+def prunePidSpecies(config: dict, species: dict, subscribedSpecies = TABLE_MAKER_SUBSCRIPTIONS):
+    """Sets the pid-* switches of the PID tasks which are on (1) but not used by the cuts to the automatic setup (-1),
+    species subscribed by other devices are computed anyway and kept as configured
+
+    Args:
+        config (dict): Updated JSON config
+        species (dict): Detector -> species -> cuts (see pidSpecies)
+        subscribedSpecies (dict, optional): Detector -> species subscribed by the devices. Defaults to TABLE_MAKER_SUBSCRIPTIONS.
+
+    Returns:
+        tuple: Pruned switches as (task, pid switch), unused switches kept for the subscriptions as (task, pid switch)
+    """
+    
+    pruned = []
+    subscribed = []
+    for task, detector in PID_TASK_DETECTORS.items():
+        for cfg, value in config.get(task, {}).items():
+            if not cfg.startswith("pid-") or value != PID_ON or cfg[len("pid-"):] in species[detector]:
+                continue
+            if cfg[len("pid-"):] in subscribedSpecies.get(detector, []):
+                subscribed.append((task, cfg))
+                continue
+            config[task][cfg] = PID_AUTO
+            pruned.append((task, cfg))
+    return pruned, subscribed
+
+
+def logPidPruning(species: dict, pruned: list, subscribed = ()):
+    """Logs the species used by the cuts, the pruned pid-* switches and the unused ones which stay computed
+
+    Args:
+        species (dict): Detector -> species -> cuts (see pidSpecies)
+        pruned (list): Pruned switches as (task, pid switch)
+        subscribed (list, optional): Unused switches kept for the subscriptions as (task, pid switch). Defaults to ().
+    """
+    
+    for detector, detectorSpecies in species.items():
+        for name, cuts in detectorSpecies.items():
+            logging.info("PID pruning: %s nσ %s is used by %s", detector, name, ", ".join(cuts))
+    for task, cfg in pruned:
+        logging.info("PID pruning: [%s] %s : %s (not used by the cuts, not computed)", task, cfg, PID_AUTO)
+    for task, cfg in subscribed:
+        logging.info("PID pruning: [%s] %s not used by the cuts, kept (subscribed by table-maker, computed anyway)", task, cfg)
+    if not pruned and not subscribed:
+        logging.info("PID pruning: all enabled species are used by the cuts")
+    elif not pruned:
+        logging.info("PID pruning: no species stops being computed")
+
+
+def pidPruning(config: dict, cutsIndex):
+    """Cut-aware pruning of the PID species of the JSON config
+
+    Args:
+        config (dict): Updated JSON config
+        cutsIndex (CutsIndex): Cut composition index of the cuts library
+
+    Returns:
+        list: Pruned switches as (task, pid switch), nothing is pruned if a selected cut is not in the library
+    """
+    
+    species, unknownCuts = pidSpecies(selectedTrackCuts(config), cutsIndex)
+    if unknownCuts:
+        logging.warning("PID pruning: %s not in the cuts library, the PID species are not pruned", ", ".join(unknownCuts))
+        return []
+    pruned, subscribed = prunePidSpecies(config, species)
+    logPidPruning(species, pruned, subscribed)
+    return pruned
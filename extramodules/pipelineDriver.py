@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the incremental execution of analysis chains (runPipeline.py), e.g. tableMaker -> tableReader -> dqEfficiency.
+# Each stage is prepared with its run script in the workflow plan mode, the hashes of its inputs (devices and options, JSON config,
+# aod-writer and aod-reader descriptors, AO2D input files with sizes and mtimes) are compared with the state of its last successful
+# run. A stage is skipped like a make target if its inputs are unchanged and its outputs are still there, once a stage runs all
+# downstream stages run again.
+
+import os
+import json
+import glob
+from extramodules.shardRunner import AOD_MERGER
+from extramodules.workflowCommand import AOD_FILE_CFG, configFileOf, digest, fileDigest, fileStat, inputFiles, parsePipeline
+
+# Run scripts which can be stages of a pipeline
+PIPELINE_SCRIPTS = [
+    "runTableMaker.py", "runTableMakerMC.py", "runTableReader.py", "runDQEfficiency.py", "runFilterPP.py", "runV0selector.py",
+    "runDQFlow.py", "runEMEfficiency.py", "runEMEfficiencyNotSkimmed.py",
+    ]
+PIPELINE_STATE = "tempPipelineState.json"
+WRITER_OPTION = "--aod-writer-json"
+MERGER_OUTPUT = "--output" # merged output of the o2-aod-merger of sharded stages
+MERGER_INPUT = "--input" # list of the shard outputs, it is in the shard directory of the run and follows from the shard workflows
+READER_CFG = "aod-reader-json"
+
+
+def stageInputs(workflows: list):
+    """Hashes of the inputs of a stage
+
+    Args:
+        workflows (list): Recorded workflows of the stage (dicts with command and cwd)
+
+    Returns:
+        dict: Hashes of the workflow (devices and options), config, writer, reader and input files, number of input files
+    """
+    
+    devices, configs, writers, readers, inputs = [], [], [], [], []
+    for workflow in workflows:
+        cwd = workflow["cwd"]
+        pipeline = parsePipeline(workflow["command"])
+        for executable, options in pipeline:
+            ignored = [WRITER_OPTION, MERGER_INPUT] if executable == AOD_MERGER else [WRITER_OPTION]
+            devices.append([executable, [[option, value] for option, value in options if option not in ignored]])
+            writers += [fileDigest(os.path.join(cwd, value)) for option, value in options if option == WRITER_OPTION]
+        
+        configFileName = configFileOf(workflow["command"], cwd)
+        config = {}
+        if configFileName is not None:
+            with open(configFileName) as configFile:
+                config = json.load(configFile)
+        for task, cfgValuePair in config.items():
+            if not isinstance(cfgValuePair, dict):
+                continue
+            if cfgValuePair.get(AOD_FILE_CFG):
+                inputs += inputFiles(cfgValuePair.pop(AOD_FILE_CFG), cwd) # input files are compared by size and mtime
+            if cfgValuePair.get(READER_CFG):
+                readers.append(fileDigest(os.path.join(cwd, cfgValuePair[READER_CFG])))
+        configs.append(config)
+    
+    return {
+        "workflow": digest(devices),
+        "config": digest(configs),
+        "writer": digest(writers),
+        "reader": digest(readers),
+        "inputs": digest(inputs),
+        "inputFiles": len(inputs)
+        }
+
+
+def stageOutputs(workflows: list):
+    """Output files of a stage (resfile of the aod-writer descriptors, merged output of sharded stages), AnalysisResults.root is
+    shared by all stages and not tracked
+
+    Args:
+        workflows (list): Recorded workflows of the stage (dicts with command and cwd)
+
+    Returns:
+        list: File name, size and mtime of the output files
+    """
+    
+    outputs = []
+    # the shard outputs of sharded stages are intermediate, only the merged output is tracked
+    mergers = [workflow for workflow in workflows if parsePipeline(workflow["command"])[0][0] == AOD_MERGER]
+    for workflow in mergers or workflows:
+        for executable, options in parsePipeline(workflow["command"]):
+            if executable == AOD_MERGER:
+                outputs += [fileStat(os.path.join(workflow["cwd"], value)) for option, value in options if option == MERGER_OUTPUT]
+                continue
+            for option, value in options:
+                if option != WRITER_OPTION:
+                    continue
+                with open(os.path.join(workflow["cwd"], value)) as writerConfigFile:
+                    resfile = json.load(writerConfigFile).get("OutputDirector", {}).get("resfile")
+                if resfile:
+                    outputs += [fileStat(fileName) for fileName in sorted(glob.glob(os.path.join(workflow["cwd"], resfile + "*.root")))]
+    return outputs
+
+
+def changedInputs(stageState: dict, inputs: dict):
+    """Inputs of a stage which changed since its last successful run
+
+    Args:
+        stageState (dict): State of the last run (inputs and outputs), None if the stage never ran
+        inputs (dict): Hashes of the current inputs (see stageInputs)
+
+    Returns:
+        list: Names of the changed inputs, missing or modified outputs included
+    """
+    
+    if stageState is None:
+        return ["no previous run"]
+    changed = [name for name, value in inputs.items() if name != "inputFiles" and stageState["inputs"].get(name) != value]
+    if any(fileStat(fileName) != [fileName, size, mtime] for fileName, size, mtime in stageState["outputs"]):
+        changed.append("outputs")
+    return changed
+
+
+def readState(stateFileName = PIPELINE_STATE):
+    """Reads the state of the stages
+
+    Args:
+        stateFileName (str, optional): State file. Defaults to PIPELINE_STATE.
+
+    Returns:
+        dict: Stage -> inputs and outputs of its last successful run
+    """
+    
+    try:
+        with open(stateFileName) as stateFile:
+            return json.load(stateFile)
+    except (OSError, ValueError):
+        return {}
+
+
+def writeState(state: dict, stateFileName = PIPELINE_STATE):
+    """Writes the state of the stages atomically
+
+    Args:
+        state (dict): Stage -> inputs and outputs of its last successful run
+        stateFileName (str, optional): State file. Defaults to PIPELINE_STATE.
+    """
+    
+    tempFileName = stateFileName + "." + str(os.getpid())
+    with open(tempFileName, "w") as stateFile:
+        json.dump(state, stateFile, indent = 2)
+    os.replace(tempFileName, stateFileName)
@@ -13,12 +13,40 @@
 # granted to it by virtue of its status as an Intergovernmental Organization
 # or submit itself to any jurisdiction.
 
-# This scripts provides remove pycache files recursively
+# This scripts provides a per-user pycache prefix for keeping the checkout clean (and remove pycache files recursively for old checkouts)
 
 import os
 import logging
 import sys
 
+# Environment variable for configuring the pycache prefix (PYTHONPYCACHEPREFIX of python is also respected)
+PYCACHE_PREFIX_ENV = "DQ_PYCACHE_PREFIX"
+
+
+def defaultPycachePrefix():
+    """Per-user bytecode cache directory outside the repository
+
+    Returns:
+        str: $DQ_PYCACHE_PREFIX or $XDG_CACHE_HOME/o2-dq-interface/pycache (default ~/.cache/o2-dq-interface/pycache)
+    """
+    
+    if os.environ.get(PYCACHE_PREFIX_ENV):
+        return os.environ[PYCACHE_PREFIX_ENV]
+    cacheHome = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cacheHome, "o2-dq-interface", "pycache")
+
+
+def setPycachePrefix():
+    """Keeps compiled bytecode of the interface in a per-user cache directory, so warm starts reuse it and the checkout stays clean.
+    Run scripts disable bytecode writing before importing this module, it is enabled again here (unless python runs with -B)
+    """
+    
+    if not hasattr(sys, "pycache_prefix"):
+        return # python < 3.8, bytecode stays disabled
+    if sys.pycache_prefix is None:
+        sys.pycache_prefix = defaultPycachePrefix()
+    sys.dont_write_bytecode = bool(sys.flags.dont_write_bytecode)
+
 
 class PycacheRemover(object):
     
@@ -40,7 +68,8 @@ class PycacheRemover(object):
 
 
 def runPycacheRemover():
-    """This function run two python command and it provides recursively deletes pycache files
+    """This function run two python command and it provides recursively deletes pycache files.
+    Run scripts use setPycachePrefix instead, it is only needed for cleaning old checkouts
 
     Raises:
         BaseException: If not path exists in OS
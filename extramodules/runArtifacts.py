@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the generated files of the run scripts. JSON configs and aod-writer/aod-reader descriptors are written
+# content-addressed into tempRunArtifacts (<name>-<content hash>.json) and the generated O2 command references them explicitly,
+# so runs in the same checkout never overwrite each other's files and equal files are shared. Files which belong to one run
+# (workflow logs, shard directories, workflow plans) go to per-run directories named by the run id (<script>-<time>-<pid>).
+# The workflow itself runs in its run directory (tempWorkflowRuns/<run id>), so the outputs of concurrent runs (reducedAod.root,
+# AnalysisResults.root, dpl-config.json) don't collide, the outputs of a successful run are published into the current directory.
+# Run directories beyond the newest KEEP_RUNS or older than MAX_AGE_DAYS and generated files unused for MAX_AGE_DAYS are removed,
+# generated files referenced by the pipeline state or a shard plan are kept.
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import shutil
+import hashlib
+import logging
+
+ARTIFACT_FOLDER = "tempRunArtifacts"
+WORKFLOW_RUN_FOLDER = "tempWorkflowRuns"
+HASH_LENGTH = 16 # hex digits of the content hash in the file name
+RUN_ID = "%s-%s-%d" % (os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python", time.strftime("%Y%m%d-%H%M%S"), os.getpid())
+INPUT_PATH_CFGS = ["aod-file", "aod-reader-json"] # paths of the JSON config relative to the current directory
+KEEP_RUNS = 20 # run directories kept per parent directory
+MAX_AGE_DAYS = 7 # older run directories and generated files are removed
+ARTIFACT_REFERENCES = ["tempPipelineState.json", os.path.join("tempShards", "*", "shardPlan.json")] # saved files using generated files
+
+
+def writeArtifact(content, fileName: str, folder = ARTIFACT_FOLDER):
+    """Writes a generated file content-addressed (atomically, only if it does not exist)
+
+    Args:
+        content (dict or str): JSON content or text (e.g. AO2D text list)
+        fileName (str): Name of the file, e.g. tempConfigTableMaker.json (the content hash is added before the extension)
+        folder (str, optional): Directory of the generated files. Defaults to ARTIFACT_FOLDER.
+
+    Returns:
+        str: Path of the written file, to be referenced in the O2 command
+    """
+    
+    data = content.encode() if isinstance(content, str) else json.dumps(content, indent = 2).encode()
+    stem, extension = os.path.splitext(os.path.basename(fileName))
+    artifact = os.path.join(folder, stem + "-" + hashlib.sha256(data).hexdigest()[: HASH_LENGTH] + (extension or ".json"))
+    if os.path.isfile(artifact):
+        os.utime(artifact) # used again, kept by the cleanup
+    else:
+        os.makedirs(folder, exist_ok = True)
+        tempFileName = artifact + "." + str(os.getpid())
+        with open(tempFileName, "wb") as artifactFile:
+            artifactFile.write(data)
+        os.replace(tempFileName, artifact)
+    return artifact
+
+
+def runDir(parent: str):
+    """Directory of the current run
+
+    Args:
+        parent (str): Parent directory, e.g. tempWorkflowLogs
+
+    Returns:
+        str: <parent>/<run id>
+    """
+    
+    return os.path.join(parent, RUN_ID)
+
+
+def readAodList(aodList: str):
+    """Reads the AO2D files of a text list, relative paths are resolved with respect to the current directory
+
+    Args:
+        aodList (str): AO2D text list (with or without @ prefix)
+
+    Returns:
+        list: AO2D files
+    """
+    
+    aodFiles = []
+    with open(aodList.lstrip("@")) as listFile:
+        for line in listFile:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "://" not in line and not os.path.isabs(line):
+                line = os.path.abspath(line)
+            aodFiles.append(line)
+    return aodFiles
+
+
+def absolutePath(path: str):
+    """Resolves a path relative to the current directory, URLs and absolute paths are kept
+
+    Args:
+        path (str): Path e.g. configs/writerConfiguration_dileptons.json
+
+    Returns:
+        str: Absolute path
+    """
+    
+    return path if "://" in path or os.path.isabs(path) else os.path.abspath(path)
+
+
+def absoluteInputs(config: dict):
+    """Resolves the input paths of the JSON config (aod-file, aod-reader-json) with respect to the current directory, so the workflow
+    can run in its run directory. AO2D text lists are written content-addressed with absolute paths of the AO2D files
+
+    Args:
+        config (dict): Updated JSON config
+    """
+    
+    for task, cfgValuePair in config.items():
+        if not isinstance(cfgValuePair, dict):
+            continue
+        for cfg in INPUT_PATH_CFGS:
+            value = cfgValuePair.get(cfg)
+            if not isinstance(value, str) or not value:
+                continue
+            if value.startswith("@") and os.path.isfile(value[1 :]):
+                aodList = writeArtifact("\n".join(readAodList(value)) + "\n", value[1 :])
+                config[task][cfg] = "@" + os.path.abspath(aodList)
+            elif value.startswith("@"):
+                config[task][cfg] = "@" + absolutePath(value[1 :])
+            else:
+                config[task][cfg] = ",".join(absolutePath(path) for path in value.split(","))
+
+
+def workflowDir(name = ""):
+    """Work directory of the workflow of this run, the generated files are linked into it with the paths of the O2 command
+
+    Args:
+        name (str, optional): Name of the workflow if the run has several workflows, e.g. stage1_0. Defaults to "".
+
+    Returns:
+        str: <WORKFLOW_RUN_FOLDER>/<run id>[/<name>]
+    """
+    
+    workDir = os.path.join(runDir(WORKFLOW_RUN_FOLDER), name) if name else runDir(WORKFLOW_RUN_FOLDER)
+    os.makedirs(workDir, exist_ok = True)
+    if not os.path.lexists(os.path.join(workDir, ARTIFACT_FOLDER)):
+        os.symlink(os.path.abspath(ARTIFACT_FOLDER), os.path.join(workDir, ARTIFACT_FOLDER))
+    return workDir
+
+
+def publishOutputs(workDir: str, fileNames = None, target = "."):
+    """Publishes the outputs of a run directory, each file is replaced atomically in the target directory
+    (hard link, copy on another file system)
+
+    Args:
+        workDir (str): Run directory
+        fileNames (list, optional): Outputs to publish. Defaults to None (all files of the run directory).
+        target (str, optional): Target directory. Defaults to "." (current directory).
+
+    Returns:
+        list: Published files
+    """
+    
+    if fileNames is None:
+        fileNames = sorted(
+            fileName for fileName in os.listdir(workDir)
+            if os.path.isfile(os.path.join(workDir, fileName)) and not os.path.islink(os.path.join(workDir, fileName))
+            )
+    for fileName in fileNames:
+        tempFileName = os.path.join(target, fileName + "." + str(os.getpid()))
+        try:
+            os.link(os.path.join(workDir, fileName), tempFileName)
+        except OSError:
+            shutil.copy2(os.path.join(workDir, fileName), tempFileName)
+        os.replace(tempFileName, os.path.join(target, fileName))
+    return fileNames
+
+
+def runIsAlive(runId: str):
+    """Checks if the process of a run is still running (pid at the end of the run id)
+
+    Args:
+        runId (str): Run id <script>-<time>-<pid>
+
+    Returns:
+        bool: True if the process exists
+    """
+    
+    try:
+        os.kill(int(runId.rsplit("-", 1)[-1]), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def referencedArtifacts(references = ARTIFACT_REFERENCES):
+    """Generated files referenced by saved files, e.g. the configs of the workflows in the pipeline state or the AO2D text list of
+    a shard plan
+
+    Args:
+        references (list, optional): Saved files (glob patterns). Defaults to ARTIFACT_REFERENCES.
+
+    Returns:
+        set: File names in ARTIFACT_FOLDER
+    """
+    
+    pattern = re.compile(re.escape(ARTIFACT_FOLDER) + r"/([^\s\"',;]+)")
+    referenced = set()
+    for reference in references:
+        for fileName in glob.glob(reference):
+            try:
+                with open(fileName) as referenceFile:
+                    referenced.update(pattern.findall(referenceFile.read()))
+            except OSError:
+                pass # removed concurrently
+    return referenced
+
+
+def cleanupRuns(parents: list, keep = KEEP_RUNS, maxAgeDays = MAX_AGE_DAYS, references = ARTIFACT_REFERENCES):
+    """Removes the run directories beyond the newest ones or older than maxAgeDays and the generated files which were not used for
+    maxAgeDays, directories of running runs and generated files referenced by saved files are kept
+
+    Args:
+        parents (list): Parent directories of the run directories, e.g. tempWorkflowRuns, tempWorkflowLogs
+        keep (int, optional): Run directories kept per parent directory. Defaults to KEEP_RUNS.
+        maxAgeDays (float, optional): Age of removed run directories and generated files. Defaults to MAX_AGE_DAYS.
+        references (list, optional): Saved files referencing generated files (glob patterns). Defaults to ARTIFACT_REFERENCES.
+
+    Returns:
+        list: Removed run directories
+    """
+    
+    oldest = time.time() - maxAgeDays*86400
+    removed = []
+    for parent in parents:
+        if not os.path.isdir(parent):
+            continue
+        runs = []
+        for runId in os.listdir(parent):
+            try:
+                if os.path.isdir(os.path.join(parent, runId)):
+                    runs.append((os.path.getmtime(os.path.join(parent, runId)), runId))
+            except OSError:
+                pass # removed concurrently
+        for i, (lastModified, runId) in enumerate(sorted(runs, reverse = True)):
+            if (i < keep and lastModified >= oldest) or runIsAlive(runId):
+                continue
+            shutil.rmtree(os.path.join(parent, runId), ignore_errors = True)
+            removed.append(os.path.join(parent, runId))
+    if removed:
+        logging.info("%d old run directories removed (newest %d kept, at most %s days old)", len(removed), keep, maxAgeDays)
+    
+    if os.path.isdir(ARTIFACT_FOLDER):
+        referenced = referencedArtifacts(references)
+        for fileName in os.listdir(ARTIFACT_FOLDER):
+            if fileName in referenced:
+                continue
+            try:
+                if os.path.getmtime(os.path.join(ARTIFACT_FOLDER, fileName)) < oldest:
+                    os.remove(os.path.join(ARTIFACT_FOLDER, fileName))
+            except OSError:
+                pass
+    return removed
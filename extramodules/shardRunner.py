@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the sharded execution of workflows over AO2D text lists (--shards).
+# The list is split into sub-lists balanced by byte size (file sizes are read in parallel, storage metadata latency is high),
+# the plan is written as JSON manifest (tempShards/<run id>/shardPlan.json) which can be inspected and replayed (--shardPlan).
+# Each shard gets its own work directory with its JSON config (aod-file -> sub-list)
+# and writer config, the same O2 command runs concurrently in all shard directories (limited by the CPU/memory budget)
+# and the reducedAod outputs of the shards are merged with o2-aod-merger. Recorded workflows (runPipeline.py) are the shard
+# workflows followed by the merging, they run one after the other.
+
+import os
+import copy
+import glob
+import json
+import time
+import shutil
+import heapq
+import logging
+import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from extramodules.workflowRunner import WORKFLOW_LOG_FOLDER, WORKFLOW_PLAN_ENV, runWorkflow
+from extramodules.memorySizing import availableMemoryGb
+from extramodules.runArtifacts import WORKFLOW_RUN_FOLDER, runDir, readAodList, workflowDir, publishOutputs, cleanupRuns
+
+SHARD_FOLDER = "tempShards"
+SHARD_MEMORY_GB = 4.0 # default memory budget of one shard workflow
+SHARD_INPUT = "input.txt"
+AOD_MERGER = "o2-aod-merger"
+MERGE_INPUT = "mergeInput.txt" # list of the shard outputs in the shard run directory
+SHARD_PLAN = "shardPlan.json"
+SHARD_PLAN_VERSION = 1
+STAT_THREADS = 32 # concurrent stat calls for AO2D file sizes
+
+
+def aodFileSize(aodFile: str):
+    """Size of an AO2D file
+
+    Args:
+        aodFile (str): AO2D file
+
+    Returns:
+        int or None: Size in bytes, None for remote files (e.g. alien://) and files which can't be read
+    """
+    
+    if "://" in aodFile:
+        return None
+    try:
+        return os.stat(aodFile).st_size
+    except OSError:
+        return None
+
+
+def statAodFiles(aodFiles: list, threads = STAT_THREADS):
+    """Reads the sizes of AO2D files concurrently on a thread pool
+
+    Args:
+        aodFiles (list): AO2D files
+        threads (int, optional): Number of concurrent stat calls. Defaults to STAT_THREADS.
+
+    Returns:
+        list: Sizes in bytes (None if unknown) in the order of the files
+    """
+    
+    with ThreadPoolExecutor(max_workers = max(1, min(threads, len(aodFiles)))) as executor:
+        return list(executor.map(aodFileSize, aodFiles))
+
+
+def aodInputSizes(aodFile: str):
+    """Sizes of the AO2D input of a workflow
+
+    Args:
+        aodFile (str): AO2D file or text list (@list.txt)
+
+    Returns:
+        list: Sizes in bytes (None if unknown), empty if there is no AO2D input
+    """
+    
+    if not aodFile:
+        return []
+    if aodFile.startswith("@"):
+        return statAodFiles(readAodList(aodFile))
+    return [aodFileSize(aodFile)]
+
+
+def planShards(aodFiles: list, sizes: list, shards: int):
+    """Assigns AO2D files to shards balanced by byte size (greedy bin packing: largest file to the lightest shard).
+    Unknown sizes are estimated with the median of the known sizes
+
+    Args:
+        aodFiles (list): AO2D files
+        sizes (list): Sizes in bytes (None if unknown)
+        shards (int): Number of shards
+
+    Returns:
+        list: Shards (no empty shard) as dicts with files (in the order of the list), bytes and unknownSizes
+    """
+    
+    knownSizes = [size for size in sizes if size is not None]
+    estimatedSize = int(statistics.median(knownSizes)) if knownSizes else 1
+    shards = max(1, min(shards, len(aodFiles)))
+    
+    loads = [(0, i) for i in range(shards)] # heap of (bytes, shard)
+    assignment = [[] for i in range(shards)]
+    fileSizes = [estimatedSize if size is None else size for size in sizes]
+    for fileIndex in sorted(range(len(aodFiles)), key = lambda fileIndex: -fileSizes[fileIndex]):
+        load, shard = heapq.heappop(loads)
+        assignment[shard].append(fileIndex)
+        heapq.heappush(loads, (load + fileSizes[fileIndex], shard))
+    
+    plan = []
+    for fileIndices in assignment:
+        fileIndices.sort()
+        plan.append(
+            {
+                "files": [aodFiles[fileIndex] for fileIndex in fileIndices],
+                "bytes": sum(fileSizes[fileIndex] for fileIndex in fileIndices),
+                "unknownSizes": len([fileIndex for fileIndex in fileIndices if sizes[fileIndex] is None])
+                }
+            )
+    return plan
+
+
+def writeShardPlan(plan: list, aodList: str, planFileName: str):
+    """Writes the shard plan manifest
+
+    Args:
+        plan (list): Shards (see planShards)
+        aodList (str): AO2D text list of the plan
+        planFileName (str): Output name of the manifest
+    """
+    
+    manifest = {
+        "version": SHARD_PLAN_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "aodList": aodList,
+        "shards": plan
+        }
+    with open(planFileName, "w") as planFile:
+        json.dump(manifest, planFile, indent = 2)
+
+
+def readShardPlan(planFileName: str):
+    """Reads a shard plan manifest for replaying it
+
+    Args:
+        planFileName (str): Shard plan manifest
+
+    Raises:
+        ValueError: If the manifest has an unknown version or no shard
+
+    Returns:
+        list: Shards (see planShards)
+    """
+    
+    with open(planFileName) as planFile:
+        manifest = json.load(planFile)
+    if manifest.get("version") != SHARD_PLAN_VERSION or not manifest.get("shards"):
+        raise ValueError("Invalid shard plan manifest: " + planFileName)
+    return manifest["shards"]
+
+
+def logShardPlan(plan: list):
+    """Logs the files and bytes of each shard and the imbalance of the plan
+
+    Args:
+        plan (list): Shards (see planShards)
+    """
+    
+    for i, shard in enumerate(plan):
+        logging.info(
+            "Shard %d: %d AO2D files, %.1f MB%s", i, len(shard["files"]), shard["bytes"] / 1024**2,
+            " (%d sizes estimated)" % shard["unknownSizes"] if shard.get("unknownSizes") else ""
+            )
+    meanBytes = statistics.mean(shard["bytes"] for shard in plan)
+    if meanBytes:
+        logging.info("Shard imbalance (largest / mean bytes): %.3f", max(shard["bytes"] for shard in plan) / meanBytes)
+
+
+def availableCpus():
+    """CPUs usable by this process
+
+    Returns:
+        int: Number of CPUs (respects the CPU affinity if supported)
+    """
+    
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def shardWorkers(shards: int, shardMemory = SHARD_MEMORY_GB, maxWorkers = None):
+    """Number of shard workflows running concurrently within the CPU/memory budget of the node
+
+    Args:
+        shards (int): Number of shards
+        shardMemory (float, optional): Memory budget of one shard workflow in GB. Defaults to SHARD_MEMORY_GB.
+        maxWorkers (int, optional): Upper limit provided in CLI. Defaults to None.
+
+    Returns:
+        int: Number of concurrent shard workflows
+    """
+    
+    cpus = availableCpus()
+    workers = min(shards, cpus)
+    memory = availableMemoryGb()
+    if memory is not None and shardMemory:
+        workers = min(workers, max(1, int(memory // shardMemory)))
+    if maxWorkers:
+        workers = min(workers, maxWorkers)
+    logging.info(
+        "Shard budget: %d CPUs, %s GB available memory, %s GB per shard -> %d concurrent workflows", cpus,
+        "unknown" if memory is None else format(memory, ".1f"), shardMemory, workers
+        )
+    return workers
+
+
+def prepareShards(shardFiles: list, config: dict, configFileName: str, writerConfigFileName: str, workDir = SHARD_FOLDER):
+    """Creates the isolated work directories of the shards with their AO2D sub-list, JSON config and writer config
+
+    Args:
+        shardFiles (list): AO2D files per shard
+        config (dict): Updated JSON config
+        configFileName (str): File name of the JSON config in the O2 command
+        writerConfigFileName (str): Writer config in the current directory (copied into the shards)
+        workDir (str, optional): Parent directory of the shard directories. Defaults to SHARD_FOLDER.
+
+    Returns:
+        list: Shard directories
+    """
+    
+    if os.path.isdir(workDir):
+        shutil.rmtree(workDir)
+    shardDirs = []
+    for i, aodFiles in enumerate(shardFiles):
+        shardDir = os.path.abspath(os.path.join(workDir, "shard_%03d" % i))
+        os.makedirs(shardDir)
+        inputList = os.path.join(shardDir, SHARD_INPUT)
+        with open(inputList, "w") as inputFile:
+            inputFile.write("\n".join(aodFiles) + "\n")
+        
+        shardConfig = copy.deepcopy(config)
+        for task, cfgValuePair in shardConfig.items():
+            if isinstance(cfgValuePair, dict) and "aod-file" in cfgValuePair:
+                shardConfig[task]["aod-file"] = "@" + inputList
+        # same relative paths as in the O2 command, which runs in the shard directory
+        os.makedirs(os.path.dirname(os.path.join(shardDir, configFileName)), exist_ok = True)
+        with open(os.path.join(shardDir, configFileName), "w") as configFile:
+            json.dump(shardConfig, configFile, indent = 2)
+        if writerConfigFileName is not None:
+            os.makedirs(os.path.dirname(os.path.join(shardDir, writerConfigFileName)), exist_ok = True)
+            shutil.copy(writerConfigFileName, os.path.join(shardDir, writerConfigFileName))
+        
+        logging.debug("Shard %d: %d AO2D files in %s", i, len(aodFiles), shardDir)
+        shardDirs.append(shardDir)
+    return shardDirs
+
+
+def runShard(commandToRun: str, shardDir: str):
+    """Runs the O2 command in a shard directory, the logs and the workflow report go to the log folder of the shard
+
+    Args:
+        commandToRun (str): Generated command for running in O2
+        shardDir (str): Shard directory
+
+    Returns:
+        tuple: Shard directory, exit code, wall time in seconds
+    """
+    
+    start = time.time()
+    exitCode = runWorkflow(commandToRun, os.path.join(shardDir, WORKFLOW_LOG_FOLDER), echo = False, cwd = shardDir)
+    return shardDir, exitCode, time.time() - start
+
+
+def mergeShardOutputs(shardDirs: list, outputName = "reducedAod", workDir = SHARD_FOLDER):
+    """Merges the outputs of the shards with o2-aod-merger into the work directory of the run, the merged output is published
+    into the current directory. If the workflows are recorded, the merging is recorded after the shard workflows like a workflow
+    of the current directory (output relative to its work directory, see runIsolatedWorkflow)
+
+    Args:
+        shardDirs (list): Shard directories
+        outputName (str, optional): resfile of the writer config. Defaults to "reducedAod".
+        workDir (str, optional): Parent directory of the shard directories. Defaults to SHARD_FOLDER.
+
+    Returns:
+        int: Exit code of the merger (1 if no shard output found)
+    """
+    
+    recorded = bool(os.environ.get(WORKFLOW_PLAN_ENV))
+    shardOutputs = []
+    for shardDir in shardDirs:
+        if recorded:
+            shardOutputs.append(os.path.join(shardDir, outputName + ".root")) # written when the recorded shard workflows run
+        else:
+            shardOutputs += sorted(glob.glob(os.path.join(shardDir, outputName + "*.root")))
+    if not shardOutputs:
+        logging.error("No %s output found in the shard directories", outputName)
+        return 1
+    
+    with open(os.path.join(workDir, MERGE_INPUT), "w") as mergeFile:
+        mergeFile.write("\n".join(shardOutputs) + "\n")
+    if recorded:
+        mergeCommand = AOD_MERGER + " --input " + os.path.abspath(os.path.join(workDir, MERGE_INPUT)) + " --output " + outputName + ".root"
+        logging.info("Merging %d shard outputs: %s", len(shardOutputs), mergeCommand)
+        return runWorkflow(mergeCommand)
+    outputDir = os.path.abspath(workflowDir())
+    mergeCommand = AOD_MERGER + " --input " + MERGE_INPUT + " --output " + os.path.join(outputDir, outputName + ".root")
+    logging.info("Merging %d shard outputs: %s", len(shardOutputs), mergeCommand)
+    exitCode = runWorkflow(mergeCommand, os.path.join(workDir, "mergeLogs"), cwd = workDir)
+    if exitCode == 0:
+        publishOutputs(outputDir, [outputName + ".root"])
+        logging.info("Merged output %s published into the current directory", os.path.join(outputDir, outputName + ".root"))
+    return exitCode
+
+
+def runShards(
+        commandToRun: str, config: dict, aodList: str, shards: int, configFileName: str, writerConfigFileName: str, maxWorkers = None,
+        shardMemory = None, shardPlan = None
+    ):
+    """Sharded execution of a workflow over an AO2D text list
+
+    Args:
+        commandToRun (str): Generated command for running in O2
+        config (dict): Updated JSON config
+        aodList (str): AO2D text list (@list.txt)
+        shards (int): Number of shards
+        configFileName (str): File name of the JSON config in the O2 command
+        writerConfigFileName (str): Writer config in the current directory
+        maxWorkers (int, optional): Upper limit of concurrent shard workflows. Defaults to None.
+        shardMemory (float, optional): Memory budget of one shard workflow in GB. Defaults to None (SHARD_MEMORY_GB).
+        shardPlan (str, optional): Shard plan manifest to replay instead of planning the AO2D text list. Defaults to None.
+
+    Returns:
+        int: 0 if all shards and the merging succeeded, otherwise 1
+    """
+    
+    if shardMemory is None:
+        shardMemory = SHARD_MEMORY_GB
+    if shardPlan is not None:
+        logging.info("Replaying shard plan %s", shardPlan)
+        plan = readShardPlan(shardPlan)
+    else:
+        aodFiles = readAodList(aodList)
+        if not aodFiles:
+            logging.error("%s does not include any AO2D file", aodList)
+            return 1
+        start = time.time()
+        sizes = statAodFiles(aodFiles)
+        logging.info("Sizes of %d AO2D files read in %.2f s", len(aodFiles), time.time() - start)
+        plan = planShards(aodFiles, sizes, shards)
+        if len(plan) < shards:
+            logging.warning("%d shards requested for %d AO2D files, using %d shards", shards, len(aodFiles), len(plan))
+    logShardPlan(plan)
+    cleanupRuns([SHARD_FOLDER, WORKFLOW_RUN_FOLDER, WORKFLOW_LOG_FOLDER])
+    workDir = runDir(SHARD_FOLDER) # shards of concurrent runs don't share directories
+    shardDirs = prepareShards([shard["files"] for shard in plan], config, configFileName, writerConfigFileName, workDir)
+    writeShardPlan(plan, aodList, os.path.join(workDir, SHARD_PLAN))
+    logging.info("Shard plan written to %s", os.path.join(workDir, SHARD_PLAN))
+    workers = shardWorkers(len(shardDirs), shardMemory, maxWorkers)
+    
+    failedShards = []
+    start = time.time()
+    with ThreadPoolExecutor(max_workers = workers) as executor: # each worker waits for its own O2 workflow process
+        futures = [executor.submit(runShard, commandToRun, shardDir) for shardDir in shardDirs]
+        for future in as_completed(futures):
+            shardDir, exitCode, wallTime = future.result()
+            if exitCode != 0:
+                failedShards.append(shardDir)
+                logging.error("%s failed with exit code %d, see %s", shardDir, exitCode, os.path.join(shardDir, WORKFLOW_LOG_FOLDER))
+            else:
+                logging.info("%s finished in %.1f s", shardDir, wallTime)
+    logging.info("%d shards finished in %.1f s", len(shardDirs), time.time() - start)
+    
+    if failedShards:
+        logging.error("%d of %d shards failed, shard outputs are not merged", len(failedShards), len(shardDirs))
+        return 1
+    return 0 if mergeShardOutputs(shardDirs, workDir = workDir) == 0 else 1
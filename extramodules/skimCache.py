@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the cache of the skimmed data (--skimCache on). The fingerprint of a tableMaker run is built from what
+# decides the content of the reducedAod: the JSON config without QA/histogram configurables, the tables to produce, the devices
+# of the workflow with their options (without logging and memory options), the O2Physics/O2 build of the environment (alienv) and
+# the AO2D input files with sizes and mtimes.
+# The reducedAod.root outputs are kept in tempSkimCache/<fingerprint>, a run with a cached fingerprint copies it instead of skimming
+# again. The least recently used entries are evicted if the cache is larger than allowed.
+
+import os
+import json
+import shutil
+import logging
+from extramodules.workflowCommand import AOD_FILE_CFG, DRIVER_OPTIONS, digest, inputFiles, parsePipeline
+from extramodules.runArtifacts import workflowDir, publishOutputs
+
+SKIM_CACHE_DIR = "tempSkimCache"
+SKIM_CACHE_ENV = "DQ_SKIM_CACHE"
+SKIM_OUTPUT = "reducedAod" # resfile of the aod-writer descriptor of tableMaker
+FINGERPRINT_FILE = "fingerprint.json"
+# O2Physics/O2 build which produces the skimmed tables, the version, revision and hash are exported by alienv if set
+BUILD_ENV = [
+    "O2PHYSICS_ROOT", "O2PHYSICS_VERSION", "O2PHYSICS_REVISION", "O2PHYSICS_HASH", "O2_ROOT", "O2_VERSION", "O2_REVISION", "O2_HASH"
+    ]
+# Configurables which don't change the skimmed tables (QA histograms, logging)
+SKIM_IRRELEVANT_CFGS = [
+    "cfgQA", "cfgDetailedQA", "cfgWithQA", "cfgAddEventHistogram", "cfgAddTrackHistogram", "cfgAddMuonHistogram", "verbose"
+    ]
+
+
+def skimCacheDir():
+    """Directory of the skimmed data cache
+
+    Returns:
+        str: DQ_SKIM_CACHE or SKIM_CACHE_DIR in the working directory
+    """
+    
+    return os.environ.get(SKIM_CACHE_ENV) or SKIM_CACHE_DIR
+
+
+def skimFingerprint(config: dict, tablesToProduce: dict, commandToRun: str, cwd = "."):
+    """Canonical fingerprint of the skimmed output of a tableMaker run
+
+    Args:
+        config (dict): Updated JSON config
+        tablesToProduce (dict): Tables written into the reducedAod
+        commandToRun (str): Generated command for running in O2
+        cwd (str, optional): Working directory of the workflow. Defaults to ".".
+
+    Returns:
+        tuple: Fingerprint (sha256 hex digest), its components
+    """
+    
+    skimConfig = {}
+    inputs = []
+    for task, cfgValuePair in config.items():
+        if not isinstance(cfgValuePair, dict):
+            skimConfig[task] = cfgValuePair
+            continue
+        skimConfig[task] = {
+            cfg: value
+            for cfg, value in cfgValuePair.items()
+            if cfg not in SKIM_IRRELEVANT_CFGS + [AOD_FILE_CFG]
+            }
+        if cfgValuePair.get(AOD_FILE_CFG):
+            inputs += inputFiles(cfgValuePair[AOD_FILE_CFG], cwd)
+    
+    devices = []
+    for executable, options in parsePipeline(commandToRun):
+        devices.append([executable, [[option, value] for option, value in options if option not in DRIVER_OPTIONS]])
+    
+    components = {
+        "config": digest(skimConfig),
+        "tables": sorted(tablesToProduce),
+        "devices": devices,
+        "build": {
+            variable: os.environ[variable]
+            for variable in BUILD_ENV
+            if os.environ.get(variable)
+            },
+        "inputs": digest(inputs),
+        "inputFiles": len(inputs)
+        }
+    return digest(components), components
+
+
+def copyAtomic(source: str, target: str):
+    """Copies a file, the target is replaced atomically"""
+    
+    tempFileName = target + "." + str(os.getpid())
+    shutil.copy2(source, tempFileName)
+    os.replace(tempFileName, target)
+
+
+def restoreSkim(fingerprint: str, cacheDir = None, outputName = SKIM_OUTPUT):
+    """Copies the cached skimmed output of a fingerprint into the work directory of the run and publishes it into the current directory
+
+    Args:
+        fingerprint (str): Fingerprint of the run (see skimFingerprint)
+        cacheDir (str, optional): Cache directory. Defaults to None (see skimCacheDir).
+        outputName (str, optional): resfile of the aod-writer descriptor. Defaults to SKIM_OUTPUT.
+
+    Returns:
+        bool: True if the output is restored from the cache
+    """
+    
+    entry = os.path.join(cacheDir or skimCacheDir(), fingerprint)
+    if not os.path.isfile(os.path.join(entry, outputName + ".root")):
+        return False
+    workDir = workflowDir()
+    copyAtomic(os.path.join(entry, outputName + ".root"), os.path.join(workDir, outputName + ".root")) # a copy, not a link to the cache
+    publishOutputs(workDir, [outputName + ".root"])
+    os.utime(entry) # least recently used
+    logging.info("Skimmed data found in the cache (%s), %s.root restored without skimming", entry, outputName)
+    return True
+
+
+def entrySize(entry: str):
+    """Size of the files of a cache entry in bytes"""
+    
+    return sum(os.path.getsize(os.path.join(entry, fileName)) for fileName in os.listdir(entry))
+
+
+def evictSkims(cacheDir: str, maxBytes: int, keep = None):
+    """Evicts the least recently used cache entries until the cache is not larger than maxBytes
+
+    Args:
+        cacheDir (str): Cache directory
+        maxBytes (int): Largest size of the cache in bytes
+        keep (str, optional): Fingerprint which is not evicted. Defaults to None.
+
+    Returns:
+        list: Evicted fingerprints
+    """
+    
+    entries = sorted(
+        (os.path.getmtime(os.path.join(cacheDir, fingerprint)), fingerprint)
+        for fingerprint in os.listdir(cacheDir)
+        if not fingerprint.startswith(".")
+        )
+    sizes = {
+        fingerprint: entrySize(os.path.join(cacheDir, fingerprint))
+        for lastUsed, fingerprint in entries
+        }
+    total = sum(sizes.values())
+    evicted = []
+    for lastUsed, fingerprint in entries:
+        if total <= maxBytes:
+            break
+        if fingerprint == keep:
+            continue
+        shutil.rmtree(os.path.join(cacheDir, fingerprint), ignore_errors = True)
+        total -= sizes[fingerprint]
+        evicted.append(fingerprint)
+        logging.info("Skimmed data %s evicted from the cache (least recently used)", fingerprint)
+    return evicted
+
+
+def storeSkim(fingerprint: str, components: dict, maxBytes: int, since = 0, cacheDir = None, outputName = SKIM_OUTPUT):
+    """Adds the skimmed output of the work directory of the run to the cache and evicts the least recently used entries
+
+    Args:
+        fingerprint (str): Fingerprint of the run (see skimFingerprint)
+        components (dict): Components of the fingerprint, written next to the outputs
+        maxBytes (int): Largest size of the cache in bytes
+        since (float, optional): Start time of the run, older outputs are not from this run. Defaults to 0.
+        cacheDir (str, optional): Cache directory. Defaults to None (see skimCacheDir).
+        outputName (str, optional): resfile of the aod-writer descriptor. Defaults to SKIM_OUTPUT.
+
+    Returns:
+        bool: True if the output is added to the cache
+    """
+    
+    cacheDir = cacheDir or skimCacheDir()
+    output = os.path.join(workflowDir(), outputName + ".root")
+    if not os.path.isfile(output) or os.path.getmtime(output) < since or os.path.getsize(output) > maxBytes:
+        logging.warning("Skimmed data not cached (%s not written by this run or larger than the cache limit of %d bytes)", output, maxBytes)
+        return False
+    size = os.path.getsize(output)
+    
+    entry = os.path.join(cacheDir, fingerprint)
+    staging = os.path.join(cacheDir, ".staging-" + str(os.getpid()))
+    if os.path.isdir(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+    shutil.copy2(output, os.path.join(staging, outputName + ".root"))
+    with open(os.path.join(staging, FINGERPRINT_FILE), "w") as fingerprintFile:
+        json.dump(components, fingerprintFile, indent = 2)
+    if os.path.isdir(entry):
+        shutil.rmtree(entry)
+    try:
+        os.rename(staging, entry)
+    except OSError:
+        shutil.rmtree(staging) # added concurrently
+    logging.info("Skimmed data added to the cache: %s (%d bytes)", entry, size)
+    evictSkims(cacheDir, maxBytes, fingerprint)
+    return True
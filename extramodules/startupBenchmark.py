@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the startup (time-to-command) benchmark of the run scripts.
+# Every run starts a fresh interpreter in a scratch work directory with stubbed o2-* executables,
+# so the benchmark works without O2. Time and peak memory are broken down by phase with hooks (see benchmarkHooks.py)
+# on stable entry points (no markers in the run scripts), so results of different commits are comparable.
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import tempfile
+import statistics
+import subprocess
+from extramodules.completionTable import PACKAGE_PATH
+from extramodules.dqLibGetter import DQ_LIBS
+from extramodules.benchmarkHooks import STUB_FOLDER
+
+BENCHMARK_VERSION = 1
+BENCHMARK_FILE = "tempStartupBenchmark.json"
+
+# Phases in execution order, the time of a phase is exclusive (nested phases are subtracted).
+# interpreterStartup also contains the imports of the benchmark hooks (completionTable, dqLibGetter)
+PHASES = [
+    "interpreterStartup", "imports", "mergeArgs", "parseArgs", "dqLibParse", "configRewrite", "jsonDump", "commandAssembly", "workflow"
+    ]
+
+# Default arguments of each entry point (configs relative to the package), event cuts make the DQ libraries being parsed
+BENCHMARK_CASES = {
+    "runTableMaker.py": ["configs/configTableMakerDataRun3.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runTableMakerMC.py": ["configs/configTableMakerMCRun3.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runTableReader.py": ["configs/configAnalysisData.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runDQEfficiency.py": ["configs/configAnalysisMC.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runFilterPP.py": ["configs/configFilterPPDataRun3.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runDQFlow.py": ["configs/configFlowDataRun3.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runV0selector.py": ["configs/configV0SelectorDataRun3.json"],
+    "runEMEfficiency.py": ["configs/configAnalysisMCEM.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    "runEMEfficiencyNotSkimmed.py": ["configs/configAnalysisMCEMNoSkimmed.json", "--cfgEventCuts", "eventStandardNoINT7"],
+    }
+
+
+def prepareWorkDir(workDir: str):
+    """Links the DQ libraries and their index into a scratch work directory, so no download is needed
+
+    Args:
+        workDir (str): Scratch work directory
+
+    Returns:
+        str: Directory of the o2-* stubs
+    """
+    
+    for fileName in list(DQ_LIBS) + ["tempDQLibsIndex.json"]:
+        source = os.path.join(os.getcwd(), fileName)
+        if os.path.isfile(source) and not os.path.exists(os.path.join(workDir, fileName)):
+            os.symlink(source, os.path.join(workDir, fileName))
+    stubDir = os.path.join(workDir, STUB_FOLDER)
+    os.makedirs(stubDir, exist_ok = True)
+    return stubDir
+
+
+def runOnce(scriptName: str, scriptArgs: list, workDir: str):
+    """Benchmarks one run of an entry point in a fresh interpreter
+
+    Args:
+        scriptName (str): Entry point e.g. runTableMaker.py
+        scriptArgs (list): Arguments of the run script
+        workDir (str): Scratch work directory
+
+    Returns:
+        dict: Run result (phase times in seconds)
+    """
+    
+    stubDir = prepareWorkDir(workDir)
+    resultFile = os.path.join(workDir, "result.json")
+    env = dict(os.environ, PATH = stubDir + os.pathsep + os.environ.get("PATH", ""), O2PHYSICS_ROOT = stubDir)
+    env.pop("_ARGCOMPLETE", None)
+    command = [sys.executable, os.path.join(PACKAGE_PATH, "BenchmarkStartup.py"), "--child", scriptName, resultFile, "--"] + scriptArgs
+    start = time.perf_counter()
+    subprocess.run(command, cwd = workDir, env = env, stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    wall = time.perf_counter() - start
+    
+    with open(resultFile) as f:
+        result = json.load(f)
+    os.remove(resultFile)
+    result["times"]["interpreterStartup"] = max(wall - result["total"], 0.0)
+    result["wall"] = wall
+    return result
+
+
+def summarize(runs: list):
+    """Min/median/max of the phase times, wall time and peak memory of runs
+
+    Args:
+        runs (list): Run results
+
+    Returns:
+        dict: Statistics per metric
+    """
+    
+    metrics = {
+        phase: [run["times"].get(phase, 0.0) for run in runs]
+        for phase in PHASES
+        }
+    metrics["wall"] = [run["wall"] for run in runs]
+    metrics["maxRssKb"] = [run["maxRssKb"] for run in runs]
+    return {
+        name: {
+            "min": min(values),
+            "median": statistics.median(values),
+            "max": max(values)
+            }
+        for name, values in metrics.items()
+        }
+
+
+def gitRevision():
+    """Commit of the package, if it is a git checkout
+
+    Returns:
+        str or None: Commit hash
+    """
+    
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd = PACKAGE_PATH, capture_output = True, text = True,
+                              check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runBenchmark(cases: dict, repeat = 5, warmup = 1):
+    """Benchmarks entry points
+
+    Args:
+        cases (dict): Entry point -> run script arguments
+        repeat (int, optional): Measured runs per entry point. Defaults to 5.
+        warmup (int, optional): Unmeasured runs per entry point (bytecode and DQ library index caches). Defaults to 1.
+
+    Returns:
+        dict: Benchmark results
+    """
+    
+    results = {}
+    workDir = tempfile.mkdtemp(prefix = "dq-startup-benchmark-")
+    try:
+        for scriptName, scriptArgs in cases.items():
+            scriptArgs = [os.path.join(PACKAGE_PATH, arg) if arg.startswith("configs/") else arg for arg in scriptArgs]
+            for i in range(warmup):
+                runOnce(scriptName, scriptArgs, workDir)
+            runs = [runOnce(scriptName, scriptArgs, workDir) for i in range(repeat)]
+            results[scriptName] = {
+                "args": scriptArgs,
+                "runs": runs,
+                "summary": summarize(runs)
+                }
+            logging.info(
+                "%s: %.3f s (median wall), %d kB max RSS", scriptName, results[scriptName]["summary"]["wall"]["median"],
+                results[scriptName]["summary"]["maxRssKb"]["median"]
+                )
+    finally:
+        shutil.rmtree(workDir, ignore_errors = True)
+    
+    return {
+        "version": BENCHMARK_VERSION,
+        "commit": gitRevision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "phases": PHASES,
+        "results": results
+        }
+
+
+def compareBenchmarks(baseline: dict, current: dict, threshold = 0.2, minDelta = 0.005):
+    """Compares median phase times and memory of two benchmark results
+
+    Args:
+        baseline (dict): Baseline benchmark results
+        current (dict): Current benchmark results
+        threshold (float, optional): Relative increase reported as regression. Defaults to 0.2.
+        minDelta (float, optional): Absolute increase (s) below which time differences are noise. Defaults to 0.005.
+
+    Returns:
+        list: Rows (entry point, metric, baseline, current, relative change, regression)
+    """
+    
+    rows = []
+    for scriptName, result in current["results"].items():
+        if scriptName not in baseline["results"]:
+            continue
+        for metric, stats in result["summary"].items():
+            old = baseline["results"][scriptName]["summary"].get(metric, {}).get("median")
+            new = stats["median"]
+            if old is None:
+                continue
+            change = (new-old) / old if old else 0.0
+            noise = metric != "maxRssKb" and new - old < minDelta
+            rows.append((scriptName, metric, old, new, change, change > threshold and not noise))
+    return rows
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the pruning of the skimmed output tables against the downstream analyses (--pruneFor). The JSON configs of the
+# analyses which read the skimmed data (tableReader, dqEfficiency) give the reduced tables consumed by their enabled process functions
+# (see the consumer declarations of dqtasks), tables of the aod-writer descriptor which no downstream analysis consumes are not written.
+# Downstream analyses given as run script with their arguments are prepared in the workflow plan mode, so their CLI overrides
+# (e.g. --analysis, --process) are in the generated config, JSON configs given as they are don't include CLI overrides.
+# The bytes saved per table are measured in a reference output written without pruning (the on-disk size of the TTree and TBasket
+# records of each tree in the ROOT file, read from the key headers without ROOT).
+
+import os
+import json
+import shlex
+import struct
+import logging
+from extramodules.dependencyGraph import inputTables
+from extramodules.memorySizing import formatGb
+from extramodules.runArtifacts import ARTIFACT_FOLDER
+from extramodules.workflowCommand import configFileOf
+from extramodules.workflowComposer import planAnalysis
+
+REFERENCE_OUTPUT = "reducedAod.root" # output of the previous run, measured before it is overwritten
+DOWNSTREAM_SCRIPTS = ["runTableReader.py", "runDQEfficiency.py"] # run scripts of the analyses which read skimmed data
+KEY_HEADER_SIZE = 1024 # bytes read for a key header (fixed part, class name, name and title)
+LARGE_FILE_VERSION = 1000000 # ROOT files of this version or newer have 64 bit fEND/fSeekFree
+LARGE_KEY_VERSION = 1000 # keys of this version or newer have 64 bit fSeekKey/fSeekPdir
+
+
+def downstreamConfigs(downstreams: list):
+    """JSON configs of the downstream analyses, run scripts with their arguments are prepared in the workflow plan mode
+
+    Args:
+        downstreams (list): JSON configs or run scripts with their arguments (e.g. "runTableReader.py config.json --analysis ...")
+
+    Returns:
+        list or None: JSON configs (generated config of the run scripts), None if a run script can't be prepared
+    """
+    
+    configFileNames = []
+    for downstream in downstreams:
+        tokens = shlex.split(downstream)
+        if tokens and tokens[0] in DOWNSTREAM_SCRIPTS:
+            exitCode, workflows = planAnalysis(tokens[0], tokens[1 :])
+            if exitCode != 0 or not workflows:
+                logging.error("Table pruning: %s could not be prepared (exit code %d)", downstream, exitCode)
+                return None
+            configFileNames.append(configFileOf(workflows[0]["command"], workflows[0]["cwd"]))
+            continue
+        if os.path.dirname(os.path.abspath(downstream)) != os.path.abspath(ARTIFACT_FOLDER):
+            logging.warning(
+                "Table pruning: CLI overrides of the downstream analysis are not considered for %s, give its run script with the"
+                " arguments (e.g. --pruneFor \"runTableReader.py %s --analysis ...\") or its generated config in %s", downstream,
+                downstream, ARTIFACT_FOLDER
+                )
+        configFileNames.append(downstream)
+    return configFileNames
+
+
+def downstreamTables(configFileNames: list, consumerDeclarations: list):
+    """Reduced tables consumed by the enabled process functions of the downstream analysis configs
+
+    Args:
+        configFileNames (list): JSON configs of the downstream analyses (e.g. configs/configAnalysisData.json)
+        consumerDeclarations (list): Consumers and workflow products of the analyses which read skimmed data (see dqtasks)
+
+    Returns:
+        dict: Table -> consumers (config task:processFunction)
+    """
+    
+    tables = {}
+    for configFileName in configFileNames:
+        with open(configFileName) as configFile:
+            config = json.load(configFile)
+        for consumers, workflowProducts in consumerDeclarations:
+            for table, tableConsumers in inputTables(config, consumers, workflowProducts).items():
+                for consumer in tableConsumers:
+                    if configFileName + " " + consumer not in tables.setdefault(table, []):
+                        tables[table].append(configFileName + " " + consumer)
+    return tables
+
+
+def readString(data: bytes, offset: int):
+    """Reads a ROOT TString (1 byte length, 255 + 4 byte length for long strings)
+
+    Args:
+        data (bytes): Key header
+        offset (int): Position of the string
+
+    Returns:
+        tuple: String, position after the string
+    """
+    
+    length = data[offset]
+    offset += 1
+    if length == 255:
+        length = struct.unpack(">i", data[offset : offset + 4])[0]
+        offset += 4
+    return data[offset : offset + length].decode(errors = "replace"), offset + length
+
+
+def treeSizes(fileName: str):
+    """On-disk size of the trees in a ROOT file, walking the records of the file like TFile::Map
+
+    Args:
+        fileName (str): ROOT file, e.g. reducedAod.root
+
+    Returns:
+        dict or None: Tree name -> compressed bytes (TTree and TBasket records of all DF folders), None if it is not a ROOT file
+    """
+    
+    sizes = {}
+    with open(fileName, "rb") as rootFile:
+        header = rootFile.read(64)
+        if len(header) < 20 or header[: 4] != b"root":
+            return None
+        version, begin = struct.unpack(">ii", header[4 : 12])
+        end = struct.unpack(">q", header[12 : 20])[0] if version >= LARGE_FILE_VERSION else struct.unpack(">i", header[12 : 16])[0]
+        
+        position = begin
+        while position < end:
+            rootFile.seek(position)
+            keyHeader = rootFile.read(KEY_HEADER_SIZE)
+            if len(keyHeader) < 4:
+                break
+            nbytes = struct.unpack(">i", keyHeader[: 4])[0]
+            if nbytes < 0:
+                position -= nbytes # free gap
+                continue
+            if nbytes == 0:
+                break
+            keyVersion = struct.unpack(">h", keyHeader[4 : 6])[0]
+            offset = 18 + (16 if keyVersion >= LARGE_KEY_VERSION else 8) # fNbytes ... fCycle, fSeekKey, fSeekPdir
+            try:
+                className, offset = readString(keyHeader, offset)
+                name, offset = readString(keyHeader, offset)
+                title, offset = readString(keyHeader, offset)
+            except (IndexError, struct.error):
+                break
+            if className == "TTree":
+                sizes[name] = sizes.get(name, 0) + nbytes
+            elif className == "TBasket":
+                sizes[title] = sizes.get(title, 0) + nbytes # the title of a basket is the name of its tree
+            position += nbytes
+    return sizes
+
+
+def pruneOutputTables(tablesToProduce: dict, consumedTables: dict):
+    """Removes the tables which are not consumed downstream from the tables to produce
+
+    Args:
+        tablesToProduce (dict): Tables are required in the output (see tableProducer)
+        consumedTables (dict): Table -> downstream consumers (see downstreamTables)
+
+    Returns:
+        list: Pruned tables
+    """
+    
+    pruned = [table for table in tablesToProduce if table not in consumedTables]
+    for table in pruned:
+        del tablesToProduce[table]
+    return pruned
+
+
+def logTablePruning(pruned: list, tables: dict, sizes = None, referenceFileName = REFERENCE_OUTPUT):
+    """Logs the pruned tables with the bytes saved per table
+
+    Args:
+        pruned (list): Pruned tables
+        tables (dict): Definition of all the tables can be produced
+        sizes (dict, optional): Tree name -> bytes in the reference output (see treeSizes). Defaults to None (no reference).
+        referenceFileName (str, optional): Reference output. Defaults to REFERENCE_OUTPUT.
+    """
+    
+    saved = None
+    for table in pruned:
+        size = (sizes or {}).get(tables[table]["treename"])
+        if size is None:
+            logging.info(
+                "Table pruning: %s not written (not consumed downstream), saved bytes unknown (not in %s)", table, referenceFileName
+                )
+            continue
+        saved = (saved or 0) + size
+        logging.info("Table pruning: %s not written (not consumed downstream), %d bytes (%s) saved", table, size, formatGb(size))
+    if saved is not None:
+        logging.info("Table pruning: %d bytes (%s) saved in total, measured in %s", saved, formatGb(saved), referenceFileName)
+    if not pruned:
+        logging.info("Table pruning: all produced tables are consumed downstream")
+
+
+def tablePruning(tablesToProduce: dict, tables: dict, downstreams: list, consumerDeclarations: list, referenceFileName = REFERENCE_OUTPUT):
+    """Pruning of the skimmed output tables against the downstream analysis configs
+
+    Args:
+        tablesToProduce (dict): Tables are required in the output (see tableProducer), pruned in place
+        tables (dict): Definition of all the tables can be produced
+        downstreams (list): JSON configs or run scripts with their arguments of the downstream analyses (see downstreamConfigs)
+        consumerDeclarations (list): Consumers and workflow products of the analyses which read skimmed data (see dqtasks)
+        referenceFileName (str, optional): Output written without pruning for the saved bytes. Defaults to REFERENCE_OUTPUT.
+
+    Returns:
+        list: Pruned tables, nothing is pruned if a downstream analysis can't be prepared or the configs enable no consumer
+    """
+    
+    configFileNames = downstreamConfigs(downstreams)
+    if configFileNames is None:
+        logging.warning("Table pruning: tables are not pruned")
+        return []
+    consumedTables = downstreamTables(configFileNames, consumerDeclarations)
+    if not consumedTables:
+        logging.warning(
+            "Table pruning: no process function consuming skimmed tables enabled in %s, tables are not pruned", ", ".join(configFileNames)
+            )
+        return []
+    for table, consumers in consumedTables.items():
+        if table in tablesToProduce:
+            logging.debug("Table pruning: %s consumed by %s", table, ", ".join(consumers))
+    
+    sizes = None
+    if os.path.isfile(referenceFileName):
+        try:
+            sizes = treeSizes(referenceFileName)
+        except OSError:
+            pass
+    pruned = pruneOutputTables(tablesToProduce, consumedTables)
+    logTablePruning(pruned, tables, sizes, referenceFileName)
+    return pruned
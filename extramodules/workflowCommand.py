@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# This script includes the parsing of the generated O2 commands (devices with their options, JSON config) and the hashes of their
+# inputs, shared by the workflow composer, the pipeline driver and the skim cache.
+
+import os
+import json
+import shlex
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from extramodules.runArtifacts import readAodList
+from extramodules.shardRunner import STAT_THREADS
+
+# options of the first device which apply to the whole workflow, merged over the analyses
+DRIVER_OPTIONS = ["--severity", "--shm-segment-size", "--aod-memory-rate-limit", "--aod-writer-json"]
+AOD_FILE_CFG = "aod-file"
+
+
+def parsePipeline(commandToRun: str):
+    """Splits a generated O2 command into its devices
+
+    Args:
+        commandToRun (str): Generated command for running in O2 (executables chained with pipes)
+
+    Returns:
+        list: Devices as (executable, options) with the options as list of (option, value or None), --configuration and -b excluded
+    """
+    
+    devices = []
+    for deviceCommand in commandToRun.split("|"):
+        tokens = shlex.split(deviceCommand)
+        if not tokens:
+            continue
+        options = []
+        i = 1
+        while i < len(tokens):
+            option = tokens[i]
+            value = None
+            if i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+                value = tokens[i + 1]
+                i += 1
+            i += 1
+            if option not in ["--configuration", "-b"]:
+                options.append((option, value))
+        devices.append((tokens[0], options))
+    return devices
+
+
+def configFileOf(commandToRun: str, cwd: str):
+    """JSON config of a generated O2 command
+
+    Args:
+        commandToRun (str): Generated command for running in O2
+        cwd (str): Working directory of the command
+
+    Returns:
+        str or None: Path of the JSON config (--configuration json://), None if it has no JSON config
+    """
+    
+    tokens = shlex.split(commandToRun.split("|")[0])
+    if "--configuration" not in tokens:
+        return None
+    configuration = tokens[tokens.index("--configuration") + 1]
+    return os.path.join(cwd, configuration.replace("json://", "", 1))
+
+
+def digest(content):
+    """Hash of JSON serializable content
+
+    Args:
+        content (object): JSON serializable content
+
+    Returns:
+        str: sha256 hex digest
+    """
+    
+    return hashlib.sha256(json.dumps(content, sort_keys = True).encode()).hexdigest()
+
+
+def fileDigest(fileName: str):
+    """Hash of the content of a file
+
+    Args:
+        fileName (str): File name
+
+    Returns:
+        str or None: sha256 hex digest, None if the file can't be read
+    """
+    
+    try:
+        with open(fileName, "rb") as inputFile:
+            return hashlib.sha256(inputFile.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def fileStat(fileName: str):
+    """Size and mtime of a file
+
+    Args:
+        fileName (str): File name
+
+    Returns:
+        list: File name, size in bytes and mtime in ns (None for remote and missing files)
+    """
+    
+    if "://" not in fileName:
+        try:
+            stat = os.stat(fileName)
+            return [fileName, stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            pass
+    return [fileName, None, None]
+
+
+def inputFiles(aodFile: str, cwd: str):
+    """Sizes and mtimes of the AO2D input files of a workflow (text lists are expanded)
+
+    Args:
+        aodFile (str): aod-file of the JSON config (file or @list.txt)
+        cwd (str): Working directory of the workflow
+
+    Returns:
+        list: File name, size and mtime of the input files
+    """
+    
+    if aodFile.startswith("@"):
+        try:
+            aodFiles = readAodList(os.path.join(cwd, aodFile[1 :]))
+        except OSError:
+            return [fileStat(aodFile)]
+    else:
+        aodFiles = [aodFile if "://" in aodFile else os.path.join(cwd, aodFile)]
+    with ThreadPoolExecutor(max_workers = max(1, min(STAT_THREADS, len(aodFiles)))) as executor:
+        return list(executor.map(fileStat, aodFiles))
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the composer of fused workflows (runFusedWorkflow.py): several analyses run in one pass over the AO2D.
+# Each analysis is prepared by its own run script with the workflow plan mode of the workflow runner (JSON config and command are
+# generated, the command is recorded instead of executed). The JSON configs are merged into one config, the devices (executables) of
+# the pipelines are deduplicated, so the common dependencies (timestamp, event selection, multiplicity, track selection, PID) and
+# the AOD reader run once, and the writer descriptors of the analyses are merged (each table keeps the output file of its analysis).
+
+import os
+import sys
+import copy
+import json
+import shlex
+import logging
+import subprocess
+from extramodules.completionTable import PACKAGE_PATH
+from extramodules.workflowRunner import WORKFLOW_PLAN_ENV
+from extramodules.runArtifacts import ARTIFACT_FOLDER, runDir
+from extramodules.workflowCommand import DRIVER_OPTIONS, configFileOf, parsePipeline
+
+# Run scripts which can be fused -> main task in their JSON config (its configurables win in the merged config)
+FUSABLE_ANALYSES = {
+    "runTableMaker.py": "table-maker",
+    "runFilterPP.py": "d-q-filter-p-p-task",
+    "runV0selector.py": "v0-selector",
+    "runDQFlow.py": "analysis-qvector",
+    }
+FUSED_CONFIG = "tempConfigFused.json"
+FUSED_WRITER_CONFIG = "aodWriterFusedConfig.json"
+FUSED_PLAN = "tempWorkflowPlan.json" # named by the run id in ARTIFACT_FOLDER
+SWITCH_VALUES = ["1", "0", "-1"] # "1/-1" switches (pid-*, est*) are merged as union, the tables are produced for all analyses
+
+
+def splitAnalyses(argv: list, scripts = FUSABLE_ANALYSES):
+    """Splits the arguments of the composer into its own arguments and the analyses (run script followed by its arguments)
+
+    Args:
+        argv (list): Arguments of the composer (without program name)
+        scripts (list, optional): Run scripts which start an analysis. Defaults to FUSABLE_ANALYSES.
+
+    Returns:
+        tuple: Arguments of the composer, list of (run script, arguments) of the analyses
+    """
+    
+    composerArgs = []
+    analyses = []
+    for arg in argv:
+        if os.path.basename(arg) in scripts:
+            analyses.append((os.path.basename(arg), []))
+        elif analyses:
+            analyses[-1][1].append(arg)
+        else:
+            composerArgs.append(arg)
+    return composerArgs, analyses
+
+
+def planAnalysis(scriptName: str, scriptArgs: list, planFileName = None):
+    """Prepares an analysis with its run script in the workflow plan mode (config is written, command is recorded)
+
+    Args:
+        scriptName (str): Run script e.g. runTableMaker.py
+        scriptArgs (list): Arguments of the run script
+        planFileName (str, optional): Workflow plan file of the run. Defaults to None (FUSED_PLAN of the run in ARTIFACT_FOLDER).
+
+    Returns:
+        tuple: Exit code of the run script, recorded workflows (dicts with command and cwd)
+    """
+    
+    planFileName = planFileName or runDir(ARTIFACT_FOLDER) + "-" + FUSED_PLAN
+    os.makedirs(os.path.dirname(os.path.abspath(planFileName)), exist_ok = True)
+    if os.path.isfile(planFileName):
+        os.remove(planFileName)
+    env = dict(os.environ)
+    env[WORKFLOW_PLAN_ENV] = os.path.abspath(planFileName)
+    env.pop("_ARGCOMPLETE", None)
+    command = [sys.executable, os.path.join(PACKAGE_PATH, scriptName)] + scriptArgs
+    logging.info("Preparing %s: %s", scriptName, " ".join(shlex.quote(arg) for arg in scriptArgs))
+    exitCode = subprocess.run(command, env = env, stdin = subprocess.DEVNULL).returncode
+    
+    workflows = []
+    if os.path.isfile(planFileName):
+        with open(planFileName) as planFile:
+            workflows = json.load(planFile)
+        os.remove(planFileName)
+    return exitCode, workflows
+
+
+def mergeConfigs(analysisConfigs: list):
+    """Merges the JSON configs of analyses. Equal values are kept, configurables of the main task of an analysis are taken
+    from this analysis, "1/-1" switches are merged as union, all other different values are conflicts.
+    Configs of tasks which only run processDummy in an analysis are taken from the analyses using the task
+
+    Args:
+        analysisConfigs (list): (analysis name, main task, JSON config) of the analyses
+
+    Returns:
+        tuple: Merged JSON config, conflicts as list of (task, cfg, dict analysis -> value)
+    """
+    
+    owners = {
+        mainTask: name
+        for name, mainTask, config in analysisConfigs
+        }
+    # tasks which run only their dummy process function in an analysis don't vote if another analysis uses them
+    activeTasks = {
+        task
+        for name, mainTask, config in analysisConfigs
+        for task, cfgValuePair in config.items()
+        if isinstance(cfgValuePair, dict) and cfgValuePair.get("processDummy") != "true"
+        }
+    values = {} # task -> cfg -> analysis -> value (in order of appearance)
+    for name, mainTask, config in analysisConfigs:
+        for task, cfgValuePair in config.items():
+            if isinstance(cfgValuePair, dict) and cfgValuePair.get("processDummy") == "true" and task in activeTasks:
+                logging.debug("[%s] is not used by %s (processDummy)", task, name)
+                continue
+            if not isinstance(cfgValuePair, dict):
+                values.setdefault(task, {}).setdefault(None, {})[name] = cfgValuePair
+                continue
+            for cfg, value in cfgValuePair.items():
+                values.setdefault(task, {}).setdefault(cfg, {})[name] = value
+    
+    merged = {}
+    conflicts = []
+    for task, cfgs in values.items():
+        for cfg, analysisValues in cfgs.items():
+            candidates = list(analysisValues.values())
+            value = candidates[0]
+            if any(candidate != value for candidate in candidates):
+                if owners.get(task) in analysisValues:
+                    value = analysisValues[owners[task]]
+                    logging.info("[%s] %s : %s (taken from %s)", task, cfg, value, owners[task])
+                elif all(candidate in SWITCH_VALUES for candidate in candidates):
+                    value = "1" if "1" in candidates else max(candidates)
+                    logging.debug("[%s] %s : %s (union of the analyses)", task, cfg, value)
+                else:
+                    conflicts.append((task, cfg, analysisValues))
+            if cfg is None:
+                merged[task] = copy.deepcopy(value)
+            else:
+                merged.setdefault(task, {})[cfg] = copy.deepcopy(value)
+    return merged, conflicts
+
+
+def mergeWriterConfigs(writerConfigs: list):
+    """Merges the aod-writer output descriptors of analyses, each descriptor keeps the output file (resfile) of its analysis
+
+    Args:
+        writerConfigs (list): aod-writer configs (OutputDirector dicts) of the analyses
+
+    Returns:
+        dict or None: Merged aod-writer config, None if no analysis writes tables
+    """
+    
+    if not writerConfigs:
+        return None
+    merged = copy.deepcopy(writerConfigs[0])
+    merged["OutputDirector"]["OutputDescriptors"] = []
+    writtenTables = set()
+    for writerConfig in writerConfigs:
+        outputDirector = writerConfig["OutputDirector"]
+        for descriptor in outputDirector.get("OutputDescriptors", []):
+            if descriptor["table"] in writtenTables:
+                continue
+            descriptor = dict(descriptor)
+            descriptor.setdefault("filename", outputDirector.get("resfile", "AnalysisResults_trees"))
+            merged["OutputDirector"]["OutputDescriptors"].append(descriptor)
+            writtenTables.add(descriptor["table"])
+    return merged
+
+
+def mergeDriverOptions(driverOptions: list):
+    """Merges the workflow options of the analyses, the largest shared memory segment and rate limit are taken
+
+    Args:
+        driverOptions (list): Workflow options (list of (option, value)) of the analyses
+
+    Returns:
+        list: Merged workflow options as (option, value)
+    """
+    
+    merged = {}
+    for options in driverOptions:
+        for option, value in options:
+            if option not in merged:
+                merged[option] = value
+            elif option in ["--shm-segment-size", "--aod-memory-rate-limit"] and float(value) > float(merged[option]):
+                merged[option] = value
+    return list(merged.items())
+
+
+def composeCommand(pipelines: list, configFileName = FUSED_CONFIG, writerConfigFileName = None):
+    """Composes one O2 command of the pipelines of the analyses with deduplicated devices
+
+    Args:
+        pipelines (list): (analysis name, devices of parsePipeline) of the analyses
+        configFileName (str, optional): Merged JSON config. Defaults to FUSED_CONFIG.
+        writerConfigFileName (str, optional): Merged aod-writer config. Defaults to None (no tables are written).
+
+    Returns:
+        tuple: Generated command for running in O2, dict executable -> analyses using it
+    """
+    
+    devices = {} # executable -> options (without workflow options)
+    users = {}
+    driverOptions = []
+    for name, pipeline in pipelines:
+        driverOptions.append([(option, value) for option, value in pipeline[0][1] if option in DRIVER_OPTIONS])
+        for executable, options in pipeline:
+            users.setdefault(executable, []).append(name)
+            devices.setdefault(executable, [(option, value) for option, value in options if option not in DRIVER_OPTIONS])
+    
+    workflowOptions = [(option, value) for option, value in mergeDriverOptions(driverOptions) if option != "--aod-writer-json"]
+    if writerConfigFileName is not None:
+        workflowOptions.append(("--aod-writer-json", writerConfigFileName))
+    
+    commands = []
+    for i, (executable, options) in enumerate(devices.items()):
+        if i == 0:
+            options = workflowOptions + options
+        deviceCommand = executable + " --configuration json://" + configFileName
+        for option, value in options:
+            deviceCommand += " " + option + ("" if value is None else " " + value)
+        commands.append(deviceCommand + " -b")
+    return " | ".join(commands), users
+
+
+def readAnalysis(scriptName: str, workflow: dict):
+    """Reads the JSON config, the pipeline and the aod-writer config of a prepared analysis
+
+    Args:
+        scriptName (str): Run script of the analysis
+        workflow (dict): Recorded workflow of the analysis (command and cwd)
+
+    Returns:
+        tuple: JSON config, pipeline (see parsePipeline), aod-writer config or None
+    """
+    
+    configFileName = configFileOf(workflow["command"], workflow["cwd"])
+    with open(configFileName) as configFile:
+        config = json.load(configFile)
+    pipeline = parsePipeline(workflow["command"])
+    writerConfig = None
+    for option, value in pipeline[0][1]:
+        if option == "--aod-writer-json":
+            with open(os.path.join(workflow["cwd"], value)) as writerConfigFile:
+                writerConfig = json.load(writerConfigFile)
+    logging.debug("%s: %d devices, config %s", scriptName, len(pipeline), configFileName)
+    return config, pipeline, writerConfig
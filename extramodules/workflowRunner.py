@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# This script includes the workflow runner of the run scripts. The generated O2 pipeline runs as subprocess,
+# its output is streamed line by line to the terminal and into one log file per DPL device ([pid:device] prefix of the driver)
+# and a report (start/stop time, exit code, CPU time, peak memory and output timing of each device) is written as JSON.
+# The run scripts run the workflow in the work directory of the run and publish its outputs if it succeeds (runIsolatedWorkflow).
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import logging
+import threading
+import subprocess
+from extramodules.runArtifacts import WORKFLOW_RUN_FOLDER, runDir, workflowDir, publishOutputs, cleanupRuns
+
+WORKFLOW_LOG_FOLDER = "tempWorkflowLogs"
+DRIVER_LOG = "driver.log" # output without device prefix (DPL driver, topology building)
+WORKFLOW_REPORT = "workflowReport.json"
+DEVICE_LINE = re.compile(r"^\[(\d+):([^\]]+)\]:?\s?")
+SHELL = "/bin/bash" # for pipefail, a failing device anywhere in the pipeline fails the workflow
+WORKFLOW_PLAN_ENV = "DQ_WORKFLOW_PLAN" # if set, commands are recorded into this JSON file instead of running them (workflow composer)
+PLAN_LOCK = threading.Lock() # workflows are recorded concurrently by the shard threads
+
+
+def deviceLogName(device: str):
+    """Log file name of a DPL device
+
+    Args:
+        device (str): Device name
+
+    Returns:
+        str: Log file name
+    """
+    
+    return re.sub(r"[^\w.-]", "_", device) + ".log"
+
+
+def recordWorkflow(commandToRun: str, planFileName: str, cwd = None):
+    """Appends the generated O2 command to a workflow plan instead of running it
+
+    Args:
+        commandToRun (str): Generated command for running in O2
+        planFileName (str): Workflow plan (JSON list of commands with their working directory)
+        cwd (str, optional): Working directory of the workflow. Defaults to None (current directory).
+    """
+    
+    with PLAN_LOCK:
+        plan = []
+        if os.path.isfile(planFileName):
+            with open(planFileName) as planFile:
+                plan = json.load(planFile)
+        plan.append({
+            "command": commandToRun,
+            "cwd": os.path.abspath(cwd or os.getcwd())
+            })
+        tempFileName = planFileName + "." + str(os.getpid())
+        with open(tempFileName, "w") as planFile:
+            json.dump(plan, planFile, indent = 2)
+        os.replace(tempFileName, planFileName)
+    logging.info("Workflow recorded in %s", planFileName)
+
+
+def runWorkflow(commandToRun: str, logDir = None, echo = True, cwd = None):
+    """Runs the generated O2 command, streams its output into per-device log files and writes the workflow report
+
+    Args:
+        commandToRun (str): Generated command for running in O2
+        logDir (str, optional): Directory of the logs and the report (recreated). Defaults to None (run directory in WORKFLOW_LOG_FOLDER).
+        echo (bool, optional): If True the output is also printed to the terminal. Defaults to True.
+        cwd (str, optional): Working directory of the workflow. Defaults to None (current directory).
+
+    Returns:
+        int: Exit code of the workflow (128 + signal number if it is killed by a signal)
+    """
+    
+    planFileName = os.environ.get(WORKFLOW_PLAN_ENV)
+    if planFileName:
+        recordWorkflow(commandToRun, planFileName, cwd)
+        return 0
+    
+    logDir = os.path.abspath(logDir or runDir(WORKFLOW_LOG_FOLDER))
+    if os.path.isdir(logDir):
+        shutil.rmtree(logDir)
+    os.makedirs(logDir)
+    
+    shell = SHELL if os.path.exists(SHELL) else None
+    command = "set -o pipefail; " + commandToRun if shell else commandToRun
+    devices = {}
+    deviceLogs = {}
+    
+    start = time.time()
+    process = subprocess.Popen(
+        command, shell = True, executable = shell, cwd = cwd, stdout = subprocess.PIPE, stderr = subprocess.STDOUT,
+        universal_newlines = True, errors = "replace", bufsize = 1
+        )
+    driverLog = open(os.path.join(logDir, DRIVER_LOG), "w")
+    try:
+        for line in process.stdout:
+            if echo:
+                sys.stdout.write(line)
+            match = DEVICE_LINE.match(line)
+            if match is None:
+                driverLog.write(line)
+                continue
+            device = match.group(2)
+            if device not in deviceLogs:
+                deviceLogs[device] = open(os.path.join(logDir, deviceLogName(device)), "w")
+                devices[device] = {
+                    "pid": int(match.group(1)),
+                    "log": deviceLogName(device),
+                    "lines": 0,
+                    "firstOutput": time.time() - start
+                    }
+            deviceLogs[device].write(line)
+            devices[device]["lines"] += 1
+            devices[device]["lastOutput"] = time.time() - start
+    except KeyboardInterrupt:
+        process.terminate()
+    finally:
+        driverLog.close()
+        for deviceLog in deviceLogs.values():
+            deviceLog.close()
+    
+    # resource usage of this workflow only (shell and all devices), also if workflows run concurrently
+    pid, status, usage = os.wait4(process.pid, 0)
+    exitCode = 128 + os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    process.returncode = exitCode
+    process.stdout.close()
+    stop = time.time()
+    
+    report = {
+        "command": commandToRun,
+        "start": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(start)),
+        "stop": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(stop)),
+        "wallTime": stop - start,
+        "exitCode": exitCode,
+        "userTime": usage.ru_utime,
+        "systemTime": usage.ru_stime,
+        "maxRssKb": usage.ru_maxrss, # largest process of the workflow
+        "devices": devices
+        }
+    with open(os.path.join(logDir, WORKFLOW_REPORT), "w") as reportFile:
+        json.dump(report, reportFile, indent = 2)
+    
+    logging.info(
+        "Workflow finished in %.1f s (CPU user %.1f s, system %.1f s, peak RSS %d kB), logs and report in %s", report["wallTime"],
+        report["userTime"], report["systemTime"], report["maxRssKb"], logDir
+        )
+    if exitCode != 0:
+        logging.error("Workflow failed with exit code %d, see %s", exitCode, os.path.join(logDir, DRIVER_LOG))
+    return exitCode
+
+
+def runIsolatedWorkflow(commandToRun: str, logDir = None, cwd = None, name = ""):
+    """Runs the generated O2 command in the work directory of the run (see workflowDir), the outputs of concurrent runs don't
+    collide and are published into the current directory if the workflow succeeds. Recorded workflows keep the current directory,
+    workflows with a directory of their own (e.g. shard directories) run there
+
+    Args:
+        commandToRun (str): Generated command for running in O2, input paths of its JSON config are absolute (see absoluteInputs)
+        logDir (str, optional): Directory of the logs and the report. Defaults to None (run directory in WORKFLOW_LOG_FOLDER).
+        cwd (str, optional): Working directory the workflow was prepared in. Defaults to None (current directory).
+        name (str, optional): Name of the work directory if the run has several workflows, e.g. stage1_0. Defaults to "".
+
+    Returns:
+        int: Exit code of the workflow
+    """
+    
+    if os.environ.get(WORKFLOW_PLAN_ENV):
+        return runWorkflow(commandToRun, logDir, cwd = cwd)
+    if cwd is not None and os.path.abspath(cwd) != os.getcwd():
+        return runWorkflow(commandToRun, logDir, cwd = cwd)
+    
+    cleanupRuns([WORKFLOW_RUN_FOLDER, WORKFLOW_LOG_FOLDER])
+    workDir = workflowDir(name)
+    exitCode = runWorkflow(commandToRun, logDir, cwd = workDir)
+    if exitCode != 0:
+        logging.error("Outputs of the failed workflow are kept in %s", workDir)
+        return exitCode
+    published = publishOutputs(workDir)
+    logging.info("Outputs of the workflow in %s published into the current directory: %s", workDir, ", ".join(published) or "none")
+    return exitCode
@@ -21,10 +21,21 @@
 import json
 import logging
 import logging.config
-import os
+import sys
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import fastComplete
+
+fastComplete() # TAB autocompletion is answered from the precompiled table (if fresh) without importing the interface
+
 from extramodules.dqTranscations import aodFileChecker, forgettedArgsChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
-from extramodules.configSetter import setSwitch, setConverters, setConfig, debugSettings, dispArgs, setPrefixSuffix
-from extramodules.pycacheRemover import runPycacheRemover
+from extramodules.configSetter import setConverters, debugSettings, dispArgs, setPrefixSuffix, ConfigRewriter
+from extramodules.workflowRunner import runIsolatedWorkflow
+from extramodules.runArtifacts import writeArtifact, absoluteInputs
 from dqtasks.dqFlow import AnalysisQvector
 
 # Predefined selections for setSwitch function
@@ -84,6 +95,19 @@ if args.onlySelect == "true":
 if args.onlySelect == "false":
     logging.info("INTERFACE MODE : JSON Additional")
 
+# Interface Logic (indexed, only the cfgs configured in CLI are visited)
+# For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
+configRewriter = ConfigRewriter(config, protectedCfgs = {
+    "tof-pid": "pid"
+    })
+configRewriter.setConfig(config, allArgs, cliMode)
+configRewriter.setSwitch(config, allArgs, cliMode, "est", centralityTableParameters, "1/-1")
+configRewriter.setSwitch(config, allArgs, cliMode, "pid", pidParameters, "1/-1")
+configRewriter.setSwitch(config, allArgs, "true", "isCovariance", covParameters, "true/false")
+configRewriter.setSwitch(config, allArgs, "true", "isWSlice", sliceParameters, "true/false")
+# we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
+configRewriter.setSwitch(config, allArgs, "true", "FT0", ft0Parameters, "true/false", selectedTask = "tof-event-time")
+
 # Iterating in JSON config file
 for task, cfgValuePair in config.items():
     if isinstance(cfgValuePair, dict):
@@ -93,27 +117,16 @@ for task, cfgValuePair in config.items():
             if cfg == "aod-file" and args.aod:
                 config[task][cfg] = args.aod
                 logging.debug(" - [%s] %s : %s", task, cfg, args.aod)
-            
-            # For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
-            if task == "tof-pid" and cfg.startswith("pid"):
-                continue
-            
-            setConfig(config, task, cfg, allArgs, cliMode)
-            setSwitch(config, task, cfg, allArgs, cliMode, "est", centralityTableParameters, "1/-1")
-            setSwitch(config, task, cfg, allArgs, cliMode, "pid", pidParameters, "1/-1")
-            setSwitch(config, task, cfg, allArgs, "true", "isCovariance", covParameters, "true/false")
-            setSwitch(config, task, cfg, allArgs, "true", "isWSlice", sliceParameters, "true/false")
-            if task == "tof-event-time": # we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
-                setSwitch(config, task, cfg, allArgs, "true", "FT0", ft0Parameters, "true/false")
 
 # Transactions
 aodFileChecker(args.aod)
 trackPropagationChecker(args.add_track_prop, commonDeps)
 
-# Write the updated configuration file into a temporary file
-updatedConfigFileName = "tempConfigDQFlow.json"
-with open(updatedConfigFileName, "w") as outputFile:
-    json.dump(config, outputFile, indent = 2)
+# Input paths relative to the current directory, the workflow runs in the work directory of the run
+absoluteInputs(config)
+
+# Write the updated configuration file content-addressed, concurrent runs in the same checkout do not overwrite it
+updatedConfigFileName = writeArtifact(config, "tempConfigDQFlow.json")
 
 # Check which dependencies need to be run
 depsToRun = {}
@@ -134,5 +147,4 @@ logging.info("Command to run:")
 logging.info(commandToRun)
 print("====================================================================================================================")
 dispArgs(allArgs) # Display all args
-os.system(commandToRun) # Execute O2 generated commands
-runPycacheRemover() # Run pycacheRemover
+sys.exit(runIsolatedWorkflow(commandToRun)) # Execute O2 generated commands
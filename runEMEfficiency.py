@@ -21,10 +21,21 @@
 import json
 import logging
 import logging.config
-import os
+import sys
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import fastComplete
+
+fastComplete() # TAB autocompletion is answered from the precompiled table (if fresh) without importing the interface
+
 from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, depsChecker, forgettedArgsChecker, jsonTypeChecker, mainTaskChecker, oneToMultiDepsChecker
-from extramodules.configSetter import setConfig, setFalseHasDeps, setSwitch, setSelection, debugSettings, setProcessDummy, dispArgs, multiConfigurableSet, setPrefixSuffix
-from extramodules.pycacheRemover import runPycacheRemover
+from extramodules.configSetter import setFalseHasDeps, setSelection, debugSettings, setProcessDummy, dispArgs, multiConfigurableSet, setPrefixSuffix, ConfigRewriter
+from extramodules.workflowRunner import runIsolatedWorkflow
+from extramodules.runArtifacts import writeArtifact, absoluteInputs, absolutePath
 from dqtasks.emEfficiency import EMEfficiency
 
 # Predefined selections for setSwitch function
@@ -80,11 +91,16 @@ if cliMode == "false":
 
 setSelection(config, analysisSelectionDeps, args.analysis, cliMode) # Set selections
 
+# Interface Logic (indexed, only the cfgs configured in CLI are visited)
+configRewriter = ConfigRewriter(config)
+configRewriter.setConfig(config, allArgs, cliMode)
+configRewriter.setSwitch(config, allArgs, cliMode, "process", sameEventPairingParameters, "true/false")
+
 # Iterating in JSON config file
 for task, cfgValuePair in config.items():
     if isinstance(cfgValuePair, dict):
         for cfg, value in cfgValuePair.items():
-
+            
             # aod
             if cfg == "aod-file" and args.aod:
                 config[task][cfg] = args.aod
@@ -93,10 +109,7 @@ for task, cfgValuePair in config.items():
             if cfg == "aod-reader-json" and args.reader:
                 config[task][cfg] = args.reader
                 logging.debug(" - [%s] %s : %s", task, cfg, args.reader)
-
-            # Interface Logic
-            setConfig(config, task, cfg, allArgs, cliMode)
-            setSwitch(config, task, cfg, allArgs, cliMode, "process", sameEventPairingParameters, "true/false")
+            
             setFalseHasDeps(config, task, cfg, args.process, sameEventPairingParameters, cliMode)
             mandatoryArgChecker(config, task, cfg, taskNameInConfig, "processSkimmed")
 
@@ -107,14 +120,15 @@ aodFileChecker(args.aod)
 oneToMultiDepsChecker(args.process, "sameEventPairing", args.analysis, "analysis")
 depsChecker(config, sameEventPairingDeps, sameEventPairingTaskName)
 
+# Input paths relative to the current directory, the workflow runs in the work directory of the run
+absoluteInputs(config)
 
-# Write the updated configuration file into a temporary file
-updatedConfigFileName = "tempConfigEMEfficiencyEE.json"
-
-with open(updatedConfigFileName, "w") as outputFile:
-    json.dump(config, outputFile, indent = 2)
+# Write the updated configuration file content-addressed, concurrent runs in the same checkout do not overwrite it
+updatedConfigFileName = writeArtifact(config, "tempConfigEMEfficiencyEE.json")
 
-commandToRun = (taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " -b" + " --aod-writer-json " + args.writer)
+commandToRun = (
+    taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " -b" + " --aod-writer-json " + absolutePath(args.writer)
+    )
 if args.writer == "false":
     commandToRun = (taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " -b")
 
@@ -123,5 +137,4 @@ logging.info("Command to run:")
 logging.info(commandToRun)
 print("====================================================================================================================")
 dispArgs(allArgs) # Display all args
-os.system(commandToRun) # Execute O2 generated commands
-runPycacheRemover() # Run pycacheRemover
+sys.exit(runIsolatedWorkflow(commandToRun)) # Execute O2 generated commands
@@ -21,10 +21,21 @@
 import json
 import logging
 import logging.config
-import os
+import sys
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import fastComplete
+
+fastComplete() # TAB autocompletion is answered from the precompiled table (if fresh) without importing the interface
+
 from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, forgettedArgsChecker, jsonTypeChecker, filterSelsChecker, mainTaskChecker, trackPropagationChecker
-from extramodules.configSetter import setSwitch, setSelection, setConverters, setConfig, setProcessDummy, debugSettings, dispArgs, setPrefixSuffix
-from extramodules.pycacheRemover import runPycacheRemover
+from extramodules.configSetter import setSelection, setConverters, setProcessDummy, debugSettings, dispArgs, setPrefixSuffix, ConfigRewriter
+from extramodules.workflowRunner import runIsolatedWorkflow
+from extramodules.runArtifacts import writeArtifact, absoluteInputs
 from dqtasks.filterPP import DQFilterPPTask
 
 # Predefined selections for setSwitch function
@@ -93,6 +104,18 @@ if args.onlySelect == "false":
 
 setSelection(config, selectionDeps, args.process, "true")
 
+# Interface Logic (indexed, only the cfgs configured in CLI are visited)
+# For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
+configRewriter = ConfigRewriter(config, protectedCfgs = {
+    "tof-pid": "pid"
+    })
+configRewriter.setConfig(config, allArgs, cliMode)
+configRewriter.setSwitch(config, allArgs, cliMode, "pid", pidParameters, "1/-1")
+configRewriter.setSwitch(config, allArgs, "true", "isCovariance", covParameters, "true/false")
+configRewriter.setSwitch(config, allArgs, "true", "isWSlice", sliceParameters, "true/false")
+# we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
+configRewriter.setSwitch(config, allArgs, "true", "FT0", ft0Parameters, "true/false", selectedTask = "tof-event-time")
+
 # Iterating in JSON config file
 for task, cfgValuePair in config.items():
     if isinstance(cfgValuePair, dict):
@@ -103,16 +126,6 @@ for task, cfgValuePair in config.items():
                 config[task][cfg] = args.aod
                 logging.debug(" - [%s] %s : %s", task, cfg, args.aod)
             
-            # For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
-            if task == "tof-pid" and cfg.startswith("pid"):
-                continue
-            
-            setConfig(config, task, cfg, allArgs, cliMode)
-            setSwitch(config, task, cfg, allArgs, cliMode, "pid", pidParameters, "1/-1")
-            setSwitch(config, task, cfg, allArgs, "true", "isCovariance", covParameters, "true/false")
-            setSwitch(config, task, cfg, allArgs, "true", "isWSlice", sliceParameters, "true/false")
-            if task == "tof-event-time": # we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
-                setSwitch(config, task, cfg, allArgs, "true", "FT0", ft0Parameters, "true/false")
             mandatoryArgChecker(config, task, cfg, "d-q-event-selection-task", "processEventSelection")
 setProcessDummy(config, dummyHasTasks) # dummy automizer
 
@@ -121,11 +134,11 @@ filterSelsChecker(args.cfgBarrelSels, args.cfgMuonSels, args.cfgBarrelTrackCuts,
 aodFileChecker(args.aod)
 trackPropagationChecker(args.add_track_prop, commonDeps)
 
-# Write the updated configuration file into a temporary file
-updatedConfigFileName = "tempConfigFilterPP.json"
+# Input paths relative to the current directory, the workflow runs in the work directory of the run
+absoluteInputs(config)
 
-with open(updatedConfigFileName, "w") as outputFile:
-    json.dump(config, outputFile, indent = 2)
+# Write the updated configuration file content-addressed, concurrent runs in the same checkout do not overwrite it
+updatedConfigFileName = writeArtifact(config, "tempConfigFilterPP.json")
 
 # Check which dependencies need to be run
 depsToRun = {}
@@ -146,5 +159,4 @@ logging.info("Command to run:")
 logging.info(commandToRun)
 print("====================================================================================================================")
 dispArgs(allArgs) # Display all args
-os.system(commandToRun) # Execute O2 generated commands
-runPycacheRemover() # Run pycacheRemover
+sys.exit(runIsolatedWorkflow(commandToRun)) # Execute O2 generated commands
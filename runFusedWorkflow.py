@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# \Author: ionut.cristian.arsene@cern.ch
+# \Interface:  cevat.batuhan.tolon@cern.ch
+
+# This script runs several analyses (tableMaker, filterPP, v0selector, dqFlow) in one pass over the AO2D.
+# Each analysis is configured by its own run script and arguments, the JSON configs are merged and the common devices
+# (reader, timestamp, event selection, multiplicity, track selection, PID) run once for all analyses.
+# Usage: runFusedWorkflow.py [--aod AO2D] <run script> <its arguments> <run script> <its arguments> ...
+
+import logging
+import logging.config
+import sys
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+import argparse
+from extramodules.dqTranscations import fusedAnalysesChecker, fusedConfigChecker, fusedWorkflowChecker
+from extramodules.configSetter import debugSettings
+from extramodules.workflowComposer import FUSABLE_ANALYSES, FUSED_CONFIG, FUSED_WRITER_CONFIG, composeCommand, mergeConfigs, mergeWriterConfigs, planAnalysis, readAnalysis, splitAnalyses
+from extramodules.workflowRunner import runIsolatedWorkflow
+from extramodules.runArtifacts import writeArtifact
+
+parser = argparse.ArgumentParser(
+    description = "Runs several analyses in one pass over the AO2D with deduplicated devices",
+    usage = "%(prog)s [-h] [--aod AOD] [--debug DEBUG] [--logFile] RUNSCRIPT ARGS [RUNSCRIPT ARGS ...]",
+    epilog = "Example: %(prog)s --aod @input.txt runTableMaker.py configs/configTableMakerDataRun3.json --process BarrelOnly "
+    "runV0selector.py configs/configV0SelectorDataRun3.json"
+    )
+parser.add_argument(
+    "analyses", help = "Run scripts with their arguments, fusable: " + ", ".join(FUSABLE_ANALYSES), nargs = "*", metavar = "RUNSCRIPT ARGS"
+    )
+parser.add_argument("--aod", help = "AO2D file or text list (@list.txt) for all analyses", action = "store", type = str)
+parser.add_argument(
+    "--debug", help = "execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    default = "INFO", type = str.upper,
+    )
+parser.add_argument("--logFile", help = "Enable logger for both file and CLI", action = "store_true")
+
+composerArgs, analyses = splitAnalyses(sys.argv[1 :])
+args = parser.parse_args(composerArgs)
+if args.analyses:
+    parser.error("%s is not a fusable run script (fusable: %s)" % (args.analyses[0], ", ".join(FUSABLE_ANALYSES)))
+
+# Debug Settings
+debugSettings(args.debug, args.logFile, fileName = "fusedWorkflow.log")
+
+fusedAnalysesChecker(analyses) # Transaction management
+
+# Prepare each analysis with its run script (configs are generated, the workflows are recorded instead of executed)
+analysisConfigs = []
+pipelines = []
+writerConfigs = []
+for scriptName, scriptArgs in analyses:
+    if args.aod:
+        scriptArgs = scriptArgs + ["--aod", args.aod]
+    exitCode, workflows = planAnalysis(scriptName, scriptArgs)
+    if exitCode != 0:
+        logging.error("%s failed with exit code %d, the analyses are not fused", scriptName, exitCode)
+        sys.exit(exitCode)
+    fusedWorkflowChecker(scriptName, workflows)
+    config, pipeline, writerConfig = readAnalysis(scriptName, workflows[0])
+    analysisConfigs.append((scriptName, FUSABLE_ANALYSES[scriptName], config))
+    pipelines.append((scriptName, pipeline))
+    if writerConfig is not None:
+        writerConfigs.append(writerConfig)
+
+# Merge the JSON configs, shared tasks run once so they have to be configured the same
+config, conflicts = mergeConfigs(analysisConfigs)
+fusedConfigChecker(conflicts)
+
+configFileName = writeArtifact(config, FUSED_CONFIG)
+
+# Each analysis keeps its output descriptors in the merged aod-writer config
+writerConfig = mergeWriterConfigs(writerConfigs)
+writerConfigFileName = writeArtifact(writerConfig, FUSED_WRITER_CONFIG) if writerConfig is not None else None
+
+commandToRun, deviceUsers = composeCommand(pipelines, configFileName, writerConfigFileName)
+sharedDevices = [executable for executable, users in deviceUsers.items() if len(users) > 1]
+
+print("====================================================================================================================")
+logging.info(
+    "%d analyses fused into %d devices instead of %d, shared devices: %s", len(analyses), len(deviceUsers),
+    sum(len(pipeline) for scriptName, pipeline in pipelines), ", ".join(sharedDevices) if sharedDevices else "none"
+    )
+logging.info("Command to run:")
+logging.info(commandToRun)
+print("====================================================================================================================")
+sys.exit(runIsolatedWorkflow(commandToRun)) # Execute O2 generated commands
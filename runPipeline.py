@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# PYTHON_ARGCOMPLETE_OK
+# -*- coding: utf-8 -*-
+
+# Copyright 2019-2020 CERN and copyright holders of ALICE O2.
+# See https://alice-o2.web.cern.ch/copyright for details of the copyright holders.
+# All rights not expressly granted are reserved.
+#
+# This software is distributed under the terms of the GNU General Public
+# License v3 (GPL Version 3), copied verbatim in the file "COPYING".
+#
+# In applying this license CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+# \Author: ionut.cristian.arsene@cern.ch
+# \Interface:  cevat.batuhan.tolon@cern.ch
+
+# This script runs an analysis chain (e.g. tableMaker -> tableReader -> dqEfficiency) incrementally like make.
+# Each stage is configured by its own run script and arguments, a stage is skipped if its config, descriptors and input files
+# are unchanged since its last successful run, after a change only this stage and the downstream stages run again.
+# Usage: runPipeline.py [--force] <run script> <its arguments> <run script> <its arguments> ...
+
+import logging
+import logging.config
+import sys
+import os
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+import argparse
+from extramodules.dqTranscations import pipelineStagesChecker
+from extramodules.configSetter import debugSettings
+from extramodules.workflowComposer import planAnalysis, splitAnalyses
+from extramodules.pipelineDriver import PIPELINE_SCRIPTS, PIPELINE_STATE, changedInputs, readState, stageInputs, stageOutputs, writeState
+from extramodules.workflowRunner import WORKFLOW_LOG_FOLDER, runIsolatedWorkflow
+from extramodules.runArtifacts import runDir
+
+parser = argparse.ArgumentParser(
+    description = "Runs an analysis chain incrementally, unchanged stages are skipped",
+    usage = "%(prog)s [-h] [--force] [--state STATE] [--debug DEBUG] [--logFile] RUNSCRIPT ARGS [RUNSCRIPT ARGS ...]",
+    epilog = "Example: %(prog)s runTableMaker.py configs/configTableMakerDataRun3.json --process BarrelOnly "
+    "runTableReader.py configs/configAnalysisData.json --aod reducedAod.root --analysis eventSelection trackSelection"
+    )
+parser.add_argument(
+    "stages", help = "Run scripts with their arguments in the order of the chain: " + ", ".join(PIPELINE_SCRIPTS), nargs = "*",
+    metavar = "RUNSCRIPT ARGS"
+    )
+parser.add_argument("--force", help = "Run all stages, also if their inputs are unchanged", action = "store_true")
+parser.add_argument("--state", help = "State file of the stages", action = "store", default = PIPELINE_STATE, type = str)
+parser.add_argument(
+    "--debug", help = "execute with debug options", action = "store", choices = ["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+    default = "INFO", type = str.upper,
+    )
+parser.add_argument("--logFile", help = "Enable logger for both file and CLI", action = "store_true")
+
+pipelineArgs, stages = splitAnalyses(sys.argv[1 :], PIPELINE_SCRIPTS)
+args = parser.parse_args(pipelineArgs)
+if args.stages:
+    parser.error("%s is not a pipeline run script (run scripts: %s)" % (args.stages[0], ", ".join(PIPELINE_SCRIPTS)))
+
+# Debug Settings
+debugSettings(args.debug, args.logFile, fileName = "pipeline.log")
+
+pipelineStagesChecker(stages) # Transaction management
+
+state = readState(args.state)
+upstreamRan = False
+for i, (scriptName, scriptArgs) in enumerate(stages):
+    stageName = "%d:%s" % (i + 1, scriptName)
+    
+    # Prepare the stage with its run script (config and descriptors are generated, the workflows are recorded instead of executed)
+    exitCode, workflows = planAnalysis(scriptName, scriptArgs)
+    if exitCode != 0:
+        logging.error("%s failed with exit code %d, the pipeline is stopped", stageName, exitCode)
+        sys.exit(exitCode)
+    inputs = stageInputs(workflows)
+    changed = changedInputs(state.get(stageName), inputs)
+    
+    if not args.force and not upstreamRan and not changed:
+        logging.info("%s is up to date (%d input files unchanged), skipped", stageName, inputs["inputFiles"])
+        continue
+    if args.force or upstreamRan:
+        reason = "--force" if args.force else "upstream stage ran"
+    else:
+        reason = "no previous run" if stageName not in state else ", ".join(changed) + " changed"
+    logging.info("%s runs: %s", stageName, reason)
+    
+    # The state of a stage is only kept after a successful run
+    state.pop(stageName, None)
+    writeState(state, args.state)
+    for j, workflow in enumerate(workflows):
+        # workflows prepared in the current directory run in their work directory and publish their outputs
+        name = "stage%d_%d" % (i + 1, j)
+        exitCode = runIsolatedWorkflow(workflow["command"], os.path.join(runDir(WORKFLOW_LOG_FOLDER), name), workflow["cwd"], name)
+        if exitCode != 0:
+            logging.error("%s failed with exit code %d, the pipeline is stopped", stageName, exitCode)
+            sys.exit(exitCode)
+    state[stageName] = {
+        "script": scriptName,
+        "args": scriptArgs,
+        "inputs": inputs,
+        "outputs": stageOutputs(workflows),
+        "workflows": workflows # generated files of the workflows are kept by the cleanup
+        }
+    writeState(state, args.state)
+    upstreamRan = True
+
+logging.info("Pipeline finished, state written to %s", args.state)
+sys.exit(0)
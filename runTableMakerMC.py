@@ -21,11 +21,32 @@
 import json
 import logging
 import logging.config
+import sys
 import os
-from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, centralityChecker, forgettedArgsChecker, jsonTypeChecker, mainTaskChecker, trackPropagationChecker
-from extramodules.configSetter import setSwitch, setConverters, setConfig, debugSettings, dispArgs, generateDescriptors, setPrefixSuffix, tableProducer
-from extramodules.pycacheRemover import runPycacheRemover
+import time
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import fastComplete
+
+fastComplete() # TAB autocompletion is answered from the precompiled table (if fresh) without importing the interface
+
+from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, centralityChecker, forgettedArgsChecker, jsonTypeChecker, mainTaskChecker, pruneForChecker
+from extramodules.configSetter import setConverters, debugSettings, dispArgs, generateDescriptors, setPrefixSuffix, tableProducer, ConfigRewriter
+from extramodules.workflowRunner import WORKFLOW_PLAN_ENV, runIsolatedWorkflow
+from extramodules.skimCache import restoreSkim, skimFingerprint, storeSkim
+from extramodules.runArtifacts import writeArtifact, absoluteInputs
+from extramodules.dependencyGraph import requiredTables, resolveDevices, logDevices
+from extramodules.pidPruning import pidPruning
+from extramodules.tablePruning import tablePruning
+from extramodules.shardRunner import aodInputSizes
+from extramodules.memorySizing import SHM_SEGMENT_SIZE, sizeSharedMemory
 from dqtasks.tableMakerMC import TableMakerMC
+from dqtasks.tableReader import TABLE_READER_CONSUMERS, TABLE_READER_PRODUCTS
+from dqtasks.dqEfficiency import DQ_EFFICIENCY_CONSUMERS, DQ_EFFICIENCY_PRODUCTS
 
 # Predefined selections for setSwitch function
 centralityTableParameters = [
@@ -37,31 +58,31 @@ covParameters = ["processStandard", "processCovariance"]
 sliceParameters = ["processWoSlice", "processWSlice"]
 centSearch = [] # for centrality transaction
 
-# All Dependencies
-commonDeps = ["o2-analysis-timestamp", "o2-analysis-event-selection", "o2-analysis-multiplicity-table",]
-barrelDeps = [
-    "o2-analysis-trackselection", "o2-analysis-trackextension", "o2-analysis-pid-tof-base", "o2-analysis-pid-tof",
-    "o2-analysis-pid-tof-full", "o2-analysis-pid-tof-beta", "o2-analysis-pid-tpc-full",
-    ]
-muonDeps = ["o2-analysis-fwdtrackextension"]
-specificDeps = {
-    "processFull": [],
-    "processFullTiny": [],
-    "processFullWithCov": [],
-    "processFullWithCent": ["o2-analysis-centrality-table"],
-    "processBarrelOnly": [],
-    "processBarrelOnlyWithCov": [],
-    "processBarrelOnlyWithV0Bits": ["o2-analysis-dq-v0-selector"],
-    "processBarrelOnlyWithEventFilter": ["o2-analysis-dq-filter-pp"],
-    "processBarrelOnlyWithQvector": ["o2-analysis-centrality-table", "o2-analysis-dq-flow",],
-    "processBarrelOnlyWithCent": ["o2-analysis-centrality-table"],
-    "processMuonOnly": [],
-    "processMuonOnlyWithCov": [],
-    "processMuonOnlyWithCent": ["o2-analysis-centrality-table"],
-    "processMuonOnlyWithQvector": ["o2-analysis-centrality-table", "o2-analysis-dq-flow"],
-    "processMuonOnlyWithFilter": ["o2-analysis-dq-filter-pp"]
-    # "processFullWithCentWithV0Bits": ["o2-analysis-centrality-table","o2-analysis-dq-v0-selector", "o2-analysis-weak-decay-indices"],
-    # "processFullWithEventFilterWithV0Bits": ["o2-analysis-dq-filter-pp","o2-analysis-dq-v0-selector", "o2-analysis-weak-decay-indices"],
+# Tables consumed by the process functions (producer devices are resolved with the dependency graph)
+eventTables = ["EvSels", "Mults"]
+barrelTables = ["TracksDCA", "TrackSelection", "pidTPCFull", "pidTOFFull", "pidTOFbeta"]
+muonTables = ["FwdTracksDCA"]
+processTables = {
+    "processFull": eventTables + barrelTables + muonTables,
+    "processFullTiny": eventTables + barrelTables + ["pidTOF"] + muonTables,
+    "processFullWithCov": eventTables + barrelTables + muonTables,
+    "processFullWithCent": eventTables + barrelTables + muonTables + ["Cents"],
+    "processBarrelOnly": eventTables + barrelTables,
+    "processBarrelOnlyWithCov": eventTables + barrelTables,
+    "processBarrelOnlyWithV0Bits": eventTables + barrelTables + ["V0Bits"],
+    "processBarrelOnlyWithEventFilter": eventTables + barrelTables + ["DQEventFilter"],
+    "processBarrelOnlyWithQvector": eventTables + barrelTables + ["Cents", "EventQvectors"],
+    "processBarrelOnlyWithCent": eventTables + barrelTables + ["Cents"],
+    "processMuonOnly": eventTables + muonTables,
+    "processMuonOnlyWithCov": eventTables + muonTables,
+    "processMuonOnlyWithCent": eventTables + muonTables + ["Cents"],
+    "processMuonOnlyWithQvector": eventTables + muonTables + ["Cents", "EventQvectors"],
+    "processMuonOnlyWithFilter": eventTables + muonTables + ["DQEventFilter"]
+    # "processFullWithCentWithV0Bits": eventTables + barrelTables + muonTables + ["Cents", "V0Bits"],
+    # "processFullWithEventFilterWithV0Bits": eventTables + barrelTables + muonTables + ["DQEventFilter", "V0Bits"],
+    }
+tableConsumers = {
+    "table-maker-m-c": dict(processTables, processOnlyBCs = ["BcSels"]),
     }
 
 # yapf: disable
@@ -155,6 +176,20 @@ if cliMode == "false":
 if args.process:
     centSearch = [s for s in args.process if "Cent" in s]
 
+# Interface Logic (indexed, only the cfgs configured in CLI are visited)
+# For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
+configRewriter = ConfigRewriter(config, protectedCfgs = {
+    "tof-pid": "pid"
+    })
+configRewriter.setConfig(config, allArgs, cliMode)
+configRewriter.setSwitch(config, allArgs, cliMode, "est", centralityTableParameters, "1/-1")
+configRewriter.setSwitch(config, allArgs, cliMode, "pid", pidParameters, "1/-1")
+configRewriter.setSwitch(config, allArgs, cliMode, "process", processTables.keys(), "true/false")
+configRewriter.setSwitch(config, allArgs, "true", "isCovariance", covParameters, "true/false")
+configRewriter.setSwitch(config, allArgs, "true", "isWSlice", sliceParameters, "true/false")
+# we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
+configRewriter.setSwitch(config, allArgs, "true", "FT0", ft0Parameters, "true/false", selectedTask = "tof-event-time")
+
 # Iterating in JSON config file
 for task, cfgValuePair in config.items():
     if isinstance(cfgValuePair, dict):
@@ -165,70 +200,55 @@ for task, cfgValuePair in config.items():
                 config[task][cfg] = args.aod
                 logging.debug(" - [%s] %s : %s", task, cfg, args.aod)
             
-            # For don't override tof-pid: pid tables. We use instead of tof-pid-full and tpc-pid-full for pid tables
-            if task == "tof-pid" and cfg.startswith("pid"):
-                continue
-            
-            setConfig(config, task, cfg, allArgs, cliMode)
-            setSwitch(config, task, cfg, allArgs, cliMode, "est", centralityTableParameters, "1/-1")
-            setSwitch(config, task, cfg, allArgs, cliMode, "pid", pidParameters, "1/-1")
-            setSwitch(config, task, cfg, allArgs, cliMode, "process", specificDeps.keys(), "true/false")
-            setSwitch(config, task, cfg, allArgs, "true", "isCovariance", covParameters, "true/false")
-            setSwitch(config, task, cfg, allArgs, "true", "isWSlice", sliceParameters, "true/false")
-            if task == "tof-event-time": # we have processRun2 option in tof-event-time and for not overriding it other processRun2 options, we have to specifiy task
-                setSwitch(config, task, cfg, allArgs, "true", "FT0", ft0Parameters, "true/false")
             mandatoryArgChecker(config, task, cfg, taskNameInConfig, "processOnlyBCs")
 
+# PID species which are not used by the barrel track cuts are set to the automatic setup
+if args.pidPruning == "cuts":
+    pidPruning(config, initArgs.dqLibGetter.cutsIndex())
+
 # Transactions
 centralityChecker(config, args.process, args.syst, centSearch)
 aodFileChecker(args.aod)
-trackPropagationChecker(args.add_track_prop, barrelDeps)
-
-# Write the updated configuration file into a temporary file
-updatedConfigFileName = "tempConfigTableMakerMC.json"
-
-with open(updatedConfigFileName, "w") as outputFile:
-    json.dump(config, outputFile, indent = 2)
-
-# Check which dependencies need to be run
-depsToRun = {}
-for dep in commonDeps:
-    depsToRun[dep] = 1
-
-for processFunc in specificDeps.keys():
-    if processFunc not in config[taskNameInConfig].keys():
-        continue
-    if config[taskNameInConfig][processFunc] == "true":
-        if "processFull" in processFunc or "processBarrel" in processFunc:
-            for dep in barrelDeps:
-                depsToRun[dep] = 1
-        if "processFull" in processFunc or "processMuon" in processFunc:
-            for dep in muonDeps:
-                depsToRun[dep] = 1
-        for dep in specificDeps[processFunc]:
-            depsToRun[dep] = 1
+pruneForChecker(args.pruneFor)
+
+# Input paths relative to the current directory, the workflow runs in the work directory of the run
+absoluteInputs(config)
+
+# Write the updated configuration file content-addressed, concurrent runs in the same checkout do not overwrite it
+updatedConfigFileName = writeArtifact(config, "tempConfigTableMakerMC.json")
+
+# Minimal set of dependencies producing the tables consumed by the enabled process functions
+convertersToRun = ["o2-analysis-track-propagation"] if args.add_track_prop else [] # track-propagation replaces trackextension
+depsToRun = resolveDevices(requiredTables(config, tableConsumers), convertersToRun)
+logDevices(depsToRun)
 
 # Check which tables are required in the output
 tablesToProduce = {}
 tableProducer(
-    config, taskNameInConfig, tablesToProduce, commonTables, barrelCommonTables, muonCommonTables, specificTables, specificDeps, runOverMC
+    config, taskNameInConfig, tablesToProduce, commonTables, barrelCommonTables, muonCommonTables, specificTables, processTables, runOverMC
     )
 
-writerConfigFileName = "aodWriterTempConfig.json"
+# Tables which no downstream analysis consumes are not written
+if args.pruneFor:
+    downstreamConsumers = [(TABLE_READER_CONSUMERS, TABLE_READER_PRODUCTS), (DQ_EFFICIENCY_CONSUMERS, DQ_EFFICIENCY_PRODUCTS)]
+    tablePruning(tablesToProduce, tables, args.pruneFor, downstreamConsumers, args.pruneReference)
 
 # Generate the aod-writer output descriptor json file
-generateDescriptors(tablesToProduce, tables, writerConfigFileName, kFlag = False)
+writerConfigFileName = generateDescriptors(tablesToProduce, tables, "aodWriterTempConfig.json", kFlag = False)[0]
+
+# Shared memory of the workflow, auto sized from the memory budget of the node, values configured in CLI win
+shmSegmentSize, aodMemoryRateLimit = args.shm_segment_size, args.aod_memory_rate_limit
+if args.memorySizing == "auto":
+    aodFile = config.get("internal-dpl-aod-reader", {}).get("aod-file") # --aod or AO2D input of the JSON config
+    shmSegmentSize, aodMemoryRateLimit, _ = sizeSharedMemory(tablesToProduce, aodInputSizes(aodFile), 1, shmSegmentSize, aodMemoryRateLimit)
 
 commandToRun = (
-    taskNameInCommandLine + " --configuration json://" + updatedConfigFileName +
-    " --severity error --shm-segment-size 12000000000 --aod-writer-json " + writerConfigFileName + " -b"
+    taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " --severity error --shm-segment-size " +
+    str(shmSegmentSize or SHM_SEGMENT_SIZE)
     )
-if args.aod_memory_rate_limit:
-    commandToRun = (
-        taskNameInCommandLine + " --configuration json://" + updatedConfigFileName +
-        " --severity error --shm-segment-size 12000000000 --aod-memory-rate-limit " + args.aod_memory_rate_limit + " --aod-writer-json " +
-        writerConfigFileName + " -b"
-        )
+if aodMemoryRateLimit:
+    commandToRun += " --aod-memory-rate-limit " + str(aodMemoryRateLimit)
+commandToRun += " --aod-writer-json " + writerConfigFileName + " -b"
 
 for dep in depsToRun.keys():
     commandToRun += " | " + dep + " --configuration json://" + updatedConfigFileName + " -b"
@@ -244,5 +264,15 @@ logging.info("Tables to produce:")
 logging.info(tablesToProduce.keys())
 print("====================================================================================================================")
 dispArgs(allArgs) # Display all args
-os.system(commandToRun) # Execute O2 generated commands
-runPycacheRemover() # Run pycacheRemover
+
+# Skimmed data cache, recorded workflows (runFusedWorkflow, runPipeline) are not cached
+skimCacheOn = args.skimCache == "on" and not os.environ.get(WORKFLOW_PLAN_ENV)
+if skimCacheOn:
+    fingerprint, fingerprintComponents = skimFingerprint(config, tablesToProduce, commandToRun)
+    if restoreSkim(fingerprint):
+        sys.exit(0)
+    skimStart = time.time()
+exitCode = runIsolatedWorkflow(commandToRun) # Execute O2 generated commands
+if skimCacheOn and exitCode == 0:
+    storeSkim(fingerprint, fingerprintComponents, int(args.skimCacheSize * 1024**3), skimStart)
+sys.exit(exitCode)
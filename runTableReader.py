@@ -21,11 +21,23 @@
 import json
 import logging
 import logging.config
-import os
+import sys
+
+sys.dont_write_bytecode = True # pycacheRemover is not cached, bytecode of other modules goes to the per-user pycache prefix
+from extramodules.pycacheRemover import setPycachePrefix
+
+setPycachePrefix()
+
+from extramodules.completionTable import fastComplete
+
+fastComplete() # TAB autocompletion is answered from the precompiled table (if fresh) without importing the interface
+
 from extramodules.dqTranscations import mandatoryArgChecker, aodFileChecker, depsChecker, forgettedArgsChecker, jsonTypeChecker, mainTaskChecker, oneToMultiDepsChecker
-from extramodules.configSetter import setConfig, setFalseHasDeps, setSwitch, setSelection, setProcessDummy, debugSettings, dispArgs, setPrefixSuffix
-from extramodules.pycacheRemover import runPycacheRemover
-from dqtasks.tableReader import TableReader
+from extramodules.configSetter import setFalseHasDeps, setSelection, setProcessDummy, debugSettings, dispArgs, setPrefixSuffix, generateReaderDescriptor, ConfigRewriter
+from extramodules.dependencyGraph import inputTables, logTables
+from extramodules.workflowRunner import runIsolatedWorkflow
+from extramodules.runArtifacts import writeArtifact, absoluteInputs, absolutePath
+from dqtasks.tableReader import TableReader, TABLE_READER_TREES, TABLE_READER_CONSUMERS, TABLE_READER_PRODUCTS
 
 # Predefined selections for setSwitch function
 sameEventPairingParameters = [
@@ -107,6 +119,12 @@ if args.onlySelect == "false":
 
 setSelection(config, analysisSelectionDeps, args.analysis, cliMode) # Set selections
 
+# Interface Logic (indexed, only the cfgs configured in CLI are visited)
+configRewriter = ConfigRewriter(config)
+configRewriter.setConfig(config, allArgs, cliMode)
+configRewriter.setSwitch(config, allArgs, cliMode, "process", sameEventPairingParameters, "true/false")
+configRewriter.setSwitch(config, allArgs, cliMode, "mixing", eventMixingParameters, "true/false")
+
 # Iterating in JSON config file
 for task, cfgValuePair in config.items():
     if isinstance(cfgValuePair, dict):
@@ -121,10 +139,6 @@ for task, cfgValuePair in config.items():
                 config[task][cfg] = args.reader
                 logging.debug(" - [%s] %s : %s", task, cfg, args.reader)
             
-            # Interface Logic
-            setConfig(config, task, cfg, allArgs, cliMode)
-            setSwitch(config, task, cfg, allArgs, cliMode, "process", sameEventPairingParameters, "true/false")
-            setSwitch(config, task, cfg, allArgs, cliMode, "mixing", eventMixingParameters, "true/false")
             setFalseHasDeps(config, task, cfg, args.process, sameEventPairingParameters, cliMode)
             setFalseHasDeps(config, task, cfg, args.mixing, eventMixingParameters, cliMode)
             mandatoryArgChecker(config, task, cfg, taskNameInConfig, "processSkimmed")
@@ -138,14 +152,22 @@ oneToMultiDepsChecker(args.process, "sameEventPairing", args.analysis, "analysis
 depsChecker(config, sameEventPairingDeps, sameEventTaskName)
 depsChecker(config, eventMixingDeps, eventMixingTaskName)
 
-# Write the updated configuration file into a temporary file
-updatedConfigFileName = "tempConfigTableReader.json"
+# Input descriptor with only the trees consumed by the enabled process functions, unless a reader config is given in CLI
+if not args.reader:
+    tablesToRead = inputTables(config, TABLE_READER_CONSUMERS, TABLE_READER_PRODUCTS)
+    logTables(tablesToRead, TABLE_READER_TREES)
+    config.setdefault("internal-dpl-aod-reader", {})["aod-reader-json"] = generateReaderDescriptor(tablesToRead, TABLE_READER_TREES)
+
+# Input paths relative to the current directory, the workflow runs in the work directory of the run
+absoluteInputs(config)
 
-with open(updatedConfigFileName, "w") as outputFile:
-    json.dump(config, outputFile, indent = 2)
+# Write the updated configuration file content-addressed, concurrent runs in the same checkout do not overwrite it
+updatedConfigFileName = writeArtifact(config, "tempConfigTableReader.json")
 
 # commandToRun = taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " -b"
-commandToRun = (taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " --aod-writer-json " + args.writer + " -b")
+commandToRun = (
+    taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " --aod-writer-json " + absolutePath(args.writer) + " -b"
+    )
 
 if args.writer == "false":
     commandToRun = (taskNameInCommandLine + " --configuration json://" + updatedConfigFileName + " -b")
@@ -155,5 +177,4 @@ logging.info("Command to run:")
 logging.info(commandToRun)
 print("====================================================================================================================")
 dispArgs(allArgs) # Display all args
-os.system(commandToRun) # Execute O2 generated commands
-runPycacheRemover() # Run pycacheRemover
+sys.exit(runIsolatedWorkflow(commandToRun)) # Execute O2 generated commands
@@ -0,0 +1,89 @@
+import copy
+
+import pytest
+
+from extramodules.configSetter import ConfigRewriter, setConfig, setSwitch
+
+CONFIG = {
+    "table-maker":
+        {
+            "cfgEventCuts": "eventStandard",
+            "cfgBarrelTrackCuts": "jpsiPID1",
+            "processBarrelOnly": "false",
+            "processMuonOnly": "true",
+            "processDummy": "false"
+            },
+    "tof-pid-full": {
+        "pid-el": "-1",
+        "pid-pi": "1",
+        "pid-ka": "0"
+        },
+    "tpc-pid-full": {
+        "pid-el": "1",
+        "pid-pi": "-1",
+        "pid-ka": "1"
+        },
+    "internal-dpl-clock": "",
+    }
+PROCESS = ["processBarrelOnly", "processMuonOnly"]
+PID = ["pid-el", "pid-pi", "pid-ka"]
+
+
+def legacyRewrite(config, allArgs, cliMode):
+    for task, cfgValuePair in config.items():
+        if not isinstance(cfgValuePair, dict):
+            continue
+        for cfg in list(cfgValuePair):
+            setConfig(config, task, cfg, allArgs, cliMode)
+            setSwitch(config, task, cfg, allArgs, cliMode, "process", PROCESS, "true/false")
+            setSwitch(config, task, cfg, allArgs, cliMode, "pid", PID, "1/-1")
+
+
+def indexedRewrite(config, allArgs, cliMode):
+    rewriter = ConfigRewriter(config)
+    rewriter.setConfig(config, allArgs, cliMode)
+    rewriter.setSwitch(config, allArgs, cliMode, "process", PROCESS, "true/false")
+    rewriter.setSwitch(config, allArgs, cliMode, "pid", PID, "1/-1")
+
+
+LIST_ARGS = {
+    "cfgEventCuts": ["eventStandardNoINT7", "eventTPCOnly"],
+    "cfgBarrelTrackCuts": "jpsiPID2",
+    "process": ["processBarrelOnly"],
+    "pid": ["pid-el", "pid-ka"]
+    }
+STRING_ARGS = {
+    "cfgEventCuts": None,
+    "process": "processMuonOnly",
+    "pid": "pid-pi"
+    }
+ALL_SWITCHES_ARGS = {
+    "process": ["processBarrelOnly", "processMuonOnly"],
+    "pid": ["pid-el"]
+    }
+
+
+@pytest.mark.parametrize("cliMode", ["true", "false"])
+@pytest.mark.parametrize("allArgs", [LIST_ARGS, STRING_ARGS, ALL_SWITCHES_ARGS, {}])
+def testConfigRewriterParity(allArgs, cliMode):
+    legacy = copy.deepcopy(CONFIG)
+    indexed = copy.deepcopy(CONFIG)
+    legacyRewrite(legacy, allArgs, cliMode)
+    indexedRewrite(indexed, allArgs, cliMode)
+    assert indexed == legacy
+
+
+def testProtectedCfgsAreNotRewritten():
+    config = copy.deepcopy(CONFIG)
+    rewriter = ConfigRewriter(config, protectedCfgs = {
+        "tof-pid-full": "pid-"
+        })
+    rewriter.setSwitch(config, {
+        "pid": ["pid-ka"]
+        }, "true", "pid", PID, "1/-1")
+    assert config["tof-pid-full"] == CONFIG["tof-pid-full"]
+    assert config["tpc-pid-full"] == {
+        "pid-el": "-1",
+        "pid-pi": "-1",
+        "pid-ka": "1"
+        }
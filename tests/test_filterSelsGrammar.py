@@ -0,0 +1,20 @@
+import pytest
+
+from extramodules.filterSelsGrammar import FilterSelsChoices
+
+CHOICES = FilterSelsChoices({"jpsiO2MCdebugCuts2", "muonQualityCuts"}, {"pairNoCut", "pairMassLow5"}, ["none"])
+
+
+@pytest.mark.parametrize("sel", ["jpsiO2MCdebugCuts2::1", "muonQualityCuts:pairNoCut:1", "muonQualityCuts:pairMassLow5:9", "none"])
+def testValidSelections(sel):
+    assert sel in CHOICES
+
+
+@pytest.mark.parametrize(
+    "sel", [
+        "jpsiO2MCdebugCuts2", "jpsiO2MCdebugCuts2:1", "jpsiO2MCdebugCuts2::0", "jpsiO2MCdebugCuts2::10", "unknownCut::1",
+        "muonQualityCuts:unknownPairCut:1", "muonQualityCuts:pairNoCut:1:1", ""
+        ]
+    )
+def testInvalidSelections(sel):
+    assert sel not in CHOICES
@@ -0,0 +1,93 @@
+import os
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from extramodules.libDownloader import DQ_LIB_PATHS, downloadLibs, libUrls
+
+
+class LibHandler(BaseHTTPRequestHandler):
+    
+    """Serves the headers of the server with ETag and Last-Modified, conditional requests are answered with 304"""
+    
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        content = self.server.files.get(path)
+        self.server.requests.append(path)
+        if content is None:
+            self.send_error(404)
+            return
+        etag = '"' + hashlib.sha256(content).hexdigest()[: 16] + '"'
+        lastModified = "Wed, 21 Oct 2015 07:28:00 GMT"
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", lastModified)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = HTTPServer(("127.0.0.1", 0), LibHandler)
+    server.files = {
+        "/master/" + path: ("// " + path + "\n").encode()
+        for path in DQ_LIB_PATHS.values()
+        }
+    server.requests = []
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def testConditionalDownload(server, tmp_path):
+    libDir = str(tmp_path)
+    urls = libUrls("master", "http://127.0.0.1:%d" % server.server_address[1])
+    
+    assert set(downloadLibs(urls, libDir = libDir).values()) == {"downloaded"}
+    for lib, path in DQ_LIB_PATHS.items():
+        with open(os.path.join(libDir, lib), "rb") as libFile:
+            assert libFile.read() == server.files["/master/" + path]
+    
+    assert set(downloadLibs(urls, libDir = libDir).values()) == {"unchanged"}
+    
+    server.files["/master/PWGDQ/Core/CutsLibrary.h"] = b"// changed\n"
+    results = downloadLibs(urls, libDir = libDir)
+    assert results.pop("tempCutsLibrary.h") == "downloaded"
+    assert set(results.values()) == {"unchanged"}
+    with open(os.path.join(libDir, "tempCutsLibrary.h"), "rb") as libFile:
+        assert libFile.read() == b"// changed\n"
+    assert len(server.requests) == 3 * len(DQ_LIB_PATHS)
+
+
+def testFailedDownloadKeepsHeader(server, tmp_path):
+    libDir = str(tmp_path)
+    urls = libUrls("master", "http://127.0.0.1:%d" % server.server_address[1])
+    downloadLibs(urls, libDir = libDir)
+    
+    del server.files["/master/PWGDQ/Core/MixingLibrary.h"]
+    assert downloadLibs(urls, libDir = libDir)["tempMixingLibrary.h"] == "failed"
+    with open(os.path.join(libDir, "tempMixingLibrary.h"), "rb") as libFile:
+        assert libFile.read() == b"// PWGDQ/Core/MixingLibrary.h\n"
+
+
+def testOnlyMissing(server, tmp_path):
+    libDir = str(tmp_path)
+    urls = libUrls("master", "http://127.0.0.1:%d" % server.server_address[1])
+    downloadLibs(urls, libDir = libDir)
+    os.remove(os.path.join(libDir, "tempHistogramsLibrary.h"))
+    
+    results = downloadLibs(urls, onlyMissing = True, libDir = libDir)
+    assert results.pop("tempHistogramsLibrary.h") == "downloaded"
+    assert set(results.values()) == {"present"}
@@ -0,0 +1,77 @@
+import os
+
+from extramodules.dqLibGetter import DQ_LIBS
+from extramodules.libStore import CURRENT, OBJECTS, addVersion, currentVersion, evictVersions, findVersion, switchVersion
+
+
+def writeLibs(libDir, content):
+    os.makedirs(libDir, exist_ok = True)
+    for lib in DQ_LIBS:
+        with open(os.path.join(libDir, lib), "w") as libFile:
+            libFile.write("// " + content + " " + lib + "\n")
+    return {
+        lib: os.path.join(libDir, lib)
+        for lib in DQ_LIBS
+        }
+
+
+def addVersions(tmp_path, count):
+    store = str(tmp_path / "store")
+    return store, [addVersion("v" + str(i), writeLibs(str(tmp_path / ("src" + str(i))), str(i)), store) for i in range(count)]
+
+
+def testLocalSourcesAreCopied(tmp_path):
+    store = str(tmp_path / "store")
+    sources = writeLibs(str(tmp_path / "O2Physics"), "local")
+    contentHash = addVersion("local-abc", sources, store)
+    stored = os.path.join(store, OBJECTS, contentHash, "tempCutsLibrary.h")
+    assert not os.path.samefile(stored, sources["tempCutsLibrary.h"])
+    
+    with open(sources["tempCutsLibrary.h"], "w") as libFile:
+        libFile.write("// edited in the checkout\n")
+    with open(stored) as libFile:
+        assert libFile.read() == "// local tempCutsLibrary.h\n"
+
+
+def testDownloadsAreLinked(tmp_path):
+    store = str(tmp_path / "store")
+    sources = writeLibs(str(tmp_path / "downloads"), "tag")
+    contentHash = addVersion("nightly-20220619", sources, store, linkSources = True)
+    assert os.path.samefile(os.path.join(store, OBJECTS, contentHash, "tempCutsLibrary.h"), sources["tempCutsLibrary.h"])
+
+
+def testSameContentIsStoredOnce(tmp_path):
+    store = str(tmp_path / "store")
+    first = addVersion("local-abc", writeLibs(str(tmp_path / "a"), "same"), store)
+    second = addVersion("local-def", writeLibs(str(tmp_path / "b"), "same"), store)
+    assert first == second
+    assert findVersion("local-def", store) == first
+    assert len([name for name in os.listdir(os.path.join(store, OBJECTS)) if not name.startswith(".")]) == 1
+
+
+def testSwitchVersionLinksWorkDir(tmp_path):
+    store, versions = addVersions(tmp_path, 2)
+    workDir = str(tmp_path / "work")
+    os.makedirs(workDir)
+    
+    assert switchVersion(versions[0], store, workDir)
+    assert currentVersion(store) == versions[0]
+    assert not switchVersion(versions[0], store, workDir)
+    assert switchVersion(versions[1], store, workDir)
+    with open(os.path.join(workDir, "tempCutsLibrary.h")) as libFile:
+        assert libFile.read() == "// 1 tempCutsLibrary.h\n"
+    assert os.path.islink(os.path.join(store, CURRENT))
+
+
+def testEvictVersionsKeepsCurrentAndRecentlyUsed(tmp_path):
+    store, versions = addVersions(tmp_path, 4)
+    for age, contentHash in enumerate(versions):
+        os.utime(os.path.join(store, OBJECTS, contentHash), (1000 + age, 1000 + age))
+    switchVersion(versions[0], store, str(tmp_path))
+    
+    evicted = evictVersions(store, maxVersions = 2)
+    assert evicted == versions[1 : 3]
+    assert findVersion("v0", store) == versions[0]
+    assert findVersion("v1", store) is None
+    assert findVersion("v3", store) == versions[3]
+    assert not os.path.exists(os.path.join(store, "refs", "v1"))
@@ -0,0 +1,47 @@
+from unittest import mock
+
+import pytest
+
+from extramodules import memorySizing
+from extramodules.memorySizing import SHM_MIN, SHM_SEGMENT_SIZE, sizeSharedMemory
+
+
+def withBudget(available):
+    budget = {
+        "memTotal": available,
+        "memAvailable": available,
+        "cgroupLimit": None,
+        "cgroupUsage": None,
+        "available": available
+        }
+    return mock.patch.object(memorySizing, "memoryBudget", return_value = budget)
+
+
+def testUnknownBudgetUsesFixedSegment():
+    with withBudget(None):
+        assert sizeSharedMemory(["ReducedEvents"], [10**9]) == (SHM_SEGMENT_SIZE, SHM_SEGMENT_SIZE // 2, 1)
+
+
+def testSegmentIsNeverBelowMinimum():
+    with withBudget(64 * 1024**3):
+        shmSegmentSize, aodMemoryRateLimit, concurrentWorkflows = sizeSharedMemory([], [1], 4)
+    assert shmSegmentSize == SHM_MIN
+    assert aodMemoryRateLimit == SHM_MIN // 2
+    assert concurrentWorkflows == 4
+
+
+def testSmallBudgetReducesConcurrentWorkflows():
+    with withBudget(4 * 1024**3):
+        shmSegmentSize, _, concurrentWorkflows = sizeSharedMemory(["ReducedEvents"], [10**9], 4)
+    assert (shmSegmentSize, concurrentWorkflows) == (SHM_MIN, 2)
+
+
+@pytest.mark.parametrize("available", [0, 1024**3])
+def testBudgetBelowOneWorkflowFails(available):
+    with withBudget(available), pytest.raises(SystemExit):
+        sizeSharedMemory(["ReducedEvents"], [10**9], 1)
+
+
+def testCliValuesAreKept():
+    with withBudget(0):
+        assert sizeSharedMemory(["ReducedEvents"], [10**9], 4, 2 * 1024**3, 1024**3) == (2 * 1024**3, 1024**3, 4)
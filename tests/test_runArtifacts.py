@@ -0,0 +1,71 @@
+import os
+import json
+import time
+
+from extramodules.runArtifacts import ARTIFACT_FOLDER, cleanupRuns, writeArtifact
+
+
+def testCleanupKeepsReferencedArtifacts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    referenced = writeArtifact({
+        "task": {
+            "cfg": "1"
+            }
+        }, "tempConfigTableMaker.json")
+    unused = writeArtifact({
+        "task": {
+            "cfg": "2"
+            }
+        }, "tempConfigTableMaker.json")
+    old = time.time() - 30*86400
+    for artifact in [referenced, unused]:
+        os.utime(artifact, (old, old))
+    os.makedirs(os.path.join("tempShards", "runTableMaker-20240101-000000-1"))
+    with open(os.path.join("tempShards", "runTableMaker-20240101-000000-1", "shardPlan.json"), "w") as planFile:
+        json.dump({
+            "version": 1,
+            "aodList": referenced,
+            "shards": []
+            }, planFile)
+    
+    cleanupRuns([])
+    assert os.listdir(ARTIFACT_FOLDER) == [os.path.basename(referenced)]
+
+
+def testCleanupKeepsArtifactsOfPipelineState(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    referenced = writeArtifact({
+        "task": {
+            "cfg": "1"
+            }
+        }, "tempConfigTableMaker.json")
+    unused = writeArtifact({
+        "task": {
+            "cfg": "2"
+            }
+        }, "tempConfigTableMaker.json")
+    old = time.time() - 30*86400
+    for artifact in [referenced, unused]:
+        os.utime(artifact, (old, old))
+    with open("tempPipelineState.json", "w") as stateFile:
+        json.dump({
+            "1:runTableMaker.py": {
+                "workflows": [{
+                    "command": "o2 --configuration json://" + referenced
+                    }]
+                }
+            }, stateFile)
+    
+    cleanupRuns([])
+    assert os.listdir(ARTIFACT_FOLDER) == [os.path.basename(referenced)]
+
+
+def testCleanupKeepsNewestRuns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for i in range(4):
+        os.makedirs(os.path.join("tempWorkflowRuns", "runTableMaker-2024010%d-000000-999999999" % i))
+        os.utime(os.path.join("tempWorkflowRuns", "runTableMaker-2024010%d-000000-999999999" % i), (1000 + i, time.time() - i))
+    
+    removed = cleanupRuns(["tempWorkflowRuns"], keep = 2)
+    assert sorted(os.listdir("tempWorkflowRuns")) == ["runTableMaker-20240100-000000-999999999", "runTableMaker-20240101-000000-999999999"]
+    assert len(removed) == 2
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from extramodules.shardRunner import SHARD_PLAN_VERSION, planShards, readShardPlan, writeShardPlan
+
+AOD_FILES = ["AO2D_%d.root" % i for i in range(6)]
+
+
+def testShardsAreBalancedByBytes():
+    plan = planShards(AOD_FILES, [100, 10, 60, 50, 40, 10], 3)
+    assert [shard["bytes"] for shard in plan] == [100, 80, 90]
+    assert sorted(aodFile for shard in plan for aodFile in shard["files"]) == AOD_FILES
+    for shard in plan:
+        assert shard["files"] == sorted(shard["files"], key = AOD_FILES.index) # order of the list is kept
+
+
+def testUnknownSizesAreEstimatedWithMedian():
+    plan = planShards(AOD_FILES[: 4], [10, None, 30, None], 2)
+    assert sum(shard["unknownSizes"] for shard in plan) == 2
+    assert sum(shard["bytes"] for shard in plan) == 10 + 30 + 2*20
+
+
+def testNoEmptyShards():
+    plan = planShards(AOD_FILES[: 2], [1, 2], 8)
+    assert len(plan) == 2
+    assert all(shard["files"] for shard in plan)
+
+
+def testShardPlanRoundTrip(tmp_path):
+    plan = planShards(AOD_FILES, [5, 4, 3, 2, 1, None], 2)
+    planFileName = str(tmp_path / "shardPlan.json")
+    writeShardPlan(plan, "@list.txt", planFileName)
+    assert readShardPlan(planFileName) == plan
+
+
+@pytest.mark.parametrize(
+    "manifest", [{
+        "version": SHARD_PLAN_VERSION + 1,
+        "shards": [{
+            "files": ["a.root"]
+            }]
+        }, {
+            "version": SHARD_PLAN_VERSION
+            }]
+    )
+def testInvalidShardPlan(tmp_path, manifest):
+    planFileName = str(tmp_path / "shardPlan.json")
+    with open(planFileName, "w") as planFile:
+        json.dump(manifest, planFile)
+    with pytest.raises(ValueError):
+        readShardPlan(planFileName)
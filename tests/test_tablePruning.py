@@ -0,0 +1,59 @@
+import struct
+
+from extramodules.tablePruning import treeSizes
+
+BEGIN = 100
+
+
+def rootString(value):
+    return bytes([len(value)]) + value.encode()
+
+
+def rootKey(nbytes, className, name, title):
+    keyHeader = struct.pack(">ihiIhhii", nbytes, 4, 0, 0, 0, 1, 0, 0)
+    keyHeader += rootString(className) + rootString(name) + rootString(title)
+    return keyHeader + b"\0" * (nbytes - len(keyHeader))
+
+
+def writeRootFile(fileName, keys, version = 62400):
+    records = b"".join(keys)
+    end = BEGIN + len(records)
+    if version >= 1000000:
+        header = b"root" + struct.pack(">iiq", version, BEGIN, end)
+    else:
+        header = b"root" + struct.pack(">iii", version, BEGIN, end)
+    with open(fileName, "wb") as rootFile:
+        rootFile.write(header + b"\0" * (BEGIN - len(header)) + records)
+
+
+def testTreeSizes(tmp_path):
+    fileName = str(tmp_path / "reducedAod.root")
+    writeRootFile(
+        fileName, [
+            rootKey(120, "TFile", "reducedAod.root", ""),
+            rootKey(200, "TDirectoryFile", "DF_1", "DF_1"),
+            rootKey(300, "TTree", "O2reducedtrack", "O2reducedtrack"),
+            rootKey(1000, "TBasket", "fPt", "O2reducedtrack"),
+            rootKey(150, "TTree", "O2reducedevent", "O2reducedevent"),
+            rootKey(500, "TBasket", "fPosZ", "O2reducedevent"),
+            rootKey(700, "TBasket", "fEta", "O2reducedtrack"),
+            ]
+        )
+    assert treeSizes(fileName) == {
+        "O2reducedtrack": 2000,
+        "O2reducedevent": 650
+        }
+
+
+def testLargeFileHeader(tmp_path):
+    fileName = str(tmp_path / "reducedAod.root")
+    writeRootFile(fileName, [rootKey(300, "TTree", "O2reducedevent", "O2reducedevent")], version = 1062400)
+    assert treeSizes(fileName) == {
+        "O2reducedevent": 300
+        }
+
+
+def testNotRootFile(tmp_path):
+    fileName = tmp_path / "reducedAod.root"
+    fileName.write_bytes(b"not a root file")
+    assert treeSizes(str(fileName)) is None
@@ -0,0 +1,94 @@
+from extramodules.workflowComposer import mergeConfigs, mergeWriterConfigs
+
+TABLE_MAKER = {
+    "table-maker": {
+        "cfgBarrelTrackCuts": "jpsiPID1",
+        "processBarrelOnly": "true"
+        },
+    "event-selection-task": {
+        "syst": "pp",
+        "processRun3": "true"
+        },
+    "tof-pid-full": {
+        "pid-el": "1",
+        "pid-pi": "-1"
+        },
+    "internal-dpl-clock": "",
+    }
+FILTER_PP = {
+    "d-q-filter-p-p-task": {
+        "cfgBarrelSels": "jpsiPID1::1"
+        },
+    "table-maker": {
+        "cfgBarrelTrackCuts": "jpsiPID2",
+        "processBarrelOnly": "false",
+        "processDummy": "true"
+        },
+    "event-selection-task": {
+        "syst": "pp",
+        "processRun3": "true"
+        },
+    "tof-pid-full": {
+        "pid-el": "-1",
+        "pid-pi": "1"
+        },
+    "internal-dpl-clock": "",
+    }
+
+
+def descriptors(tables, fileName = None):
+    if fileName is None:
+        return [dict(table = table) for table in tables]
+    return [dict(table = table, filename = fileName) for table in tables]
+
+
+def testMergeConfigs():
+    merged, conflicts = mergeConfigs(
+        [("runTableMaker.py", "table-maker", TABLE_MAKER), ("runFilterPP.py", "d-q-filter-p-p-task", FILTER_PP)]
+        )
+    assert conflicts == []
+    assert merged["table-maker"] == TABLE_MAKER["table-maker"] # processDummy in the filter, taken from table-maker
+    assert merged["d-q-filter-p-p-task"] == FILTER_PP["d-q-filter-p-p-task"]
+    assert set(merged["tof-pid-full"].values()) == {"1"} # "1/-1" switches are merged as union
+    assert merged["internal-dpl-clock"] == ""
+
+
+def testMergeConfigsConflicts():
+    other = {
+        "event-selection-task": dict(TABLE_MAKER["event-selection-task"], syst = "PbPb")
+        }
+    merged, conflicts = mergeConfigs([("runTableMaker.py", "table-maker", TABLE_MAKER), ("runDQFlow.py", "analysis-qvector", other)])
+    task, cfg, analysisValues = conflicts[0]
+    assert (len(conflicts), task, cfg) == (1, "event-selection-task", "syst")
+    assert analysisValues == dict([("runTableMaker.py", "pp"), ("runDQFlow.py", "PbPb")])
+
+
+def testMainTaskWins():
+    other = {
+        "table-maker": dict(TABLE_MAKER["table-maker"], cfgBarrelTrackCuts = "jpsiPID2")
+        }
+    merged, conflicts = mergeConfigs([("runTableMaker.py", "table-maker", TABLE_MAKER), ("runDQFlow.py", "analysis-qvector", other)])
+    assert conflicts == []
+    assert merged["table-maker"]["cfgBarrelTrackCuts"] == "jpsiPID1"
+
+
+def testMergeWriterConfigs():
+    tableMakerWriter = {
+        "OutputDirector": {
+            "resfile": "reducedAod",
+            "OutputDescriptors": descriptors(["AOD/REDUCEDEVENT/0", "AOD/REDUCEDTRACK/0"])
+            }
+        }
+    filterWriter = {
+        "OutputDirector": {
+            "resfile": "dqFilter",
+            "OutputDescriptors": descriptors(["AOD/DQEVENTFILTER/0", "AOD/REDUCEDEVENT/0"])
+            }
+        }
+    merged = mergeWriterConfigs([tableMakerWriter, filterWriter])
+    assert merged["OutputDirector"]["resfile"] == "reducedAod"
+    assert merged["OutputDirector"]["OutputDescriptors"] == (
+        descriptors(["AOD/REDUCEDEVENT/0", "AOD/REDUCEDTRACK/0"], "reducedAod") + descriptors(["AOD/DQEVENTFILTER/0"], "dqFilter")
+        )
+    assert tableMakerWriter["OutputDirector"]["OutputDescriptors"] == descriptors(["AOD/REDUCEDEVENT/0", "AOD/REDUCEDTRACK/0"])
+    assert mergeWriterConfigs([]) is None